@@ -194,6 +194,22 @@ CREATE TRIGGER autoupdate_tc
                             closure_table_child_field=closure_table_child_field)
 
 
+def get_pg_drop_tc(links_table_name, closure_table_name):
+    """
+    Return the SQL to remove the trigger that keeps the transitive closure
+    table up to date, and to empty the table, reclaiming its space.
+    """
+    from string import Template
+
+    pg_drop_tc = Template("""
+DROP TRIGGER IF EXISTS autoupdate_tc ON $links_table_name;
+DROP FUNCTION IF EXISTS update_tc();
+TRUNCATE $closure_table_name;
+""")
+    return pg_drop_tc.substitute(links_table_name=links_table_name,
+                                 closure_table_name=closure_table_name)
+
+
 #====================================
 #   Mysql Transive Closure
 #====================================
@@ -378,6 +394,7 @@ END;
 
 def install_tc(sender, **kwargs):
     from django.db import connection, transaction
+    from aiida.backends import settings as aiida_settings
 
     cursor = connection.cursor()
 
@@ -437,6 +454,14 @@ def install_tc(sender, **kwargs):
 
         transaction.commit_unless_managed()
 
+    elif ("postgresql" in settings.DATABASES['default']['ENGINE'] and
+          not aiida_settings.USE_DBPATH):
+        print '== Postgres found, DbPath disabled in the profile, removing transitive closure engine =='
+
+        cursor.execute(get_pg_drop_tc(links_table_name, closure_table_name))
+
+        transaction.commit_unless_managed()
+
     elif "postgresql" in settings.DATABASES['default']['ENGINE']:
         print '== Postgres found, installing transitive closure engine =='
 
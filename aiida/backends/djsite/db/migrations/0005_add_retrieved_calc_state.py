@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from aiida.backends.djsite.db.migrations import update_schema_version
+
+
+SCHEMA_VERSION = "1.0.5"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('db', '0004_add_daemon_and_uuid_indices'),
+    ]
+
+    operations = [
+        # Add the RETRIEVED state, set when the files of a calculation
+        # have been retrieved but not parsed yet
+        migrations.AlterField(
+            model_name='dbcalcstate',
+            name='state',
+            field=models.CharField(db_index=True, max_length=25,
+                                   choices=[(b'RETRIEVALFAILED', b'RETRIEVALFAILED'), (b'COMPUTED', b'COMPUTED'),
+                                            (b'RETRIEVING', b'RETRIEVING'), (b'RETRIEVED', b'RETRIEVED'),
+                                            (b'WITHSCHEDULER', b'WITHSCHEDULER'),
+                                            (b'SUBMISSIONFAILED', b'SUBMISSIONFAILED'), (b'PARSING', b'PARSING'),
+                                            (b'FAILED', b'FAILED'), (b'FINISHED', b'FINISHED'),
+                                            (b'TOSUBMIT', b'TOSUBMIT'), (b'SUBMITTING', b'SUBMITTING'),
+                                            (b'IMPORTED', b'IMPORTED'), (b'NEW', b'NEW'),
+                                            (b'PARSINGFAILED', b'PARSINGFAILED')]),
+            preserve_default=True,
+        ),
+        # The parser of the daemon queries for the RETRIEVED state, too
+        migrations.RunSQL("""
+        DROP INDEX IF EXISTS tval_idx_for_daemon;
+        CREATE INDEX tval_idx_for_daemon
+        ON db_dbattribute (tval)
+        WHERE ("db_dbattribute"."tval"
+        IN ('COMPUTED', 'WITHSCHEDULER', 'TOSUBMIT', 'RETRIEVED'))"""),
+        update_schema_version(SCHEMA_VERSION)
+    ]
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from aiida.backends.djsite.db.migrations import update_schema_version
+
+
+SCHEMA_VERSION = "1.0.6"
+
+
+def drop_dbpath(apps, schema_editor):
+    """
+    If the profile does not use the DbPath table (AIIDADB_USE_DBPATH set to
+    False), remove the trigger that maintains it and empty the table.
+
+    .. note:: to use the DbPath table again afterwards, it has to be rebuilt
+        from the links.
+    """
+    from aiida.backends import settings
+    from aiida.backends.djsite.db.management import get_pg_drop_tc
+
+    if settings.USE_DBPATH:
+        return
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(get_pg_drop_tc('db_dblink', 'db_dbpath'))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('db', '0005_add_retrieved_calc_state'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_dbpath),
+        update_schema_version(SCHEMA_VERSION)
+    ]
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from __future__ import unicode_literals
+
+from django.db import models, migrations
+
+from aiida.backends.djsite.db.migrations import update_schema_version
+from aiida.backends.utils import get_fill_calc_state_sql
+
+
+SCHEMA_VERSION = "1.0.7"
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('db', '0006_optional_dbpath'),
+    ]
+
+    operations = [
+        # Keep the most recent state of each calculation on the node row,
+        # so that it can be read and filtered with a single index lookup
+        migrations.AddField(
+            model_name='dbnode',
+            name='calc_state',
+            field=models.CharField(max_length=25, null=True, db_index=True,
+                                   editable=False),
+            preserve_default=True,
+        ),
+        migrations.RunSQL(get_fill_calc_state_sql()),
+        update_schema_version(SCHEMA_VERSION)
+    ]
@@ -187,10 +187,30 @@ class DbNode(m.Model):
     # For the API: whether this node
     public = m.BooleanField(default=False)
 
+    # Most recent state of a calculation (the full history is in DbCalcState),
+    # to read and filter it without going through the DbCalcState table.
+    # Managed by the JobCalculation class. Do not modify
+    calc_state = m.CharField(max_length=25, null=True, db_index=True,
+                             editable=False)
+
     objects = m.Manager()
     # Return aiida Node instances or their subclasses instead of DbNode instances
     aiidaobjects = AiidaObjectManager()
 
+    def save(self, *args, **kwargs):
+        """
+        Save the node. When updating an existing node, the calc_state field
+        is not written: it is only changed with atomic updates by the
+        JobCalculation class, and the value held by this instance may be
+        stale.
+        """
+        if (self.pk is not None and not kwargs.get('force_insert', False)
+                and kwargs.get('update_fields') is None):
+            kwargs['update_fields'] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name != 'calc_state']
+        return super(DbNode, self).save(*args, **kwargs)
+
     def get_aiida_class(self):
         """
         Return the corresponding aiida instance of class aiida.orm.Node or a
@@ -651,6 +671,12 @@ class DbMultipleValueAttributeBaseClass(m.Model):
     # separator for subfields
     _sep = AIIDA_ATTRIBUTE_SEP
 
+    # Maximum number of rows of a single INSERT in bulk_insert
+    _bulk_batch_size = 1000
+    # On PostgreSQL, bulk_insert uses a COPY instead of INSERTs
+    # from this number of rows on
+    _copy_threshold = 500
+
     class Meta:
         abstract = True
         unique_together = (('key',),)
@@ -695,6 +721,42 @@ class DbMultipleValueAttributeBaseClass(m.Model):
         from aiida.backends.utils import validate_attribute_key
         return validate_attribute_key(key)
 
+    @classmethod
+    def bulk_insert(cls, entries):
+        """
+        Insert in the DB the given (unsaved) class instances, typically
+        those returned by create_value.
+
+        On PostgreSQL, large numbers of entries are sent with a single COPY
+        command, much faster than INSERTs; otherwise, multi-row INSERTs of
+        at most cls._bulk_batch_size rows are used.
+
+        :note: the primary keys of the entries are not set.
+
+        :param entries: a list of class instances
+        """
+        from django.db import connection
+        from aiida.backends.utils import copy_rows
+
+        if not entries:
+            return
+
+        if (connection.vendor != 'postgresql' or
+                len(entries) < cls._copy_threshold):
+            cls.objects.bulk_create(entries, batch_size=cls._bulk_batch_size)
+            return
+
+        fields = [f for f in cls._meta.local_concrete_fields
+                  if not f.primary_key]
+        rows = ([f.get_db_prep_save(f.pre_save(entry, True),
+                                    connection=connection)
+                 for f in fields] for entry in entries)
+
+        with connection.cursor() as cursor:
+            # copy_expert is only available on the psycopg2 cursor
+            copy_rows(cursor.cursor, cls._meta.db_table,
+                      [f.column for f in fields], rows)
+
     @classmethod
     def set_value(cls, key, value, with_transaction=True,
                   subspecifier_value=None, other_attribs={},
@@ -757,7 +819,7 @@ class DbMultipleValueAttributeBaseClass(m.Model):
                     ## all sub-items.
                     cls.del_value(key,
                                   subspecifier_value=subspecifier_value)
-                cls.objects.bulk_create(to_store)
+                cls.bulk_insert(to_store)
 
             if with_transaction:
                 transaction.savepoint_commit(sid)
@@ -1168,27 +1230,50 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
             stored in the Db table, correctly converted
             to the right type.
         """
-        dballsubvalues = cls.objects.filter(dbnode__id=dbnodepk).values_list(
-            'key', 'datatype', 'tval', 'fval',
-            'ival', 'bval', 'dval')
-
-        data = {_[0]: {
-            "datatype": _[1],
-            "tval": _[2],
-            "fval": _[3],
-            "ival": _[4],
-            "bval": _[5],
-            "dval": _[6],
-        } for _ in dballsubvalues
+        return cls.get_all_values_for_nodepks([dbnodepk])[dbnodepk]
+
+    @classmethod
+    def get_all_values_for_nodepks(cls, dbnodepks):
+        """
+        Return the attributes of many nodes at once, fetching the rows of
+        all the nodes with a single query.
+
+        :param dbnodepks: an iterable of node PKs
+        :return: a dictionary where each key is one of the given PKs, and
+            the value the dictionary that would be returned by
+            :py:meth:`get_all_values_for_nodepk`
+        """
+        from collections import defaultdict
+
+        dbnodepks = set(dbnodepks)
+        data_by_node = defaultdict(dict)
+        if dbnodepks:
+            dballsubvalues = cls.objects.filter(
+                dbnode__id__in=dbnodepks).values_list(
+                'dbnode_id', 'key', 'datatype', 'tval', 'fval',
+                'ival', 'bval', 'dval')
+
+            for _ in dballsubvalues:
+                data_by_node[_[0]][_[1]] = {
+                    "datatype": _[2],
+                    "tval": _[3],
+                    "fval": _[4],
+                    "ival": _[5],
+                    "bval": _[6],
+                    "dval": _[7],
                 }
-        try:
-            return deserialize_attributes(data, sep=cls._sep,
-                                          original_class=cls,
-                                          original_pk=dbnodepk)
-        except DeserializationException as e:
-            exc = DbContentError(e.message)
-            exc.original_exception = e
-            raise exc
+
+        retval = {}
+        for dbnodepk in dbnodepks:
+            try:
+                retval[dbnodepk] = deserialize_attributes(
+                    data_by_node[dbnodepk], sep=cls._sep,
+                    original_class=cls, original_pk=dbnodepk)
+            except DeserializationException as e:
+                exc = DbContentError(e.message)
+                exc.original_exception = e
+                raise exc
+        return retval
 
     @classmethod
     def reset_values_for_node(cls, dbnode, attributes, with_transaction=True,
@@ -1221,8 +1306,45 @@ class DbAttributeBaseClass(DbMultipleValueAttributeBaseClass):
                 # Reset. For set, use also a filter for key__in=attributes.keys()
                 cls.objects.filter(dbnode=dbnode_node).delete()
 
-                if nodes_to_store:
-                    cls.objects.bulk_create(nodes_to_store)
+                cls.bulk_insert(nodes_to_store)
+
+            if with_transaction:
+                transaction.savepoint_commit(sid)
+        except:
+            if with_transaction:
+                transaction.savepoint_rollback(sid)
+            raise
+
+    @classmethod
+    def reset_values_for_nodes(cls, attributes_by_node, with_transaction=True):
+        """
+        Replace all the attributes of several nodes at once, with a single
+        DELETE and a single bulk insertion (see bulk_insert) for all of them.
+
+        :param attributes_by_node: a dictionary where the keys are dbnodes
+          (or their PKs) and the values are the dictionaries of attributes
+          to set
+        :param with_transaction: if True (default), do this within a
+          transaction, so that nothing gets stored if an attribute cannot be
+          created.
+        """
+        from django.db import transaction
+
+        entries = []
+        dbnode_pks = []
+        for dbnode, attributes in attributes_by_node.iteritems():
+            entries.extend(cls.reset_values_for_node(
+                dbnode, attributes, with_transaction=False,
+                return_not_store=True))
+            dbnode_pks.append(dbnode if isinstance(dbnode, (int, long))
+                              else dbnode.pk)
+
+        try:
+            if with_transaction:
+                sid = transaction.savepoint()
+
+            cls.objects.filter(dbnode__in=dbnode_pks).delete()
+            cls.bulk_insert(entries)
 
             if with_transaction:
                 transaction.savepoint_commit(sid)
@@ -1632,6 +1754,25 @@ class DbLock(m.Model):
     owner = m.CharField(max_length=255, blank=False)
 
 
+class DbCheckpoint(m.Model):
+    """
+    The pickled checkpoint of a process of the workflow engine, stored by
+    aiida.work.persistence.DbPersistence.
+    """
+    # The pid of the process, i.e. the pk of its calculation node. It is not
+    # a ForeignKey, so that the checkpoint can be saved before the node
+    pid = m.IntegerField(unique=True)
+    # running, finished or failed
+    state = m.CharField(max_length=20, db_index=True)
+    # The pk of the calculation the process is waiting on, if any
+    waiting_on_pk = m.IntegerField(null=True, db_index=True)
+    mtime = m.DateTimeField(auto_now=True, db_index=True, editable=False)
+    checkpoint = m.BinaryField()
+
+    def __str__(self):
+        return "Checkpoint of process {} ({})".format(self.pid, self.state)
+
+
 @python_2_unicode_compatible
 class DbWorkflow(m.Model):
     from aiida.common.datastructures import wf_states
@@ -26,7 +26,7 @@ class CalcStateChanges(AiidaTestCase):
             'aiida.backends.djsite.db.migrations.0002_db_state_change',
             fromlist=['fix_calc_states']
         )
-        from aiida.common.datastructures import calc_states
+        from aiida.common.datastructures import calc_states, sort_states
         from aiida.backends.djsite.db.models import DbCalcState, DbLog
         from aiida.orm.calculation.job import JobCalculation
 
@@ -64,7 +64,10 @@ class CalcStateChanges(AiidaTestCase):
             if handler:
                 handler.setLevel(original_level)
 
-            current_state = job.get_state()
+            # The migration fixes the state history: the calc_state column
+            # is added (and filled from the history) only by a later one
+            current_state = sort_states(DbCalcState.objects.filter(
+                dbnode=job.dbnode).values_list('state', flat=True))[0]
             self.assertNotEqual(current_state, state,
                                 "Migration code failed to change removed state {}".
                                 format(state))
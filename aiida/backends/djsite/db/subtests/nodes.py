@@ -95,9 +95,13 @@ class TestDataNodeDjango(AiidaTestCase):
 
 class TestTransitiveClosureDeletionDjango(AiidaTestCase):
     def test_creation_and_deletion(self):
+        from aiida.backends import settings
         from aiida.backends.djsite.db.models import DbLink  # Direct links
         from aiida.backends.djsite.db.models import DbPath  # The transitive closure table
 
+        if not settings.USE_DBPATH:
+            self.skipTest("The DbPath table is disabled in the profile")
+
         n1 = Node().store()
         n2 = Node().store()
         n3 = Node().store()
@@ -279,6 +283,46 @@ class TestNodeBasicDjango(AiidaTestCase):
 
         self.assertEqual(s1.getvalue(), "a")
 
+    def test_bulk_insert_attributes(self):
+        """
+        Large attributes are inserted with a COPY on PostgreSQL: check
+        that all datatypes are written back correctly.
+        """
+        import datetime
+        from aiida.backends.djsite.db.models import DbAttribute
+        from aiida.utils.timezone import make_aware, get_current_timezone
+
+        date = make_aware(datetime.datetime(2017, 1, 2, 3, 4, 5, 6),
+                          get_current_timezone())
+        attributes = {
+            'list': range(DbAttribute._copy_threshold),
+            'mixed': [None, True, False, 1.5, float('inf'), -3,
+                      u'\xe0"\n,', '', date, {'a': []}],
+        }
+        a = Node()
+        for k, v in attributes.iteritems():
+            a._set_attr(k, v)
+        a.store()
+
+        self.assertEquals(DbAttribute.get_all_values_for_node(a.dbnode),
+                          attributes)
+
+    def test_reset_values_for_nodes(self):
+        from aiida.backends.djsite.db.models import DbAttribute
+
+        a = Node()
+        a._set_attr('old', 1)
+        a.store()
+        b = Node().store()
+
+        DbAttribute.reset_values_for_nodes(
+            {a.dbnode: {'x': [1, 2]}, b.pk: {'y': {'z': 'w'}}})
+
+        self.assertEquals(DbAttribute.get_all_values_for_node(a.dbnode),
+                          {'x': [1, 2]})
+        self.assertEquals(DbAttribute.get_all_values_for_nodepk(b.pk),
+                          {'y': {'z': 'w'}})
+
     def test_load_nodes(self):
         """
         """
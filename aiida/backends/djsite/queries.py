@@ -41,8 +41,6 @@ class QueryManagerDjango(AbstractQueryManager):
 
         :return: a list of calculation objects matching the filters.
         """
-        # I assume that calc_states are strings. If this changes in the future,
-        # update the filter below from dbattributes__tval to the correct field.
         from aiida.orm import Computer,User
         from aiida.common.exceptions import InputValidationError
         from aiida.orm.implementation.django.calculation.job import JobCalculation
@@ -67,10 +65,9 @@ class QueryManagerDjango(AbstractQueryManager):
             kwargs['dbcomputer__enabled'] = True
 
 
-        queryresults = JobCalculation.query(
-            dbattributes__key='state',
-            dbattributes__tval=state,
-            **kwargs)
+        # The current state is kept in the indexed calc_state column of the
+        # node, no join on the attributes or on the DbCalcState is needed
+        queryresults = JobCalculation.query(calc_state=state, **kwargs)
 
         if only_computer_user_pairs:
             computer_users_ids = queryresults.values_list(
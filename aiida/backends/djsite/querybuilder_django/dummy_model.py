@@ -306,6 +306,8 @@ class DbNode(Base):
 
     nodeversion = Column(Integer, default=1)
 
+    calc_state = Column(String(25), index=True, nullable=True)
+
     attributes = relationship('DbAttribute', uselist=True, backref='dbnode')
     extras = relationship('DbExtra', uselist=True, backref='dbnode')
 
@@ -360,70 +362,20 @@ class DbNode(Base):
     @hybrid_property
     def state(self):
         """
-        Return the most recent state from DbCalcState
+        Return the most recent state of the calculation, as stored in the
+        calc_state column
         """
-        if not self.id:
-            return None
-        all_states = DbCalcState.query.filter(DbCalcState.dbnode_id == self.id).all()
-        if all_states:
-            #return max((st.time, st.state) for st in all_states)[1]
-            return sort_states(((dbcalcstate.state, dbcalcstate.state.value)
-                                for dbcalcstate in all_states),
-                                use_key=True)[0]
-        else:
-            return None
+        return self.calc_state
 
     @state.expression
     def state(cls):
         """
-        Return the expression to get the 'latest' state from DbCalcState,
-        to be used in queries, where 'latest' is defined using the state order
-        defined in _sorted_datastates.
+        Return the expression to get the 'latest' state of a calculation,
+        to be used in queries. The latest state (using the state order
+        defined in _sorted_datastates) is kept in the indexed calc_state
+        column, so no subquery on the DbCalcState table is needed.
         """
-        # Sort first the latest states
-        whens = {
-            v: idx for idx, v
-            in enumerate(_sorted_datastates[::-1], start=1)}
-        custom_sort_order = case(value=DbCalcState.state,
-                                 whens=whens,
-                                 else_=100) # else: high value to put it at the bottom
-
-        # Add numerical state to string, to allow to sort them
-        states_with_num = select([
-            DbCalcState.id.label('id'),
-            DbCalcState.dbnode_id.label('dbnode_id'),
-            DbCalcState.state.label('state_string'),
-            custom_sort_order.label('num_state')
-        ]).select_from(DbCalcState).alias()
-
-        # Get the most 'recent' state (using the state ordering, and the min function) for
-        # each calc
-        calc_state_num = select([
-            states_with_num.c.dbnode_id.label('dbnode_id'),
-            func.min(states_with_num.c.num_state).label('recent_state')
-        ]).group_by(states_with_num.c.dbnode_id).alias()
-
-        # Join the most-recent-state table with the DbCalcState table
-        all_states_q = select([
-            DbCalcState.dbnode_id.label('dbnode_id'),
-            DbCalcState.state.label('state_string'),
-            calc_state_num.c.recent_state.label('recent_state'),
-            custom_sort_order.label('num_state'),
-        ]).select_from(#DbCalcState).alias().join(
-            join(DbCalcState, calc_state_num, DbCalcState.dbnode_id == calc_state_num.c.dbnode_id)).alias()
-
-        # Get the association between each calc and only its corresponding most-recent-state row
-        subq = select([
-            all_states_q.c.dbnode_id.label('dbnode_id'),
-            all_states_q.c.state_string.label('state')
-        ]).select_from(all_states_q).where(all_states_q.c.num_state == all_states_q.c.recent_state).alias()
-
-        # Final filtering for the actual query
-        return select([subq.c.state]).\
-            where(
-                    subq.c.dbnode_id == cls.id,
-                ).\
-            label('laststate')
+        return cls.calc_state.label('laststate')
 
 
 
@@ -28,6 +28,7 @@ from sqlalchemy.sql.elements import Cast, Label
 from aiida.common.exceptions import InputValidationError
 from aiida.backends.general.querybuilder_interface import QueryBuilderInterface
 from aiida.backends.utils import _get_column
+from aiida.common.utils import grouper
 from aiida.common.exceptions import (
         InputValidationError, DbContentError,
         MissingPluginError, ConfigurationError
@@ -653,6 +654,36 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
         with transaction.atomic():
             return query.first()
 
+    def _iter_aiida_rows(self, rows, batch_size, keys):
+        """
+        Convert the rows returned by the query to lists of AiiDA results.
+
+        If all the attributes (or extras) of a node are projected, the query
+        returns the PK of the node: rather than rebuilding the attributes of
+        each node with a separate query, those of all the nodes in a batch
+        of rows are fetched at once.
+
+        :param rows: the rows returned by the query, as sequences
+        :param batch_size: the number of rows in each batch
+        :param keys: the keys of the values in each row
+        """
+        bulk_classes = {'attributes': DbAttribute, 'extras': DbExtra}
+        bulk_indices = [index for index, key in enumerate(keys)
+                        if key in bulk_classes]
+
+        for batch in grouper(batch_size, rows):
+            bulk_values = {
+                index: bulk_classes[keys[index]].get_all_values_for_nodepks(
+                    row[index] for row in batch)
+                for index in bulk_indices
+            }
+            for row in batch:
+                yield [
+                    bulk_values[index][value] if index in bulk_values
+                    else self.get_aiida_res(key, value)
+                    for index, (key, value) in enumerate(zip(keys, row))
+                ]
+
     def iterall(self, query, batch_size, tag_to_index_dict):
         from django.db import transaction
 
@@ -664,21 +695,15 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
                 # if you have provided an ormclass
 
                 if tag_to_index_dict.values() == ['*']:
-                    for rowitem in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-                else:
-                    for rowitem, in results:
-                        yield [self.get_aiida_res(tag_to_index_dict[0], rowitem)]
-            elif len(tag_to_index_dict) > 1:
-                for resultrow in results:
-                    yield [
-                        self.get_aiida_res(tag_to_index_dict[colindex], rowitem)
-                        for colindex, rowitem
-                        in enumerate(resultrow)
-                    ]
-            else:
+                    results = ([rowitem] for rowitem in results)
+            elif not tag_to_index_dict:
                 raise Exception("Got an empty dictionary: {}".format(tag_to_index_dict))
 
+            keys = [tag_to_index_dict[colindex]
+                    for colindex in range(len(tag_to_index_dict))]
+            for resultrow in self._iter_aiida_rows(results, batch_size, keys):
+                yield resultrow
+
 
     def iterdict(self, query, batch_size, tag_to_projected_entity_dict):
         from django.db import transaction
@@ -687,42 +712,29 @@ class QueryBuilderImplDjango(QueryBuilderInterface):
             results = query.yield_per(batch_size)
             # Two cases: If one column was asked, the database returns a matrix of rows * columns:
             nr_items = sum([len(v) for v in tag_to_projected_entity_dict.values()])
-            if nr_items > 1:
-                for this_result in results:
-                    yield {
-                        tag:{
-                            attrkey:self.get_aiida_res(
-                                    attrkey, this_result[index_in_sql_result]
-                                )
-                            for attrkey, index_in_sql_result
-                            in projected_entities_dict.items()
-                        }
-                        for tag, projected_entities_dict
-                        in tag_to_projected_entity_dict.items()
-                    }
-            elif nr_items == 1:
-                # I this case, sql returns a  list, where each listitem is the result
-                # for one row. Here I am converting it to a list of lists (of length 1)
+            if nr_items == 1:
+                # If an ormclass was asked, sql returns the instance for each
+                # row. Here I am converting it to a list of lists (of length 1)
                 if [ v for entityd in tag_to_projected_entity_dict.values() for v in entityd.keys()] == ['*']:
-                    for this_result in results:
-                        yield {
-                            tag:{
-                                attrkey : self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
-                else:
-                    for this_result, in results:
-                        yield {
-                            tag:{
-                                attrkey : self.get_aiida_res(attrkey, this_result)
-                                for attrkey, position in projected_entities_dict.items()
-                            }
-                            for tag, projected_entities_dict in tag_to_projected_entity_dict.items()
-                        }
-            else:
+                    results = ([this_result] for this_result in results)
+            elif nr_items < 1:
                 raise Exception("Got an empty dictionary")
 
+            keys = [None] * nr_items
+            for projected_entities_dict in tag_to_projected_entity_dict.values():
+                for attrkey, index_in_sql_result in projected_entities_dict.items():
+                    keys[index_in_sql_result] = attrkey
+
+            for this_result in self._iter_aiida_rows(results, batch_size, keys):
+                yield {
+                    tag:{
+                        attrkey:this_result[index_in_sql_result]
+                        for attrkey, index_in_sql_result
+                        in projected_entities_dict.items()
+                    }
+                    for tag, projected_entities_dict
+                    in tag_to_projected_entity_dict.items()
+                }
+
 
 
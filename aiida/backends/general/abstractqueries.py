@@ -47,8 +47,6 @@ class AbstractQueryManager(object):
 
         :return: a list of calculation objects matching the filters.
         """
-        # I assume that calc_states are strings. If this changes in the future,
-        # update the filter below from dbattributes__tval to the correct field.
         from aiida.orm.computer import Computer
         from aiida.orm.calculation.job import JobCalculation
         from aiida.orm.user import User
@@ -60,6 +58,7 @@ class AbstractQueryManager(object):
             raise InputValidationError("querying for calculation state='{}', but it "
                                 "is not a valid calculation state".format(state))
 
+        # The 'state' of a calculation is its (indexed) calc_state column
         calcfilter = {'state': {'==': state}}
         computerfilter = {"enabled": {'==': True}}
         userfilter = {}
@@ -102,7 +101,6 @@ class AbstractQueryManager(object):
             qb.add_projection("calc", "*")
             if limit is not None:
                 qb.limit(limit)
-            returnresult = qb.all()
-            returnresult = zip(*returnresult)[0]
+            returnresult = [_[0] for _ in qb.all()]
         return returnresult
 
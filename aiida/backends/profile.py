@@ -61,6 +61,9 @@ def load_profile(process=None, profile=None):
     # Migration script should put it in profile (config.json)
     settings.BACKEND = config.get("AIIDADB_BACKEND", BACKEND_DJANGO)
 
+    # Profiles with large graphs can do without the transitive closure table
+    settings.USE_DBPATH = config.get("AIIDADB_USE_DBPATH", True)
+
 
 def is_profile_loaded():
     """
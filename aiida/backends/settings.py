@@ -17,6 +17,12 @@ AIIDANODES_UUID_VERSION = 4
 
 BACKEND = None
 
+# Whether the DbPath table (the transitive closure of the links, kept up to
+# date by a trigger) is used. It is set by load_profile from the
+# AIIDADB_USE_DBPATH key of the profile; if False, the ancestors and the
+# descendants of the nodes are found with recursive queries on the links.
+USE_DBPATH = True
+
 TEST_REPOSITORY = None
 
 # This is used (and should be set to true) for the correct compilation
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Migrations of the schema of an existing SQLAlchemy database.
+
+They are never applied when loading the database environment (load_dbenv
+only checks the schema version): run them explicitly with
+``verdi devel migrate``, with the daemon stopped.
+"""
+from aiida.backends import sqlalchemy as sa
+
+
+def _add_node_calc_state(session):
+    """
+    Upgrade the schema from version 0.1 to 0.2: add the (indexed) calc_state
+    column to the DbNode table, filled with the most recent state of each
+    calculation.
+    """
+    from sqlalchemy.engine import reflection
+    from aiida.backends.utils import get_fill_calc_state_sql
+
+    # The column is already there if the database was converted from a
+    # Django one
+    inspector = reflection.Inspector.from_engine(session.bind)
+    if 'calc_state' not in [column['name'] for column in
+                            inspector.get_columns('db_dbnode')]:
+        session.execute("ALTER TABLE db_dbnode "
+                        "ADD COLUMN calc_state varchar(25)")
+        session.execute("CREATE INDEX ix_db_dbnode_calc_state "
+                        "ON db_dbnode (calc_state)")
+    session.execute(get_fill_calc_state_sql())
+
+
+def _add_checkpoint_table(session):
+    """
+    Upgrade the schema from version 0.2 to 0.3: add the DbCheckpoint table,
+    used to store the checkpoints of the workflow engine in the database.
+    """
+    from aiida.backends.sqlalchemy.models.checkpoint import DbCheckpoint
+
+    # The table is already there if the database was converted from a
+    # Django one
+    DbCheckpoint.__table__.create(bind=session.connection(), checkfirst=True)
+
+
+def _drop_dbpath(session):
+    """
+    Upgrade the schema from version 0.3 to 0.4: if the profile does not use
+    the DbPath table (AIIDADB_USE_DBPATH set to False), remove the trigger
+    that maintains it and empty the table.
+
+    .. note:: to use the DbPath table again afterwards, it has to be rebuilt
+        from the links.
+    """
+    from aiida.backends import settings
+    from aiida.backends.sqlalchemy.utils import get_pg_drop_tc
+
+    if settings.USE_DBPATH:
+        return
+
+    session.execute(get_pg_drop_tc('db_dblink', 'db_dbpath'))
+
+
+# The migrations, in the format
+# (db_schema_version, new_schema_version, upgrade_function). They are
+# applied in sequence by migrate.
+MIGRATIONS = [
+    (0.1, 0.2, _add_node_calc_state),
+    (0.2, 0.3, _add_checkpoint_table),
+    (0.3, 0.4, _drop_dbpath),
+]
+
+
+def migrate():
+    """
+    Bring the schema of the database of the loaded profile to the version of
+    the code, applying in sequence the needed migrations. Each migration is
+    committed together with the new schema version, so that an interrupted
+    migrate can simply be run again.
+
+    The database environment must be loaded without the schema check
+    (see aiida.backends.sqlalchemy.utils._load_dbenv_noschemacheck).
+
+    :return: the list of the schema versions the database was migrated to.
+    :raise ConfigurationError: if the database has a schema version for
+      which no migration is known.
+    """
+    from aiida.common.exceptions import ConfigurationError
+    from aiida.backends.sqlalchemy.models import SCHEMA_VERSION
+    from aiida.backends.utils import (get_db_schema_version,
+                                      set_db_schema_version)
+
+    session = sa.get_scoped_session()
+    migrations = dict((version, (new_version, upgrade))
+                      for version, new_version, upgrade in MIGRATIONS)
+
+    applied = []
+    db_schema_version = get_db_schema_version()
+    while (db_schema_version is not None and
+           db_schema_version != SCHEMA_VERSION):
+        try:
+            new_schema_version, upgrade = migrations[db_schema_version]
+        except KeyError:
+            raise ConfigurationError(
+                "No migration is known from the schema version {} of the "
+                "database to the schema version {} of the code".format(
+                    db_schema_version, SCHEMA_VERSION))
+        try:
+            upgrade(session)
+            # This also commits the upgrade
+            set_db_schema_version(new_schema_version)
+        except Exception:
+            session.rollback()
+            raise
+        applied.append(new_schema_version)
+        db_schema_version = new_schema_version
+
+    # The setting may have been turned off after the 0.4 migration (the
+    # removal is idempotent)
+    try:
+        _drop_dbpath(session)
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+
+    return applied
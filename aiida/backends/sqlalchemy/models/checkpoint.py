@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+
+from sqlalchemy.schema import Column
+from sqlalchemy.types import Integer, DateTime, String, LargeBinary
+
+from aiida.utils import timezone
+from aiida.backends.sqlalchemy.models.base import Base
+
+
+class DbCheckpoint(Base):
+    """
+    The pickled checkpoint of a process of the workflow engine, stored by
+    aiida.work.persistence.DbPersistence.
+    """
+    __tablename__ = "db_dbcheckpoint"
+
+    id = Column(Integer, primary_key=True)
+
+    # The pid of the process, i.e. the pk of its calculation node. It is not
+    # a foreign key, so that the checkpoint can be saved before the node
+    pid = Column(Integer, unique=True, nullable=False)
+    # running, finished or failed
+    state = Column(String(20), index=True, nullable=False)
+    # The pk of the calculation the process is waiting on, if any
+    waiting_on_pk = Column(Integer, index=True, nullable=True)
+    mtime = Column(DateTime(timezone=True), default=timezone.now,
+                   onupdate=timezone.now, index=True)
+    checkpoint = Column(LargeBinary, nullable=False)
+
+    def __str__(self):
+        return "Checkpoint of process {} ({})".format(self.pid, self.state)
@@ -8,7 +8,9 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 
-from sqlalchemy import ForeignKey, select, func, join, and_, case
+from contextlib import contextmanager
+
+from sqlalchemy import ForeignKey, func, and_, inspect, literal
 from sqlalchemy.orm import (
     relationship, backref, Query, mapper,
     foreign, aliased
@@ -30,7 +32,7 @@ from aiida.backends.sqlalchemy.models.utils import uuid_func
 from aiida.common import aiidalogger
 from aiida.common.pluginloader import load_plugin
 from aiida.common.exceptions import DbContentError, MissingPluginError
-from aiida.common.datastructures import calc_states, _sorted_datastates, sort_states
+from aiida.common.datastructures import calc_states
 
 
 class DbCalcState(Base):
@@ -80,6 +82,9 @@ class DbNode(Base):
     public = Column(Boolean, default=False)
     attributes = Column(JSONB)
     extras = Column(JSONB)
+    # Most recent state of a calculation (the full history is in DbCalcState).
+    # Managed by the JobCalculation class. Do not modify
+    calc_state = Column(String(25), index=True, nullable=True)
 
     dbcomputer_id = Column(
         Integer,
@@ -208,14 +213,18 @@ class DbNode(Base):
             return thistype.rpartition('.')[2]
 
     def set_attr(self, key, value):
-        DbNode._set_attr(self.attributes, key, value)
-        flag_modified(self, "attributes")
-        self.save()
+        self._update_json_column("attributes", updates={key: value})
 
     def set_extra(self, key, value):
-        DbNode._set_attr(self.extras, key, value)
-        flag_modified(self, "extras")
-        self.save()
+        self._update_json_column("extras", updates={key: value})
+
+    def set_extras(self, extras):
+        """
+        Set many extras at once, with a single UPDATE of the node.
+
+        :param extras: a dictionary of key: value pairs
+        """
+        self._update_json_column("extras", updates=extras)
 
     def reset_extras(self, new_extras):
         self.extras.clear()
@@ -224,27 +233,152 @@ class DbNode(Base):
         self.save()
 
     def del_attr(self, key):
-        DbNode._del_attr(self.attributes, key)
-        flag_modified(self, "attributes")
-        self.save()
+        self._update_json_column("attributes", deletions=[key])
 
     def del_extra(self, key):
-        DbNode._del_attr(self.extras, key)
-        flag_modified(self, "extras")
-        self.save()
+        self._update_json_column("extras", deletions=[key])
+
+    def del_extras(self, keys):
+        """
+        Delete many extras at once, with a single UPDATE of the node.
+
+        :param keys: a list of keys
+        """
+        self._update_json_column("extras", deletions=keys)
+
+    @contextmanager
+    def coalesce_updates(self):
+        """
+        Return a context manager within which the changes to the attributes
+        and to the extras of a stored node are only recorded, and then
+        written to the database with a single UPDATE when the context is
+        exited (or discarded, if an exception is raised).
+        """
+        if getattr(self, '_pending_json_updates', None) is not None:
+            # Nested: the outermost context writes everything
+            yield
+            return
+
+        self._pending_json_updates = {}
+        try:
+            yield
+        except:
+            pending = self._pending_json_updates
+            self._pending_json_updates = None
+            if pending and inspect(self).persistent:
+                # Reload the values that were changed in memory only
+                self.session.expire(self, list(pending))
+            raise
+        else:
+            pending = self._pending_json_updates
+            self._pending_json_updates = None
+            if pending:
+                self._write_json_updates(pending)
+
+    def _update_json_column(self, column, updates=None, deletions=None):
+        """
+        Set and delete keys of one of the JSONB columns (attributes or
+        extras), both in memory and in the database.
+
+        For a node already in the database only the given keys are sent,
+        with an in-place UPDATE (``||`` to set and ``-`` to delete keys),
+        rather than rewriting the whole document; within
+        :py:meth:`coalesce_updates` the changes are only recorded.
+        """
+        updates = updates or {}
+        deletions = deletions or []
+
+        values = getattr(self, column)
+        # Check all the keys before changing anything
+        for key in updates:
+            DbNode._check_key(key)
+        for key in deletions:
+            DbNode._check_key(key)
+            if key not in values:
+                raise ValueError("Key {} does not exists".format(key))
+
+        values.update(updates)
+        for key in deletions:
+            del values[key]
+
+        pending = getattr(self, '_pending_json_updates', None)
+        if pending is None:
+            pending = {}
+            write = True
+        else:
+            write = False
+
+        column_updates, column_deletions = pending.setdefault(
+            column, ({}, set()))
+        for key, value in updates.iteritems():
+            column_updates[key] = value
+            column_deletions.discard(key)
+        for key in deletions:
+            column_updates.pop(key, None)
+            column_deletions.add(key)
+
+        if write:
+            self._write_json_updates(pending)
+
+    def _write_json_updates(self, pending):
+        """
+        Write to the database the changes recorded by
+        :py:meth:`_update_json_column`, and increment the node version.
+
+        :param pending: a dictionary with the column names as keys and
+            tuples (updates, deletions) as values.
+        """
+        from sqlalchemy.orm.attributes import set_committed_value
+
+        state = inspect(self)
+        if (not state.persistent or
+                any(column in state.committed_state for column in pending)):
+            # The node is not in the database yet, or there are other
+            # unflushed changes to the same columns: write whole documents
+            for column in pending:
+                flag_modified(self, column)
+            if self.id is not None:
+                self.nodeversion = DbNode.nodeversion + 1
+            self.save()
+            return
+
+        table = DbNode.__table__
+        new_values = {'nodeversion': table.c.nodeversion + 1}
+        for column, (updates, deletions) in pending.iteritems():
+            new_value = func.coalesce(table.c[column],
+                                      literal({}, type_=JSONB))
+            for key in sorted(deletions):
+                new_value = new_value.op('-')(literal(key, type_=Text))
+            if updates:
+                new_value = new_value.op('||')(literal(updates, type_=JSONB))
+            new_values[column] = new_value
+
+        session = self.session
+        nodeversion = session.execute(
+            table.update().where(table.c.id == self.id).values(
+                new_values).returning(table.c.nodeversion)).scalar()
+        # The in-memory values already contain the changes: mark them as
+        # in sync with the database, so that they are not written again
+        for column in pending:
+            set_committed_value(self, column, getattr(self, column))
+        set_committed_value(self, 'nodeversion', nodeversion)
+        session.commit()
 
     @staticmethod
-    def _set_attr(d, key, value):
+    def _check_key(key):
         if '.' in key:
             raise ValueError(
                 "We don't know how to treat key with dot in it yet")
 
+    @staticmethod
+    def _set_attr(d, key, value):
+        DbNode._check_key(key)
+
         d[key] = value
 
     @staticmethod
     def _del_attr(d, key):
-        if '.' in key:
-            raise ValueError("We don't know how to treat key with dot in it yet")
+        DbNode._check_key(key)
 
         if key not in d:
             raise ValueError("Key {} does not exists".format(key))
@@ -267,70 +401,20 @@ class DbNode(Base):
     @hybrid_property
     def state(self):
         """
-        Return the most recent state from DbCalcState
+        Return the most recent state of the calculation, as stored in the
+        calc_state column
         """
-        if not self.id:
-            return None
-        all_states = DbCalcState.query.filter(DbCalcState.dbnode_id == self.id).all()
-        if all_states:
-            #return max((st.time, st.state) for st in all_states)[1]
-            return sort_states(((dbcalcstate.state, dbcalcstate.state.value)
-                                for dbcalcstate in all_states),
-                                use_key=True)[0]
-        else:
-            return None
+        return self.calc_state
 
     @state.expression
     def state(cls):
         """
-        Return the expression to get the 'latest' state from DbCalcState,
-        to be used in queries, where 'latest' is defined using the state order
-        defined in _sorted_datastates.
+        Return the expression to get the 'latest' state of a calculation,
+        to be used in queries. The latest state (using the state order
+        defined in _sorted_datastates) is kept in the indexed calc_state
+        column, so no subquery on the DbCalcState table is needed.
         """
-        # Sort first the latest states
-        whens = {
-            v: idx for idx, v
-            in enumerate(_sorted_datastates[::-1], start=1)}
-        custom_sort_order = case(value=DbCalcState.state,
-                                 whens=whens,
-                                 else_=100) # else: high value to put it at the bottom
-
-        # Add numerical state to string, to allow to sort them
-        states_with_num = select([
-            DbCalcState.id.label('id'),
-            DbCalcState.dbnode_id.label('dbnode_id'),
-            DbCalcState.state.label('state_string'),
-            custom_sort_order.label('num_state')
-        ]).select_from(DbCalcState).alias()
-
-        # Get the most 'recent' state (using the state ordering, and the min function) for
-        # each calc
-        calc_state_num = select([
-            states_with_num.c.dbnode_id.label('dbnode_id'),
-            func.min(states_with_num.c.num_state).label('recent_state')
-        ]).group_by(states_with_num.c.dbnode_id).alias()
-
-        # Join the most-recent-state table with the DbCalcState table
-        all_states_q = select([
-            DbCalcState.dbnode_id.label('dbnode_id'),
-            DbCalcState.state.label('state_string'),
-            calc_state_num.c.recent_state.label('recent_state'),
-            custom_sort_order.label('num_state'),
-        ]).select_from(#DbCalcState).alias().join(
-            join(DbCalcState, calc_state_num, DbCalcState.dbnode_id == calc_state_num.c.dbnode_id)).alias()
-
-        # Get the association between each calc and only its corresponding most-recent-state row
-        subq = select([
-            all_states_q.c.dbnode_id.label('dbnode_id'),
-            all_states_q.c.state_string.label('state')
-        ]).select_from(all_states_q).where(all_states_q.c.num_state == all_states_q.c.recent_state).alias()
-
-        # Final filtering for the actual query
-        return select([subq.c.state]).\
-            where(
-                    subq.c.dbnode_id == cls.id,
-                ).\
-            label('laststate')
+        return cls.calc_state.label('laststate')
 
 
 class DbLink(Base):
@@ -392,4 +392,64 @@ class TestRelationshipsSQLA(AiidaTestCase):
     #     # # Check that only one stored node has user_id equal to that of dbu1
     #     # qb = QueryBuilder()
     #     # qb.append(Node, filters={'computer_id': {'==', dbc1.id}})
-    #     # self.assertIs(qb.count(), 1)
\ No newline at end of file
+    #     # self.assertIs(qb.count(), 1)
+
+class TestSchemaMigrationSQLA(AiidaTestCase):
+    """
+    Tests of the explicit migrations of the schema of the database.
+    """
+
+    def test_migrate(self):
+        """
+        check_schema_version only checks the version of the schema, and
+        migrate brings it back to the version of the code.
+        """
+        from aiida.backends.sqlalchemy.migrations import migrate
+        from aiida.backends.sqlalchemy.models import SCHEMA_VERSION
+        from aiida.backends.sqlalchemy.utils import check_schema_version
+        from aiida.backends.utils import (get_db_schema_version,
+                                          set_db_schema_version)
+        from aiida.common.exceptions import ConfigurationError
+
+        self.assertEqual(migrate(), [])
+
+        set_db_schema_version(0.2)
+        try:
+            with self.assertRaises(ConfigurationError):
+                check_schema_version()
+            self.assertEqual(get_db_schema_version(), 0.2)
+
+            self.assertEqual(migrate()[-1], SCHEMA_VERSION)
+            self.assertEqual(get_db_schema_version(), SCHEMA_VERSION)
+            check_schema_version()
+        finally:
+            set_db_schema_version(SCHEMA_VERSION)
+
+    def test_migrate_drop_dbpath(self):
+        """
+        The migration to the version 0.4 removes the trigger maintaining the
+        DbPath table if the profile does not use it.
+        """
+        from aiida.backends import settings
+        from aiida.backends.sqlalchemy import get_scoped_session
+        from aiida.backends.sqlalchemy.migrations import migrate
+        from aiida.backends.sqlalchemy.models import SCHEMA_VERSION
+        from aiida.backends.sqlalchemy.utils import install_tc
+        from aiida.backends.utils import set_db_schema_version
+
+        session = get_scoped_session()
+        count_triggers = ("SELECT count(*) FROM pg_trigger "
+                          "WHERE tgname = 'autoupdate_tc'")
+
+        use_dbpath = settings.USE_DBPATH
+        settings.USE_DBPATH = False
+        set_db_schema_version(0.3)
+        try:
+            self.assertEqual(migrate(), [0.4])
+            self.assertEqual(session.execute(count_triggers).scalar(), 0)
+        finally:
+            settings.USE_DBPATH = use_dbpath
+            set_db_schema_version(SCHEMA_VERSION)
+            if use_dbpath:
+                install_tc(session)
+                session.commit()
@@ -217,6 +217,22 @@ def install_tc(session):
                               closure_table_child_field))
 
 
+def get_pg_drop_tc(links_table_name, closure_table_name):
+    """
+    Return the SQL to remove the trigger that keeps the transitive closure
+    table up to date, and to empty the table, reclaiming its space.
+    """
+    from string import Template
+
+    pg_drop_tc = Template("""
+DROP TRIGGER IF EXISTS autoupdate_tc ON $links_table_name;
+DROP FUNCTION IF EXISTS update_tc();
+TRUNCATE $closure_table_name;
+""")
+    return pg_drop_tc.substitute(links_table_name=links_table_name,
+                                 closure_table_name=closure_table_name)
+
+
 def get_pg_tc(links_table_name,
               links_table_input_field,
               links_table_output_field,
@@ -437,7 +453,11 @@ def check_schema_version():
 
     if code_schema_version != db_schema_version:
         raise ConfigurationError(
-            "The code schema version is {}, but the version stored in the"
-            "database (DbSetting table) is {}, stopping.\n".
-            format(code_schema_version, db_schema_version)
+            "The code schema version is {}, but the version stored in the "
+            "database (DbSetting table) is {}, stopping.\n"
+            "To migrate the database to the current version, run the "
+            "following commands:\n  verdi daemon stop\n"
+            "  verdi -p {} devel migrate".
+            format(code_schema_version, db_schema_version,
+                   settings.AIIDADB_PROFILE)
         )
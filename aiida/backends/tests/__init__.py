@@ -66,6 +66,7 @@ db_test_list = {
         'work.legacy.job_process': ['aiida.backends.tests.work.legacy.job_process'],
         'pluginloader': ['aiida.backends.tests.test_plugin_loader'],
         'daemon': ['aiida.backends.tests.daemon'],
+        'daemon_polling': ['aiida.backends.tests.daemon_polling'],
         'verdi_commands': ['aiida.backends.tests.verdi_commands'],
     }
 }
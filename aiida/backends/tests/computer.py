@@ -39,3 +39,32 @@ class TestComputer(AiidaTestCase):
         with self.assertRaises(NotExistent):
             Computer.get(comp_pk)
 
+
+    def test_job_polling_policy(self):
+        from aiida.orm import Computer
+        new_comp = Computer(name='bbb',
+                            hostname='bbb',
+                            transport_type='local',
+                            scheduler_type='pbspro',
+                            workdir='/tmp/aiida')
+        self.assertEquals(new_comp.get_job_polling_policy(),
+                          Computer._default_job_polling_policy)
+
+        new_comp.set_job_polling_policy(minimum_interval=120)
+        new_comp.store()
+        policy = Computer.get(new_comp.pk).get_job_polling_policy()
+        self.assertEquals(policy['minimum_interval'], 120)
+        self.assertEquals(
+            policy['max_backoff'],
+            Computer._default_job_polling_policy['max_backoff'])
+
+        # None restores the default
+        new_comp.set_job_polling_policy(minimum_interval=None)
+        self.assertEquals(
+            new_comp.get_job_polling_policy()['minimum_interval'],
+            Computer._default_job_polling_policy['minimum_interval'])
+
+        with self.assertRaises(ValueError):
+            new_comp.set_job_polling_policy(unknown=1)
+        with self.assertRaises(ValueError):
+            new_comp.set_job_polling_policy(max_backoff=-1)
@@ -82,3 +82,525 @@ class TestDaemonBasic(AiidaTestCase):
         self.assertEquals(running_no, 0,
                           "At this point there should be "
                           "no running workflows.")
+
+
+    def test_running_steps_with_states(self):
+        from aiida.cmdline.commands.workflow import Workflow as WfCmd
+        from aiida.common.datastructures import calc_states
+        from aiida.orm.implementation import get_running_steps_with_states
+
+        head_wf = WFTestSimpleWithSubWF()
+        head_wf.start()
+
+        steps = [_ for _ in get_running_steps_with_states()
+                 if _[0].parent.pk == head_wf.pk]
+        self.assertEquals(len(steps), 1)
+        step, calc_states_by_pk, sub_wf_states_by_pk = steps[0]
+        self.assertEquals(step.name, 'start')
+        self.assertEquals(calc_states_by_pk.values(), [calc_states.FINISHED])
+        self.assertEquals(
+            sorted(sub_wf_states_by_pk.keys()),
+            sorted(_.pk for _ in head_wf.get_step('start').get_sub_workflows()))
+        self.assertEquals(set(sub_wf_states_by_pk.values()),
+                          set([wf_states.RUNNING]))
+
+        WfCmd().workflow_kill(*[str(head_wf.pk), "-f"])
+
+
+class TestAuthinfoWorkers(AiidaTestCase):
+    """
+    Tests for the dispatching of (computer, aiidauser) pairs to the
+    daemon workers.
+    """
+
+    class _Named(object):
+        def __init__(self, pk, name):
+            self.pk = pk
+            self.name = name
+            self.email = name
+
+    def _get_pairs(self):
+        computers = [self._Named(pk, 'computer{}'.format(pk))
+                     for pk in range(3)]
+        users = [self._Named(pk, 'user{}'.format(pk)) for pk in range(2)]
+        return [(c, u) for c in computers for u in users]
+
+    def _run(self, properties, function, pairs):
+        import mock
+        from aiida.daemon.execmanager import _run_for_computer_user_pairs
+
+        def get_property(name):
+            return properties[name]
+
+        with mock.patch('aiida.common.setup.get_property', get_property):
+            _run_for_computer_user_pairs(function, pairs)
+
+    def test_all_pairs_processed(self):
+        import threading
+
+        pairs = self._get_pairs()
+        processed = []
+        lock = threading.Lock()
+
+        def function(computer, aiidauser):
+            with lock:
+                processed.append((computer.pk, aiidauser.pk))
+
+        for num_workers in [1, 4]:
+            processed[:] = []
+            self._run({'daemon.authinfo_workers': num_workers,
+                       'daemon.computer_max_workers': 1,
+                       'daemon.authinfo_timeout': 0},
+                      function, pairs)
+            self.assertEquals(
+                sorted(processed),
+                sorted((c.pk, u.pk) for c, u in pairs))
+
+    def test_computer_max_workers(self):
+        import threading
+        import time
+
+        pairs = self._get_pairs()
+        running = {}
+        max_running = {}
+        lock = threading.Lock()
+
+        def function(computer, aiidauser):
+            with lock:
+                running[computer.pk] = running.get(computer.pk, 0) + 1
+                max_running[computer.pk] = max(
+                    max_running.get(computer.pk, 0), running[computer.pk])
+            time.sleep(0.05)
+            with lock:
+                running[computer.pk] -= 1
+
+        self._run({'daemon.authinfo_workers': 6,
+                   'daemon.computer_max_workers': 1,
+                   'daemon.authinfo_timeout': 0},
+                  function, pairs)
+        self.assertEquals(set(max_running.values()), set([1]))
+
+    def test_timeout(self):
+        import threading
+        import time
+        from aiida.daemon import execmanager
+
+        pairs = self._get_pairs()
+        properties = {'daemon.authinfo_workers': 3,
+                      'daemon.computer_max_workers': 2,
+                      'daemon.authinfo_timeout': 1}
+        release = threading.Event()
+        processed = []
+        lock = threading.Lock()
+
+        def function(computer, aiidauser):
+            with lock:
+                processed.append((computer.pk, aiidauser.pk))
+            if computer.pk == 0:
+                # Simulate a hanging computer
+                release.wait(10)
+
+        start = time.time()
+        try:
+            self._run(properties, function, pairs)
+            self.assertLess(time.time() - start, 5)
+            self.assertEquals(sorted(execmanager._in_flight_pairs),
+                              [(0, 0), (0, 1)])
+
+            # The pairs still being processed are not dispatched again
+            processed[:] = []
+            self._run(properties, function, pairs)
+            self.assertEquals(
+                sorted(processed),
+                sorted((c.pk, u.pk) for c, u in pairs if c.pk != 0))
+        finally:
+            release.set()
+
+        # Once their processing ends, they are dispatched again
+        start = time.time()
+        while execmanager._in_flight_pairs and time.time() - start < 10:
+            time.sleep(0.01)
+        self.assertEquals(execmanager._in_flight_pairs, set())
+        processed[:] = []
+        self._run(properties, function, pairs)
+        self.assertEquals(sorted(processed),
+                          sorted((c.pk, u.pk) for c, u in pairs))
+
+
+class TestJobsSnapshot(AiidaTestCase):
+    """
+    Tests for the jobs snapshot shared by the users of a computer.
+    """
+
+    def test_query_by_user_scheduler(self):
+        import mock
+        from aiida.daemon.execmanager import _get_jobs_from_snapshot
+        from aiida.scheduler.cache import JobsSnapshotCache
+        from aiida.scheduler.plugins.sge import SgeScheduler
+
+        class SgeLikeScheduler(SgeScheduler):
+            # The jobs in the queue, as seen by the next query
+            queue = {}
+            num_calls = 0
+
+            def getJobs(self, jobs=None, user=None, as_dict=False):
+                # Raises FeatureNotAvailable if jobs are given
+                self._get_joblist_command(jobs=jobs, user=user)
+                SgeLikeScheduler.num_calls += 1
+                return dict(self.queue)
+
+        authinfo = mock.Mock()
+        authinfo.dbcomputer.pk = self.computer.pk
+        scheduler = SgeLikeScheduler()
+        cache = JobsSnapshotCache(ttl=60)
+
+        with mock.patch('aiida.scheduler.cache.get_default',
+                        return_value=cache):
+            SgeLikeScheduler.queue = {'1': 'job1', '2': 'job2'}
+            found_jobs = _get_jobs_from_snapshot(authinfo, scheduler,
+                                                 ['1', '2'])
+            self.assertEquals(sorted(found_jobs.keys()), ['1', '2'])
+
+            # Job 3 was submitted and job 2 left the queue after the
+            # snapshot: a new snapshot is taken, job 2 is not in it
+            SgeLikeScheduler.queue = {'1': 'job1', '3': 'job3'}
+            found_jobs = _get_jobs_from_snapshot(authinfo, scheduler,
+                                                 ['1', '2', '3'])
+            self.assertEquals(sorted(found_jobs.keys()), ['1', '3'])
+            self.assertEquals(SgeLikeScheduler.num_calls, 2)
+
+            # Nothing is missing: the snapshot is reused
+            _get_jobs_from_snapshot(authinfo, scheduler, ['1', '3'])
+            self.assertEquals(SgeLikeScheduler.num_calls, 2)
+
+
+class TestBundleUpload(AiidaTestCase):
+    """
+    Tests for the upload of calculation inputs as a single archive.
+    """
+
+    def test_put_bundle(self):
+        import os
+        import shutil
+        import tempfile
+        from aiida.daemon.execmanager import _put_bundle
+        from aiida.transport.plugins.local import LocalTransport
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(local_dir, 'subfolder'))
+            with open(os.path.join(local_dir, 'subfolder', 'a.txt'), 'w') as f:
+                f.write('a')
+            with open(os.path.join(local_dir, 'b.txt'), 'w') as f:
+                f.write('b')
+            with open(os.path.join(local_dir, 'b_new.txt'), 'w') as f:
+                f.write('b_new')
+
+            to_upload = [
+                (os.path.join(local_dir, 'subfolder'), 'subfolder'),
+                (os.path.join(local_dir, 'b.txt'), 'b.txt'),
+                # Later entries overwrite earlier ones
+                (os.path.join(local_dir, 'b_new.txt'), 'b.txt'),
+            ]
+            with LocalTransport() as t:
+                t.chdir(remote_dir)
+                self.assertTrue(_put_bundle(t, to_upload, calc_pk=None))
+
+            self.assertEquals(sorted(os.listdir(remote_dir)),
+                              ['b.txt', 'subfolder'])
+            with open(os.path.join(remote_dir, 'subfolder', 'a.txt')) as f:
+                self.assertEquals(f.read(), 'a')
+            with open(os.path.join(remote_dir, 'b.txt')) as f:
+                self.assertEquals(f.read(), 'b_new')
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+    def test_get_bundle(self):
+        import os
+        import shutil
+        import tempfile
+        from aiida.daemon.execmanager import _get_bundle
+        from aiida.transport.plugins.local import LocalTransport
+
+        local_dir = tempfile.mkdtemp()
+        remote_dir = tempfile.mkdtemp()
+        try:
+            os.mkdir(os.path.join(remote_dir, 'out'))
+            for name in ['out/a.xml', 'out/b.xml', 'out/c.txt',
+                         'file name.dat', 'other.dat']:
+                with open(os.path.join(remote_dir, name), 'w') as f:
+                    f.write(name)
+
+            with LocalTransport() as t:
+                t.chdir(remote_dir)
+                self.assertTrue(_get_bundle(
+                    t, ['out/*.xml', 'file name.dat', 'missing[0-9].dat'],
+                    local_dir, calc_pk=None))
+                # The remote archive is removed
+                self.assertEquals(sorted(t.listdir('.')),
+                                  ['file name.dat', 'other.dat', 'out'])
+                # Absolute paths are not supported
+                self.assertFalse(_get_bundle(
+                    t, [os.path.join(remote_dir, 'other.dat')],
+                    local_dir, calc_pk=None))
+
+            self.assertEquals(sorted(os.listdir(local_dir)),
+                              ['file name.dat', 'out'])
+            self.assertEquals(sorted(os.listdir(os.path.join(local_dir, 'out'))),
+                              ['a.xml', 'b.xml'])
+        finally:
+            shutil.rmtree(local_dir)
+            shutil.rmtree(remote_dir)
+
+
+class TestNotifications(AiidaTestCase):
+    """
+    Tests for the notifications waking up the daemon tasks.
+    """
+
+    def test_calculation_state_notification(self):
+        import Queue
+        import mock
+        from aiida.common import setup
+        from aiida.common.datastructures import calc_states
+        from aiida.daemon.notifications import (
+            NotificationListener, CALCULATION_STATE_CHANNEL)
+        from aiida.orm import JobCalculation
+
+        received = Queue.Queue()
+        listener = NotificationListener(
+            {CALCULATION_STATE_CHANNEL: received.put})
+        listener.start()
+        try:
+            self.assertTrue(listener.wait_listening(10))
+
+            calc = JobCalculation(computer=self.computer,
+                                  resources={'num_machines': 1,
+                                             'num_mpiprocs_per_machine': 1})
+            calc.store()
+
+            get_property = setup.get_property
+
+            def patched_get_property(name):
+                if name == 'daemon.notifications':
+                    return True
+                return get_property(name)
+
+            with mock.patch('aiida.common.setup.get_property',
+                            patched_get_property):
+                calc._set_state(calc_states.TOSUBMIT)
+
+            self.assertEquals(received.get(timeout=10),
+                              "{} {}".format(calc.pk, calc_states.TOSUBMIT))
+
+            # Nothing is sent if notifications are disabled (the default)
+            calc._set_state(calc_states.SUBMITTING)
+            with self.assertRaises(Queue.Empty):
+                received.get(timeout=1)
+        finally:
+            listener.stop()
+
+    def test_workflow_state_notification(self):
+        import Queue
+        import mock
+        from aiida.daemon.notifications import (
+            NotificationListener, WORKFLOW_STATE_CHANNEL)
+
+        received = Queue.Queue()
+        listener = NotificationListener(
+            {WORKFLOW_STATE_CHANNEL: received.put})
+        listener.start()
+        try:
+            self.assertTrue(listener.wait_listening(10))
+
+            with mock.patch('aiida.daemon.notifications.notifications_enabled',
+                            return_value=True):
+                wf = WFTestSimpleWithSubWF()
+                wf.store()
+                wf.set_state(wf_states.FINISHED)
+
+            self.assertEquals(received.get(timeout=10),
+                              "{} {}".format(wf.pk, wf_states.FINISHED))
+        finally:
+            listener.stop()
+
+    def test_checkpoint_notification(self):
+        import mock
+        from aiida.work.persistence import Persistence
+
+        process = mock.Mock(pid=5)
+        ready = mock.Mock()
+        ready.is_ready.return_value = True
+        not_ready = mock.Mock()
+        not_ready.is_ready.return_value = False
+
+        with mock.patch('plum.persistence.pickle_persistence.'
+                        'PicklePersistence.on_process_wait'):
+            with mock.patch('aiida.work.persistence.notify_process') as notify:
+                persistence = Persistence.__new__(Persistence)
+                persistence.on_process_wait(process, not_ready)
+                self.assertFalse(notify.called)
+                # A process that can continue is ticked right away
+                persistence.on_process_wait(process, ready)
+                notify.assert_called_once_with(5)
+
+    def test_task_waker(self):
+        import mock
+        from aiida.daemon.notifications import TaskWaker
+
+        task = mock.Mock()
+        task.name = 'task'
+        waker = TaskWaker(delay=60)
+        waker.wake(task)
+        waker.wake(task)
+        # Only one run for the notifications received while it is pending
+        task.apply_async.assert_called_once_with(countdown=60)
+
+
+class TestParsing(AiidaTestCase):
+    """
+    Tests for the parsing of the retrieved calculations, in the daemon or
+    in the parser pool.
+    """
+
+    def _new_calc(self, state, parser_name=None):
+        from aiida.orm import JobCalculation
+
+        calc = JobCalculation(computer=self.computer,
+                              resources={'num_machines': 1,
+                                         'num_mpiprocs_per_machine': 1})
+        if parser_name is not None:
+            calc.set_parser_name(parser_name)
+        calc.store()
+        calc._set_state(state)
+        return calc
+
+    def _patch_property(self, **properties):
+        import mock
+        from aiida.common import setup
+
+        get_property = setup.get_property
+        properties = {'daemon.{}'.format(k): v
+                      for k, v in properties.iteritems()}
+
+        def patched_get_property(name):
+            if name in properties:
+                return properties[name]
+            return get_property(name)
+
+        return mock.patch('aiida.common.setup.get_property',
+                          patched_get_property)
+
+    def test_parse_calc(self):
+        from aiida.common.datastructures import calc_states
+        from aiida.daemon.execmanager import parse_calc
+
+        # Without a parser, the calculation is successful
+        calc = self._new_calc(calc_states.RETRIEVED)
+        self.assertTrue(parse_calc(calc))
+        self.assertEquals(calc.get_state(), calc_states.FINISHED)
+        # It is not parsed twice
+        self.assertFalse(parse_calc(calc))
+
+        calc = self._new_calc(calc_states.RETRIEVED,
+                              parser_name='nonexistent_parser')
+        self.assertTrue(parse_calc(calc))
+        self.assertEquals(calc.get_state(), calc_states.PARSINGFAILED)
+
+    def test_retrieve_hands_off_parsing(self):
+        import mock
+        import shutil
+        import tempfile
+        from aiida.common.datastructures import calc_states
+        from aiida.daemon.execmanager import retrieve_computed_for_authinfo
+        from aiida.transport.plugins.local import LocalTransport
+
+        workdir = tempfile.mkdtemp()
+        try:
+            for parser_workers, final_state in [(0, calc_states.FINISHED),
+                                                (2, calc_states.RETRIEVED)]:
+                calc = self._new_calc(calc_states.SUBMITTING)
+                calc._set_remote_workdir(workdir)
+                calc._set_retrieve_list([])
+                calc._set_retrieve_singlefile_list([])
+                calc._set_state(calc_states.COMPUTED)
+
+                authinfo = mock.Mock()
+                authinfo.enabled = True
+                authinfo.dbcomputer = self.computer.dbcomputer
+                authinfo.aiidauser = calc.dbnode.user
+
+                with self._patch_property(parser_workers=parser_workers,
+                                          bundle_retrieve=False):
+                    with mock.patch('aiida.daemon.execmanager.get_transport',
+                                    return_value=LocalTransport()):
+                        retrieved = retrieve_computed_for_authinfo(authinfo)
+
+                self.assertEquals([c.pk for c in retrieved], [calc.pk])
+                # With parser workers, the parsing is left to parse_jobs
+                self.assertEquals(calc.get_state(), final_state)
+        finally:
+            shutil.rmtree(workdir)
+
+    def test_parse_jobs(self):
+        from aiida.common.datastructures import calc_states
+        from aiida.daemon.execmanager import parse_jobs
+
+        calc = self._new_calc(calc_states.RETRIEVED)
+        with self._patch_property(parser_workers=0):
+            parse_jobs()
+        self.assertEquals(calc.get_state(), calc_states.FINISHED)
+
+    def test_parse_jobs_pool(self):
+        import mock
+        from aiida.common.datastructures import calc_states
+        from aiida.daemon import execmanager
+
+        class FakeResult(object):
+            def __init__(self):
+                self.done = False
+
+            def ready(self):
+                return self.done
+
+        class FakePool(object):
+            def __init__(self):
+                self._pool = [mock.Mock(pid=1), mock.Mock(pid=2)]
+                self.sent = []
+
+            def apply_async(self, func, args):
+                result = FakeResult()
+                self.sent.append((args[0], result))
+                return result
+
+        calc = self._new_calc(calc_states.RETRIEVED)
+        pool = FakePool()
+
+        def sent_pks():
+            return [pk for pk, _ in pool.sent if pk == calc.pk]
+
+        with self._patch_property(parser_workers=2):
+            with mock.patch.object(execmanager, '_get_parser_pool',
+                                   return_value=pool):
+                with mock.patch.object(execmanager, '_parsing_results', {}):
+                    with mock.patch.object(execmanager, '_parser_pids', None):
+                        execmanager.parse_jobs()
+                        self.assertEquals(sent_pks(), [calc.pk])
+                        # Still being parsed: not sent again
+                        execmanager.parse_jobs()
+                        self.assertEquals(sent_pks(), [calc.pk])
+
+                        # The parsing failed without changing the state:
+                        # the calculation is sent again
+                        for pk, result in pool.sent:
+                            if pk == calc.pk:
+                                result.done = True
+                        execmanager.parse_jobs()
+                        self.assertEquals(sent_pks(), [calc.pk] * 2)
+
+                        # A worker died: its calculation is sent again
+                        pool._pool = [mock.Mock(pid=1), mock.Mock(pid=3)]
+                        execmanager.parse_jobs()
+                        self.assertEquals(sent_pks(), [calc.pk] * 3)
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from aiida.backends.testbase import AiidaTestCase
+from aiida.daemon.polling import (get_next_poll_delay, get_walltime_left,
+                                  _BACKOFF_BASE)
+from aiida.scheduler.datastructures import JobInfo
+
+
+_POLICY = {
+    'minimum_interval': 60,
+    'max_backoff': 600,
+    'near_walltime_interval': 10,
+}
+
+
+class TestPollingSchedule(AiidaTestCase):
+    """
+    Test the computation of the delay before the next query of the jobs.
+    """
+
+    def test_minimum_interval(self):
+        self.assertEquals(get_next_poll_delay(_POLICY), 60)
+        self.assertEquals(get_next_poll_delay(_POLICY, walltime_left=100), 60)
+
+    def test_backoff(self):
+        delays = [get_next_poll_delay(_POLICY, failures=i)
+                  for i in range(1, 6)]
+        self.assertEquals(delays, [60, 120, 240, 480, 600])
+
+        policy = dict(_POLICY, minimum_interval=0)
+        self.assertEquals(get_next_poll_delay(policy, failures=1),
+                          _BACKOFF_BASE)
+
+    def test_near_walltime(self):
+        self.assertEquals(get_next_poll_delay(_POLICY, walltime_left=30), 30)
+        # Never faster than the near_walltime_interval
+        self.assertEquals(get_next_poll_delay(_POLICY, walltime_left=0), 10)
+
+    def test_walltime_left(self):
+        def jobinfo(requested, elapsed):
+            info = JobInfo()
+            info.requested_wallclock_time_seconds = requested
+            info.wallclock_time_seconds = elapsed
+            return info
+
+        self.assertIsNone(get_walltime_left([]))
+        self.assertIsNone(get_walltime_left([JobInfo()]))
+        self.assertEquals(get_walltime_left(
+            [jobinfo(3600, 600), jobinfo(600, 500), jobinfo(60, 120)]), 0)
+        self.assertEquals(get_walltime_left(
+            [jobinfo(3600, 600), jobinfo(600, None)]), 600)
@@ -75,6 +75,45 @@ class TestCalcStatus(AiidaTestCase):
             c._set_state(calc_states.WITHSCHEDULER)
 
 
+    def test_state_compare_and_set(self):
+        """
+        Test that a state read before a concurrent change is not written,
+        and that the current state is used to query the calculations.
+        """
+        from aiida.orm import JobCalculation
+        from aiida.common.datastructures import calc_states
+        from aiida.backends.utils import QueryFactory
+
+        c = JobCalculation(computer=self.computer,
+                           resources={
+                               'num_machines': 1,
+                               'num_mpiprocs_per_machine': 1}
+                           ).store()
+        stale = load_node(c.pk)
+
+        c._set_state(calc_states.TOSUBMIT)
+
+        # Simulate a process that read the state before the change above
+        stale.get_state = lambda: calc_states.NEW
+        with self.assertRaises(ModificationNotAllowed):
+            stale._set_state(calc_states.SUBMITTING)
+        self.assertEquals(c.get_state(), calc_states.TOSUBMIT)
+
+        # Nothing was written, so the state can still be set
+        c._set_state(calc_states.SUBMITTING)
+        self.assertEquals(c.get_state(), calc_states.SUBMITTING)
+
+        queries = QueryFactory()()
+        self.assertIn(c.pk, [_.pk for _ in
+                             queries.query_jobcalculations_by_computer_user_state(
+                                 calc_states.SUBMITTING,
+                                 computer=self.computer)])
+        self.assertNotIn(c.pk, [_.pk for _ in
+                                queries.query_jobcalculations_by_computer_user_state(
+                                    calc_states.TOSUBMIT,
+                                    computer=self.computer)])
+
+
 class TestSinglefileData(AiidaTestCase):
     """
     Test the SinglefileData class.
@@ -1710,6 +1749,134 @@ class TestStructureDataReload(AiidaTestCase):
             self.assertAlmostEqual(c.sites[1].position[i], 1.)
 
 
+class TestArrayStructureData(AiidaTestCase):
+    """
+    Tests the StructureData storing the sites as arrays.
+    """
+    from aiida.orm.data.structure import has_ase
+
+    def _get_structures(self):
+        from aiida.orm.data.structure import (
+            StructureData, ArrayStructureData, Kind)
+
+        cell = ((4., 0., 0.), (0., 4., 0.), (0., 0., 4.))
+        s = StructureData(cell=cell)
+        a = ArrayStructureData(cell=cell)
+        for struct in [s, a]:
+            struct.append_kind(Kind(symbols='Ba', name='Ba'))
+            struct.append_kind(Kind(symbols='Ti', name='Ti'))
+            struct.append_kind(Kind(symbols='O', name='O1'))
+            struct.append_kind(Kind(symbols='O', name='O2'))
+
+        kind_names = ['Ba', 'Ti', 'O1', 'O1', 'O2'] * 2
+        positions = [[float(i), 0., 0.] for i in range(len(kind_names))]
+        for name, position in zip(kind_names, positions):
+            s.append_atom(name=name, symbols=name.rstrip('12'),
+                          position=position)
+        a.append_sites(kind_names[:5], positions[:5])
+        for name, position in zip(kind_names[5:], positions[5:]):
+            a.append_atom(name=name, symbols=name.rstrip('12'),
+                          position=position)
+        return s, a
+
+    def test_same_as_structuredata(self):
+        s, a = self._get_structures()
+
+        self.assertEquals(len(a.sites), len(s.sites))
+        for site_a, site_s in zip(a.sites, s.sites):
+            self.assertEquals(site_a.kind_name, site_s.kind_name)
+            self.assertEquals(site_a.position, site_s.position)
+        self.assertEquals(a.get_site_kindnames(), s.get_site_kindnames())
+        self.assertEquals(a.get_composition(), s.get_composition())
+        for mode in ['hill', 'hill_compact', 'reduce', 'group', 'count',
+                     'count_compact']:
+            self.assertEquals(a.get_formula(mode=mode),
+                              s.get_formula(mode=mode))
+        self.assertEquals(a.get_formula(mode='count_compact'), 'BaTiO3')
+
+    def test_store_and_reload(self):
+        import numpy
+        from aiida.orm.data.structure import ArrayStructureData
+
+        _, a = self._get_structures()
+        a.store()
+        self.assertEquals(a.get_shape('positions'), (10, 3))
+        self.assertNotIn('sites', a.get_attrs())
+
+        b = load_node(a.uuid)
+        self.assertIsInstance(b, ArrayStructureData)
+        self.assertTrue(numpy.array_equal(b.get_positions(),
+                                          a.get_positions()))
+        self.assertEquals(b.get_site_kind_indices().tolist(),
+                          [0, 1, 2, 2, 3] * 2)
+        self.assertEquals(b.get_formula(), 'Ba2O6Ti2')
+
+        with self.assertRaises(ModificationNotAllowed):
+            b.append_sites(['Ba'], [[0., 0., 0.]])
+        with self.assertRaises(ModificationNotAllowed):
+            b.set_positions(b.get_positions())
+
+        c = b.copy()
+        c.set_positions(b.get_positions() + 1.)
+        self.assertEquals(c.sites[0].position, (1., 1., 1.))
+
+    def test_set_positions(self):
+        import numpy
+
+        _, a = self._get_structures()
+        positions = numpy.random.random((10, 3))
+        a.set_positions(positions)
+        self.assertTrue(numpy.array_equal(a.get_positions(), positions))
+        self.assertEquals(a.get_site_kind_indices().tolist(),
+                          [0, 1, 2, 2, 3] * 2)
+
+        with self.assertRaises(ValueError):
+            a.set_positions(positions[:5])
+        with self.assertRaises(ValueError):
+            a.append_sites(['Ba', 'Zr'], [[0., 0., 0.], [1., 1., 1.]])
+        with self.assertRaises(ValueError):
+            a.append_sites(['Ba'], [[0., 0.]])
+        # Failed appends leave the sites untouched
+        self.assertEquals(len(a.get_positions()), 10)
+
+        with self.assertRaises(NotImplementedError):
+            a.reset_sites_positions(positions[:5], conserve_particle=False)
+
+        a.clear_sites()
+        self.assertEquals(len(a.sites), 0)
+
+    def test_adjust_default_cell(self):
+        import numpy
+
+        _, a = self._get_structures()
+        a.set_positions(a.get_positions() + [1., 2., 3.])
+        a._adjust_default_cell(vacuum_factor=2., vacuum_addition=5.,
+                               pbc=(True, False, False))
+
+        self.assertEquals(a.get_positions().min(axis=0).tolist(),
+                          [0., 0., 0.])
+        self.assertEquals(a.get_positions()[-1].tolist(), [9., 0., 0.])
+        self.assertEquals(a.pbc, (True, False, False))
+        self.assertTrue(numpy.allclose(
+            a.cell, [[23., 0., 0.], [0., 5., 0.], [0., 0., 5.]]))
+        self.assertNotIn('sites', a.get_attrs())
+
+    @unittest.skipIf(not has_ase(), "Unable to import ase")
+    def test_get_ase(self):
+        s, a = self._get_structures()
+
+        ase_s = s.get_ase()
+        ase_a = a.get_ase()
+        self.assertEquals(ase_a.get_chemical_symbols(),
+                          ase_s.get_chemical_symbols())
+        self.assertEquals(ase_a.get_tags().tolist(),
+                          ase_s.get_tags().tolist())
+        self.assertEquals(ase_a.get_masses().tolist(),
+                          ase_s.get_masses().tolist())
+        self.assertEquals(ase_a.get_positions().tolist(),
+                          ase_s.get_positions().tolist())
+
+
 class TestStructureDataFromAse(AiidaTestCase):
     """
     Tests the creation of Sites from/to a ASE object.
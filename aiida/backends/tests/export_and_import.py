@@ -220,6 +220,293 @@ class TestSimple(AiidaTestCase):
             shutil.rmtree(temp_folder, ignore_errors=True)
             # print temp_folder
 
+    def test_stream(self):
+        """
+        Test that a streamed export, with the data in chunks of
+        newline-delimited JSON, is imported correctly.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.orm import DataFactory
+        from aiida.orm import load_node
+        from aiida.orm.calculation.job import JobCalculation
+        from aiida.orm.importexport import export, export_zip
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            StructureData = DataFactory('structure')
+            sd = StructureData(cell=((1., 0., 0.), (0., 2., 0.), (0., 0., 3.)))
+            sd.append_atom(position=(0., 0., 0.), symbols=['Ba'])
+            sd.store()
+
+            calc = JobCalculation()
+            calc.set_computer(self.computer)
+            calc.set_resources({"num_machines": 1, "num_mpiprocs_per_machine": 1})
+            calc.store()
+
+            calc.add_link_from(sd, label='structure')
+
+            attrs = {node.uuid: dict(node.iterattrs())
+                     for node in (sd, calc)}
+
+            filenames = [os.path.join(temp_folder, "export.tar.gz"),
+                         os.path.join(temp_folder, "export.zip")]
+            export([calc.dbnode], outfile=filenames[0], silent=True,
+                   stream=True)
+            export_zip([calc.dbnode], outfile=filenames[1], silent=True,
+                       stream=True)
+
+            for filename in filenames:
+                self.clean_db()
+                self.insert_data()
+
+                import_data(filename, silent=True)
+                for uuid in attrs.keys():
+                    node = load_node(uuid)
+                    for k in attrs[uuid].keys():
+                        self.assertEquals(attrs[uuid][k], node.get_attr(k))
+
+                calc = load_node(calc.uuid)
+                self.assertEquals(
+                    [(label, node.uuid) for label, node in
+                     calc.get_inputs(also_labels=True)],
+                    [('structure', sd.uuid)])
+        finally:
+            # Deleting the created temporary folder
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_bulk(self):
+        """
+        Test the import with COPY commands, of a streamed and of a
+        non-streamed export file, and of the same file twice.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.orm import DataFactory
+        from aiida.orm import load_node
+        from aiida.orm.calculation.job import JobCalculation
+        from aiida.orm.importexport import export
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            StructureData = DataFactory('structure')
+            sd = StructureData(cell=((1., 0., 0.), (0., 2., 0.), (0., 0., 3.)))
+            sd.append_atom(position=(0., 0., 0.), symbols=['Ba'])
+            sd.store()
+
+            calc = JobCalculation()
+            calc.set_computer(self.computer)
+            calc.set_resources({"num_machines": 1, "num_mpiprocs_per_machine": 1})
+            calc.store()
+
+            calc.add_link_from(sd, label='structure')
+
+            attrs = {node.uuid: dict(node.iterattrs())
+                     for node in (sd, calc)}
+
+            filenames = [os.path.join(temp_folder, "export.tar.gz"),
+                         os.path.join(temp_folder, "export_stream.tar.gz")]
+            export([calc.dbnode], outfile=filenames[0], silent=True)
+            export([calc.dbnode], outfile=filenames[1], silent=True,
+                   stream=True)
+
+            node_model = 'aiida.backends.djsite.db.models.DbNode'
+            link_model = 'aiida.backends.djsite.db.models.DbLink'
+            for filename in filenames:
+                self.clean_db()
+                self.insert_data()
+
+                ret_dict = import_data(filename, silent=True, bulk=True)
+                # The same format as the other importers
+                self.assertEquals(len(ret_dict[node_model]['new']), 2)
+                self.assertEquals(ret_dict[node_model]['existing'], [])
+                self.assertEquals(
+                    set(local_pk for _, local_pk in
+                        ret_dict[node_model]['new']),
+                    set(load_node(uuid).pk for uuid in attrs.keys()))
+                self.assertEquals(ret_dict[link_model]['new'],
+                                  [(load_node(sd.uuid).pk,
+                                    load_node(calc.uuid).pk)])
+                for uuid in attrs.keys():
+                    node = load_node(uuid)
+                    for k in attrs[uuid].keys():
+                        self.assertEquals(attrs[uuid][k], node.get_attr(k))
+
+                calc = load_node(calc.uuid)
+                self.assertEquals(
+                    [(label, node.uuid) for label, node in
+                     calc.get_inputs(also_labels=True)],
+                    [('structure', sd.uuid)])
+
+                # Nothing new is created importing the file again
+                ret_dict = import_data(filename, silent=True, bulk=True)
+                self.assertEquals(ret_dict[node_model]['new'], [])
+                self.assertEquals(len(ret_dict[node_model]['existing']), 2)
+                self.assertNotIn(link_model, ret_dict)
+        finally:
+            # Deleting the created temporary folder
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_resumable(self):
+        """
+        Test that the copy of the node folders is resumed from its manifest,
+        and that a resumable export can be completed.
+        """
+        import os
+        import shutil
+        import tempfile
+        import threading
+
+        from aiida.common.folders import Folder
+        from aiida.orm import DataFactory
+        from aiida.orm import load_node
+        from aiida.orm.importexport import (copy_node_folders, export,
+                                            export_tree,
+                                            EXPORT_MANIFEST_NAME)
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            manifest = os.path.join(temp_folder, 'manifest')
+            copied = []
+
+            def copy_folder(uuid):
+                if uuid == 'c' and 'c' not in copied:
+                    copied.append(uuid)
+                    raise IOError("Interrupted")
+                copied.append(uuid)
+
+            with self.assertRaises(IOError):
+                copy_node_folders('abcd', copy_folder, manifest=manifest,
+                                  num_workers=1)
+            self.assertEquals(open(manifest).read().split(), ['a', 'b'])
+            self.assertEquals(
+                copy_node_folders('abcd', copy_folder, manifest=manifest,
+                                  num_workers=2), 2)
+            self.assertEquals(sorted(open(manifest).read().split()),
+                              ['a', 'b', 'c', 'd'])
+
+            # The uuids are consumed by the calling thread, not by the
+            # threads of the pool
+            threads = set()
+
+            def iter_uuids():
+                for uuid in 'efgh':
+                    threads.add(threading.current_thread())
+                    yield uuid
+
+            self.assertEquals(
+                copy_node_folders(iter_uuids(), copy_folder, num_workers=2),
+                4)
+            self.assertEquals(threads, set([threading.current_thread()]))
+
+            ParameterData = DataFactory('parameter')
+            node = ParameterData(dict={'a': 1}).store()
+
+            # An interrupted export, after all the folders were copied
+            filename = os.path.join(temp_folder, "export.tar.gz")
+            partial = Folder(filename + '.partial')
+            partial.create()
+            export_tree([node.dbnode], folder=partial, silent=True,
+                        manifest=partial.get_abs_path(EXPORT_MANIFEST_NAME))
+            self.assertEquals(
+                open(partial.get_abs_path(EXPORT_MANIFEST_NAME)).read().split(),
+                [node.uuid])
+
+            export([node.dbnode], outfile=filename, silent=True,
+                   resumable=True)
+            self.assertFalse(partial.exists())
+
+            self.clean_db()
+            self.insert_data()
+            import_data(filename, silent=True)
+            self.assertEquals(load_node(node.uuid).get_dict(), {'a': 1})
+        finally:
+            # Deleting the created temporary folder
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def test_delta(self):
+        """
+        Test a delta export against a previous export, and its import where
+        the previous export was imported.
+        """
+        import os
+        import shutil
+        import tempfile
+
+        from aiida.orm import DataFactory
+        from aiida.orm import load_node
+        from aiida.orm.calculation.job import JobCalculation
+        from aiida.orm.importexport import export, ExportSnapshot
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            StructureData = DataFactory('structure')
+            sd = StructureData(cell=((1., 0., 0.), (0., 2., 0.), (0., 0., 3.)))
+            sd.append_atom(position=(0., 0., 0.), symbols=['Ba'])
+            sd.store()
+
+            full = os.path.join(temp_folder, "full.tar.gz")
+            export([sd.dbnode], outfile=full, silent=True)
+
+            calc = JobCalculation()
+            calc.set_computer(self.computer)
+            calc.set_resources({"num_machines": 1, "num_mpiprocs_per_machine": 1})
+            calc.store()
+            calc.add_link_from(sd, label='structure')
+            # This increments the nodeversion
+            sd.label = 'modified'
+
+            delta = os.path.join(temp_folder, "delta.tar.gz")
+            export([calc.dbnode], outfile=delta, silent=True, previous=full)
+            # The snapshot of the delta contains also the unchanged entries
+            self.assertEquals(set(ExportSnapshot.load(delta).nodes.keys()),
+                              set([sd.uuid, calc.uuid]))
+            # Nothing changed since the delta
+            unchanged = os.path.join(temp_folder, "unchanged.tar.gz")
+            export([calc.dbnode], outfile=unchanged, silent=True,
+                   previous=delta)
+            # Only the extras changed: the node is exported again
+            sd.set_extra('source', 1)
+            extras_only = os.path.join(temp_folder, "extras_only.tar.gz")
+            export([calc.dbnode], outfile=extras_only, silent=True,
+                   previous=unchanged)
+
+            node_model = 'aiida.backends.djsite.db.models.DbNode'
+            for bulk in (False, True):
+                self.clean_db()
+                self.insert_data()
+
+                import_data(full, silent=True, bulk=bulk)
+                self.assertEquals(load_node(sd.uuid).label, '')
+                # Setting extras increments the local nodeversion, that must
+                # not prevent the update
+                for i in range(5):
+                    load_node(sd.uuid).set_extra('local', i)
+
+                ret_dict = import_data(delta, silent=True, bulk=bulk)
+                self.assertEquals(len(ret_dict[node_model]['new']), 1)
+                self.assertEquals(len(ret_dict[node_model]['updated']), 1)
+                self.assertEquals(load_node(sd.uuid).label, 'modified')
+                calc = load_node(calc.uuid)
+                self.assertEquals(
+                    [(label, node.uuid) for label, node in
+                     calc.get_inputs(also_labels=True)],
+                    [('structure', sd.uuid)])
+
+                ret_dict = import_data(unchanged, silent=True, bulk=bulk)
+                self.assertNotIn(node_model, ret_dict)
+
+                ret_dict = import_data(extras_only, silent=True,
+                                       bulk=bulk)
+                self.assertNotIn('updated', ret_dict[node_model])
+        finally:
+            # Deleting the created temporary folder
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
     def test_2(self):
         """
         Test the check for the export format version.
@@ -268,6 +555,53 @@ class TestSimple(AiidaTestCase):
             shutil.rmtree(export_file_tmp_folder, ignore_errors=True)
             shutil.rmtree(unpack_tmp_folder, ignore_errors=True)
 
+    def test_export_version(self):
+        """
+        Test that the streamed and delta exports, that the importers of the
+        version 0.2 cannot read, have a newer export version, while the
+        other exports keep the version 0.2.
+        """
+        import json
+        import os
+        import shutil
+        import tarfile
+        import tempfile
+
+        from aiida.orm import DataFactory
+        from aiida.orm.importexport import (export, EXPORT_VERSION,
+                                            BASE_EXPORT_VERSION)
+
+        def get_export_version(filename):
+            with tarfile.open(filename, "r:gz",
+                              format=tarfile.PAX_FORMAT) as tar:
+                metadata = json.load(tar.extractfile('metadata.json'))
+            return metadata['export_version']
+
+        temp_folder = tempfile.mkdtemp()
+        try:
+            StructureData = DataFactory('structure')
+            sd = StructureData()
+            sd.store()
+
+            full = os.path.join(temp_folder, "export.tar.gz")
+            streamed = os.path.join(temp_folder, "streamed.tar.gz")
+            delta = os.path.join(temp_folder, "delta.tar.gz")
+            export([sd.dbnode], outfile=full, silent=True)
+            export([sd.dbnode], outfile=streamed, silent=True, stream=True)
+            export([sd.dbnode], outfile=delta, silent=True, previous=full)
+
+            self.assertEquals(get_export_version(full), BASE_EXPORT_VERSION)
+            self.assertEquals(get_export_version(streamed), EXPORT_VERSION)
+            self.assertEquals(get_export_version(delta), EXPORT_VERSION)
+            self.assertNotEquals(EXPORT_VERSION, BASE_EXPORT_VERSION)
+
+            for filename in (full, streamed, delta):
+                self.clean_db()
+                self.insert_data()
+                import_data(filename, silent=True)
+        finally:
+            shutil.rmtree(temp_folder, ignore_errors=True)
+
     def test_3(self):
         """
         Test importing of nodes, that have links to unknown nodes.
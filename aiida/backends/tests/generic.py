@@ -310,6 +310,80 @@ class TestGroups(AiidaTestCase):
         # Cleanup
         g.delete()
 
+    def test_add_remove_nodes_by_pk_and_query(self):
+        """
+        Test adding and removing nodes given their pks or a QueryBuilder
+        """
+        from aiida.orm.group import Group
+        from aiida.orm.querybuilder import QueryBuilder
+
+        nodes = [Node().store() for _ in range(4)]
+        for n in nodes[:2]:
+            n.set_extra('group_query_test', True)
+
+        g = Group(name='test_add_remove_nodes_by_pk_and_query').store()
+        g.add_nodes([nodes[2].pk, nodes[3]])
+        # Adding twice does not duplicate the node
+        g.add_nodes(nodes[2].pk)
+        self.assertEquals(len(g.nodes), 2)
+
+        qb = QueryBuilder()
+        qb.append(Node, filters={'extras.group_query_test': True},
+                  project=['id'])
+        g.add_nodes(qb)
+        self.assertEquals(set([_.pk for _ in nodes]),
+                          set([_.pk for _ in g.nodes]))
+
+        g.remove_nodes(qb)
+        self.assertEquals(set([_.pk for _ in nodes[2:]]),
+                          set([_.pk for _ in g.nodes]))
+        g.remove_nodes([nodes[2].pk])
+        self.assertEquals([nodes[3].pk], [_.pk for _ in g.nodes])
+
+        # The QueryBuilder must project only the ids
+        qb = QueryBuilder()
+        qb.append(Node, project=['id', 'uuid'])
+        with self.assertRaises(ValueError):
+            g.add_nodes(qb)
+
+        g.delete()
+
+    def test_set_operations(self):
+        """
+        Test the union, intersection and difference of groups
+        """
+        from aiida.orm.group import Group
+
+        n1, n2, n3, n4 = [Node().store() for _ in range(4)]
+
+        g1 = Group(name='test_set_operations_1').store()
+        g1.add_nodes([n1, n2, n3])
+        g2 = Group(name='test_set_operations_2').store()
+        g2.add_nodes([n2, n3, n4])
+        g3 = Group(name='test_set_operations_3').store()
+        g3.add_nodes([n3])
+
+        union = g1.union(g2, name='test_set_operations_union')
+        self.assertEquals(set([_.pk for _ in [n1, n2, n3, n4]]),
+                          set([_.pk for _ in union.nodes]))
+        self.assertEquals(len(union.nodes), 4)
+
+        intersection = g1.intersection(
+            [g2, g3], name='test_set_operations_intersection',
+            description='common nodes')
+        self.assertEquals([n3.pk], [_.pk for _ in intersection.nodes])
+        self.assertEquals(intersection.description, 'common nodes')
+
+        difference = g1.difference([g2], name='test_set_operations_diff')
+        self.assertEquals([n1.pk], [_.pk for _ in difference.nodes])
+
+        with self.assertRaises(ModificationNotAllowed):
+            g1.union(Group(name='test_set_operations_unstored'),
+                     name='test_set_operations_fail')
+
+        for g in [g1, g2, g3, union, intersection, difference]:
+            g.delete()
+
     def test_creation_from_dbgroup(self):
         from aiida.orm.group import Group
 
@@ -13,7 +13,8 @@ Tests for nodes, attributes and links
 import unittest
 
 from aiida.backends.testbase import AiidaTestCase
-from aiida.common.exceptions import ModificationNotAllowed, UniquenessError
+from aiida.common.exceptions import (ModificationNotAllowed, UniquenessError,
+                                     ValidationError)
 from aiida.common.links import LinkType
 from aiida.orm.data import Data
 from aiida.orm.node import Node
@@ -75,6 +76,42 @@ class TestTransitiveNoLoops(AiidaTestCase):
         with self.assertRaises(ValueError):  # This would generate a loop
             n1.add_link_from(n4, link_type=LinkType.CREATE)
 
+    def test_loop_not_allowed_without_dbpath(self):
+        """
+        Check the loops with the recursive queries used when the DbPath
+        table is disabled in the profile.
+        """
+        from aiida.backends import settings
+
+        n1 = Node().store()
+        n2 = Node().store()
+        n3 = Node().store()
+        n4 = Node().store()
+
+        use_dbpath = settings.USE_DBPATH
+        settings.USE_DBPATH = False
+        try:
+            self.assertFalse(n1.has_parents)
+            self.assertFalse(n1.has_children)
+
+            n2.add_link_from(n1, link_type=LinkType.CREATE)
+            n3.add_link_from(n2, link_type=LinkType.CREATE)
+            n4.add_link_from(n3, link_type=LinkType.CREATE)
+            # Not a loop: n1 -> n2 -> n3 -> n4 and n1 -> n4
+            n4.add_link_from(n1, label='other', link_type=LinkType.CREATE)
+
+            self.assertTrue(n1.has_children)
+            self.assertFalse(n1.has_parents)
+            self.assertTrue(n4.has_parents)
+            self.assertFalse(n4.has_children)
+
+            with self.assertRaises(ValueError):  # This would generate a loop
+                n1.add_link_from(n4, link_type=LinkType.CREATE)
+            with self.assertRaises(ValueError):  # This would generate a loop
+                n2.add_link_from(n3, link_type=LinkType.CREATE)
+        finally:
+            settings.USE_DBPATH = use_dbpath
+
 
 class TestQueryWithAiidaObjects(AiidaTestCase):
     """
@@ -929,6 +966,46 @@ class TestNodeBasic(AiidaTestCase):
             del extras_to_set[k]
             self.assertEquals({k: v for k, v in a.iterextras()}, extras_to_set)
 
+    def test_set_and_delete_many_extras(self):
+        """
+        Checks setting and deleting several extras at once, and grouping
+        changes with coalesce_updates.
+        """
+        a = Node()
+        with self.assertRaises(ModificationNotAllowed):
+            a.set_extras({'a': 1})
+        a.store()
+
+        extras_to_set = {'extra{}'.format(i): i for i in range(20)}
+        extras_to_set['dict'] = self.dictval
+        a.set_extras(extras_to_set)
+        self.assertEquals(dict(a.iterextras()), extras_to_set)
+        # The keys are all checked before setting any extra
+        with self.assertRaises(ValidationError):
+            a.set_extras({'valid': 1, 'in.valid': 2})
+        self.assertEquals(dict(a.iterextras()), extras_to_set)
+
+        a.del_extras(['extra{}'.format(i) for i in range(10)])
+        for i in range(10):
+            del extras_to_set['extra{}'.format(i)]
+        self.assertEquals(dict(a.iterextras()), extras_to_set)
+
+        with a.coalesce_updates():
+            a.set_extra('new', 'value')
+            a.set_extra('extra10', 'changed')
+            a.del_extra('extra11')
+            a.set_extra('extra11', 'set again')
+            a.del_extra('extra12')
+        extras_to_set['new'] = 'value'
+        extras_to_set['extra10'] = 'changed'
+        extras_to_set['extra11'] = 'set again'
+        del extras_to_set['extra12']
+        self.assertEquals(dict(a.iterextras()), extras_to_set)
+
+        # Check also what was written in the database
+        b = load_node(a.uuid)
+        self.assertEquals(dict(b.iterextras()), extras_to_set)
+
     def test_replace_extras_1(self):
         """
         Checks the ability of replacing extras, removing the subkeys also when
@@ -1429,6 +1506,47 @@ class TestSubNodesAndLinks(AiidaTestCase):
                          set([("N1", n1.uuid), ("N2", n2.uuid),
                               ("N3", n3.uuid), ("N4", n4.uuid)]))
 
+    def test_add_links_from(self):
+        """
+        Test adding many links at once, with automatic labels.
+        """
+        endnode = Node().store()
+        sources = [Node().store() for _ in range(5)]
+
+        endnode.add_links_from(
+            [(src, None, LinkType.CREATE) for src in sources[:3]])
+        endnode.add_links_from(
+            [(sources[3], 'label', LinkType.CREATE),
+             (sources[4], None, LinkType.CREATE)])
+
+        self.assertEqual(set([(i[0], i[1].uuid)
+                              for i in endnode.get_inputs(only_in_db=True,
+                                                          also_labels=True)]),
+                         set([("link_1", sources[0].uuid),
+                              ("link_2", sources[1].uuid),
+                              ("link_3", sources[2].uuid),
+                              ("label", sources[3].uuid),
+                              ("link_4", sources[4].uuid)]))
+
+        # A link that would create a loop: no link of the batch is added
+        other = Node().store()
+        with self.assertRaises(ValueError):
+            sources[0].add_links_from([(other, 'other', LinkType.CREATE),
+                                       (endnode, 'loop', LinkType.CREATE)])
+        self.assertEqual(sources[0].get_inputs(only_in_db=True), [])
+
+        # With an unstored node, the links are kept in the cache
+        unstored = Node()
+        unstored.add_links_from([(sources[0], 'a', LinkType.CREATE),
+                                 (sources[1], 'b', LinkType.CREATE)])
+        self.assertEqual(unstored.get_inputs(only_in_db=True), [])
+        unstored.store()
+        self.assertEqual(set([(i[0], i[1].uuid)
+                              for i in unstored.get_inputs(only_in_db=True,
+                                                           also_labels=True)]),
+                         set([("a", sources[0].uuid),
+                              ("b", sources[1].uuid)]))
+
     def test_store_with_unstored_parents(self):
         """
         I want to check that if parents are unstored I cannot store
@@ -1821,3 +1939,107 @@ class TestSubNodesAndLinks(AiidaTestCase):
         # more than one input to the same data object!
         with self.assertRaises(ValueError):
             d1.add_link_from(calc2, link_type=LinkType.CREATE)
+
+
+class TestStoreNodes(AiidaTestCase):
+    """
+    Test the storage of many nodes at once with store_nodes.
+    """
+
+    def test_store_nodes(self):
+        import tempfile
+        from aiida.orm.node import store_nodes
+
+        stored = Node().store()
+        n1 = Node()
+        n1._set_attr('a', {'b': [1, 2.5, 'c']})
+        n2 = Node()
+        n2.label = 'second'
+        with tempfile.NamedTemporaryFile() as f:
+            f.write('content')
+            f.flush()
+            n2.add_path(f.name, 'file.txt')
+        # n1 is listed after its child on purpose
+        n2.add_link_from(n1, label='l1')
+        n2.add_link_from(stored, label='l2')
+
+        store_nodes([n2, n1])
+
+        self.assertTrue(n1.is_stored)
+        self.assertTrue(n2.is_stored)
+        self.assertFalse(n2._has_cached_links())
+
+        n1_loaded = load_node(n1.pk)
+        n2_loaded = load_node(n2.pk)
+        self.assertEquals(n1_loaded.get_attr('a'), {'b': [1, 2.5, 'c']})
+        self.assertEquals(n2_loaded.label, 'second')
+        self.assertEquals(
+            sorted((l, n.uuid) for l, n in n2_loaded.get_inputs(also_labels=True)),
+            sorted([('l1', n1.uuid), ('l2', stored.uuid)]))
+        self.assertEquals(n2_loaded.get_folder_list(), ['file.txt'])
+        with open(n2_loaded.get_abs_path('file.txt')) as f:
+            self.assertEquals(f.read(), 'content')
+        # The transitive closure is updated
+        self.assertTrue(stored.has_children)
+
+    def test_store_nodes_unstored_parent(self):
+        from aiida.orm.node import store_nodes
+
+        n1 = Node()
+        n2 = Node()
+        n2.add_link_from(n1)
+
+        with self.assertRaises(ModificationNotAllowed):
+            store_nodes([n2])
+        self.assertFalse(n2.is_stored)
+
+        with self.assertRaises(ModificationNotAllowed):
+            store_nodes([n1.store()])
+
+    def test_store_nodes_invalid_links(self):
+        """
+        The links put in the cache without the checks of add_link_from are
+        checked before storing
+        """
+        from aiida.orm.calculation import Calculation
+        from aiida.orm.node import store_nodes
+
+        # The output of a data node can only be a calculation
+        d1 = Data()
+        d2 = Data()
+        d2._replace_link_from(d1, 'input', LinkType.CREATE)
+        with self.assertRaises(ValueError):
+            store_nodes([d1, d2])
+        self.assertFalse(d1.is_stored)
+        self.assertFalse(d2.is_stored)
+
+        # At most one CREATE link can enter a data node
+        c1 = Calculation()
+        c2 = Calculation()
+        d = Data()
+        d._replace_link_from(c1, 'output1', LinkType.CREATE)
+        d._replace_link_from(c2, 'output2', LinkType.CREATE)
+        with self.assertRaises(ValueError):
+            store_nodes([c1, c2, d])
+        self.assertFalse(d.is_stored)
+
+    def test_store_nodes_custom_store(self):
+        """
+        Nodes overriding store() are stored with their own store()
+        """
+        from aiida.orm import JobCalculation
+        from aiida.orm.node import store_nodes
+        from aiida.common.datastructures import calc_states
+
+        d = Data()
+        calc = JobCalculation(computer=self.computer,
+                              resources={'num_machines': 1,
+                                         'num_mpiprocs_per_machine': 1})
+        calc.add_link_from(d, label='input')
+
+        store_nodes([calc, d])
+
+        self.assertTrue(d.is_stored)
+        self.assertEquals(calc.get_state(), calc_states.NEW)
+        self.assertEquals(
+            [n.uuid for n in load_node(calc.pk).get_inputs()], [d.uuid])
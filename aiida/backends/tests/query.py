@@ -481,6 +481,43 @@ class TestAttributes(AiidaTestCase):
         res_query = set([str(_[0]) for _ in qb.all()])
         self.assertEqual(res_query, res_uuids)
 
+    def test_project_all_attributes(self):
+        from aiida.orm.node import Node
+        from aiida.orm.querybuilder import QueryBuilder
+
+        nodes = []
+        for i in range(5):
+            n = Node()
+            n._set_attr("index", i)
+            n._set_attr("nested", {"list": [i, "a"], "float": 1.5})
+            n._set_attr("test_case", "test_project_all_attributes")
+            n.set_extra("extra_index", i)
+            n.store()
+            nodes.append(n)
+        # A node without attributes
+        n = Node()
+        n._set_attr("test_case", "test_project_all_attributes")
+        n.store()
+        nodes.append(n)
+        expected = {n.pk: (n.get_attrs(), n.get_extras()) for n in nodes}
+
+        qb = QueryBuilder()
+        qb.append(Node, filters={
+            'attributes.test_case': 'test_project_all_attributes'},
+            project=['id', 'attributes', 'extras'])
+        # A batch size not dividing the number of nodes, so that the
+        # attributes are fetched in batches of different length
+        res = {pk: (attributes, extras) for pk, attributes, extras
+               in qb.iterall(batch_size=4)}
+        self.assertEqual(res, expected)
+
+        res = {d['node']['id']: (d['node']['attributes'], d['node']['extras'])
+               for d in QueryBuilder().append(
+                   Node, tag='node', filters={
+                       'attributes.test_case': 'test_project_all_attributes'},
+                   project=['id', 'attributes', 'extras']).iterdict(
+                   batch_size=4)}
+        self.assertEqual(res, expected)
 
 
 class QueryBuilderDateTimeAttribute(AiidaTestCase):
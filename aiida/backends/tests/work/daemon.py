@@ -13,7 +13,7 @@ from shutil import rmtree
 
 from plum.wait_ons import checkpoint
 
-from aiida.work.persistence import Persistence
+from aiida.work.persistence import Persistence, DbPersistence
 from aiida.orm.data.base import get_true_node
 import aiida.work.daemon as daemon
 from aiida.work.process import Process
@@ -22,6 +22,7 @@ from aiida.work.run import submit
 from aiida.common.lang import override
 from aiida.orm import load_node
 import aiida.work.util as util
+from aiida.work.legacy.wait_on import wait_on_job_calculation
 from aiida.work.test_utils import DummyProcess, ExceptionProcess
 
 
@@ -106,6 +107,26 @@ class FailCreateFromSavedStateProcess(DummyProcess):
             raise RuntimeError()
 
 
+class WaitOnCalculationProcess(Process):
+    """
+    A process waiting on the calculation with the pk given as input.
+    """
+
+    @classmethod
+    def define(cls, spec):
+        from aiida.orm.data.base import Int
+
+        super(WaitOnCalculationProcess, cls).define(spec)
+        spec.input("pk", valid_type=Int)
+
+    @override
+    def _run(self, pk, **kwargs):
+        return wait_on_job_calculation(self.finish, pk.value)
+
+    def finish(self, wait_on):
+        pass
+
+
 class TestDaemon(AiidaTestCase):
     def setUp(self):
         self.assertEquals(len(util.ProcessStack.stack()), 0)
@@ -156,3 +177,96 @@ class TestDaemon(AiidaTestCase):
 
         self.assertTrue(registry.has_finished(dp_rinfo.pid))
         self.assertFalse(registry.has_finished(fail_rinfo.pid))
+
+    def _tick_with_workers(self, num_workers):
+        import mock
+        from aiida.common import setup
+
+        get_property = setup.get_property
+
+        def patched_get_property(name):
+            if name == 'daemon.workflow_engine_workers':
+                return num_workers
+            return get_property(name)
+
+        with mock.patch('aiida.common.setup.get_property',
+                        patched_get_property):
+            return daemon.tick_workflow_engine(
+                self.storage, print_exceptions=False)
+
+    def test_concurrent_tick(self):
+        registry = ProcessRegistry()
+
+        rinfos = [submit(ProcessEventsTester, _jobs_store=self.storage)
+                  for _ in range(4)]
+        i = 0
+        while self._tick_with_workers(3):
+            self.assertLess(i, 10, "Engine not done after 10 ticks")
+            i += 1
+        for rinfo in rinfos:
+            self.assertTrue(registry.has_finished(rinfo.pid))
+
+    def test_concurrent_tick_errors(self):
+        import mock
+
+        # More processes than the workers and the queue can take
+        for _ in range(10):
+            submit(DummyProcess, _jobs_store=self.storage)
+
+        # The workers survive the errors of the processes
+        with mock.patch.object(self.storage, 'persist_process',
+                               side_effect=RuntimeError):
+            self.assertFalse(self._tick_with_workers(2))
+
+        # The tick does not hang if all the workers die
+        with mock.patch.object(daemon, '_tick_checkpoint',
+                               side_effect=SystemExit):
+            self.assertTrue(self._tick_with_workers(2))
+
+    def test_skip_waiting_on_running_calculation(self):
+        import mock
+        from aiida.orm import JobCalculation
+        from aiida.orm.data.base import Int
+        from aiida.common.datastructures import calc_states
+
+        registry = ProcessRegistry()
+
+        calc = JobCalculation(computer=self.computer,
+                              resources={'num_machines': 1,
+                                         'num_mpiprocs_per_machine': 1})
+        calc.store()
+        calc._set_state(calc_states.TOSUBMIT)
+
+        rinfo = submit(WaitOnCalculationProcess, pk=Int(calc.pk),
+                       _jobs_store=self.storage)
+        # The first tick gets the process to wait on the calculation
+        self.assertTrue(self._tick_with_workers(1))
+
+        # The process is not even recreated while the calculation is running
+        with mock.patch.object(daemon.Process, 'create_from') as create_from:
+            self.assertTrue(self._tick_with_workers(1))
+            self.assertFalse(create_from.called)
+        self.assertFalse(registry.has_finished(rinfo.pid))
+
+        calc._set_state(calc_states.FINISHED)
+        i = 0
+        while self._tick_with_workers(1):
+            self.assertLess(i, 10, "Engine not done after 10 ticks")
+            i += 1
+        self.assertTrue(registry.has_finished(rinfo.pid))
+
+
+class TestDaemonDbPersistence(TestDaemon):
+    """
+    Run the daemon tests with the checkpoints stored in the database.
+    """
+
+    def setUp(self):
+        super(TestDaemonDbPersistence, self).setUp()
+        self.storage = DbPersistence()
+
+    def tearDown(self):
+        from aiida.orm.implementation import CheckpointStore
+
+        super(TestDaemonDbPersistence, self).tearDown()
+        CheckpointStore().clear_all()
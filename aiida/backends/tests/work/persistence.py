@@ -12,7 +12,7 @@ import tempfile
 
 import plum.process_monitor
 from aiida.backends.testbase import AiidaTestCase
-from aiida.work.persistence import Persistence
+from aiida.work.persistence import Persistence, DbPersistence
 import aiida.work.util as util
 from aiida.work.test_utils import DummyProcess
 
@@ -42,3 +42,73 @@ class TestProcess(AiidaTestCase):
         self.assertEqual(b, b2)
 
         dp.run_until_complete()
+
+
+class TestDbPersistence(AiidaTestCase):
+    def setUp(self):
+        super(TestDbPersistence, self).setUp()
+        self.assertEquals(len(util.ProcessStack.stack()), 0)
+        self.assertEquals(len(plum.process_monitor.MONITOR.get_pids()), 0)
+
+        self.persistence = DbPersistence()
+
+    def tearDown(self):
+        from aiida.orm.implementation import CheckpointStore
+
+        super(TestDbPersistence, self).tearDown()
+        self.assertEquals(len(util.ProcessStack.stack()), 0)
+        self.assertEquals(len(plum.process_monitor.MONITOR.get_pids()), 0)
+        CheckpointStore().clear_all()
+
+    def test_save_load(self):
+        dp = DummyProcess.new_instance()
+
+        b = self.persistence.create_bundle(dp)
+        self.persistence.save(dp)
+        self.assertEqual(b, self.persistence.load_checkpoint(dp.pid))
+        # Saving again replaces the checkpoint
+        self.persistence.save(dp)
+        self.assertEqual(b, self.persistence.load_checkpoint(dp.pid))
+
+        self.assertEqual(
+            [cp[DummyProcess.BundleKeys.PID.value]
+             for cp in self.persistence.load_all_checkpoints()], [dp.pid])
+
+        dp.run_until_complete()
+
+    def test_ready_checkpoints(self):
+        from aiida.orm import JobCalculation
+        from aiida.common.datastructures import calc_states
+        from aiida.work.legacy.wait_on import WaitOnJobCalculation
+
+        calc = JobCalculation(computer=self.computer,
+                              resources={'num_machines': 1,
+                                         'num_mpiprocs_per_machine': 1})
+        calc.store()
+        calc._set_state(calc_states.TOSUBMIT)
+
+        waiting = DummyProcess.new_instance()
+        waiting._waiting_on = WaitOnJobCalculation('run', calc.pk)
+        self.persistence.save(waiting)
+        ready = DummyProcess.new_instance()
+        self.persistence.save(ready)
+
+        def get_ready_pids():
+            pids = []
+            skipped = False
+            for checkpoints, blocked in \
+                    self.persistence.iter_ready_checkpoints(chunk_size=1):
+                pids.extend(cp[DummyProcess.BundleKeys.PID.value]
+                            for cp in checkpoints)
+                skipped |= blocked
+            return pids, skipped
+
+        self.assertEqual(get_ready_pids(), ([ready.pid], True))
+
+        calc._set_state(calc_states.FINISHED)
+        self.assertEqual(get_ready_pids(),
+                         (sorted([waiting.pid, ready.pid]), False))
+
+        waiting._waiting_on = None
+        waiting.run_until_complete()
+        ready.run_until_complete()
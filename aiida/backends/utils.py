@@ -10,6 +10,8 @@
 
 from __future__ import absolute_import
 
+from contextlib import contextmanager
+
 from aiida.backends import settings
 from aiida.backends.profile import load_profile, BACKEND_SQLA, BACKEND_DJANGO
 from aiida.common.exceptions import (
@@ -39,6 +41,28 @@ def validate_attribute_key(key):
             AIIDA_ATTRIBUTE_SEP))
 
 
+def get_fill_calc_state_sql():
+    """
+    Return the SQL statement that sets the calc_state column of the DbNode
+    table to the most recent state of each calculation in the DbCalcState
+    table (where 'most recent' follows the order of
+    ``aiida.common.datastructures._sorted_datastates``). Used to fill the
+    column when it is added to an existing database.
+    """
+    from aiida.common.datastructures import _sorted_datastates
+
+    state_order = " ".join("WHEN '{}' THEN {}".format(state, idx)
+                           for idx, state in enumerate(_sorted_datastates))
+    return """
+        UPDATE db_dbnode SET calc_state = (
+            SELECT state FROM db_dbcalcstate
+            WHERE db_dbcalcstate.dbnode_id = db_dbnode.id
+            ORDER BY CASE state {} ELSE -1 END DESC
+            LIMIT 1)
+        WHERE id IN (SELECT dbnode_id FROM db_dbcalcstate)""".format(
+        state_order)
+
+
 def QueryFactory():
     if settings.BACKEND == BACKEND_SQLA:
         from aiida.backends.sqlalchemy.queries import QueryManagerSQLA as QueryManager
@@ -168,6 +192,169 @@ def get_authinfo(computer, aiidauser):
     return authinfo
 
 
+def close_thread_db_connection():
+    """
+    Release the database connection (Django) or session (SQLAlchemy) bound
+    to the current thread. To be called at the end of any thread, other than
+    the main one, that accessed the database.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        connection.close()
+    elif settings.BACKEND == BACKEND_SQLA:
+        import aiida.backends.sqlalchemy as sa
+        if sa.scopedsessionclass is not None:
+            sa.scopedsessionclass.remove()
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
+def close_db_connections_before_fork():
+    """
+    Close all the database connections of this process, including those
+    kept in the pool of the SQLAlchemy engine. To be called before forking
+    processes that access the database, so that they do not share (and
+    corrupt) the sockets of the connections of this process.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connections
+        for connection in connections.all():
+            connection.close()
+    elif settings.BACKEND == BACKEND_SQLA:
+        import aiida.backends.sqlalchemy as sa
+        if sa.scopedsessionclass is not None:
+            sa.scopedsessionclass.remove()
+        if sa.engine is not None:
+            sa.engine.dispose()
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
+def send_notification(channel, payload=''):
+    """
+    Send a PostgreSQL notification on the given channel, received by all the
+    connections that issued a LISTEN on it (see aiida.daemon.notifications).
+
+    With Django, the notification is delivered when the current transaction
+    is committed: at the end of the enclosing atomic block, if any, otherwise
+    immediately. With SQLAlchemy it is sent on a connection of its own, so
+    that the session is not committed, and delivered immediately: the
+    changes it refers to must be committed before.
+
+    :param channel: the name of the channel
+    :param payload: a (short) string sent along with the notification
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection
+        connection.cursor().execute("SELECT pg_notify(%s, %s)",
+                                    [channel, payload])
+    elif settings.BACKEND == BACKEND_SQLA:
+        from sqlalchemy import text
+        import aiida.backends.sqlalchemy as sa
+        with sa.engine.connect() as connection:
+            connection.execution_options(autocommit=True).execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                channel=channel, payload=payload)
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
+@contextmanager
+def raw_transaction():
+    """
+    Return a context manager yielding a psycopg2 cursor on the database
+    connection of the current backend, within a transaction that is
+    committed when the context is exited (or rolled back, if an exception
+    is raised). The entries saved with the ORM within the context are part
+    of the same transaction (with SQLAlchemy, flush the session before
+    reading them with the cursor).
+
+    Only PostgreSQL is supported.
+    """
+    if settings.BACKEND == BACKEND_DJANGO:
+        from django.db import connection, transaction
+        if connection.vendor != 'postgresql':
+            raise NotImplementedError("Only PostgreSQL is supported")
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # The psycopg2 cursor wrapped by Django
+                yield cursor.cursor
+    elif settings.BACKEND == BACKEND_SQLA:
+        import aiida.backends.sqlalchemy as sa
+        session = sa.get_scoped_session()
+        try:
+            cursor = session.connection().connection.cursor()
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            session.commit()
+        except:
+            session.rollback()
+            raise
+    else:
+        raise Exception("unknown backend {}".format(settings.BACKEND))
+
+
+def to_copy_csv_value(value):
+    """
+    Format a value for the CSV format of the PostgreSQL COPY command, where
+    an unquoted empty string is a NULL.
+    """
+    import datetime
+    import math
+
+    if value is None:
+        return ''
+    elif isinstance(value, bool):
+        return 't' if value else 'f'
+    elif isinstance(value, float):
+        if math.isnan(value):
+            return 'NaN'
+        elif math.isinf(value):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return repr(value)
+    elif isinstance(value, (int, long)):
+        return str(value)
+    elif isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    elif isinstance(value, unicode):
+        value = value.encode('utf-8')
+    elif not isinstance(value, str):
+        value = str(value)
+    return '"{}"'.format(value.replace('"', '""'))
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    Write rows in a table of a PostgreSQL database with a single COPY
+    command, much faster than INSERTs for many rows.
+
+    :param cursor: a psycopg2 cursor
+    :param table: the name of the table
+    :param columns: the names of the columns
+    :param rows: an iterable of sequences of values, one for each column
+    :return: the number of rows written
+    """
+    import io
+
+    data = io.BytesIO()
+    num_rows = 0
+    for row in rows:
+        data.write(",".join(to_copy_csv_value(v) for v in row))
+        data.write("\n")
+        num_rows += 1
+    if not num_rows:
+        return 0
+    data.seek(0)
+
+    cursor.copy_expert(
+        'COPY "{}" ({}) FROM STDIN WITH CSV'.format(
+            table, ", ".join('"{}"'.format(c) for c in columns)),
+        data)
+    return num_rows
+
+
 def get_daemon_user():
     if settings.BACKEND == BACKEND_DJANGO:
         from aiida.backends.djsite.utils import (get_daemon_user
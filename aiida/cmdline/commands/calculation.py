@@ -150,6 +150,7 @@ class Calculation(VerdiCommandWithSubcommands):
                                      calc_states.SUBMITTING,
                                      calc_states.COMPUTED,
                                      calc_states.RETRIEVING,
+                                     calc_states.RETRIEVED,
                                      calc_states.PARSING,
                                      ])
 
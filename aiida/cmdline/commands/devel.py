@@ -109,6 +109,7 @@ class Devel(VerdiCommandWithSubcommands):
             'describeproperties': (self.run_describeproperties, self.complete_none),
             'listproperties': (self.run_listproperties, self.complete_none),
             'listislands': (self.run_listislands, self.complete_none),
+            'migrate': (self.run_migrate, self.complete_none),
             'play': (self.run_play, self.complete_none),
             'getresults': (self.calculation_getresults, self.complete_none),
             'tickd': (self.tick_daemon, self.complete_none)
@@ -413,14 +414,57 @@ class Devel(VerdiCommandWithSubcommands):
         from aiida.backends.utils import get_automatic_user
 
         q_object = Q(user=get_automatic_user())
-        q_object.add(Q(parents__isnull=True), Q.AND)
-        q_object.add(Q(children__isnull=True), Q.AND)
+        q_object.add(Q(inputs__isnull=True), Q.AND)
+        q_object.add(Q(outputs__isnull=True), Q.AND)
 
         node_list = Node.query(q_object).distinct().order_by('ctime')
         print "ID\tclass"
         for node in node_list:
             print "{}\t{}".format(node.pk, node.__class__.__name__)
 
+    def run_migrate(self, *args):
+        """
+        Migrate the database of the current profile to the schema version
+        of the code. Stop the daemon before running it.
+        """
+        from aiida.backends import settings
+        from aiida.backends.profile import (
+            load_profile, BACKEND_DJANGO, BACKEND_SQLA)
+
+        if args:
+            print >> sys.stderr, ("No parameters allowed for {}".format(
+                self.get_full_command_name()))
+            sys.exit(1)
+
+        # Perform the same loading procedure as the normal load_dbenv does,
+        # but without checking the schema version
+        settings.LOAD_DBENV_CALLED = True
+        load_profile()
+
+        if settings.BACKEND == BACKEND_DJANGO:
+            import django.core.management
+            from aiida.backends.djsite.utils import _load_dbenv_noschemacheck
+
+            _load_dbenv_noschemacheck(process=None,
+                                      profile=settings.AIIDADB_PROFILE)
+            django.core.management.execute_from_command_line(
+                [execname, 'migrate'])
+        elif settings.BACKEND == BACKEND_SQLA:
+            from aiida.backends.sqlalchemy.utils import (
+                _load_dbenv_noschemacheck)
+            from aiida.backends.sqlalchemy.migrations import migrate
+
+            _load_dbenv_noschemacheck()
+            applied = migrate()
+            if applied:
+                print "Database migrated to the schema version {}".format(
+                    applied[-1])
+            else:
+                print "The database schema is already up to date"
+        else:
+            print >> sys.stderr, "Unknown backend {}".format(settings.BACKEND)
+            sys.exit(1)
+
     def run_getproperty(self, *args):
         """
         Get a global AiiDA property from the config file in .aiida.
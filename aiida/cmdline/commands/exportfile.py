@@ -74,6 +74,31 @@ class Export(VerdiCommand):
         parser.set_defaults(zipfilec=False)
         parser.set_defaults(zipfileu=False)
 
+        parser.add_argument('-s', '--stream',
+                            dest='stream', action='store_true',
+                            help="Write the data to the output file while it "
+                                 "is collected, with a bounded memory usage "
+                                 "and without a temporary copy of the files "
+                                 "(for large exports)")
+        parser.set_defaults(stream=False)
+        parser.add_argument('-r', '--resumable',
+                            dest='resumable', action='store_true',
+                            help="Collect the files in the folder "
+                                 "OUTPUT_FILE.partial, so that an "
+                                 "interrupted export can be resumed by "
+                                 "running the same command again")
+        parser.set_defaults(resumable=False)
+        parser.add_argument('-d', '--delta-from', type=str, dest='previous',
+                            metavar='PREVIOUS_EXPORT_FILE',
+                            help="Export only the new or modified nodes, "
+                                 "links and group members, with respect to "
+                                 "a previous export file (delta export)")
+        parser.add_argument('--workers', type=int, dest='num_workers',
+                            metavar='N',
+                            help="Number of threads copying the files of "
+                                 "the nodes (default: the "
+                                 "importexport.repository_workers property)")
+
         parser.add_argument('output_file', type=str,
                             help='The output file name for the export file')
 
@@ -148,7 +173,14 @@ class Export(VerdiCommand):
         what_list = dbnode_list + dbcomputer_list + dbgroups_list
 
         export_function = export
-        additional_kwargs = {}
+        additional_kwargs = {"stream": parsed_args.stream,
+                             "num_workers": parsed_args.num_workers,
+                             "previous": parsed_args.previous}
+        if parsed_args.resumable:
+            if parsed_args.zipfileu or parsed_args.zipfilec:
+                print >> sys.stderr, ("A zip file export cannot be resumed.")
+                sys.exit(1)
+            additional_kwargs.update({"resumable": True})
         if parsed_args.zipfileu:
             export_function = export_zip
             additional_kwargs.update({"use_compression": False})
@@ -164,6 +196,9 @@ class Export(VerdiCommand):
         except IOError as e:
             print >> sys.stderr, "IOError: {}".format(e.message)
             sys.exit(1)
+        except ValueError as e:
+            print >> sys.stderr, "ValueError: {}".format(e.message)
+            sys.exit(1)
 
     def complete(self, subargs_idx, subargs):
         return ""
@@ -26,11 +26,12 @@ class Import(VerdiCommand):
         load_dbenv()
 
         import argparse
+        import os
         import traceback
         import urllib2
 
         from aiida.common.folders import SandboxFolder
-        from aiida.orm.importexport import get_valid_import_links, import_data_dj, import_data_sqla
+        from aiida.orm.importexport import get_valid_import_links, import_data
 
         parser = argparse.ArgumentParser(
             prog=self.get_full_command_name(),
@@ -42,6 +43,20 @@ class Import(VerdiCommand):
         parser.add_argument(nargs='*', type=str,
                             dest='files', metavar='URL_OR_PATH',
                             help="Import the given files or URLs")
+        parser.add_argument('-b', '--bulk', action='store_true',
+                            help="Load the data with PostgreSQL COPY "
+                                 "commands, much faster for large files "
+                                 "(PostgreSQL only)")
+        parser.add_argument('-r', '--resumable', action='store_true',
+                            help="Record the files already moved to the "
+                                 "repository in FILE.manifest, so that an "
+                                 "interrupted import of a file can be "
+                                 "resumed by running the same command again")
+        parser.add_argument('--workers', type=int, dest='num_workers',
+                            metavar='N',
+                            help="Number of threads moving the files of "
+                                 "the nodes to the repository (default: the "
+                                 "importexport.repository_workers property)")
 
         parsed_args = parser.parse_args(args)
 
@@ -82,12 +97,15 @@ class Import(VerdiCommand):
         for filename in files:
             try:
                 print "**** Importing file {}".format(filename)
-                from aiida.backends.settings import BACKEND
-                from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
-                if BACKEND == BACKEND_SQLA:
-                    import_data_sqla(filename)
-                elif BACKEND == BACKEND_DJANGO:
-                    import_data_dj(filename)
+                if parsed_args.resumable:
+                    manifest = os.path.abspath(filename) + '.manifest'
+                else:
+                    manifest = None
+                import_data(filename, bulk=parsed_args.bulk,
+                            manifest=manifest,
+                            num_workers=parsed_args.num_workers)
+                if manifest is not None and os.path.exists(manifest):
+                    os.remove(manifest)
             except Exception:
                 traceback.print_exc()
 
@@ -112,7 +130,8 @@ class Import(VerdiCommand):
 
                     print " `-> File downloaded. Importing it..."
                     import_data(temp_download_folder.get_abs_path(
-                        download_file_name))
+                        download_file_name), bulk=parsed_args.bulk,
+                        num_workers=parsed_args.num_workers)
             except Exception:
                 traceback.print_exc()
 
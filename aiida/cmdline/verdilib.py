@@ -542,6 +542,8 @@ def setup(profile, only_config, non_interactive=False, **kwargs):
                 DbComputer)
             from aiida.backends.sqlalchemy.models.group import (
                 DbGroup, table_groups_nodes)
+            from aiida.backends.sqlalchemy.models.checkpoint import (
+                DbCheckpoint)
             from aiida.backends.sqlalchemy.models.lock import DbLock
             from aiida.backends.sqlalchemy.models.log import DbLog
             from aiida.backends.sqlalchemy.models.node import (
@@ -555,7 +557,8 @@ def setup(profile, only_config, non_interactive=False, **kwargs):
             from aiida.backends.sqlalchemy import get_scoped_session
             connection = get_scoped_session().connection()
             Base.metadata.create_all(connection)
-            install_tc(connection)
+            if get_profile_config(gprofile).get('AIIDADB_USE_DBPATH', True):
+                install_tc(connection)
 
             set_backend_type(BACKEND_SQLA)
 
@@ -24,6 +24,7 @@ _sorted_datastates = (
     'COMPUTED',  # Calculation finished on scheduler, not yet retrieved
     # (both DONE and FAILED)
     'RETRIEVING',  # while retrieving data
+    'RETRIEVED',  # data retrieved, waiting to be parsed
     'PARSING',  # while parsing data
     'FINISHED',  # Final state of the calculation: data retrieved and eventually parsed
     'SUBMISSIONFAILED',  # error occurred during submission phase
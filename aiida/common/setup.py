@@ -933,7 +933,117 @@ _property_table = {
         "bool",
         "Boolean whether to print deprecation warnings",
         False,
-        None)
+        None),
+    "daemon.authinfo_workers": (
+        "daemon_authinfo_workers",
+        "int",
+        "Number of (computer, user) pairs that the daemon submitter, updater "
+        "and retriever process concurrently, each in its own thread; "
+        "1 processes them one after the other",
+        1,
+        None),
+    "daemon.computer_max_workers": (
+        "daemon_computer_max_workers",
+        "int",
+        "Maximum number of (computer, user) pairs of the same computer that "
+        "are processed concurrently when daemon.authinfo_workers is larger "
+        "than 1",
+        1,
+        None),
+    "daemon.authinfo_timeout": (
+        "daemon_authinfo_timeout",
+        "int",
+        "Maximum time (in seconds) a daemon task waits for the concurrent "
+        "(computer, user) workers to finish before returning; pairs still "
+        "running are left to complete in the background. 0 means no timeout",
+        0,
+        None),
+    "transport.pool": (
+        "transport_pool",
+        "bool",
+        "Boolean whether the daemon should keep the transports to the "
+        "computers open and reuse them across tasks, instead of opening a "
+        "new connection each time",
+        False,
+        None),
+    "transport.pool_idle_timeout": (
+        "transport_pool_idle_timeout",
+        "int",
+        "Number of seconds after which a transport left unused in the pool "
+        "is closed and reopened on the next request; 0 means never",
+        300,
+        None),
+    "daemon.bundle_upload": (
+        "daemon_bundle_upload",
+        "bool",
+        "Boolean whether the daemon should upload the input files of a "
+        "calculation as a single compressed archive, unpacked remotely with "
+        "tar, instead of copying each file separately",
+        False,
+        None),
+    "daemon.bundle_retrieve": (
+        "daemon_bundle_retrieve",
+        "bool",
+        "Boolean whether the daemon should retrieve the output files of a "
+        "calculation as a single compressed archive, created remotely with "
+        "tar, instead of listing and copying each file separately",
+        False,
+        None),
+    "daemon.parser_workers": (
+        "daemon_parser_workers",
+        "int",
+        "Number of worker processes used by the daemon to parse the "
+        "retrieved calculations; 0 parses them in the retriever, right "
+        "after retrieval",
+        0,
+        None),
+    "daemon.jobs_cache_ttl": (
+        "daemon_jobs_cache_ttl",
+        "int",
+        "Number of seconds for which the list of jobs in the queue of a "
+        "computer is reused by the daemon tasks of all the users of that "
+        "computer; 0 queries the scheduler for each user",
+        0,
+        None),
+    "daemon.workflow_engine_workers": (
+        "daemon_workflow_engine_workers",
+        "int",
+        "Number of threads used by the daemon to tick the processes of the "
+        "workflow engine concurrently; 1 ticks them one after the other",
+        1,
+        None),
+    "workflow.checkpoint_storage": (
+        "workflow_checkpoint_storage",
+        "string",
+        "Where the workflow engine stores the checkpoints of the processes: "
+        "'file' for pickle files in the repository, 'database' for the "
+        "DbCheckpoint table",
+        "file",
+        ["file", "database"]),
+    "daemon.notifications": (
+        "daemon_notifications",
+        "bool",
+        "Boolean whether to send database notifications (PostgreSQL "
+        "NOTIFY) when a calculation changes state or a process is submitted "
+        "or finishes, that wake up the daemon tasks immediately",
+        False,
+        None),
+    "daemon.notifications_fallback_interval": (
+        "daemon_notifications_fallback_interval",
+        "int",
+        "Minimum number of seconds between the periodic runs of the daemon "
+        "tasks that are woken up by notifications, when daemon.notifications "
+        "is set; the periodic runs only catch the notifications that were "
+        "lost",
+        120,
+        None),
+    "importexport.repository_workers": (
+        "importexport_repository_workers",
+        "int",
+        "Number of threads copying the repository folders of the nodes "
+        "during import and export; 1 copies them one after the other",
+        4,
+        None),
 }
 
 
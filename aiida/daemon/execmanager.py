@@ -13,6 +13,9 @@ results. These are general and contain only the main logic; where appropriate,
 the routines make reference to the suitable plugins for all
 plugin-specific operations.
 """
+import threading
+from contextlib import contextmanager
+
 from aiida.common.datastructures import calc_states
 from aiida.scheduler.datastructures import job_states
 from aiida.common.exceptions import (
@@ -23,21 +26,26 @@ from aiida.common.exceptions import (
 from aiida.common import aiidalogger
 from aiida.common.links import LinkType
 from aiida.orm import load_node
+from aiida.transport.pool import get_transport
 
 
 
 execlogger = aiidalogger.getChild('execmanager')
 
 
-def update_running_calcs_status(authinfo):
+def update_running_calcs_status(authinfo, running_jobinfos=None):
     """
     Update the states of calculations in WITHSCHEDULER status belonging
     to user and machine as defined in the 'dbauthinfo' table.
+
+    :param running_jobinfos: if a list is given, the JobInfo of the jobs
+      that are still running are appended to it
     """
     from aiida.orm import JobCalculation, Computer
     from aiida.scheduler.datastructures import JobInfo
     from aiida.utils.logger import get_dblogger_extra
     from aiida.backends.utils import QueryFactory
+    from aiida.common.setup import get_property
     
     if not authinfo.enabled:
         return
@@ -62,7 +70,6 @@ def update_running_calcs_status(authinfo):
     # NOTE: no further check is done that machine and
     # aiidauser are correct for each calc in calcs
     s = Computer(dbcomputer=authinfo.dbcomputer).get_scheduler()
-    t = authinfo.get_transport()
 
     computed = []
 
@@ -72,7 +79,7 @@ def update_running_calcs_status(authinfo):
         jobids_to_inquire = [str(c.get_job_id()) for c in calcs_to_inquire]
 
         # Open connection
-        with t:
+        with get_transport(authinfo) as t:
             s.set_transport(t)
             # TODO: Check if we are ok with filtering by job (to make this work,
             # I had to remove the check on the retval for getJobs,
@@ -83,7 +90,11 @@ def update_running_calcs_status(authinfo):
             # sensible (at least, skip this computer but continue with
             # following ones, and set a counter; set calculations to
             # UNKNOWN after a while?
-            if s.get_feature('can_query_by_user'):
+            if (get_property('daemon.jobs_cache_ttl') > 0 and
+                    s.get_feature('can_query_all_users')):
+                found_jobs = _get_jobs_from_snapshot(
+                    authinfo, s, jobids_to_inquire)
+            elif s.get_feature('can_query_by_user'):
                 found_jobs = s.getJobs(user="$USER", as_dict=True)
             else:
                 found_jobs = s.getJobs(jobs=jobids_to_inquire, as_dict=True)
@@ -119,6 +130,8 @@ def update_running_calcs_status(authinfo):
                             except ModificationNotAllowed:
                                 # Someone already set it, just skip
                                 pass
+                        elif running_jobinfos is not None:
+                            running_jobinfos.append(jobinfo)
 
                         ## Do not set the WITHSCHEDULER state multiple times,
                         ## this would raise a ModificationNotAllowed
@@ -148,12 +161,33 @@ def update_running_calcs_status(authinfo):
                         ), extra=logger_extra)
                     continue
 
+            # Get the detailed jobinfo of all the finished jobs at once
+            bulk_jobinfos = {}
+            if computed:
+                try:
+                    bulk_jobinfos = s.get_detailed_jobinfo_bulk(
+                        [c.get_job_id() for c in computed])
+                except NotImplementedError:
+                    bulk_jobinfos = None
+                except Exception as e:
+                    # Fall back to one command per job below
+                    execlogger.debug("Error while retrieving the detailed "
+                                     "jobinfo of the finished jobs in bulk "
+                                     "({}): {}".format(e.__class__.__name__,
+                                                       e.message))
+
             for c in computed:
                 try:
                     logger_extra = get_dblogger_extra(c)
                     try:
-                        detailed_jobinfo = s.get_detailed_jobinfo(
-                            jobid=c.get_job_id())
+                        if bulk_jobinfos is None:
+                            raise NotImplementedError
+                        try:
+                            detailed_jobinfo = bulk_jobinfos[
+                                str(c.get_job_id())]
+                        except KeyError:
+                            detailed_jobinfo = s.get_detailed_jobinfo(
+                                jobid=c.get_job_id())
                     except NotImplementedError:
                         detailed_jobinfo = (
                             u"AiiDA MESSAGE: This scheduler does not implement "
@@ -188,6 +222,167 @@ def update_running_calcs_status(authinfo):
     return computed
 
 
+def _get_jobs_from_snapshot(authinfo, scheduler, jobids):
+    """
+    Return the jobs found in the queue of the computer of the given authinfo,
+    using the snapshot of the whole queue shared by all the users of the
+    computer (see :py:mod:`aiida.scheduler.cache`).
+
+    A job that is missing from a snapshot taken by a previous call may just
+    have been submitted after that snapshot: those jobs are queried
+    explicitly, so that they are not considered finished by mistake.
+    Schedulers that are queried by user (e.g. SGE) do not accept a list of
+    jobs: for those, a new snapshot is taken instead, and the jobs still
+    missing from it are considered finished, as when the queue is queried
+    without the snapshot.
+
+    :param authinfo: the DbAuthInfo whose transport is set in the scheduler
+    :param scheduler: the Scheduler instance, with an open transport
+    :param jobids: the list of job ids to look for
+    :return: a dictionary of JobInfo objects as returned by getJobs (with
+        as_dict=True), possibly containing also other jobs
+    """
+    from aiida.scheduler.cache import get_default
+
+    cache = get_default()
+    key = (authinfo.dbcomputer.pk, 'getJobs', None, None)
+    fetch = lambda: scheduler.getJobs(as_dict=True)
+    found_jobs, fresh = cache.get_jobs(key, fetch)
+
+    if not fresh:
+        missing_jobids = [j for j in jobids if j not in found_jobs]
+        if missing_jobids:
+            if scheduler.get_feature('can_query_by_user'):
+                cache.invalidate(key)
+                found_jobs, _ = cache.get_jobs(key, fetch)
+            else:
+                found_jobs = dict(found_jobs)
+                found_jobs.update(
+                    scheduler.getJobs(jobs=missing_jobids, as_dict=True))
+
+    return found_jobs
+
+
+# The (computer pk, aiidauser pk) pairs being processed by a daemon worker,
+# possibly left running in the background by a previous call that timed out
+_in_flight_pairs = set()
+_in_flight_pairs_lock = threading.Lock()
+
+
+def _run_for_computer_user_pairs(function, computers_users):
+    """
+    Call ``function(computer, aiidauser)`` for each (computer, aiidauser)
+    pair.
+
+    If the ``daemon.authinfo_workers`` property is larger than one, the pairs
+    are processed concurrently by a pool of worker threads, so that a slow
+    or unresponsive computer does not delay all the other ones. At most
+    ``daemon.computer_max_workers`` pairs of the same computer are processed
+    at the same time. If ``daemon.authinfo_timeout`` is positive, this
+    function returns after that many seconds even if some pairs are still
+    being processed: those are left to complete in the background, while
+    the pairs that were not started yet are skipped until the next call.
+    The pairs still being processed in the background are skipped by the
+    following calls, until their processing ends.
+
+    :param function: a callable accepting a computer and an aiidauser. It is
+        expected to catch and log its own exceptions.
+    :param computers_users: an iterable of (computer, aiidauser) pairs
+    """
+    import time
+    from aiida.common.setup import get_property
+    from aiida.backends.utils import close_thread_db_connection
+
+    with _in_flight_pairs_lock:
+        computers_users = [(computer, aiidauser)
+                           for computer, aiidauser in computers_users
+                           if (computer.pk, aiidauser.pk)
+                           not in _in_flight_pairs]
+    num_workers = min(get_property('daemon.authinfo_workers'),
+                      len(computers_users))
+
+    if num_workers <= 1:
+        for computer, aiidauser in computers_users:
+            function(computer, aiidauser)
+        return
+
+    max_per_computer = max(get_property('daemon.computer_max_workers'), 1)
+    timeout = get_property('daemon.authinfo_timeout')
+
+    pending = list(computers_users)
+    # Number of pairs currently being processed, for each computer pk
+    running = {}
+    condition = threading.Condition()
+
+    def pop_next_pair():
+        # To be called only with the condition acquired
+        for idx, (computer, aiidauser) in enumerate(pending):
+            if running.get(computer.pk, 0) < max_per_computer:
+                running[computer.pk] = running.get(computer.pk, 0) + 1
+                with _in_flight_pairs_lock:
+                    _in_flight_pairs.add((computer.pk, aiidauser.pk))
+                return pending.pop(idx)
+        return None
+
+    def worker():
+        try:
+            while True:
+                with condition:
+                    pair = pop_next_pair()
+                    while pair is None and pending:
+                        condition.wait()
+                        pair = pop_next_pair()
+                if pair is None:
+                    return
+
+                computer, aiidauser = pair
+                try:
+                    function(computer, aiidauser)
+                except Exception as e:
+                    execlogger.error("Unexpected error in the daemon worker "
+                                     "for aiidauser={} on computer={}, "
+                                     "error type is {}, error message: "
+                                     "{}".format(aiidauser.email,
+                                                 computer.name,
+                                                 e.__class__.__name__,
+                                                 e.message))
+                finally:
+                    with _in_flight_pairs_lock:
+                        _in_flight_pairs.discard((computer.pk, aiidauser.pk))
+                    with condition:
+                        running[computer.pk] -= 1
+                        condition.notify_all()
+        finally:
+            close_thread_db_connection()
+
+    threads = [threading.Thread(target=worker,
+                                name="aiida-authinfo-worker-{}".format(i))
+               for i in range(num_workers)]
+    for thread in threads:
+        # Do not prevent the interpreter from exiting because of
+        # a worker hanging on an unresponsive computer
+        thread.daemon = True
+        thread.start()
+
+    if timeout > 0:
+        deadline = time.time() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.time(), 0.))
+    else:
+        for thread in threads:
+            thread.join()
+
+    if any(thread.is_alive() for thread in threads):
+        with condition:
+            skipped = len(pending)
+            del pending[:]
+        execlogger.warning("Timeout of {}s reached while waiting for the "
+                           "daemon workers; {} (computer, aiidauser) pairs "
+                           "are still being processed in the background and "
+                           "{} were skipped".format(
+            timeout, sum(running.values()), skipped))
+
+
 def retrieve_jobs():
     from aiida.orm import JobCalculation, Computer
     from aiida.backends.utils import get_authinfo, QueryFactory
@@ -208,7 +403,7 @@ def retrieve_jobs():
             #~ only_enabled=True)
     #~ )
 
-    for computer, aiidauser in computers_users_to_check:
+    def retrieve_for_pair(computer, aiidauser):
         execlogger.debug("({},{}) pair to check".format(
             aiidauser.email, computer.name))
         try:
@@ -223,16 +418,23 @@ def retrieve_jobs():
                 e.__class__.__name__, e.message))
             execlogger.error(msg)
             # Continue with next computer
-            continue
+
+    _run_for_computer_user_pairs(retrieve_for_pair, computers_users_to_check)
 
 
 # in daemon
 def update_jobs():
     """
     calls an update for each set of pairs (machine, aiidauser)
+
+    The pairs are checked following the job polling policy of the computer
+    (see aiida.daemon.polling): not more often than its minimum interval,
+    with an increasing delay after consecutive errors, and earlier if a
+    job is going to reach its walltime.
     """
     from aiida.orm import JobCalculation, Computer, User
     from aiida.backends.utils import get_authinfo, QueryFactory
+    from aiida.daemon import polling
 
     qmanager = QueryFactory()()
     # I create a unique set of pairs (computer, aiidauser)
@@ -242,24 +444,46 @@ def update_jobs():
             only_enabled=True
         )
 
-    for computer, aiidauser in computers_users_to_check:
-
+    def update_for_pair(computer, aiidauser):
         execlogger.debug("({},{}) pair to check".format(
             aiidauser.email, computer.name))
 
         try:
             authinfo = get_authinfo(computer.dbcomputer, aiidauser._dbuser)
-            computed_calcs = update_running_calcs_status(authinfo)
+            if not polling.is_poll_due(authinfo):
+                execlogger.debug("({},{}) pair not due for a check".format(
+                    aiidauser.email, computer.name))
+                return
+        except Exception as e:
+            execlogger.error("Error while getting the authinfo for "
+                             "aiidauser={} on computer={}, error type is {}, "
+                             "error message: {}".format(
+                aiidauser.email, computer.name,
+                e.__class__.__name__, e.message))
+            return
+
+        policy = computer.get_job_polling_policy()
+        running_jobinfos = []
+        try:
+            computed_calcs = update_running_calcs_status(
+                authinfo, running_jobinfos=running_jobinfos)
         except Exception as e:
+            delay = polling.record_poll(authinfo, policy, success=False)
             msg = ("Error while updating calculation status "
                    "for aiidauser={} on computer={}, "
-                   "error type is {}, error message: {}".format(
+                   "error type is {}, error message: {}; "
+                   "retrying in {} seconds".format(
                 aiidauser.email,
                 computer.name,
-                e.__class__.__name__, e.message))
+                e.__class__.__name__, e.message, delay))
             execlogger.error(msg)
             # Continue with next computer
-            continue
+        else:
+            polling.record_poll(
+                authinfo, policy, success=True,
+                walltime_left=polling.get_walltime_left(running_jobinfos))
+
+    _run_for_computer_user_pairs(update_for_pair, computers_users_to_check)
 
 
 def submit_jobs():
@@ -279,8 +503,7 @@ def submit_jobs():
             only_enabled=True
         )
 
-    for computer, aiidauser in computers_users_to_check:
-
+    def submit_for_pair(computer, aiidauser):
         execlogger.debug("({},{}) pair to submit".format(
             aiidauser.email, computer.name))
 
@@ -312,7 +535,7 @@ def submit_jobs():
                         aiidauser.email),
                                      extra=logger_extra)
                 # Go to the next (dbcomputer,aiidauser) pair
-                continue
+                return
 
             submitted_calcs = submit_jobs_with_authinfo(authinfo)
         except Exception as e:
@@ -327,7 +550,8 @@ def submit_jobs():
             print msg
             execlogger.error(msg)
             # Continue with next computer
-            continue
+
+    _run_for_computer_user_pairs(submit_for_pair, computers_users_to_check)
 
 
 def submit_jobs_with_authinfo(authinfo):
@@ -363,7 +587,7 @@ def submit_jobs_with_authinfo(authinfo):
         # Open connection
         try:
             # I do it here so that the transport is opened only once per computer
-            with authinfo.get_transport() as t:
+            with get_transport(authinfo) as t:
                 for c in calcs_to_inquire:
                     logger_extra = get_dblogger_extra(c)
                     t._set_logger_extra(logger_extra)
@@ -424,6 +648,7 @@ def submit_calc(calc, authinfo, transport=None):
         InputValidationError)
     from aiida.orm.data.remote import RemoteData
     from aiida.utils.logger import get_dblogger_extra
+    from aiida.common.setup import get_property
 
     if not authinfo.enabled:
         return
@@ -537,6 +762,10 @@ def submit_calc(calc, authinfo, transport=None):
             # retrieval
             calc._set_remote_workdir(workdir)
 
+            # List of (local_abs_path, remote_rel_path) to upload; the order
+            # matters, since later entries overwrite earlier ones.
+            to_upload = []
+
             # I first create the code files, so that the code can put
             # default files to be overwritten by the plugin itself.
             # Still, beware! The code file itself could be overwritten...
@@ -545,15 +774,14 @@ def submit_calc(calc, authinfo, transport=None):
                 if code.is_local():
                     # Note: this will possibly overwrite files
                     for f in code.get_folder_list():
-                        t.put(code.get_abs_path(f), f)
-                    t.chmod(code.get_local_executable(), 0755)  # rwxr-xr-x
+                        to_upload.append((code.get_abs_path(f), f))
 
             # copy all files, recursively with folders
             for f in folder.get_content_list():
                 execlogger.debug("[submission of calc {}] "
                                  "copying file/folder {}...".format(calc.pk, f),
                                  extra=logger_extra)
-                t.put(folder.get_abs_path(f), f)
+                to_upload.append((folder.get_abs_path(f), f))
 
             # local_copy_list is a list of tuples,
             # each with (src_abs_path, dest_rel_path)
@@ -569,8 +797,19 @@ def submit_calc(calc, authinfo, transport=None):
                                      "copying local file/folder to {}".format(
                         calc.pk, dest_rel_path),
                                      extra=logger_extra)
+                    to_upload.append((src_abs_path, dest_rel_path))
+
+            uploaded = False
+            if to_upload and get_property('daemon.bundle_upload'):
+                uploaded = _put_bundle(t, to_upload, calc.pk, logger_extra)
+            if not uploaded:
+                for src_abs_path, dest_rel_path in to_upload:
                     t.put(src_abs_path, dest_rel_path)
 
+            for code in input_codes:
+                if code.is_local():
+                    t.chmod(code.get_local_executable(), 0755)  # rwxr-xr-x
+
             if remote_copy_list is not None:
                 for (remote_computer_uuid, remote_abs_path,
                      dest_rel_path) in remote_copy_list:
@@ -660,9 +899,192 @@ def submit_calc(calc, authinfo, transport=None):
             t.close()
 
 
+def _put_bundle(transport, to_upload, calc_pk, logger_extra=None):
+    """
+    Upload files and folders to the current remote directory as a single
+    compressed tar archive, that is then unpacked with one remote command.
+    This replaces several round trips per file with a single transfer.
+
+    :param transport: an open transport, whose current directory is the
+        destination of the upload
+    :param to_upload: a list of (local_abs_path, remote_rel_path) tuples;
+        folders are added recursively, and later entries overwrite earlier
+        ones, as it happens with subsequent calls to put()
+    :param calc_pk: the pk of the calculation, used only for logging
+    :param logger_extra: extras passed to the logger
+    :return: True if the files were uploaded, False if the archive could not
+        be unpacked on the remote side (e.g. because ``tar`` is not
+        available); in this case the caller should fall back to uploading
+        each file separately.
+    """
+    import os
+    import tarfile
+    import tempfile
+    from aiida.common.utils import escape_for_bash
+
+    archive_name = '.aiida_upload.tar.gz'
+
+    handle, archive_path = tempfile.mkstemp(suffix='.tar.gz')
+    os.close(handle)
+    try:
+        archive = tarfile.open(archive_path, 'w:gz', dereference=True)
+        try:
+            for src_abs_path, dest_rel_path in to_upload:
+                archive.add(src_abs_path, arcname=dest_rel_path)
+        finally:
+            archive.close()
+
+        execlogger.debug("[submission of calc {}] uploading {} files/folders "
+                         "as a single archive of {} bytes".format(
+            calc_pk, len(to_upload), os.path.getsize(archive_path)),
+                         extra=logger_extra)
+        transport.putfile(archive_path, archive_name)
+    finally:
+        os.remove(archive_path)
+
+    retval, stdout, stderr = transport.exec_command_wait(
+        "tar -xzf {0} && rm -f {0}".format(escape_for_bash(archive_name)))
+    if retval != 0:
+        execlogger.warning("[submission of calc {}] unable to unpack the "
+                           "uploaded archive (exit code {}, stderr: '{}'), "
+                           "falling back to uploading each file "
+                           "separately".format(calc_pk, retval,
+                                               stderr.strip()),
+                           extra=logger_extra)
+        try:
+            transport.remove(archive_name)
+        except (IOError, OSError):
+            pass
+        return False
+
+    return True
+
+
+def _get_bundle(transport, remote_paths, local_folder, calc_pk,
+                logger_extra=None):
+    """
+    Pack the given remote files and folders into a single compressed tar
+    archive on the remote side, transfer it and unpack it in a local folder.
+    Shell patterns in the paths are expanded by the remote shell, so that
+    no listing of remote folders is needed.
+
+    :param transport: an open transport, whose current directory is the one
+        the paths are relative to
+    :param remote_paths: a list of paths (possibly with shell patterns),
+        relative to the current remote directory. Non-existing paths are
+        ignored.
+    :param local_folder: the absolute path of the local folder in which the
+        archive is unpacked, preserving the relative paths
+    :param calc_pk: the pk of the calculation, used only for logging
+    :param logger_extra: extras passed to the logger
+    :return: True if the files were retrieved, False if this was not
+        possible (absolute paths or paths pointing outside the current
+        folder were given, or ``tar`` is not available on the remote side);
+        in this case the caller should fall back to retrieving each file
+        separately.
+    """
+    import os
+    import re
+    import tarfile
+    import tempfile
+    from aiida.common.utils import escape_for_bash
+
+    archive_name = '.aiida_retrieve.tar.gz'
+
+    # Escape everything but the wildcards, so that patterns are expanded by
+    # the remote shell. Patterns not matching any file are passed literally
+    # to tar, that just skips them.
+    wildcard_regex = re.compile(r'(\[[^\]/]*\]|[*?])')
+    safe_wildcard_regex = re.compile(r'^(\[[\w.!^-]+\]|[*?])$')
+    escaped_paths = []
+    for path in remote_paths:
+        if os.path.isabs(path) or os.pardir in path.split(os.path.sep):
+            return False
+        escaped_parts = []
+        for part in wildcard_regex.split(path):
+            if not part:
+                continue
+            if wildcard_regex.match(part):
+                if not safe_wildcard_regex.match(part):
+                    return False
+                escaped_parts.append(part)
+            else:
+                escaped_parts.append(escape_for_bash(part))
+        escaped_paths.append("".join(escaped_parts))
+
+    retval, stdout, stderr = transport.exec_command_wait(
+        "rm -f {0}; tar -czhf {0} -- {1} 2>/dev/null; test -f {0}".format(
+            escape_for_bash(archive_name), " ".join(escaped_paths)))
+    if retval != 0:
+        execlogger.warning("[retrieval of calc {}] unable to create the "
+                           "archive of the files to retrieve, falling back "
+                           "to retrieving each file separately".format(
+            calc_pk), extra=logger_extra)
+        return False
+
+    handle, archive_path = tempfile.mkstemp(suffix='.tar.gz')
+    os.close(handle)
+    try:
+        transport.getfile(archive_name, archive_path)
+        transport.remove(archive_name)
+
+        archive = tarfile.open(archive_path, 'r:gz')
+        try:
+            # Do not trust member names pointing outside of the folder
+            members = [m for m in archive.getmembers()
+                       if not os.path.isabs(m.name) and
+                       os.pardir not in m.name.split('/')]
+            archive.extractall(local_folder, members=members)
+        finally:
+            archive.close()
+    finally:
+        os.remove(archive_path)
+
+    return True
+
+
+@contextmanager
+def _get_retrieval_transport(transport, remote_paths, calc_pk,
+                             logger_extra=None):
+    """
+    Return a context manager yielding the transport to be used to retrieve
+    the given paths.
+
+    If the ``daemon.bundle_retrieve`` property is set, all paths are first
+    fetched with a single archive (see :py:func:`_get_bundle`) and a local
+    transport, whose current directory is the one where the archive was
+    unpacked, is returned. Otherwise (or if the archive could not be
+    created) the given transport is returned.
+
+    :param transport: an open transport, whose current directory is the one
+        the paths are relative to
+    :param remote_paths: a list of paths (possibly with shell patterns)
+    :param calc_pk: the pk of the calculation, used only for logging
+    :param logger_extra: extras passed to the logger
+    """
+    from aiida.common.folders import SandboxFolder
+    from aiida.common.setup import get_property
+    from aiida.transport.plugins.local import LocalTransport
+
+    if not remote_paths or not get_property('daemon.bundle_retrieve'):
+        yield transport
+        return
+
+    with SandboxFolder() as bundle_folder:
+        if not _get_bundle(transport, remote_paths, bundle_folder.abspath,
+                           calc_pk, logger_extra):
+            yield transport
+            return
+
+        with LocalTransport() as local_transport:
+            local_transport.chdir(bundle_folder.abspath)
+            yield local_transport
+
+
 def retrieve_computed_for_authinfo(authinfo):
     from aiida.orm import JobCalculation
     from aiida.common.folders import SandboxFolder
+    from aiida.common.setup import get_property
     from aiida.orm.data.folder import FolderData
     from aiida.utils.logger import get_dblogger_extra
     from aiida.orm import DataFactory
@@ -689,7 +1111,7 @@ def retrieve_computed_for_authinfo(authinfo):
     if len(calcs_to_retrieve):
 
         # Open connection
-        with authinfo.get_transport() as t:
+        with get_transport(authinfo) as t:
             for calc in calcs_to_retrieve:
                 logger_extra = get_dblogger_extra(calc)
                 t._set_logger_extra(logger_extra)
@@ -719,86 +1141,94 @@ def retrieve_computed_for_authinfo(authinfo):
                         calc, label=calc._get_linkname_retrieved(),
                         link_type=LinkType.CREATE)
 
-                    # First, retrieve the files of folderdata
-                    with SandboxFolder() as folder:
-                        for item in retrieve_list:
-                            # I have two possibilities:
-                            # * item is a string
-                            # * or is a list
-                            # then I have other two possibilities:
-                            # * there are file patterns
-                            # * or not
-                            # First decide the name of the files
-                            if isinstance(item, list):
-                                tmp_rname, tmp_lname, depth = item
-                                # if there are more than one file I do something differently
-                                if t.has_magic(tmp_rname):
-                                    remote_names = t.glob(tmp_rname)
-                                    local_names = []
-                                    for rem in remote_names:
-                                        to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
-                                        local_names.append(os.path.sep.join([tmp_lname] + to_append))
-                                else:
-                                    remote_names = [tmp_rname]
-                                    to_append = remote_names.split(os.path.sep)[-depth:] if depth > 0 else []
-                                    local_names = [os.path.sep.join([tmp_lname] + to_append)]
-                                if depth > 1:  # create directories in the folder, if needed
-                                    for this_local_file in local_names:
-                                        new_folder = os.path.join(
-                                            folder.abspath,
-                                            os.path.split(this_local_file)[0])
-                                        if not os.path.exists(new_folder):
-                                            os.makedirs(new_folder)
-                            else:  # it is a string
-                                if t.has_magic(item):
-                                    remote_names = t.glob(item)
-                                    local_names = [os.path.split(rem)[1] for rem in remote_names]
-                                else:
-                                    remote_names = [item]
-                                    local_names = [os.path.split(item)[1]]
-
-                            for rem, loc in zip(remote_names, local_names):
-                                execlogger.debug("[retrieval of calc {}] "
-                                                 "Trying to retrieve remote item '{}'".format(
-                                    calc.pk, rem),
+                    # If requested, fetch all the files at once: rt is then a
+                    # local transport on the unpacked archive
+                    remote_paths = [item[0] if isinstance(item, list) else item
+                                    for item in retrieve_list]
+                    remote_paths += [filename for (_, _, filename)
+                                     in retrieve_singlefile_list]
+                    with _get_retrieval_transport(t, remote_paths, calc.pk,
+                                                  logger_extra) as rt:
+                        # First, retrieve the files of folderdata
+                        with SandboxFolder() as folder:
+                            for item in retrieve_list:
+                                # I have two possibilities:
+                                # * item is a string
+                                # * or is a list
+                                # then I have other two possibilities:
+                                # * there are file patterns
+                                # * or not
+                                # First decide the name of the files
+                                if isinstance(item, list):
+                                    tmp_rname, tmp_lname, depth = item
+                                    # if there are more than one file I do something differently
+                                    if rt.has_magic(tmp_rname):
+                                        remote_names = rt.glob(tmp_rname)
+                                        local_names = []
+                                        for rem in remote_names:
+                                            to_append = rem.split(os.path.sep)[-depth:] if depth > 0 else []
+                                            local_names.append(os.path.sep.join([tmp_lname] + to_append))
+                                    else:
+                                        remote_names = [tmp_rname]
+                                        to_append = tmp_rname.split(os.path.sep)[-depth:] if depth > 0 else []
+                                        local_names = [os.path.sep.join([tmp_lname] + to_append)]
+                                    if depth > 1:  # create directories in the folder, if needed
+                                        for this_local_file in local_names:
+                                            new_folder = os.path.join(
+                                                folder.abspath,
+                                                os.path.split(this_local_file)[0])
+                                            if not os.path.exists(new_folder):
+                                                os.makedirs(new_folder)
+                                else:  # it is a string
+                                    if rt.has_magic(item):
+                                        remote_names = rt.glob(item)
+                                        local_names = [os.path.split(rem)[1] for rem in remote_names]
+                                    else:
+                                        remote_names = [item]
+                                        local_names = [os.path.split(item)[1]]
+
+                                for rem, loc in zip(remote_names, local_names):
+                                    execlogger.debug("[retrieval of calc {}] "
+                                                     "Trying to retrieve remote item '{}'".format(
+                                        calc.pk, rem),
+                                                     extra=logger_extra)
+                                    rt.get(rem,
+                                           os.path.join(folder.abspath, loc),
+                                           ignore_nonexisting=True)
+
+                            # Here I retrieved everything;
+                            # now I store them inside the calculation
+                            retrieved_files.replace_with_folder(folder.abspath,
+                                                                overwrite=True)
+
+                        # Second, retrieve the singlefiles
+                        with SandboxFolder() as folder:
+                            singlefile_list = []
+                            for (linkname, subclassname, filename) in retrieve_singlefile_list:
+                                execlogger.debug("[retrieval of calc {}] Trying "
+                                                 "to retrieve remote singlefile '{}'".format(
+                                    calc.pk, filename),
                                                  extra=logger_extra)
-                                t.get(rem,
-                                      os.path.join(folder.abspath, loc),
-                                      ignore_nonexisting=True)
-
-                        # Here I retrieved everything;
-                        # now I store them inside the calculation
-                        retrieved_files.replace_with_folder(folder.abspath,
-                                                            overwrite=True)
-
-                    # Second, retrieve the singlefiles
-                    with SandboxFolder() as folder:
-                        singlefile_list = []
-                        for (linkname, subclassname, filename) in retrieve_singlefile_list:
-                            execlogger.debug("[retrieval of calc {}] Trying "
-                                             "to retrieve remote singlefile '{}'".format(
-                                calc.pk, filename),
-                                             extra=logger_extra)
-                            localfilename = os.path.join(
-                                folder.abspath, os.path.split(filename)[1])
-                            t.get(filename, localfilename,
-                                  ignore_nonexisting=True)
-                            singlefile_list.append((linkname, subclassname,
-                                                    localfilename))
-
-                        # ignore files that have not been retrieved
-                        singlefile_list = [i for i in singlefile_list if
-                                           os.path.exists(i[2])]
-
-                        # after retrieving from the cluster, I create the objects
-                        singlefiles = []
-                        for (linkname, subclassname, filename) in singlefile_list:
-                            SinglefileSubclass = DataFactory(subclassname)
-                            singlefile = SinglefileSubclass()
-                            singlefile.set_file(filename)
-                            singlefile.add_link_from(calc, label=linkname,
-                                                     link_type=LinkType.CREATE)
-                            singlefiles.append(singlefile)
+                                localfilename = os.path.join(
+                                    folder.abspath, os.path.split(filename)[1])
+                                rt.get(filename, localfilename,
+                                       ignore_nonexisting=True)
+                                singlefile_list.append((linkname, subclassname,
+                                                        localfilename))
+
+                            # ignore files that have not been retrieved
+                            singlefile_list = [i for i in singlefile_list if
+                                               os.path.exists(i[2])]
+
+                            # after retrieving from the cluster, I create the objects
+                            singlefiles = []
+                            for (linkname, subclassname, filename) in singlefile_list:
+                                SinglefileSubclass = DataFactory(subclassname)
+                                singlefile = SinglefileSubclass()
+                                singlefile.set_file(filename)
+                                singlefile.add_link_from(calc, label=linkname,
+                                                         link_type=LinkType.CREATE)
+                                singlefiles.append(singlefile)
 
                     # Finally, store
                     execlogger.debug("[retrieval of calc {}] "
@@ -814,43 +1244,8 @@ def retrieve_computed_for_authinfo(authinfo):
                         fil.store()
 
                     # If I was the one retrieving, I should also be the only
-                    # one parsing! I do not check
-                    calc._set_state(calc_states.PARSING)
-
-                    Parser = calc.get_parserclass()
-                    # If no parser is set, the calculation is successful
-                    successful = True
-                    if Parser is not None:
-                        # TODO: parse here
-                        parser = Parser(calc)
-                        successful, new_nodes_tuple = parser.parse_from_calc()
-
-                        for label, n in new_nodes_tuple:
-                            n.add_link_from(calc, label=label,
-                                            link_type=LinkType.CREATE)
-                            n.store()
-
-                    if successful:
-                        try:
-                            calc._set_state(calc_states.FINISHED)
-                        except ModificationNotAllowed:
-                            # I should have been the only one to set it, but
-                            # in order to avoid unuseful error messages, I
-                            # just ignore
-                            pass
-                    else:
-                        try:
-                            calc._set_state(calc_states.FAILED)
-                        except ModificationNotAllowed:
-                            # I should have been the only one to set it, but
-                            # in order to avoid unuseful error messages, I
-                            # just ignore
-                            pass
-                        execlogger.error("[parsing of calc {}] "
-                                         "The parser returned an error, but it should have "
-                                         "created an output node with some partial results "
-                                         "and warnings. Check there for more information on "
-                                         "the problem".format(calc.pk), extra=logger_extra)
+                    # one setting it as retrieved! I do not check
+                    calc._set_state(calc_states.RETRIEVED)
                     retrieved.append(calc)
                 except Exception:
                     import traceback
@@ -858,23 +1253,200 @@ def retrieve_computed_for_authinfo(authinfo):
                     tb = traceback.format_exc()
                     newextradict = logger_extra.copy()
                     newextradict['full_traceback'] = tb
-                    if calc.get_state() == calc_states.PARSING:
-                        execlogger.error("Error parsing calc {}. "
-                                         "Traceback: {}".format(calc.pk, tb),
-                                         extra=newextradict)
-                        # TODO: add a 'comment' to the calculation
-                        try:
-                            calc._set_state(calc_states.PARSINGFAILED)
-                        except ModificationNotAllowed:
-                            pass
-                    else:
-                        execlogger.error("Error retrieving calc {}. "
-                                         "Traceback: {}".format(calc.pk, tb),
-                                         extra=newextradict)
-                        try:
-                            calc._set_state(calc_states.RETRIEVALFAILED)
-                        except ModificationNotAllowed:
-                            pass
-                        raise
+                    execlogger.error("Error retrieving calc {}. "
+                                     "Traceback: {}".format(calc.pk, tb),
+                                     extra=newextradict)
+                    try:
+                        calc._set_state(calc_states.RETRIEVALFAILED)
+                    except ModificationNotAllowed:
+                        pass
+                    raise
+
+    # Parse here, unless the parsing is delegated to the parser workers
+    # (see parse_jobs); in any case, this is done after closing the
+    # transport, that is not needed anymore
+    if get_property('daemon.parser_workers') <= 0:
+        for calc in retrieved:
+            parse_calc(calc)
 
     return retrieved
+
+
+def parse_calc(calc):
+    """
+    Parse a calculation in the RETRIEVED state with its parser, attach the
+    output nodes and set the final state (FINISHED, FAILED or
+    PARSINGFAILED) of the calculation.
+
+    :param calc: the calculation to parse
+    :return: True if the calculation was parsed (successfully or not),
+        False if someone else is already parsing it.
+    """
+    from aiida.utils.logger import get_dblogger_extra
+
+    logger_extra = get_dblogger_extra(calc)
+
+    try:
+        calc._set_state(calc_states.PARSING)
+    except ModificationNotAllowed:
+        # Someone else has already started to parse it,
+        # just log and continue
+        execlogger.debug("Attempting to parse more than once "
+                         "calculation {}: skipping!".format(calc.pk),
+                         extra=logger_extra)
+        return False
+
+    try:
+        Parser = calc.get_parserclass()
+        # If no parser is set, the calculation is successful
+        successful = True
+        if Parser is not None:
+            parser = Parser(calc)
+            successful, new_nodes_tuple = parser.parse_from_calc()
+
+            for label, n in new_nodes_tuple:
+                n.add_link_from(calc, label=label,
+                                link_type=LinkType.CREATE)
+                n.store()
+
+        if successful:
+            try:
+                calc._set_state(calc_states.FINISHED)
+            except ModificationNotAllowed:
+                # I should have been the only one to set it, but
+                # in order to avoid unuseful error messages, I
+                # just ignore
+                pass
+        else:
+            try:
+                calc._set_state(calc_states.FAILED)
+            except ModificationNotAllowed:
+                # I should have been the only one to set it, but
+                # in order to avoid unuseful error messages, I
+                # just ignore
+                pass
+            execlogger.error("[parsing of calc {}] "
+                             "The parser returned an error, but it should have "
+                             "created an output node with some partial results "
+                             "and warnings. Check there for more information on "
+                             "the problem".format(calc.pk), extra=logger_extra)
+    except Exception:
+        import traceback
+
+        tb = traceback.format_exc()
+        newextradict = logger_extra.copy()
+        newextradict['full_traceback'] = tb
+        execlogger.error("Error parsing calc {}. "
+                         "Traceback: {}".format(calc.pk, tb),
+                         extra=newextradict)
+        # TODO: add a 'comment' to the calculation
+        try:
+            calc._set_state(calc_states.PARSINGFAILED)
+        except ModificationNotAllowed:
+            pass
+
+    return True
+
+
+def _parse_calc_with_pk(pk):
+    """
+    Load and parse the calculation with the given pk. Executed in the
+    processes of the parser pool.
+
+    :param pk: the pk of a calculation in the RETRIEVED state
+    """
+    from aiida.orm import JobCalculation
+
+    try:
+        parse_calc(load_node(pk, parent_class=JobCalculation))
+    except Exception as e:
+        # Do not propagate exceptions to the pool
+        execlogger.error("Error while parsing calculation {}, error type is "
+                         "{}, error message: {}".format(
+            pk, e.__class__.__name__, e.message))
+
+
+# The pool of processes parsing the retrieved calculations, the pids of its
+# processes, and the results of the calculations sent to it, by pk
+_parser_pool = None
+_parser_pids = None
+_parsing_results = {}
+
+
+def _get_parser_pool(num_workers):
+    """
+    Return the pool of parser processes, creating it if needed.
+    """
+    import atexit
+    import multiprocessing
+    from aiida.backends.utils import close_db_connections_before_fork
+
+    global _parser_pool
+
+    if _parser_pool is None:
+        # The connections of this process must not be shared with the
+        # forked workers, that will open their own
+        close_db_connections_before_fork()
+        _parser_pool = multiprocessing.Pool(processes=num_workers)
+        atexit.register(_parser_pool.terminate)
+
+    return _parser_pool
+
+
+def _forget_parsed_calcs(pool):
+    """
+    Forget the calculations sent to the parser pool that were parsed (or
+    whose parsing raised), so that those still in the RETRIEVED state are
+    sent again. If a worker process died, its calculation will never be
+    parsed: all the calculations are forgotten, since sending again one that
+    is still being parsed is harmless (parse_calc does nothing if the
+    calculation is not in the RETRIEVED state anymore).
+    """
+    global _parser_pids
+
+    # The pool replaces the worker processes that died
+    pids = set(process.pid for process in pool._pool)
+    if _parser_pids is not None and not pids.issuperset(_parser_pids):
+        execlogger.warning("A parser worker process died, the calculations "
+                           "it was parsing will be sent again")
+        _parsing_results.clear()
+    _parser_pids = pids
+
+    for pk, result in _parsing_results.items():
+        if result.ready():
+            del _parsing_results[pk]
+
+
+def parse_jobs():
+    """
+    Parse all calculations in the RETRIEVED state.
+
+    If the ``daemon.parser_workers`` property is positive, the calculations
+    are sent to a pool with that many worker processes and this function
+    returns without waiting for the parsing to complete, so that parsing
+    does not delay the retrieval of other calculations and can use all
+    the available cores. Otherwise they are parsed here, one after the
+    other.
+    """
+    from aiida.common.setup import get_property
+    from aiida.backends.utils import QueryFactory
+
+    qmanager = QueryFactory()()
+    calcs_to_parse = qmanager.query_jobcalculations_by_computer_user_state(
+        state=calc_states.RETRIEVED)
+
+    num_workers = get_property('daemon.parser_workers')
+    if num_workers <= 0:
+        for calc in calcs_to_parse:
+            parse_calc(calc)
+        return
+
+    pool = _get_parser_pool(num_workers)
+    _forget_parsed_calcs(pool)
+
+    pks_to_parse = [calc.pk for calc in calcs_to_parse
+                    if calc.pk not in _parsing_results]
+    for pk in pks_to_parse:
+        _parsing_results[pk] = pool.apply_async(_parse_calc_with_pk, (pk,))
+        execlogger.debug("Calculation {} sent to the parser "
+                         "pool".format(pk))
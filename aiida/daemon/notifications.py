@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Notifications sent through the PostgreSQL LISTEN/NOTIFY mechanism, to wake
+up the daemon tasks as soon as there is something for them to do, rather
+than at their next periodic run.
+
+Notifications are sent only if the ``daemon.notifications`` property is
+set. They are received by a :py:class:`NotificationListener`, started by
+the daemon worker, that keeps a dedicated connection to the database.
+"""
+import select
+import threading
+import time
+
+from aiida.common import aiidalogger
+
+notificationlogger = aiidalogger.getChild('daemon').getChild('notifications')
+
+# Payload: '<pk> <new state>'
+CALCULATION_STATE_CHANNEL = 'aiida_calculation_state'
+# Payload: '<pid>'
+PROCESS_CHANNEL = 'aiida_process'
+# Payload: '<pk> <new state>'
+WORKFLOW_STATE_CHANNEL = 'aiida_workflow_state'
+
+
+def notifications_enabled():
+    from aiida.common.setup import get_property
+
+    return get_property('daemon.notifications')
+
+
+def notify_calculation_state(pk, state):
+    """
+    Notify that the calculation with the given pk moved to a new state.
+    """
+    from aiida.backends.utils import send_notification
+
+    if notifications_enabled():
+        send_notification(CALCULATION_STATE_CHANNEL,
+                          "{} {}".format(pk, state))
+
+
+def notify_process(pid):
+    """
+    Notify that the process of the workflow engine with the given pid was
+    submitted, finished or checkpointed, so that the engine should be ticked.
+    """
+    from aiida.backends.utils import send_notification
+
+    if notifications_enabled():
+        send_notification(PROCESS_CHANNEL, str(pid))
+
+
+def notify_workflow_state(pk, state):
+    """
+    Notify that the legacy workflow with the given pk moved to a new state.
+    """
+    from aiida.backends.utils import send_notification
+
+    if notifications_enabled():
+        send_notification(WORKFLOW_STATE_CHANNEL, "{} {}".format(pk, state))
+
+
+def get_connection_parameters():
+    """
+    Return the parameters to connect with psycopg2 to the database of the
+    current profile.
+    """
+    from aiida.backends import settings
+    from aiida.common.setup import get_profile_config
+
+    config = get_profile_config(settings.AIIDADB_PROFILE)
+    params = dict(database=config['AIIDADB_NAME'],
+                  user=config['AIIDADB_USER'],
+                  password=config['AIIDADB_PASS'],
+                  host=config['AIIDADB_HOST'],
+                  port=config['AIIDADB_PORT'])
+    # Empty values mean the psycopg2 defaults, e.g. a local socket
+    return {k: v for k, v in params.iteritems() if v}
+
+
+class NotificationListener(object):
+    """
+    Listen on some notification channels and call the given callback, in
+    a background thread, for each notification received.
+
+    If the connection to the database is lost, it is reopened after
+    ``reconnect_interval`` seconds; the notifications sent in the meantime
+    are lost, so the listeners should not rely on them only.
+    """
+
+    def __init__(self, callbacks, connection_parameters=None,
+                 reconnect_interval=10):
+        """
+        :param callbacks: a dictionary {channel: callback}, where each
+            callback accepts the payload of the notification
+        :param connection_parameters: the keyword arguments for
+            psycopg2.connect, by default those of the current profile
+        :param reconnect_interval: number of seconds to wait before
+            reconnecting after an error
+        """
+        if connection_parameters is None:
+            connection_parameters = get_connection_parameters()
+
+        self._callbacks = dict(callbacks)
+        self._connection_parameters = connection_parameters
+        self._reconnect_interval = reconnect_interval
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """
+        Start listening in a daemon thread.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="aiida-notification-listener")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """
+        Stop listening, waiting at most ``timeout`` seconds for the thread.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_listening(self, timeout=None):
+        """
+        Wait until the LISTEN commands were issued.
+
+        :return: True if listening, False after a timeout
+        """
+        return self._listening.wait(timeout)
+
+    def _connect(self):
+        import psycopg2
+        import psycopg2.extensions
+
+        connection = psycopg2.connect(**self._connection_parameters)
+        connection.set_isolation_level(
+            psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+        cursor = connection.cursor()
+        for channel in self._callbacks:
+            cursor.execute('LISTEN "{}"'.format(channel))
+        return connection
+
+    def _run(self):
+        while not self._stop.is_set():
+            connection = None
+            try:
+                connection = self._connect()
+                self._listening.set()
+                self._listen(connection)
+            except Exception as e:
+                notificationlogger.warning(
+                    "Error while listening for notifications ({}): {}; "
+                    "reconnecting in {} seconds".format(
+                        e.__class__.__name__, e, self._reconnect_interval))
+                self._stop.wait(self._reconnect_interval)
+            finally:
+                self._listening.clear()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:
+                        pass
+
+    def _listen(self, connection):
+        while not self._stop.is_set():
+            # Wake up once in a while to check whether to stop
+            if select.select([connection], [], [], 1.) == ([], [], []):
+                continue
+            connection.poll()
+            while connection.notifies:
+                notify = connection.notifies.pop(0)
+                try:
+                    self._callbacks[notify.channel](notify.payload)
+                except Exception as e:
+                    notificationlogger.error(
+                        "Error in the callback for a notification on "
+                        "channel {} ({}): {}".format(
+                            notify.channel, e.__class__.__name__, e))
+
+
+class TaskWaker(object):
+    """
+    Run the given celery tasks in response to notifications, coalescing the
+    notifications received within ``delay`` seconds in a single run.
+    """
+
+    def __init__(self, delay=1.):
+        self._delay = delay
+        self._last_sent = {}
+        self._lock = threading.Lock()
+
+    def wake(self, task):
+        """
+        Schedule a run of the given task in ``delay`` seconds, unless one was
+        already scheduled in the last ``delay`` seconds (that has not started
+        yet, so it will also see the changes that triggered this call).
+        """
+        now = time.time()
+        with self._lock:
+            if now - self._last_sent.get(task.name, 0.) < self._delay:
+                return
+            self._last_sent[task.name] = now
+        task.apply_async(countdown=self._delay)
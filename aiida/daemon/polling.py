@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Schedule of the queries of the state of the jobs done by the daemon updater,
+following the job polling policy of each computer (see
+:py:meth:`aiida.orm.implementation.general.computer.AbstractComputer.get_job_polling_policy`).
+
+The time of the next query, and the number of consecutive errors, of each
+(computer, user) pair are kept in the DbSetting table, so that they are
+shared by all the daemon workers.
+"""
+import time
+
+# Number of seconds to wait after the first error, doubled at each
+# following one (unless the minimum interval of the computer is larger)
+_BACKOFF_BASE = 30
+
+
+def get_next_poll_delay(policy, failures=0, walltime_left=None):
+    """
+    Return the number of seconds to wait before the next query.
+
+    :param policy: the job polling policy of the computer
+    :param failures: the number of consecutive failed queries
+    :param walltime_left: the minimum number of seconds before one of the
+        running jobs reaches its requested walltime, or None if not known
+    """
+    if failures > 0:
+        base = max(policy['minimum_interval'], _BACKOFF_BASE)
+        return min(base * 2 ** (failures - 1),
+                   max(policy['max_backoff'], base))
+
+    delay = policy['minimum_interval']
+    if walltime_left is not None and walltime_left < delay:
+        # The job is likely to end at its walltime: check it right after
+        delay = max(walltime_left, policy['near_walltime_interval'])
+    return delay
+
+
+def get_walltime_left(jobinfos):
+    """
+    Return the minimum number of seconds before one of the jobs reaches its
+    requested walltime, or None if not known for any of them.
+
+    :param jobinfos: an iterable of JobInfo objects
+    """
+    walltimes_left = [
+        max(info.requested_wallclock_time_seconds -
+            (info.wallclock_time_seconds or 0), 0)
+        for info in jobinfos
+        if info.requested_wallclock_time_seconds is not None]
+    return min(walltimes_left) if walltimes_left else None
+
+
+def _get_key(authinfo):
+    return 'daemon|job_poll|{}'.format(authinfo.id)
+
+
+def _get_state(authinfo):
+    from aiida.backends.utils import get_global_setting
+
+    try:
+        return get_global_setting(_get_key(authinfo))
+    except KeyError:
+        return {'next_poll': 0., 'failures': 0}
+
+
+def is_poll_due(authinfo, now=None):
+    """
+    Return whether the jobs of the given authinfo should be queried now.
+    """
+    if now is None:
+        now = time.time()
+    return _get_state(authinfo)['next_poll'] <= now
+
+
+def record_poll(authinfo, policy, success, walltime_left=None, now=None):
+    """
+    Record the outcome of a query of the jobs of the given authinfo, and
+    schedule the next one.
+
+    :param policy: the job polling policy of the computer
+    :param success: False if the query failed because of an error of the
+        transport or of the scheduler
+    :param walltime_left: see :py:func:`get_next_poll_delay`
+    :return: the number of seconds before the next query
+    """
+    from aiida.backends.utils import set_global_setting
+
+    if now is None:
+        now = time.time()
+    failures = 0 if success else _get_state(authinfo)['failures'] + 1
+    delay = get_next_poll_delay(policy, failures, walltime_left)
+    set_global_setting(
+        _get_key(authinfo), {'next_poll': now + delay, 'failures': failures},
+        description="The time of the next query of the jobs of authinfo {} "
+                    "by the daemon, and the number of consecutive failed "
+                    "queries".format(authinfo.id))
+    return delay
@@ -12,6 +12,7 @@ from datetime import timedelta
 from aiida.backends.utils import load_dbenv, is_dbenv_loaded
 from celery import Celery
 from celery.task import periodic_task
+from celery.signals import worker_ready
 
 from aiida.backends import settings
 from aiida.backends.profile import BACKEND_SQLA, BACKEND_DJANGO
@@ -26,12 +27,44 @@ from aiida.daemon.timestamps import set_daemon_timestamp,get_last_daemon_timesta
 
 DAEMON_INTERVALS_SUBMIT = 10
 DAEMON_INTERVALS_RETRIEVE = 10
+DAEMON_INTERVALS_PARSE = 10
 DAEMON_INTERVALS_UPDATE = 30
 DAEMON_INTERVALS_WFSTEP = 30
 DAEMON_INTERVALS_TICK_WORKFLOWS = 5
 
 config = get_profile_config(settings.AIIDADB_PROFILE)
 
+
+def get_interval(name, default):
+    """
+    Return the interval (in seconds) between the periodic runs of a task.
+
+    When the tasks are woken up by notifications (see
+    aiida.daemon.notifications), the periodic runs are only a fallback, in
+    case a notification is lost, and are done at most every
+    ``daemon.notifications_fallback_interval`` seconds.
+    """
+    from aiida.common.setup import get_property
+    from aiida.daemon.notifications import notifications_enabled
+
+    interval = config.get(name, default)
+    if notifications_enabled():
+        interval = max(interval,
+                       get_property('daemon.notifications_fallback_interval'))
+    return interval
+
+
+def rearm(task, countdown=0):
+    """
+    Run the task again after ``countdown`` seconds if it has more work to
+    do, when the tasks are woken up by notifications: its periodic runs are
+    then too rare to make progress (see get_interval).
+    """
+    from aiida.daemon.notifications import notifications_enabled
+
+    if notifications_enabled():
+        task.apply_async(countdown=countdown)
+
 engine = config["AIIDADB_ENGINE"]
 
 # defining the broker.
@@ -55,7 +88,7 @@ app = Celery('tasks', broker=broker)
 
 @periodic_task(
     run_every=timedelta(
-        seconds=config.get("DAEMON_INTERVALS_SUBMIT", DAEMON_INTERVALS_SUBMIT)
+        seconds=get_interval("DAEMON_INTERVALS_SUBMIT", DAEMON_INTERVALS_SUBMIT)
     )
 )
 def submitter():
@@ -81,8 +114,8 @@ def updater():
 
 @periodic_task(
     run_every=timedelta(
-        seconds=config.get("DAEMON_INTERVALS_RETRIEVE",
-                           DAEMON_INTERVALS_RETRIEVE)
+        seconds=get_interval("DAEMON_INTERVALS_RETRIEVE",
+                             DAEMON_INTERVALS_RETRIEVE)
     )
 )
 def retriever():
@@ -95,18 +128,36 @@ def retriever():
 
 @periodic_task(
     run_every=timedelta(
-        seconds=config.get("DAEMON_INTERVALS_TICK_WORKFLOWS",
-                           DAEMON_INTERVALS_TICK_WORKFLOWS)
+        seconds=get_interval("DAEMON_INTERVALS_PARSE", DAEMON_INTERVALS_PARSE)
+    )
+)
+def parser():
+    from aiida.daemon.execmanager import parse_jobs
+    print "aiida.daemon.tasks.parse:  Checking for calculations to parse"
+    set_daemon_timestamp(task_name='parser', when='start')
+    parse_jobs()
+    set_daemon_timestamp(task_name='parser', when='stop')
+
+
+@periodic_task(
+    run_every=timedelta(
+        seconds=get_interval("DAEMON_INTERVALS_TICK_WORKFLOWS",
+                             DAEMON_INTERVALS_TICK_WORKFLOWS)
     )
 )
 def tick_work():
     from aiida.work.daemon import tick_workflow_engine
     print "aiida.daemon.tasks.tick_workflows:  Ticking workflows"
-    tick_workflow_engine()
-
-@periodic_task(run_every=timedelta(seconds=config.get("DAEMON_INTERVALS_WFSTEP",
-                                                      DAEMON_INTERVALS_WFSTEP
-                                                      )
+    if tick_workflow_engine():
+        # The processes also notify when they can continue: wait for the
+        # regular interval, rather than ticking in a loop the processes
+        # that are waiting
+        rearm(tick_work, countdown=config.get(
+            "DAEMON_INTERVALS_TICK_WORKFLOWS", DAEMON_INTERVALS_TICK_WORKFLOWS))
+
+@periodic_task(run_every=timedelta(seconds=get_interval("DAEMON_INTERVALS_WFSTEP",
+                                                        DAEMON_INTERVALS_WFSTEP
+                                                        )
                                    )
                )
 def workflow_stepper(): # daemon for legacy workflow 
@@ -126,18 +177,79 @@ def workflow_stepper(): # daemon for legacy workflow
         set_daemon_timestamp(task_name='workflow', when='start')
         # the previous wf manager stopped already -> we can run a new one
         print "aiida.daemon.tasks.workflowmanager: running execute_steps"
-        execute_steps()
+        advanced = execute_steps()
         set_daemon_timestamp(task_name='workflow', when='stop')
+        if advanced:
+            # Submit the calculations of the new steps right away
+            rearm(workflow_stepper)
     else:
         print "aiida.daemon.tasks.workflowmanager: execute_steps already running"
        
 
+def _on_calculation_state(payload):
+    from aiida.common.datastructures import calc_states
+
+    _, state = payload.split(' ', 1)
+    if state == calc_states.TOSUBMIT:
+        _waker.wake(submitter)
+    elif state == calc_states.COMPUTED:
+        _waker.wake(retriever)
+    elif state == calc_states.RETRIEVED:
+        _waker.wake(parser)
+    elif state in (calc_states.FINISHED, calc_states.FAILED,
+                   calc_states.SUBMISSIONFAILED,
+                   calc_states.RETRIEVALFAILED, calc_states.PARSINGFAILED):
+        # Wake up the workflows waiting on the calculation
+        _waker.wake(tick_work)
+        _waker.wake(workflow_stepper)
+
+
+def _on_process(payload):
+    _waker.wake(tick_work)
+
+
+def _on_workflow_state(payload):
+    # Wake up the steps waiting on the (sub)workflow
+    _waker.wake(workflow_stepper)
+
+
+_waker = None
+_listener = None
+
+
+@worker_ready.connect
+def start_notification_listener(**kwargs):
+    """
+    When the worker starts, and notifications are enabled, listen for them
+    to run the tasks as soon as there is something for them to do.
+    The updater is not woken up, as it has to poll the schedulers anyway.
+    """
+    from aiida.daemon.notifications import (
+        notifications_enabled, NotificationListener, TaskWaker,
+        CALCULATION_STATE_CHANNEL, PROCESS_CHANNEL, WORKFLOW_STATE_CHANNEL)
+    global _waker, _listener
+
+    if not notifications_enabled() or _listener is not None:
+        return
+
+    _waker = TaskWaker()
+    _listener = NotificationListener({
+        CALCULATION_STATE_CHANNEL: _on_calculation_state,
+        PROCESS_CHANNEL: _on_process,
+        WORKFLOW_STATE_CHANNEL: _on_workflow_state,
+    })
+    _listener.start()
+    print "aiida.daemon.tasks: listening for notifications"
+
+
 def manual_tick_all():
-    from aiida.daemon.execmanager import submit_jobs, update_jobs, retrieve_jobs
+    from aiida.daemon.execmanager import (submit_jobs, update_jobs,
+                                          retrieve_jobs, parse_jobs)
     from aiida.work.daemon import tick_workflow_engine
     from aiida.daemon.workflowmanager import execute_steps
     submit_jobs()
     update_jobs()
     retrieve_jobs()
+    parse_jobs()
     execute_steps() # legacy workflows
     tick_workflow_engine()
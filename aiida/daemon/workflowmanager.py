@@ -9,11 +9,23 @@
 ###########################################################################
 
 from aiida.common import aiidalogger
-from aiida.common.datastructures import wf_states, wf_exit_call, wf_default_call
+from aiida.common.datastructures import (calc_states, wf_states, wf_exit_call,
+                                         wf_default_call)
 
 
 logger = aiidalogger.getChild('workflowmanager')
 
+# The states checked by JobCalculation._is_new, has_finished_ok and
+# has_failed, and by Workflow.has_finished_ok and has_failed
+_CALC_NEW_STATES = (calc_states.NEW, None)
+_CALC_FINISHED_OK_STATES = (calc_states.FINISHED,)
+_CALC_FAILED_STATES = (calc_states.SUBMISSIONFAILED,
+                       calc_states.RETRIEVALFAILED,
+                       calc_states.PARSINGFAILED,
+                       calc_states.FAILED)
+_WF_FINISHED_OK_STATES = (wf_states.FINISHED, wf_states.SLEEP)
+_WF_FAILED_STATES = (wf_states.ERROR,)
+
 
 def execute_steps():
     """
@@ -33,44 +45,54 @@ def execute_steps():
     to be launched, and in case reloads the workflow and execute the specific 
     those steps. In case or error the step is flagged in ERROR state and the 
     stack is reported in the workflow report.
+
+    :return: True if some step was finished and its workflow advanced, so
+        that there may already be more steps to handle.
     """
 
     from aiida.orm import JobCalculation
-    from aiida.orm.implementation import get_all_running_steps
- 
+    from aiida.orm.implementation import get_running_steps_with_states
+
     logger.info("Querying the worflow DB")
-    
-    running_steps = get_all_running_steps()
 
-    for s in running_steps:
+    # The steps come with the states of their calculations and subworkflows
+    # (fetched with a few aggregate queries), so that the transitions can be
+    # decided without querying each calculation and subworkflow separately
+    running_steps = get_running_steps_with_states()
+    advanced = False
+
+    for s, calc_states_by_pk, sub_wf_states_by_pk in running_steps:
         if s.parent.state == wf_states.FINISHED:
             s.set_state(wf_states.FINISHED)
             continue
 
-        w = s.parent.get_aiida_class()
+        logger.info("[{0}] Found active step: {1}".format(s.parent.pk, s.name))
 
-        logger.info("[{0}] Found active step: {1}".format(w.pk, s.name))
+        s_calcs_new = [pk for pk, state in calc_states_by_pk.iteritems()
+                       if state in _CALC_NEW_STATES]
+        s_calcs_finished = [pk for pk, state in calc_states_by_pk.iteritems()
+                            if state in _CALC_FINISHED_OK_STATES]
+        s_calcs_failed = [pk for pk, state in calc_states_by_pk.iteritems()
+                          if state in _CALC_FAILED_STATES]
+        s_calcs_num = len(calc_states_by_pk)
 
-        s_calcs_new = [c.pk for c in s.get_calculations() if c._is_new()]
-        s_calcs_finished = [c.pk for c in s.get_calculations()
-                            if c.has_finished_ok()]
-        s_calcs_failed = [c.pk for c in s.get_calculations() if c.has_failed()]
-        s_calcs_num = len(s.get_calculations())
-
-        s_sub_wf_finished = [sw.pk for sw in s.get_sub_workflows()
-                             if sw.has_finished_ok()]
-        s_sub_wf_failed = [sw.pk for sw in s.get_sub_workflows()
-                           if sw.has_failed()]
-        s_sub_wf_num = len(s.get_sub_workflows())
+        s_sub_wf_finished = [pk for pk, state in sub_wf_states_by_pk.iteritems()
+                             if state in _WF_FINISHED_OK_STATES]
+        s_sub_wf_failed = [pk for pk, state in sub_wf_states_by_pk.iteritems()
+                           if state in _WF_FAILED_STATES]
+        s_sub_wf_num = len(sub_wf_states_by_pk)
 
         if (s_calcs_num == (len(s_calcs_finished) + len(s_calcs_failed)) and
             s_sub_wf_num == (len(s_sub_wf_finished) + len(s_sub_wf_failed))):
 
+            w = s.parent.get_aiida_class()
+
             logger.info("[{0}] Step: {1} ready to move".format(w.pk, s.name))
 
             s.set_state(wf_states.FINISHED)
-            
+
             advance_workflow(w, s)
+            advanced = True
 
         elif len(s_calcs_new) > 0:
 
@@ -79,9 +101,11 @@ def execute_steps():
                 obj_calc = JobCalculation.get_subclass_from_pk(pk=pk)
                 try:
                     obj_calc.submit()
-                    logger.info("[{0}] Step: {1} launched calculation {2}".format(w.pk, s.name, pk))
+                    logger.info("[{0}] Step: {1} launched calculation {2}".format(s.parent.pk, s.name, pk))
                 except:
-                    logger.error("[{0}] Step: {1} cannot launch calculation {2}".format(w.pk, s.name, pk))
+                    logger.error("[{0}] Step: {1} cannot launch calculation {2}".format(s.parent.pk, s.name, pk))
+
+    return advanced
 
 
 def advance_workflow(w, step):
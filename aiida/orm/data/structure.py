@@ -13,8 +13,10 @@ functions to operate on them.
 """
 
 from aiida.orm import Data
+from aiida.orm.data.array import ArrayData
 from aiida.common.utils import classproperty, xyz_parser_iterator
 from aiida.orm.calculation.inline import optional_inline
+import collections
 import itertools
 import copy
 
@@ -499,8 +501,38 @@ def get_formula(symbol_list, mode='hill', separator=""):
 
     # for hill and count cases, simply count the occurences of each
     # chemical symbol (with some re-ordering in hill)
-    elif mode in ['hill', 'hill_compact']:
-        symbol_set = set(symbol_list)
+    elif mode in ['hill', 'hill_compact', 'count', 'count_compact']:
+        symbol_counts = collections.OrderedDict()
+        for symbol in symbol_list:
+            symbol_counts[symbol] = symbol_counts.get(symbol, 0) + 1
+        return _get_formula_from_counts(symbol_counts, mode=mode,
+                                        separator=separator)
+
+    elif mode == 'reduce':
+        return get_formula_from_symbol_list(group_symbols(symbol_list),
+                                            separator=separator)
+
+    else:
+        raise ValueError('Mode should be hill, hill_compact, group, '
+                         'reduce, count or count_compact')
+
+
+def _get_formula_from_counts(symbol_counts, mode='hill', separator=""):
+    """
+    Return a string with the chemical formula, given the number of
+    occurrences of each symbol.
+
+    :param symbol_counts: an ordered dictionary with the symbols as keys and
+        the number of atoms as values, in the order in which the symbols
+        first appear in the structure
+    :param mode: one of 'hill', 'hill_compact', 'count' or 'count_compact',
+        see :py:func:`get_formula`
+    :param separator: a string used to concatenate symbols. Default empty.
+
+    :return: a string with the formula
+    """
+    if mode in ['hill', 'hill_compact']:
+        symbol_set = set(symbol_counts)
         first_symbols = []
         if 'C' in symbol_set:
             # remove C (and H if present) from list and put them at the
@@ -511,22 +543,14 @@ def get_formula(symbol_list, mode='hill', separator=""):
                 symbol_set.remove('H')
                 first_symbols.append('H')
         ordered_symbol_set = first_symbols + list(sorted(symbol_set))
-        the_symbol_list = [[symbol_list.count(elem), elem]
-                           for elem in ordered_symbol_set]
-
     elif mode in ['count', 'count_compact']:
-        ordered_symbol_indexes = sorted([symbol_list.index(elem)
-                                         for elem in set(symbol_list)])
-        ordered_symbol_set = [symbol_list[i] for i in ordered_symbol_indexes]
-        the_symbol_list = [[symbol_list.count(elem), elem]
-                           for elem in ordered_symbol_set]
-
-    elif mode == 'reduce':
-        the_symbol_list = group_symbols(symbol_list)
-
+        ordered_symbol_set = list(symbol_counts)
     else:
-        raise ValueError('Mode should be hill, hill_compact, group, '
-                         'reduce, count or count_compact')
+        raise ValueError('Mode should be hill, hill_compact, '
+                         'count or count_compact')
+
+    the_symbol_list = [[int(symbol_counts[elem]), elem]
+                       for elem in ordered_symbol_set]
 
     if mode in ['hill_compact', 'count_compact']:
 
@@ -706,6 +730,58 @@ def _get_cif_ase_inline(struct=None, parameters=None):
     return {'cif': cif}
 
 
+def _get_ase_tags(kinds):
+    """
+    Return the list of ASE tags to use for each of the given kinds (None if
+    no tag has to be set), so that kinds of the same element with different
+    names can be distinguished once converted to ase.
+
+    :param kinds: the list of kinds from the StructureData object.
+    """
+    from collections import defaultdict
+
+    # I create the list of tags
+    tag_list = []
+    used_tags = defaultdict(list)
+    for k in kinds:
+        # Skip alloys and vacancies
+        if k.is_alloy() or k.has_vacancies():
+            tag_list.append(None)
+        # If the kind name is equal to the specie name,
+        # then no tag should be set
+        elif unicode(k.name) == unicode(k.symbols[0]):
+            tag_list.append(None)
+        else:
+            # Name is not the specie name
+            if k.name.startswith(k.symbols[0]):
+                try:
+                    new_tag = int(k.name[len(k.symbols[0])])
+                    tag_list.append(new_tag)
+                    used_tags[k.symbols[0]].append(new_tag)
+                    continue
+                except ValueError:
+                    pass
+            tag_list.append(k.symbols[0])  # I use a string as a placeholder
+
+    for i in range(len(tag_list)):
+        # If it is a string, it is the name of the element,
+        # and I have to generate a new integer for this element
+        # and replace tag_list[i] with this new integer
+        if isinstance(tag_list[i], basestring):
+            # I get a list of used tags for this element
+            existing_tags = used_tags[tag_list[i]]
+            if existing_tags:
+                new_tag = max(existing_tags) + 1
+            else:  # empty list
+                new_tag = 1
+            # I store it also as a used tag!
+            used_tags[tag_list[i]].append(new_tag)
+            # I update the tag
+            tag_list[i] = new_tag
+
+    return tag_list
+
+
 class StructureData(Data):
     """
     This class contains the information about a given structure, i.e. a
@@ -1769,6 +1845,393 @@ class StructureData(Data):
         return Molecule(species, positions)
 
 
+class ArrayStructureData(StructureData, ArrayData):
+    """
+    A :py:class:`StructureData` that stores the positions and the kinds of
+    the sites as numpy arrays in the node repository (``positions``, with
+    shape (N, 3), and ``kind_indices``, with shape (N,), the index of the
+    kind of each site in the ``kinds`` attribute), rather than as a list of
+    dictionaries in the ``sites`` attribute.
+
+    The cell, the periodic boundary conditions and the kinds are still
+    stored as (small) attributes, so they can be queried as for a
+    StructureData.
+
+    Appending sites does not rebuild any list: new sites are buffered in
+    memory and the arrays are written only when the node is stored. Use
+    :py:meth:`append_sites` and :py:meth:`set_positions` to set many sites
+    at once.
+    """
+    _positions_array = 'positions'
+    _kind_indices_array = 'kind_indices'
+
+    def _get_site_buffers(self):
+        """
+        Return the lists of chunks of the positions and of the kind indices,
+        reading them from the arrays the first time if they were already set.
+        """
+        import numpy
+
+        try:
+            return self._site_buffers
+        except AttributeError:
+            pass
+
+        if self._positions_array in self.get_arraynames():
+            positions = self.get_array(self._positions_array)
+            kind_indices = self.get_array(self._kind_indices_array)
+        else:
+            positions = numpy.zeros((0, 3), dtype=float)
+            kind_indices = numpy.zeros((0,), dtype=int)
+
+        self._site_buffers = ([positions], [kind_indices])
+        return self._site_buffers
+
+    def _get_site_arrays(self):
+        """
+        Return the positions and the kind indices of all the sites as two
+        numpy arrays, joining the chunks appended so far.
+
+        .. note:: the arrays are not copied, do not modify them in place.
+        """
+        import numpy
+
+        positions_chunks, kind_indices_chunks = self._get_site_buffers()
+        if len(positions_chunks) > 1:
+            positions_chunks[:] = [numpy.concatenate(positions_chunks)]
+            kind_indices_chunks[:] = [numpy.concatenate(kind_indices_chunks)]
+        return positions_chunks[0], kind_indices_chunks[0]
+
+    def _check_modifiable(self):
+        from aiida.common.exceptions import ModificationNotAllowed
+
+        if self.is_stored:
+            raise ModificationNotAllowed(
+                "The StructureData object cannot be modified, "
+                "it has already been stored")
+
+    def _get_kind_indices(self, kind_names):
+        """
+        Return a numpy array with the index in the kinds of each of the
+        given kind names.
+
+        :raise ValueError: if a kind name is not defined.
+        """
+        import numpy
+
+        kind_names_list = [k['name'] for k in self.get_attr('kinds', [])]
+        index_of_kind = {name: idx for idx, name in enumerate(kind_names_list)}
+        try:
+            return numpy.array([index_of_kind[name] for name in kind_names],
+                               dtype=int)
+        except KeyError as e:
+            raise ValueError("No kind with name '{}', available kinds are: "
+                             "{}".format(e.args[0], kind_names_list))
+
+    @staticmethod
+    def _get_valid_positions(positions):
+        import numpy
+
+        try:
+            the_positions = numpy.array(positions, dtype=float)
+        except (ValueError, TypeError):
+            raise ValueError("Wrong format for positions, must be a list of "
+                             "lists of three float numbers.")
+        if the_positions.size == 0:
+            the_positions = the_positions.reshape((0, 3))
+        if the_positions.ndim != 2 or the_positions.shape[1] != 3:
+            raise ValueError("Wrong format for positions, must be a list of "
+                             "lists of three float numbers.")
+        return the_positions
+
+    def append_site(self, site):
+        """
+        Append a site to the
+        :py:class:`ArrayStructureData <aiida.orm.data.structure.ArrayStructureData>`.
+
+        :param site: the site to append. It must be a Site object.
+        """
+        self.append_sites([site.kind_name], [site.position])
+
+    def append_sites(self, kind_names, positions):
+        """
+        Append many sites at once.
+
+        :param kind_names: a list of N kind names, one per site. The kinds
+            must have been already appended to the structure.
+        :param positions: the absolute positions of the sites, in angstrom:
+            a list of N lists of three floats, or a numpy array of shape (N, 3)
+        """
+        self._check_modifiable()
+
+        new_positions = self._get_valid_positions(positions)
+        new_kind_indices = self._get_kind_indices(kind_names)
+        if len(new_kind_indices) != len(new_positions):
+            raise ValueError("{} kind names were given for {} positions"
+                             "".format(len(new_kind_indices),
+                                       len(new_positions)))
+
+        positions_chunks, kind_indices_chunks = self._get_site_buffers()
+        positions_chunks.append(new_positions)
+        kind_indices_chunks.append(new_kind_indices)
+
+    def set_positions(self, positions):
+        """
+        Replace the positions of all the sites, keeping their kinds.
+
+        :param positions: the new absolute positions of the sites, in
+            angstrom, in the same order of the sites: a list of lists of
+            three floats, or a numpy array of shape (N, 3)
+        :raise ValueError: if the number of positions is not equal to the
+            number of sites
+        """
+        self._check_modifiable()
+
+        new_positions = self._get_valid_positions(positions)
+        _, kind_indices = self._get_site_arrays()
+        if len(new_positions) != len(kind_indices):
+            raise ValueError(
+                "the new positions should be as many as the previous structure.")
+
+        self._site_buffers = ([new_positions], [kind_indices])
+
+    def reset_sites_positions(self, new_positions, conserve_particle=True):
+        """
+        Replace all the Site positions attached to the Structure.
+        See :py:meth:`StructureData.reset_sites_positions`.
+        """
+        if not conserve_particle:
+            raise NotImplementedError(
+                "The number of sites cannot be changed by "
+                "reset_sites_positions, use clear_sites and append_sites")
+        self.set_positions(new_positions)
+
+    def _adjust_default_cell(self, vacuum_factor=1.0, vacuum_addition=10.0,
+                             pbc=(False, False, False)):
+        """
+        Adjust the cell of a structure without a defined cell.
+        See :py:meth:`StructureData._adjust_default_cell`.
+        """
+        import numpy
+
+        self.set_pbc(pbc)
+
+        # Translate the structure to the origin
+        positions = self.get_positions()
+        positions -= positions.min(axis=0)
+        self.set_positions(positions)
+
+        # The orthorhombic cell that (just) accomodates the whole structure,
+        # with the vacuum added
+        dimensions = vacuum_factor * positions.max(axis=0) + vacuum_addition
+        self.set_cell(numpy.diag(dimensions).tolist())
+
+    def get_positions(self):
+        """
+        Return the absolute positions of the sites, in angstrom.
+
+        :return: a numpy array of shape (N, 3)
+        """
+        positions, _ = self._get_site_arrays()
+        return positions.copy()
+
+    def get_site_kind_indices(self):
+        """
+        Return, for each site, the index of its kind in ``self.kinds``.
+
+        :return: a numpy array of integers of shape (N,)
+        """
+        _, kind_indices = self._get_site_arrays()
+        return kind_indices.copy()
+
+    def clear_sites(self):
+        """
+        Removes all sites for the ArrayStructureData object.
+        """
+        import numpy
+
+        self._check_modifiable()
+        self._site_buffers = ([numpy.zeros((0, 3), dtype=float)],
+                              [numpy.zeros((0,), dtype=int)])
+
+    @property
+    def sites(self):
+        """
+        Returns a list of sites.
+
+        .. note:: this creates a Site object for each site; use
+            :py:meth:`get_positions` and :py:meth:`get_site_kind_indices`
+            to access the sites of large structures.
+        """
+        kind_names = self.get_kind_names()
+        positions, kind_indices = self._get_site_arrays()
+        return [Site(kind_name=kind_names[kind_idx], position=position)
+                for kind_idx, position in zip(kind_indices, positions)]
+
+    def get_site_kindnames(self):
+        """
+        Return a list with length equal to the number of sites of this
+        structure, where each element of the list is the kind name of the
+        corresponding site.
+
+        :return: a list of strings
+        """
+        kind_names = self.get_kind_names()
+        _, kind_indices = self._get_site_arrays()
+        return [kind_names[kind_idx] for kind_idx in kind_indices]
+
+    def _get_symbol_counts(self):
+        """
+        Return an ordered dictionary with the number of sites for each
+        symbols string (see :py:meth:`Kind.get_symbols_string`), in the order
+        in which the symbols first appear in the sites.
+        """
+        import numpy
+
+        kind_symbols = [k.get_symbols_string() for k in self.kinds]
+        _, kind_indices = self._get_site_arrays()
+        counts = numpy.bincount(kind_indices, minlength=len(kind_symbols))
+        used_kinds, first_sites = numpy.unique(kind_indices,
+                                               return_index=True)
+
+        symbol_counts = collections.OrderedDict()
+        for kind_idx in used_kinds[numpy.argsort(first_sites)]:
+            symbol = kind_symbols[kind_idx]
+            symbol_counts[symbol] = (symbol_counts.get(symbol, 0) +
+                                     int(counts[kind_idx]))
+        return symbol_counts
+
+    def get_formula(self, mode='hill', separator=""):
+        """
+        Return a string with the chemical formula.
+        See :py:meth:`StructureData.get_formula` for the possible modes.
+        """
+        if mode in ['hill', 'hill_compact', 'count', 'count_compact']:
+            return _get_formula_from_counts(self._get_symbol_counts(),
+                                            mode=mode, separator=separator)
+
+        kind_symbols = [k.get_symbols_string() for k in self.kinds]
+        _, kind_indices = self._get_site_arrays()
+        symbol_list = [kind_symbols[kind_idx] for kind_idx in kind_indices]
+        return get_formula(symbol_list, mode=mode, separator=separator)
+
+    def get_composition(self):
+        """
+        Returns the chemical composition of this structure as a dictionary,
+        where each key is the kind symbol (e.g. H, Li, Ba),
+        and each value is the number of occurences of that element in this
+        structure. For BaZrO3 it would return {'Ba':1, 'Zr':1, 'O':3}.
+        No reduction with smallest common divisor!
+
+        :returns: a dictionary with the composition
+        """
+        return dict(self._get_symbol_counts())
+
+    def _get_object_ase(self):
+        """
+        Converts
+        :py:class:`ArrayStructureData <aiida.orm.data.structure.ArrayStructureData>`
+        to ase.Atoms
+
+        :return: an ase.Atoms object
+        """
+        import ase
+        import numpy
+
+        kinds = self.kinds
+        positions, kind_indices = self._get_site_arrays()
+
+        for kind_idx in numpy.unique(kind_indices):
+            if kinds[kind_idx].is_alloy() or kinds[kind_idx].has_vacancies():
+                raise ValueError("Cannot convert to ASE if the kind "
+                                 "represents an alloy or it has vacancies.")
+
+        kind_symbols = [str(k.symbols[0]) for k in kinds]
+        kind_masses = numpy.array([k.mass for k in kinds], dtype=float)
+        kind_tags = numpy.array([0 if t is None else t
+                                 for t in _get_ase_tags(kinds)], dtype=int)
+
+        return ase.Atoms(
+            symbols=[kind_symbols[kind_idx] for kind_idx in kind_indices],
+            positions=positions, masses=kind_masses[kind_indices],
+            tags=kind_tags[kind_indices], cell=self.cell, pbc=self.pbc)
+
+    def _validate(self):
+        """
+        Performs some standard validation tests.
+        """
+        import numpy
+        from aiida.common.exceptions import ValidationError
+
+        # Skip the validation of StructureData, that would create all the
+        # Site objects
+        super(StructureData, self)._validate()
+
+        try:
+            _get_valid_cell(self.cell)
+        except ValueError as e:
+            raise ValidationError("Invalid cell: {}".format(e.message))
+
+        try:
+            get_valid_pbc(self.pbc)
+        except ValueError as e:
+            raise ValidationError(
+                "Invalid periodic boundary conditions: {}".format(e.message))
+
+        try:
+            kind_names = self.get_kind_names()
+        except ValueError as e:
+            raise ValidationError(
+                "Unable to validate the kinds: {}".format(e.message))
+
+        from collections import Counter
+
+        counts = Counter(kind_names)
+        for c in counts:
+            if counts[c] != 1:
+                raise ValidationError("Kind with name '{}' appears {} times "
+                                      "instead of only one".format(
+                    c, counts[c]))
+
+        positions, kind_indices = self._get_site_arrays()
+        if positions.ndim != 2 or positions.shape[1] != 3:
+            raise ValidationError("The positions array must have shape "
+                                  "(N, 3), found {}".format(positions.shape))
+        if kind_indices.shape != (positions.shape[0],):
+            raise ValidationError(
+                "The kind_indices array must have shape ({},), found {}"
+                "".format(positions.shape[0], kind_indices.shape))
+        if len(kind_indices) and (kind_indices.min() < 0 or
+                                  kind_indices.max() >= len(kind_names)):
+            raise ValidationError("A site refers to a kind that does not "
+                                  "exist")
+
+        kinds_without_sites = (set(range(len(kind_names))) -
+                               set(numpy.unique(kind_indices).tolist()))
+        if kinds_without_sites:
+            raise ValidationError("The following kinds are defined, but there "
+                                  "are no sites with that kind: {}".format(
+                [kind_names[i] for i in sorted(kinds_without_sites)]))
+
+    def copy(self):
+        newobj = super(ArrayStructureData, self).copy()
+        if not self.is_stored:
+            positions, kind_indices = self._get_site_arrays()
+            newobj._site_buffers = ([positions.copy()], [kind_indices.copy()])
+        return newobj
+
+    def store(self, *args, **kwargs):
+        """
+        Store the node, writing the positions and the kind indices of the
+        sites to the arrays first.
+        """
+        if not self.is_stored:
+            positions, kind_indices = self._get_site_arrays()
+            self.set_array(self._positions_array, positions)
+            self.set_array(self._kind_indices_array, kind_indices)
+        return super(ArrayStructureData, self).store(*args, **kwargs)
+
+
 class Kind(object):
     """
     This class contains the information about the species (kinds) of the system.
@@ -2252,47 +2715,9 @@ class Site(object):
         .. note:: If any site is an alloy or has vacancies, a ValueError
             is raised (from the site.get_ase() routine).
         """
-        from collections import defaultdict
         import ase
 
-        # I create the list of tags
-        tag_list = []
-        used_tags = defaultdict(list)
-        for k in kinds:
-            # Skip alloys and vacancies
-            if k.is_alloy() or k.has_vacancies():
-                tag_list.append(None)
-            # If the kind name is equal to the specie name,
-            # then no tag should be set
-            elif unicode(k.name) == unicode(k.symbols[0]):
-                tag_list.append(None)
-            else:
-                # Name is not the specie name
-                if k.name.startswith(k.symbols[0]):
-                    try:
-                        new_tag = int(k.name[len(k.symbols[0])])
-                        tag_list.append(new_tag)
-                        used_tags[k.symbols[0]].append(new_tag)
-                        continue
-                    except ValueError:
-                        pass
-                tag_list.append(k.symbols[0])  # I use a string as a placeholder
-
-        for i in range(len(tag_list)):
-            # If it is a string, it is the name of the element,
-            # and I have to generate a new integer for this element
-            # and replace tag_list[i] with this new integer
-            if isinstance(tag_list[i], basestring):
-                # I get a list of used tags for this element
-                existing_tags = used_tags[tag_list[i]]
-                if existing_tags:
-                    new_tag = max(existing_tags) + 1
-                else:  # empty list
-                    new_tag = 1
-                # I store it also as a used tag!
-                used_tags[tag_list[i]].append(new_tag)
-                # I update the tag
-                tag_list[i] = new_tag
+        tag_list = _get_ase_tags(kinds)
 
         found = False
         for k, t in zip(kinds, tag_list):
@@ -15,23 +15,29 @@ from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
 
 if BACKEND == BACKEND_SQLA:
-    from aiida.orm.implementation.sqlalchemy.node import Node
+    from aiida.orm.implementation.sqlalchemy.node import Node, store_nodes
     from aiida.orm.implementation.sqlalchemy.computer import Computer
     from aiida.orm.implementation.sqlalchemy.group import Group
     from aiida.orm.implementation.sqlalchemy.lock import Lock, LockManager
+    from aiida.orm.implementation.sqlalchemy.checkpoint import CheckpointStore
     # from aiida.orm.implementation.sqlalchemy.querytool import QueryTool
-    from aiida.orm.implementation.sqlalchemy.workflow import Workflow, kill_all, get_workflow_info, get_all_running_steps
+    from aiida.orm.implementation.sqlalchemy.workflow import (
+        Workflow, kill_all, get_workflow_info, get_all_running_steps,
+        get_running_steps_with_states)
     from aiida.orm.implementation.sqlalchemy.code import Code, delete_code
     from aiida.orm.implementation.sqlalchemy.comment import Comment
     from aiida.orm.implementation.sqlalchemy.user import User
     from aiida.backends.sqlalchemy import models
 elif BACKEND == BACKEND_DJANGO:
-    from aiida.orm.implementation.django.node import Node
+    from aiida.orm.implementation.django.node import Node, store_nodes
     from aiida.orm.implementation.django.computer import Computer
     from aiida.orm.implementation.django.group import Group
     from aiida.orm.implementation.django.lock import Lock, LockManager
+    from aiida.orm.implementation.django.checkpoint import CheckpointStore
     from aiida.orm.implementation.django.querytool import QueryTool
-    from aiida.orm.implementation.django.workflow import Workflow, kill_all, get_workflow_info, get_all_running_steps
+    from aiida.orm.implementation.django.workflow import (
+        Workflow, kill_all, get_workflow_info, get_all_running_steps,
+        get_running_steps_with_states)
     from aiida.orm.implementation.django.code import Code, delete_code
     from aiida.orm.implementation.django.comment import Comment
     from aiida.orm.implementation.django.user import User
@@ -15,6 +15,7 @@ from aiida.common.utils import str_timedelta
 from aiida.common.datastructures import sort_states, calc_states
 from aiida.common.exceptions import ModificationNotAllowed, DbContentError
 from aiida.backends.djsite.utils import get_automatic_user
+from aiida.daemon.notifications import notify_calculation_state
 from aiida.orm.group import Group
 from aiida.orm.implementation.django.calculation import Calculation
 from aiida.orm.implementation.general.calculation.job import (
@@ -29,21 +30,22 @@ class JobCalculation(AbstractJobCalculation, Calculation):
         """
         Set the state of the calculation.
 
-        Set it in the DbCalcState to have also the uniqueness check.
+        Set it in the DbCalcState to have also the uniqueness check, and in
+        the calc_state column of the node, with a compare-and-set update in
+        the same transaction: if the state was changed in the meantime by
+        someone else, nothing is written.
         Moreover (except for the IMPORTED state) also store in the 'state'
         attribute, useful to know it also after importing, and for faster
         querying.
 
-        .. todo:: Add further checks to enforce that the states are set
-           in order?
-
         :param state: a string with the state. This must be a valid string,
           from ``aiida.common.datastructures.calc_states``.
-        :raise: ModificationNotAllowed if the given state was already set.
+        :raise: ModificationNotAllowed if the given state was already set,
+          or if the state was changed concurrently.
         """
 
         from aiida.common.datastructures import sort_states
-        from aiida.backends.djsite.db.models import DbCalcState
+        from aiida.backends.djsite.db.models import DbCalcState, DbNode
 
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot set the calculation state "
@@ -65,11 +67,20 @@ class JobCalculation(AbstractJobCalculation, Calculation):
 
         try:
             with transaction.atomic():
-                new_state = DbCalcState(dbnode=self.dbnode, state=state).save()
+                DbCalcState(dbnode=self.dbnode, state=state).save()
+                # Compare-and-set: only move on from the state we have
+                # just read (raising rolls back the transaction)
+                if not DbNode.objects.filter(
+                        pk=self.pk, calc_state=old_state).update(
+                        calc_state=state):
+                    raise ModificationNotAllowed(
+                        "The state of calculation pk= {} was changed while "
+                        "setting it to {}".format(self.pk, state))
         except IntegrityError:
             raise ModificationNotAllowed(
                 "Calculation pk= {} already transited through "
                 "the state {}".format(self.pk, state))
+        notify_calculation_state(self.pk, state)
 
         # For non-imported states, also set in the attribute (so that, if we
         # export, we can still see the original state the calculation had.
@@ -80,43 +91,30 @@ class JobCalculation(AbstractJobCalculation, Calculation):
         """
         Get the state of the calculation.
 
-        .. note:: this method returns the NOTFOUND state if no state
-          is found in the DB.
-
-        .. note:: the 'most recent' state is obtained using the logic in the
-          ``aiida.common.datastructures.sort_states`` function.
-
-        .. todo:: Understand if the state returned when no state entry is found
-          in the DB is the best choice.
+        .. note:: the most recent state (following the logic of the
+          ``aiida.common.datastructures.sort_states`` function) is kept in
+          the calc_state column of the node, so that it is read with a
+          single lookup.
 
         :param from_attribute: if set to True, read it from the attributes
           (the attribute is also set with set_state, unless the state is set
           to IMPORTED; in this way we can also see the state before storing).
 
         :return: a string. If from_attribute is True and no attribute is found,
-          return None. If from_attribute is False and no entry is found in the
-          DB, return the "NOTFOUND" state.
+          return None. If from_attribute is False and no state was set,
+          return None.
         """
-        from aiida.backends.djsite.db.models import DbCalcState
+        from aiida.backends.djsite.db.models import DbNode
         if from_attribute:
             return self.get_attr('state', None)
         else:
             if not self.is_stored:
                 return calc_states.NEW
             else:
-                this_calc_states = DbCalcState.objects.filter(
-                    dbnode=self).values_list('state', flat=True)
-                if not this_calc_states:
-                    return None
-                else:
-                    try:
-                        most_recent_state = sort_states(this_calc_states)[0]
-                    except ValueError as e:
-                        raise DbContentError("Error in the content of the "
-                                             "DbCalcState table ({})".format(
-                            e.message))
-
-                    return most_recent_state
+                # Read it from the database, as it can be changed by other
+                # processes (e.g. the daemon)
+                return DbNode.objects.filter(pk=self.pk).values_list(
+                    'calc_state', flat=True)[0]
 
     @classmethod
     def _list_calculations_old(cls, states=None, past_days=None, group=None,
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+
+from django.db import transaction
+
+from aiida.orm.implementation.general.checkpoint import AbstractCheckpointStore
+from aiida.common.exceptions import NotExistent
+from aiida.utils import timezone
+
+
+class CheckpointStore(AbstractCheckpointStore):
+    def save(self, pid, state, waiting_on_pk, checkpoint):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        # update() does not set the auto_now fields
+        values = dict(state=state, waiting_on_pk=waiting_on_pk,
+                      checkpoint=checkpoint, mtime=timezone.now())
+        with transaction.atomic():
+            if not DbCheckpoint.objects.filter(pid=pid).update(**values):
+                DbCheckpoint.objects.create(pid=pid, **values)
+
+    def exists(self, pid):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        return DbCheckpoint.objects.filter(pid=pid).exists()
+
+    def load(self, pid):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        try:
+            checkpoint = DbCheckpoint.objects.values_list(
+                'checkpoint', flat=True).get(pid=pid)
+        except DbCheckpoint.DoesNotExist:
+            raise NotExistent("No checkpoint for process {}".format(pid))
+        return bytes(checkpoint)
+
+    def set_state(self, pid, state):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        if not DbCheckpoint.objects.filter(pid=pid).update(
+                state=state, mtime=timezone.now()):
+            raise NotExistent("No checkpoint for process {}".format(pid))
+
+    def _get_blocked(self, state, blocking_calc_states):
+        from aiida.backends.djsite.db.models import DbCheckpoint, DbNode
+
+        return DbCheckpoint.objects.filter(
+            state=state,
+            waiting_on_pk__in=DbNode.objects.filter(
+                calc_state__in=blocking_calc_states).values('id'))
+
+    def get_ready(self, state, blocking_calc_states, after_pid=None,
+                  limit=None):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        checkpoints = DbCheckpoint.objects.filter(state=state)
+        if blocking_calc_states:
+            checkpoints = checkpoints.exclude(pk__in=self._get_blocked(
+                state, blocking_calc_states).values('pk'))
+        if after_pid is not None:
+            checkpoints = checkpoints.filter(pid__gt=after_pid)
+        checkpoints = checkpoints.order_by('pid').values_list(
+            'pid', 'checkpoint')
+        if limit is not None:
+            checkpoints = checkpoints[:limit]
+        return [(pid, bytes(checkpoint)) for pid, checkpoint in checkpoints]
+
+    def has_blocked(self, state, blocking_calc_states):
+        return self._get_blocked(state, blocking_calc_states).exists()
+
+    def clear_all(self):
+        from aiida.backends.djsite.db.models import DbCheckpoint
+
+        DbCheckpoint.objects.all().delete()
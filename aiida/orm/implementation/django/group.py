@@ -132,36 +132,81 @@ class Group(AbstractGroup):
         # To allow to do directly g = Group(...).store()
         return self
 
-    def add_nodes(self, nodes):
+    def _get_node_ids_sql(self, nodes, method_name):
+        """
+        Return the SQL (and its parameters) selecting the ids of the given
+        nodes: either a list of pks or, if a QueryBuilder is passed, the
+        query of the QueryBuilder itself, to be run as a subquery.
+
+        :return: a tuple (sql, params), or None if there are no nodes
+        """
+        from sqlalchemy import select
+        from sqlalchemy.dialects import postgresql
         from aiida.backends.djsite.db.models import DbNode
-        if not self.is_stored:
-            raise ModificationNotAllowed("Cannot add nodes to a group before "
-                                         "storing")
+        from aiida.orm.querybuilder import QueryBuilder
+
+        if isinstance(nodes, QueryBuilder):
+            # Positional parameters, as expected by the Django cursor
+            compiled = select(
+                [self._get_querybuilder_ids_column(nodes)]).compile(
+                dialect=postgresql.dialect(paramstyle='format'))
+            return (unicode(compiled),
+                    [compiled.params[k] for k in compiled.positiontup])
 
         # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
+        if isinstance(nodes, (Node, DbNode, int, long)):
             nodes = [nodes]
 
         if isinstance(nodes, basestring) or not isinstance(
                 nodes, collections.Iterable):
             raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "add_nodes, can only be a Node, DbNode, or a list "
-                            "of such objects, it is instead {}".format(
-                str(type(nodes))))
+                            "{}, can only be a Node, DbNode, pk, a list "
+                            "of such objects or a QueryBuilder, it is "
+                            "instead {}".format(method_name,
+                                                str(type(nodes))))
 
         list_pk = []
         for node in nodes:
+            if isinstance(node, (int, long)):
+                list_pk.append(node)
+                continue
             if not isinstance(node, (Node, DbNode)):
                 raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
+                                "to {}, it should be either a Node, a "
+                                "DbNode or a pk, it is instead {}".format(
+                    method_name, str(type(node))))
             if node.pk is None:
                 raise ValueError("At least one of the provided nodes is "
                                  "unstored, stopping...")
             list_pk.append(node.pk)
 
-        self.dbgroup.dbnodes.add(*list_pk)
+        if not list_pk:
+            return None
+        return ", ".join(["%s"] * len(list_pk)), list_pk
+
+    def add_nodes(self, nodes):
+        from django.db import connection
+        if not self.is_stored:
+            raise ModificationNotAllowed("Cannot add nodes to a group before "
+                                         "storing")
+
+        node_ids = self._get_node_ids_sql(nodes, 'add_nodes')
+        if node_ids is None:
+            return
+        node_ids_sql, params = node_ids
+
+        # A single INSERT ... SELECT, skipping the nodes already in the group
+        table = self.dbgroup.dbnodes.through._meta.db_table
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO {table} (dbgroup_id, dbnode_id)
+            SELECT %s, db_dbnode.id FROM db_dbnode
+            WHERE db_dbnode.id IN ({node_ids})
+            AND NOT EXISTS (
+                SELECT 1 FROM {table}
+                WHERE dbgroup_id = %s AND dbnode_id = db_dbnode.id)""".format(
+            table=table, node_ids=node_ids_sql),
+            [self.pk] + params + [self.pk])
 
     @property
     def nodes(self):
@@ -190,35 +235,38 @@ class Group(AbstractGroup):
         return iterator(self.dbgroup.dbnodes.all())
 
     def remove_nodes(self, nodes):
-        from aiida.backends.djsite.db.models import DbNode
+        from django.db import connection
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot remove nodes from a group "
                                          "before storing")
 
-        # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
-            nodes = [nodes]
-
-        if isinstance(nodes, basestring) or not isinstance(
-                nodes, collections.Iterable):
-            raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "remove_nodes, can only be a Node, DbNode, or a "
-                            "list of such objects, it is instead {}".format(
-                str(type(nodes))))
-
-        list_pk = []
-        for node in nodes:
-            if not isinstance(node, (Node, DbNode)):
-                raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
-            if node.pk is None:
-                raise ValueError("At least one of the provided nodes is "
-                                 "unstored, stopping...")
-            list_pk.append(node.pk)
-
-        self.dbgroup.dbnodes.remove(*list_pk)
+        node_ids = self._get_node_ids_sql(nodes, 'remove_nodes')
+        if node_ids is None:
+            return
+        node_ids_sql, params = node_ids
+
+        cursor = connection.cursor()
+        cursor.execute("""
+            DELETE FROM {table}
+            WHERE dbgroup_id = %s AND dbnode_id IN ({node_ids})""".format(
+            table=self.dbgroup.dbnodes.through._meta.db_table,
+            node_ids=node_ids_sql),
+            [self.pk] + params)
+
+    def _add_nodes_from_groups(self, groups, operator):
+        from django.db import connection
+
+        table = self.dbgroup.dbnodes.through._meta.db_table
+        members_sql = "\n{}\n".format(operator).join(
+            ["SELECT dbnode_id FROM {} WHERE dbgroup_id = %s".format(table)] *
+            len(groups))
+
+        cursor = connection.cursor()
+        cursor.execute("""
+            INSERT INTO {table} (dbgroup_id, dbnode_id)
+            SELECT %s, members.dbnode_id FROM ({members}) AS members""".format(
+            table=table, members=members_sql),
+            [self.pk] + [group.pk for group in groups])
 
     @classmethod
     def query(cls, name=None, type_string="", pk=None, uuid=None, nodes=None,
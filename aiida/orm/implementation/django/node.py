@@ -171,7 +171,6 @@ class Node(AbstractNode):
         DbLink.objects.filter(output=self.dbnode, label=label).delete()
 
     def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
-        from aiida.backends.djsite.db.models import DbPath
         if not isinstance(src, Node):
             raise ValueError("src must be a Node instance")
         if self.uuid == src.uuid:
@@ -187,13 +186,11 @@ class Node(AbstractNode):
                 "source node is not stored")
 
         if link_type is LinkType.CREATE or link_type is LinkType.INPUT:
-            # Check for cycles. This works if the transitive closure is enabled; if it
-            # isn't, this test will never fail, but then having a circular link is not
-            # meaningful but does not pose a huge threat
+            # Check for cycles.
             #
-            # I am linking src->self; a loop would be created if a DbPath exists already
-            # in the TC table from self to src
-            if len(DbPath.objects.filter(parent=self.dbnode, child=src.dbnode)) > 0:
+            # I am linking src->self; a loop would be created if src is
+            # already a descendant of self
+            if self._has_descendant(src):
                 raise ValueError(
                     "The link you are attempting to create would generate a loop")
 
@@ -224,6 +221,10 @@ class Node(AbstractNode):
         else:
             self._do_create_link(src, label, link_type)
 
+    def _add_dblinks_from(self, links):
+        with transaction.atomic():
+            super(Node, self)._add_dblinks_from(links)
+
     def _do_create_link(self, src, label, link_type):
         sid = None
         try:
@@ -655,14 +656,154 @@ class Node(AbstractNode):
         # n = Node().store()
         return self
 
+    def _has_descendant(self, node):
+        """
+        Return True if the given (stored) node is a descendant of this one,
+        using the DbPath table if enabled in the profile, or otherwise a
+        recursive query on the links.
+        """
+        from django.db import connection
+        from aiida.backends import settings
+        from aiida.backends.djsite.db.models import DbPath
+
+        if settings.USE_DBPATH:
+            return DbPath.objects.filter(parent=self.dbnode,
+                                         child=node.dbnode).exists()
+
+        cursor = connection.cursor()
+        cursor.execute("""
+            WITH RECURSIVE descendants(id) AS (
+                SELECT output_id FROM db_dblink WHERE input_id = %s
+              UNION
+                SELECT db_dblink.output_id FROM db_dblink
+                JOIN descendants ON db_dblink.input_id = descendants.id
+            )
+            SELECT EXISTS (SELECT 1 FROM descendants WHERE id = %s)""",
+                       [self.pk, node.pk])
+        return cursor.fetchone()[0]
+
     @property
     def has_children(self):
-        from aiida.backends.djsite.db.models import DbPath
-        childrens = DbPath.objects.filter(parent=self.pk)
-        return False if not childrens else True
+        # A node has descendants if and only if it has outputs: no need to
+        # look at the transitive closure
+        return DbLink.objects.filter(input=self.pk).exists()
 
     @property
     def has_parents(self):
-        from aiida.backends.djsite.db.models import DbPath
-        parents = DbPath.objects.filter(child=self.pk)
-        return False if not parents else True
+        return DbLink.objects.filter(output=self.pk).exists()
+
+
+# Maximum number of rows inserted by a single INSERT in store_nodes
+_BULK_STORE_BATCH_SIZE = 1000
+
+
+def _reserve_ids(model, num):
+    """
+    Get ``num`` new values from the sequence of the primary key of the
+    given model (PostgreSQL only), so that the rows can be inserted with a
+    multi-row INSERT, knowing their primary keys in advance.
+    """
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT nextval(pg_get_serial_sequence(%s, 'id')) "
+            "FROM generate_series(1, %s)", [model._meta.db_table, num])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def store_nodes(nodes, with_transaction=True):
+    """
+    Store a list of unstored nodes in a single transaction, together with
+    their cached input links, issuing multi-row INSERTs for the nodes,
+    their attributes and the links instead of a few queries per node.
+
+    The input links of the nodes must come from nodes that are either
+    already stored or in the list. Nodes whose class customizes the
+    store() method (e.g. calculations, that also set their state) are
+    stored with their own store(), in the same transaction.
+
+    :param nodes: an iterable of unstored nodes
+    :parameter with_transaction: if False, no transaction is used. This
+      is meant to be used ONLY if the outer calling function has already
+      a transaction open!
+    :return: the list of nodes
+    :raise ModificationNotAllowed: if a node is already stored, or has
+      an input link from a node that is neither stored nor in the list
+    :raise ValueError: if a link is not valid, or the links between the
+      nodes would generate a loop
+    """
+    from django.db import connection
+    from aiida.backends.djsite.db.models import DbNode, DbAttribute
+    from aiida.common.utils import EmptyContextManager
+    from aiida.orm.implementation.general.node import (
+        _has_default_store, _get_bulk_store_order, _move_to_repository,
+        _move_back_to_sandbox, _finalize_bulk_store)
+
+    nodes = list(nodes)
+    ordered = _get_bulk_store_order(nodes, Node)
+    to_insert = [n for n in ordered if _has_default_store(n, Node)]
+    to_store = [n for n in ordered if not _has_default_store(n, Node)]
+
+    for node in to_insert:
+        node._validate()
+
+    if with_transaction:
+        context_man = transaction.atomic()
+    else:
+        context_man = EmptyContextManager()
+
+    # As in store(), I first store the files, then the DB entries
+    _move_to_repository(to_insert)
+    try:
+        with context_man:
+            dbnodes = [n.dbnode for n in to_insert]
+            if connection.vendor == 'postgresql':
+                for dbnode, pk in zip(dbnodes,
+                                      _reserve_ids(DbNode, len(dbnodes))):
+                    dbnode.pk = pk
+                DbNode.objects.bulk_create(
+                    dbnodes, batch_size=_BULK_STORE_BATCH_SIZE)
+                for dbnode in dbnodes:
+                    dbnode._state.adding = False
+                    dbnode._state.db = DbNode.objects.db
+            else:
+                for dbnode in dbnodes:
+                    dbnode.save()
+
+            attributes = []
+            for node in to_insert:
+                attributes.extend(DbAttribute.reset_values_for_node(
+                    node.dbnode, attributes=node._attrs_cache,
+                    with_transaction=False, return_not_store=True))
+            DbAttribute.bulk_insert(attributes)
+
+            for node in to_insert:
+                node._to_be_stored = False
+
+            # The parents of these nodes are already stored at this point
+            for node in to_store:
+                node.store(with_transaction=False)
+
+            links = []
+            for node in to_insert:
+                for label, (src, link_type) in \
+                        node._inputlinks_cache.iteritems():
+                    links.append(DbLink(input=src.dbnode, output=node.dbnode,
+                                        label=label, type=link_type.value))
+            DbLink.objects.bulk_create(
+                links, batch_size=_BULK_STORE_BATCH_SIZE)
+
+    # This is one of the few cases where it is ok to do a 'global'
+    # except, also because I am re-raising the exception
+    except:
+        for node in to_insert:
+            node._to_be_stored = True
+            node.dbnode.pk = None
+            node.dbnode._state.adding = True
+        _move_back_to_sandbox(to_insert)
+        raise
+
+    _finalize_bulk_store(to_insert)
+
+    return nodes
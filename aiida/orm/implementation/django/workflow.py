@@ -21,6 +21,7 @@ from aiida.common.exceptions import (InternalError, ModificationNotAllowed,
                                      AiidaException)
 from aiida.common.folders import RepositoryFolder, SandboxFolder
 from aiida.common.utils import md5_file, str_timedelta
+from aiida.daemon.notifications import notify_workflow_state
 from aiida.orm.implementation.django.calculation.job import JobCalculation
 from aiida.orm.implementation.general.workflow import AbstractWorkflow
 from aiida.utils import timezone
@@ -429,6 +430,8 @@ class Workflow(AbstractWorkflow):
         :param name: a state from wf_states in aiida.common.datastructures
         """
         self.dbworkflowinstance.set_state(state)
+        # The steps waiting on this workflow (as a subworkflow) can continue
+        notify_workflow_state(self.pk, state)
 
     def is_new(self):
         """
@@ -578,6 +581,43 @@ def get_all_running_steps():
     from aiida.backends.djsite.db.models import DbWorkflowStep
     return DbWorkflowStep.objects.filter(state=wf_states.RUNNING)
 
+def get_running_steps_with_states():
+    """
+    Return all the RUNNING steps, together with the states of their
+    calculations and sub-workflows, using three queries in total.
+
+    :return: a list of tuples ``(step, calc_states, sub_workflow_states)``,
+      where ``step`` is a DbWorkflowStep (with its parent DbWorkflow already
+      loaded), ``calc_states`` a dictionary mapping the pk of each
+      JobCalculation of the step to its state, and ``sub_workflow_states``
+      a dictionary mapping the pk of each sub-workflow of the step to its
+      state.
+    """
+    from collections import defaultdict
+    from aiida.backends.djsite.db.models import DbWorkflowStep
+
+    steps = list(DbWorkflowStep.objects.filter(
+        state=wf_states.RUNNING).select_related('parent'))
+    step_pks = [step.pk for step in steps]
+
+    calc_states = defaultdict(dict)
+    for step_pk, calc_pk, state in (
+            DbWorkflowStep.calculations.through.objects.filter(
+                dbworkflowstep_id__in=step_pks,
+                dbnode__type__startswith='calculation.job.').values_list(
+                'dbworkflowstep_id', 'dbnode_id', 'dbnode__calc_state')):
+        calc_states[step_pk][calc_pk] = state
+
+    sub_workflow_states = defaultdict(dict)
+    for step_pk, sub_wf_pk, state in (
+            DbWorkflowStep.sub_workflows.through.objects.filter(
+                dbworkflowstep_id__in=step_pks).values_list(
+                'dbworkflowstep_id', 'dbworkflow_id', 'dbworkflow__state')):
+        sub_workflow_states[step_pk][sub_wf_pk] = state
+
+    return [(step, calc_states[step.pk], sub_workflow_states[step.pk])
+            for step in steps]
+
 def get_workflow_info(w, tab_size=2, short=False, pre_string="",
                       depth=16):
     """
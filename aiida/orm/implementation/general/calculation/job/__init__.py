@@ -552,17 +552,17 @@ class AbstractJobCalculation(object):
         """
         Set the state of the calculation.
 
-        Set it in the DbCalcState to have also the uniqueness check.
+        Set it in the DbCalcState to have also the uniqueness check, and
+        (with a compare-and-set update, in the same transaction) in the
+        calc_state column of the node, that keeps the current state.
         Moreover (except for the IMPORTED state) also store in the 'state'
         attribute, useful to know it also after importing, and for faster
         querying.
 
-        .. todo:: Add further checks to enforce that the states are set
-           in order?
-
         :param state: a string with the state. This must be a valid string,
           from ``aiida.common.datastructures.calc_states``.
-        :raise: ModificationNotAllowed if the given state was already set.
+        :raise: ModificationNotAllowed if the given state was already set,
+          or if the state was changed concurrently.
         """
         pass
 
@@ -571,11 +571,9 @@ class AbstractJobCalculation(object):
         """
         Get the state of the calculation.
 
-        .. note:: the 'most recent' state is obtained using the logic in the
-          ``aiida.common.datastructures.sort_states`` function.
-
-        .. todo:: Understand if the state returned when no state entry is found
-          in the DB is the best choice.
+        .. note:: the 'most recent' state (according to the logic in the
+          ``aiida.common.datastructures.sort_states`` function) is kept in
+          the calc_state column of the node.
 
         :param from_attribute: if set to True, read it from the attributes
           (the attribute is also set with set_state, unless the state is set
@@ -614,7 +612,7 @@ class AbstractJobCalculation(object):
         """
         Get whether the calculation is in a running state,
         i.e. one of TOSUBMIT, SUBMITTING, WITHSCHEDULER,
-        COMPUTED, RETRIEVING or PARSING.
+        COMPUTED, RETRIEVING, RETRIEVED or PARSING.
 
         :return: a boolean
         """
@@ -624,6 +622,7 @@ class AbstractJobCalculation(object):
             calc_states.WITHSCHEDULER,
             calc_states.COMPUTED,
             calc_states.RETRIEVING,
+            calc_states.RETRIEVED,
             calc_states.PARSING
         ]
 
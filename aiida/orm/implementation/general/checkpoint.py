@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+from abc import ABCMeta, abstractmethod
+
+
+class AbstractCheckpointStore(object):
+    """
+    Store the checkpoints of the processes of the workflow engine in the
+    DbCheckpoint table.
+
+    Each process has (at most) one row, identified by its pid, holding the
+    pickled checkpoint together with the state of the process (running,
+    finished or failed) and the pk of the calculation it is waiting on, if
+    any, so that the processes that can continue are found with a query.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def save(self, pid, state, waiting_on_pk, checkpoint):
+        """
+        Create or replace the checkpoint of a process.
+
+        :param pid: the pid of the process
+        :param state: the state of the process
+        :param waiting_on_pk: the pk of the calculation that the process is
+            waiting on, or None
+        :param checkpoint: the pickled checkpoint, a string
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, pid):
+        """
+        Return whether there is a checkpoint for the given process.
+        """
+        pass
+
+    @abstractmethod
+    def load(self, pid):
+        """
+        Return the pickled checkpoint of a process.
+
+        :raise NotExistent: if there is no checkpoint for the process
+        """
+        pass
+
+    @abstractmethod
+    def set_state(self, pid, state):
+        """
+        Change the state of the checkpoint of a process.
+
+        :raise NotExistent: if there is no checkpoint for the process
+        """
+        pass
+
+    @abstractmethod
+    def get_ready(self, state, blocking_calc_states, after_pid=None,
+                  limit=None):
+        """
+        Return the checkpoints in the given state of the processes that are
+        not waiting on a calculation in one of the ``blocking_calc_states``.
+
+        :param state: the state of the processes
+        :param blocking_calc_states: a list of calculation states, empty to
+            return all the checkpoints in the given state
+        :param after_pid: if given, only the processes with a larger pid are
+            returned, to iterate over the checkpoints in chunks
+        :param limit: the maximum number of checkpoints to return
+        :return: a list of (pid, pickled checkpoint) tuples, sorted by pid
+        """
+        pass
+
+    @abstractmethod
+    def has_blocked(self, state, blocking_calc_states):
+        """
+        Return whether there are checkpoints in the given state of processes
+        waiting on a calculation in one of the ``blocking_calc_states``.
+        """
+        pass
+
+    @abstractmethod
+    def clear_all(self):
+        """
+        Delete all the checkpoints.
+        """
+        pass
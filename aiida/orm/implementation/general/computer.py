@@ -41,6 +41,13 @@ class AbstractComputer(object):
     """
     _logger = logging.getLogger(__name__)
 
+    # See get_job_polling_policy
+    _default_job_polling_policy = {
+        'minimum_interval': 0,
+        'max_backoff': 1800,
+        'near_walltime_interval': 10,
+    }
+
     @classproperty
     def _conf_attributes(self):
         """
@@ -670,6 +677,51 @@ class AbstractComputer(object):
                 raise TypeError("def_cpus_per_machine must be an integer (or None)")
         self._set_property("default_mpiprocs_per_machine", def_cpus_per_machine)
 
+    def get_job_polling_policy(self):
+        """
+        Return the policy followed by the daemon to check the state of the
+        jobs on this computer (see aiida.daemon.polling), a dictionary with
+        the keys:
+
+        * ``minimum_interval``: the minimum number of seconds between two
+          queries of the scheduler for the same (computer, user) pair;
+          0 means at each run of the daemon updater
+        * ``max_backoff``: the maximum number of seconds to wait after
+          consecutive errors of the transport or of the scheduler; the wait
+          is doubled at each error
+        * ``near_walltime_interval``: if a job reaches its requested
+          walltime before the next query, it is queried at that time
+          instead, but not sooner than this number of seconds
+
+        The values that were not set have the defaults in
+        ``_default_job_polling_policy``.
+        """
+        policy = dict(self._default_job_polling_policy)
+        policy.update(self._get_property("job_polling_policy", {}))
+        return policy
+
+    def set_job_polling_policy(self, **kwargs):
+        """
+        Set some of the values of the job polling policy (see
+        :py:meth:`get_job_polling_policy`), e.g.
+        ``set_job_polling_policy(minimum_interval=120)``. Set a value to None
+        to restore its default.
+        """
+        policy = self._get_property("job_polling_policy", {})
+        for k, v in kwargs.iteritems():
+            if k not in self._default_job_polling_policy:
+                raise ValueError("Unknown job polling policy key '{}', valid "
+                                 "keys are: {}".format(k, ", ".join(
+                                     self._default_job_polling_policy)))
+            if v is None:
+                policy.pop(k, None)
+            elif not isinstance(v, (int, long, float)) or v < 0:
+                raise ValueError("The value of '{}' must be a non-negative "
+                                 "number of seconds".format(k))
+            else:
+                policy[k] = v
+        self._set_property("job_polling_policy", policy)
+
     @abstractmethod
     def get_transport_params(self):
         pass
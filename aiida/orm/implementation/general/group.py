@@ -10,7 +10,9 @@
 
 from abc import ABCMeta, abstractmethod, abstractproperty
 
-from aiida.common.exceptions import UniquenessError, NotExistent, MultipleObjectsError
+from aiida.common.exceptions import (UniquenessError, NotExistent,
+                                     MultipleObjectsError,
+                                     ModificationNotAllowed)
 from aiida.common.utils import abstractclassmethod, abstractstaticmethod
 
 
@@ -180,14 +182,19 @@ class AbstractGroup(object):
     @abstractmethod
     def add_nodes(self, nodes):
         """
-        Add a node or a set of nodes to the group.
+        Add a node or a set of nodes to the group. Nodes that are already
+        in the group are skipped; the insertion is done with a single query.
 
         :note: The group must be already stored.
 
         :note: each of the nodes passed to add_nodes must be already stored.
 
         :param nodes: a Node or DbNode object to add to the group, or
-          a list of Nodes or DbNodes to add.
+          a list of Nodes, DbNodes or node pks to add, or a QueryBuilder
+          projecting only the ids of the nodes to add (e.g. appending
+          ``Node`` with ``project=['id']``). In the latter case the nodes
+          are selected directly in the database, without loading them.
+          Pks that do not correspond to any node are ignored.
         """
         pass
 
@@ -203,17 +210,109 @@ class AbstractGroup(object):
     @abstractmethod
     def remove_nodes(self, nodes):
         """
-        Remove a node or a set of nodes to the group.
+        Remove a node or a set of nodes from the group. Nodes that are not
+        in the group are skipped; the removal is done with a single query.
 
         :note: The group must be already stored.
 
-        :note: each of the nodes passed to add_nodes must be already stored.
+        :note: each of the nodes passed to remove_nodes must be already
+          stored.
 
-        :param nodes: a Node or DbNode object to add to the group, or
-          a list of Nodes or DbNodes to add.
+        :param nodes: a Node or DbNode object to remove from the group, or
+          a list of Nodes, DbNodes or node pks to remove, or a QueryBuilder
+          projecting only the ids of the nodes to remove (see
+          :py:meth:`add_nodes`).
+        """
+        pass
+
+    @staticmethod
+    def _get_querybuilder_ids_column(querybuilder):
+        """
+        Return the (only) column projected by the given QueryBuilder, to be
+        used as a subquery of node ids.
+
+        :raise ValueError: if the QueryBuilder projects more than one column
+        """
+        subquery = querybuilder.get_query().subquery()
+        columns = list(subquery.c)
+        if len(columns) != 1:
+            raise ValueError("The QueryBuilder used to select the nodes of a "
+                             "group must project only the ids of the nodes, "
+                             "it projects {} columns instead".format(
+                len(columns)))
+        return columns[0]
+
+    @abstractmethod
+    def _add_nodes_from_groups(self, groups, operator):
+        """
+        Add to this group the nodes obtained by combining the nodes of the
+        given groups with a SQL set operator, with a single query.
+
+        :param groups: a list of stored groups
+        :param operator: one of 'UNION', 'INTERSECT' and 'EXCEPT'
         """
         pass
 
+    def _combine(self, others, operator, name, **kwargs):
+        """
+        Create and store a new group with the given name, containing the
+        nodes obtained by combining this group with the other ones with the
+        given SQL set operator. The nodes are never loaded from the database.
+        """
+        if isinstance(others, AbstractGroup):
+            others = [others]
+        groups = [self] + list(others)
+        for group in groups:
+            if not isinstance(group, AbstractGroup):
+                raise TypeError("Groups can only be combined with other "
+                                "groups, got {} instead".format(type(group)))
+            if not group.is_stored:
+                raise ModificationNotAllowed("Cannot combine groups before "
+                                             "storing them")
+
+        new_group = self.__class__(name=name, **kwargs).store()
+        new_group._add_nodes_from_groups(groups, operator)
+        return new_group
+
+    def union(self, others, name, **kwargs):
+        """
+        Create and store a new group with the nodes that belong to this
+        group or to any of the other groups.
+
+        :param others: a group, or a list of groups
+        :param name: the name of the new group
+        :param kwargs: any other parameter for the creation of the new
+          group (description, type_string, user)
+        :return: the new group
+        """
+        return self._combine(others, 'UNION', name, **kwargs)
+
+    def intersection(self, others, name, **kwargs):
+        """
+        Create and store a new group with the nodes that belong both to this
+        group and to all the other groups.
+
+        :param others: a group, or a list of groups
+        :param name: the name of the new group
+        :param kwargs: any other parameter for the creation of the new
+          group (description, type_string, user)
+        :return: the new group
+        """
+        return self._combine(others, 'INTERSECT', name, **kwargs)
+
+    def difference(self, others, name, **kwargs):
+        """
+        Create and store a new group with the nodes that belong to this
+        group but to none of the other groups.
+
+        :param others: a group, or a list of groups
+        :param name: the name of the new group
+        :param kwargs: any other parameter for the creation of the new
+          group (description, type_string, user)
+        :return: the new group
+        """
+        return self._combine(others, 'EXCEPT', name, **kwargs)
+
     @abstractclassmethod
     def query(cls, name=None, type_string="", pk=None, uuid=None, nodes=None,
               user=None, node_attributes=None, past_days=None, **kwargs):
@@ -8,6 +8,7 @@
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
 from abc import ABCMeta, abstractmethod, abstractproperty
+from contextlib import contextmanager
 from aiida.common.utils import abstractclassmethod
 
 import collections
@@ -217,6 +218,8 @@ class AbstractNode(object):
         self._to_be_stored = True
         # Empty cache of input links in any case
         self._inputlinks_cache = {}
+        # Links to be written to the DB together, see add_links_from
+        self._dblinks_to_add = None
 
     @property
     def is_stored(self):
@@ -462,10 +465,40 @@ class AbstractNode(object):
 
         # If both are stored, write directly on the DB
         if self.is_stored and src.is_stored:
-            self._add_dblink_from(src, label, link_type)
+            if self._dblinks_to_add is not None:
+                # Within add_links_from: written later, all together
+                self._dblinks_to_add.append((src, label, link_type))
+            else:
+                self._add_dblink_from(src, label, link_type)
         else:  # at least one is not stored: add to the internal cache
             self._add_cachelink_from(src, label, link_type)
 
+    def add_links_from(self, links):
+        """
+        Add many input links to the current node at once.
+        Each link is checked as in :py:meth:`add_link_from`; if the current
+        node is stored, the links from stored nodes are then written to the
+        DB together.
+
+        :param links: a list of tuples (src, label, link_type), with the
+            same meaning as the parameters of :py:meth:`add_link_from`.
+            The label can be None (if both nodes are stored) to get an
+            automatic label.
+        """
+        if self._dblinks_to_add is not None:
+            raise InternalError("add_links_from cannot be nested")
+
+        self._dblinks_to_add = []
+        try:
+            for src, label, link_type in links:
+                self.add_link_from(src, label, link_type)
+            dblinks = self._dblinks_to_add
+        finally:
+            self._dblinks_to_add = None
+
+        if dblinks:
+            self._add_dblinks_from(dblinks)
+
     def _add_cachelink_from(self, src, label, link_type):
         """
         Add a link in the cache.
@@ -593,6 +626,19 @@ class AbstractNode(object):
         """
         pass
 
+    def _add_dblinks_from(self, links):
+        """
+        Add many links to the current node, directly in the DB.
+        Backends can override it to write all the links at once.
+
+        :note: this function should not be called directly; it acts directly on
+            the database.
+
+        :param links: a list of tuples (src, label, link_type)
+        """
+        for src, label, link_type in links:
+            self._add_dblink_from(src, label, link_type)
+
     def _linking_as_output(self, dest, link_type):
         """
         Raise a ValueError if a link from self to dest is not allowed.
@@ -953,13 +999,32 @@ class AbstractNode(object):
 
         :param the_dict: a dictionary of key:value to be set as extras
         """
-
         try:
-            for key, value in the_dict.iteritems():
-                self.set_extra(key, value)
+            items = the_dict.items()
         except AttributeError:
             raise AttributeError("set_extras takes a dictionary as argument")
 
+        for key, _ in items:
+            validate_attribute_key(key)
+
+        if self._to_be_stored:
+            raise ModificationNotAllowed(
+                "The extras of a node can be set only after "
+                "storing the node")
+        self._set_db_extras({key: clean_value(value) for key, value in items})
+
+    def _set_db_extras(self, extras):
+        """
+        Store several extras directly in the DB, without checks.
+        Backends can override it to write all the extras at once.
+
+        DO NOT USE DIRECTLY.
+
+        :param extras: a dictionary of key:value to be set as extras
+        """
+        for key, value in extras.iteritems():
+            self._set_db_extra(key, value, False)
+
 
     def reset_extras(self, new_extras):
         """
@@ -1070,6 +1135,47 @@ class AbstractNode(object):
         """
         pass
 
+    def del_extras(self, keys):
+        """
+        Delete several extras, acting directly on the DB!
+        Can be used *only* after saving.
+
+        :param keys: a list of key names
+        :raise: ModificationNotAllowed: if the node is not stored yet
+        """
+        if self._to_be_stored:
+            raise ModificationNotAllowed(
+                "The extras of a node can be set and deleted "
+                "only after storing the node")
+        self._del_db_extras(list(keys))
+
+    def _del_db_extras(self, keys):
+        """
+        Delete several extras, directly on the DB.
+        Backends can override it to delete all the extras at once.
+
+        DO NOT USE DIRECTLY.
+
+        :param keys: a list of key names
+        """
+        for key in keys:
+            self._del_db_extra(key)
+
+    @contextmanager
+    def coalesce_updates(self):
+        """
+        Return a context manager to group many changes to the attributes and
+        extras of a stored node, e.g.::
+
+            with node.coalesce_updates():
+                for key, value in many_extras.iteritems():
+                    node.set_extra(key, value)
+
+        Backends that support it write all the changes to the database at
+        once when the context is exited, rather than one by one.
+        """
+        yield
+
     def extras(self):
         """
         Get the keys of the extras.
@@ -1700,3 +1806,171 @@ class AttributeManager(object):
             return self._node.get_attr(name)
         except AttributeError as e:
             raise KeyError(e.message)
+
+
+def _has_default_store(node, node_class):
+    """
+    Return True if the class of the node does not override the store()
+    method of the given (backend-specific) node class.
+    """
+    return getattr(type(node).store, '__func__', None) is node_class.store.__func__
+
+
+def _get_bulk_store_order(nodes, node_class):
+    """
+    Check that the given nodes can be stored together by store_nodes, and
+    return them sorted so that the source of each link between them comes
+    before its destination.
+
+    :raise ModificationNotAllowed: if a node is already stored, or has
+      an input link from a node that is neither stored nor in the list
+    :raise ValueError: if a link is not valid, or the links between the
+      nodes would generate a loop
+    """
+    to_store = {}
+    for node in nodes:
+        if not isinstance(node, node_class):
+            raise TypeError("Only nodes can be stored, got {} "
+                            "instead".format(type(node)))
+        if node.is_stored:
+            raise ModificationNotAllowed(
+                "Node with pk= {} was already stored".format(node.pk))
+        to_store[id(node)] = node
+
+    for node in to_store.itervalues():
+        for label, (src, _) in node._inputlinks_cache.iteritems():
+            if not src.is_stored and id(src) not in to_store:
+                raise ModificationNotAllowed(
+                    "Cannot store the input link '{}' of node (UUID={}) "
+                    "because the source node is neither stored nor in the "
+                    "list of nodes to store".format(label, node.uuid))
+
+    for node in to_store.itervalues():
+        _check_cached_links(node, node_class)
+
+    def get_unstored_parents(node):
+        return [src for src, _ in node._inputlinks_cache.itervalues()
+                if id(src) in to_store]
+
+    # Depth-first topological sort, without recursion as the chains of
+    # nodes can be long
+    ordered = []
+    done = set()
+    visiting = set()
+    for root in nodes:
+        if id(root) in done:
+            continue
+        visiting.add(id(root))
+        stack = [(root, iter(get_unstored_parents(root)))]
+        while stack:
+            node, parents = stack[-1]
+            for parent in parents:
+                if id(parent) in visiting:
+                    raise ValueError("The links between the nodes to store "
+                                     "would generate a loop")
+                if id(parent) not in done:
+                    visiting.add(id(parent))
+                    stack.append(
+                        (parent, iter(get_unstored_parents(parent))))
+                    break
+            else:
+                stack.pop()
+                visiting.discard(id(node))
+                done.add(id(node))
+                ordered.append(node)
+
+    return ordered
+
+
+def _check_cached_links(node, node_class):
+    """
+    Apply to the cached input links of a node stored by store_nodes the
+    checks done by _add_dblink_from when the links are stored one by one,
+    since links can be put in the cache without them (see
+    _replace_link_from). The loops are detected when sorting the nodes:
+    a stored node cannot be a descendant of an unstored one.
+
+    :raise ValueError: if a link is not valid
+    """
+    from aiida.orm.data import Data
+
+    num_create_links = 0
+    for label, (src, link_type) in node._inputlinks_cache.iteritems():
+        if not isinstance(src, node_class):
+            raise ValueError("src must be a Node instance")
+        if src is node:
+            raise ValueError("Cannot link to itself")
+        if not isinstance(link_type, LinkType):
+            raise ValueError("The type of the link '{}' of node (UUID={}) "
+                             "is not a LinkType".format(label, node.uuid))
+        src._linking_as_output(node, link_type)
+        if link_type is LinkType.CREATE:
+            num_create_links += 1
+
+    if isinstance(node, Data) and num_create_links > 1:
+        raise ValueError("At most one CREATE node can enter a data node")
+
+
+def _move_to_repository(nodes):
+    """
+    Move the sandbox folders of the given unstored nodes to their
+    repository folders. If a move fails, the folders already moved are
+    put back in their sandbox before raising.
+    """
+    moved = []
+    try:
+        for node in nodes:
+            if node._temp_folder is None:
+                # No file was ever added: just create the empty folders
+                # instead of creating a sandbox and moving it
+                node._repository_folder.erase()
+                node._repository_folder.get_subfolder(
+                    node._path_subfolder_name, create=True)
+            else:
+                node._repository_folder.replace_with_folder(
+                    node._temp_folder.abspath, move=True, overwrite=True)
+            moved.append(node)
+    except:
+        _move_back_to_sandbox(moved)
+        raise
+
+
+def _move_back_to_sandbox(nodes):
+    """
+    Put back the repository folders of the given nodes, that could not be
+    stored, in a sandbox folder.
+    """
+    for node in nodes:
+        node._get_temp_folder().replace_with_folder(
+            node._repository_folder.abspath, move=True, overwrite=True)
+
+
+def _finalize_bulk_store(nodes):
+    """
+    Update the internal state of the given nodes, just stored (with their
+    links) by store_nodes, and add them to the current autogroup, if any.
+    """
+    import aiida.orm.autogroup
+    from aiida.common.exceptions import ValidationError
+
+    for node in nodes:
+        # This should not be used anymore: I delete it to
+        # possibly free memory
+        del node._attrs_cache
+        node._temp_folder = None
+        node._to_be_stored = False
+        node._inputlinks_cache.clear()
+
+    # Set up autogrouping used be verdi run
+    autogroup = aiida.orm.autogroup.current_autogroup
+    grouptype = aiida.orm.autogroup.VERDIAUTOGROUP_TYPE
+    if autogroup is not None:
+        if not isinstance(autogroup, aiida.orm.autogroup.Autogroup):
+            raise ValidationError("current_autogroup is not an AiiDA Autogroup")
+        group_name = autogroup.get_group_name()
+        to_group = [n for n in nodes if autogroup.is_to_be_grouped(n)]
+        if group_name is not None and to_group:
+            from aiida.orm import Group
+
+            g = Group.get_or_create(name=group_name, type_string=grouptype)[0]
+            g.add_nodes(to_group)
@@ -12,6 +12,7 @@ import datetime
 # XXX to remove when we implements the settings/tasks using SQLA
 from dateutil.parser import parse
 
+from sqlalchemy import and_
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import joinedload
 
@@ -23,6 +24,7 @@ from aiida.backends import sqlalchemy as sa
 from aiida.backends.sqlalchemy.utils import get_automatic_user
 from aiida.backends.sqlalchemy.models.node import DbNode, DbCalcState
 from aiida.backends.sqlalchemy.models.group import DbGroup
+from aiida.daemon.notifications import notify_calculation_state
 
 from aiida.orm.implementation.sqlalchemy.utils import django_filter
 from aiida.orm.implementation.sqlalchemy.calculation import Calculation
@@ -39,17 +41,18 @@ class JobCalculation(AbstractJobCalculation, Calculation):
         """
         Set the state of the calculation.
 
-        Set it in the DbCalcState to have also the uniqueness check.
+        Set it in the DbCalcState to have also the uniqueness check, and in
+        the calc_state column of the node, with a compare-and-set update in
+        the same transaction: if the state was changed in the meantime by
+        someone else, nothing is written.
         Moreover (except for the IMPORTED state) also store in the 'state'
         attribute, useful to know it also after importing, and for faster
         querying.
 
-        .. todo:: Add further checks to enforce that the states are set
-           in order?
-
         :param state: a string with the state. This must be a valid string,
           from ``aiida.common.datastructures.calc_states``.
-        :raise: ModificationNotAllowed if the given state was already set.
+        :raise: ModificationNotAllowed if the given state was already set,
+          or if the state was changed concurrently.
         """
 
         if self._to_be_stored:
@@ -70,13 +73,29 @@ class JobCalculation(AbstractJobCalculation, Calculation):
                 raise ModificationNotAllowed("Cannot change the state from {} "
                                              "to {}".format(old_state, state))
 
+        session = sa.get_scoped_session()
         try:
-            new_state = DbCalcState(dbnode=self.dbnode, state=state).save()
+            session.add(DbCalcState(dbnode=self.dbnode, state=state))
+            session.flush()
         except SQLAlchemyError:
-            self.dbnode.session.rollback()
+            session.rollback()
             raise ModificationNotAllowed("Calculation pk= {} already transited through "
                                          "the state {}".format(self.pk, state))
 
+        # Compare-and-set: only move on from the state we have just read
+        node_table = DbNode.__table__
+        updated = session.execute(node_table.update().where(and_(
+            node_table.c.id == self.pk,
+            node_table.c.calc_state == old_state)).values(
+            calc_state=state)).rowcount
+        if not updated:
+            session.rollback()
+            raise ModificationNotAllowed(
+                "The state of calculation pk= {} was changed while setting "
+                "it to {}".format(self.pk, state))
+        session.commit()
+        notify_calculation_state(self.pk, state)
+
         # For non-imported states, also set in the attribute (so that, if we
         # export, we can still see the original state the calculation had.
         if state != calc_states.IMPORTED:
@@ -101,11 +120,10 @@ class JobCalculation(AbstractJobCalculation, Calculation):
             if self._to_be_stored:
                 state_to_return = calc_states.NEW
             else:
-                # In the sqlalchemy model, the state
-                most_recent_state = self.dbnode.state
-                if most_recent_state:
-                    state_to_return = most_recent_state.value
-                else:
-                    state_to_return = None
+                # The most recent state is kept in the calc_state column:
+                # read it from the database, as it can be changed by other
+                # processes (e.g. the daemon)
+                state_to_return = sa.get_scoped_session().query(
+                    DbNode.calc_state).filter(DbNode.id == self.pk).scalar()
         return state_to_return
 
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+
+from aiida.backends.sqlalchemy import get_scoped_session
+from aiida.backends.sqlalchemy.models.checkpoint import DbCheckpoint
+from aiida.backends.sqlalchemy.models.node import DbNode
+from aiida.orm.implementation.general.checkpoint import AbstractCheckpointStore
+from aiida.common.exceptions import NotExistent
+from aiida.utils import timezone
+
+
+class CheckpointStore(AbstractCheckpointStore):
+    def save(self, pid, state, waiting_on_pk, checkpoint):
+        session = get_scoped_session()
+        values = dict(state=state, waiting_on_pk=waiting_on_pk,
+                      checkpoint=checkpoint, mtime=timezone.now())
+        try:
+            if not session.query(DbCheckpoint).filter(
+                    DbCheckpoint.pid == pid).update(
+                    values, synchronize_session=False):
+                session.add(DbCheckpoint(pid=pid, **values))
+            session.commit()
+        except:
+            session.rollback()
+            raise
+
+    def exists(self, pid):
+        session = get_scoped_session()
+        return session.query(session.query(DbCheckpoint).filter(
+            DbCheckpoint.pid == pid).exists()).scalar()
+
+    def load(self, pid):
+        session = get_scoped_session()
+        checkpoint = session.query(DbCheckpoint.checkpoint).filter(
+            DbCheckpoint.pid == pid).scalar()
+        if checkpoint is None:
+            raise NotExistent("No checkpoint for process {}".format(pid))
+        return bytes(checkpoint)
+
+    def set_state(self, pid, state):
+        session = get_scoped_session()
+        try:
+            updated = session.query(DbCheckpoint).filter(
+                DbCheckpoint.pid == pid).update(
+                {'state': state, 'mtime': timezone.now()},
+                synchronize_session=False)
+            session.commit()
+        except:
+            session.rollback()
+            raise
+        if not updated:
+            raise NotExistent("No checkpoint for process {}".format(pid))
+
+    @staticmethod
+    def _is_blocked(blocking_calc_states):
+        session = get_scoped_session()
+        return DbCheckpoint.waiting_on_pk.in_(
+            session.query(DbNode.id).filter(
+                DbNode.calc_state.in_(blocking_calc_states)))
+
+    def get_ready(self, state, blocking_calc_states, after_pid=None,
+                  limit=None):
+        session = get_scoped_session()
+        query = session.query(DbCheckpoint.pid, DbCheckpoint.checkpoint).filter(
+            DbCheckpoint.state == state)
+        if blocking_calc_states:
+            # The waiting_on_pk is NULL for the processes not waiting on
+            # a calculation, for which the IN condition is NULL and not False
+            query = query.filter((DbCheckpoint.waiting_on_pk == None) |
+                                 ~self._is_blocked(blocking_calc_states))
+        if after_pid is not None:
+            query = query.filter(DbCheckpoint.pid > after_pid)
+        query = query.order_by(DbCheckpoint.pid)
+        if limit is not None:
+            query = query.limit(limit)
+        return [(pid, bytes(checkpoint)) for pid, checkpoint in query]
+
+    def has_blocked(self, state, blocking_calc_states):
+        session = get_scoped_session()
+        return session.query(session.query(DbCheckpoint).filter(
+            DbCheckpoint.state == state,
+            self._is_blocked(blocking_calc_states)).exists()).scalar()
+
+    def clear_all(self):
+        session = get_scoped_session()
+        try:
+            session.query(DbCheckpoint).delete()
+            session.commit()
+        except:
+            session.rollback()
+            raise
@@ -12,7 +12,10 @@ import collections
 
 from copy import copy
 
+from sqlalchemy import (and_, except_, exists, intersect, literal, select,
+                        union)
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql.expression import Selectable
 from sqlalchemy.orm.session import make_transient
 
 from aiida.backends import sqlalchemy as sa
@@ -133,46 +136,68 @@ class Group(AbstractGroup):
 
         return self
 
-    def add_nodes(self, nodes):
-        if not self.is_stored:
-            raise ModificationNotAllowed("Cannot add nodes to a group before "
-                                         "storing")
+    def _get_node_ids(self, nodes, method_name):
+        """
+        Return the ids of the given nodes, either as a list of pks or, if a
+        QueryBuilder is passed, as a subquery to be run in the database.
+        """
         from aiida.orm.implementation.sqlalchemy.node import Node
-        from aiida.backends.sqlalchemy import get_scoped_session
-        session = get_scoped_session()
+        from aiida.orm.querybuilder import QueryBuilder
+
+        if isinstance(nodes, QueryBuilder):
+            return select([self._get_querybuilder_ids_column(nodes)])
 
         # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
+        if isinstance(nodes, (Node, DbNode, int, long)):
             nodes = [nodes]
 
         if isinstance(nodes, basestring) or not isinstance(
                 nodes, collections.Iterable):
             raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "add_nodes, can only be a Node, DbNode, or a list "
-                            "of such objects, it is instead {}".format(
-                str(type(nodes))))
+                            "{}, can only be a Node, DbNode, pk, a list "
+                            "of such objects or a QueryBuilder, it is "
+                            "instead {}".format(method_name,
+                                                str(type(nodes))))
 
-        list_nodes = []
+        node_ids = []
         for node in nodes:
+            if isinstance(node, (int, long)):
+                node_ids.append(node)
+                continue
             if not isinstance(node, (Node, DbNode)):
                 raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
-
+                                "to {}, it should be either a Node, a "
+                                "DbNode or a pk, it is instead {}".format(
+                    method_name, str(type(node))))
             if node.id is None:
                 raise ValueError("At least one of the provided nodes is "
                                  "unstored, stopping...")
-            if isinstance(node, Node):
-                to_add = node.dbnode
-            else:
-                to_add = node
+            node_ids.append(node.id)
+
+        return node_ids
 
-            if to_add not in self._dbgroup.dbnodes:
-                # ~ list_nodes.append(to_add)
-                self._dbgroup.dbnodes.append(to_add)
+    def add_nodes(self, nodes):
+        if not self.is_stored:
+            raise ModificationNotAllowed("Cannot add nodes to a group before "
+                                         "storing")
+        session = sa.get_scoped_session()
+
+        node_ids = self._get_node_ids(nodes, 'add_nodes')
+        if not isinstance(node_ids, Selectable) and not node_ids:
+            return
+
+        # A single INSERT ... SELECT, skipping the nodes already in the group
+        # (there is no unique constraint on the table to rely on)
+        membership = table_groups_nodes.c
+        already_in_group = exists().where(and_(
+            membership.dbgroup_id == self.pk,
+            membership.dbnode_id == DbNode.id))
+        new_members = select([literal(self.pk), DbNode.id]).where(and_(
+            DbNode.id.in_(node_ids), ~already_in_group))
+
+        session.execute(table_groups_nodes.insert().from_select(
+            ['dbgroup_id', 'dbnode_id'], new_members))
         session.commit()
-        # ~ self._dbgroup.dbnodes.extend(list_nodes)
 
     @property
     def nodes(self):
@@ -204,40 +229,33 @@ class Group(AbstractGroup):
         if not self.is_stored:
             raise ModificationNotAllowed("Cannot remove nodes from a group "
                                          "before storing")
+        session = sa.get_scoped_session()
 
-        from aiida.orm.implementation.sqlalchemy.node import Node
-        # First convert to a list
-        if isinstance(nodes, (Node, DbNode)):
-            nodes = [nodes]
+        node_ids = self._get_node_ids(nodes, 'remove_nodes')
+        if not isinstance(node_ids, Selectable) and not node_ids:
+            return
 
-        if isinstance(nodes, basestring) or not isinstance(
-                nodes, collections.Iterable):
-            raise TypeError("Invalid type passed as the 'nodes' parameter to "
-                            "remove_nodes, can only be a Node, DbNode, or a "
-                            "list of such objects, it is instead {}".format(
-                str(type(nodes))))
+        membership = table_groups_nodes.c
+        session.execute(table_groups_nodes.delete().where(and_(
+            membership.dbgroup_id == self.pk,
+            membership.dbnode_id.in_(node_ids))))
+        session.commit()
 
-        list_nodes = []
-        for node in nodes:
-            if not isinstance(node, (Node, DbNode)):
-                raise TypeError("Invalid type of one of the elements passed "
-                                "to add_nodes, it should be either a Node or "
-                                "a DbNode, it is instead {}".format(
-                    str(type(node))))
-            if node.id is None:
-                raise ValueError("At least one of the provided nodes is "
-                                 "unstored, stopping...")
-            if isinstance(node, Node):
-                node = node.dbnode
-            # If we don't check first, SqlA might issue a DELETE statement for
-            # an unexisting key, resulting in an error
-            if node in self._dbgroup.dbnodes:
-                list_nodes.append(node)
+    def _add_nodes_from_groups(self, groups, operator):
+        set_operations = {'UNION': union, 'INTERSECT': intersect,
+                          'EXCEPT': except_}
+        session = sa.get_scoped_session()
 
-        for node in list_nodes:
-            self._dbgroup.dbnodes.remove(node)
+        membership = table_groups_nodes.c
+        members = set_operations[operator](*[
+            select([membership.dbnode_id]).where(
+                membership.dbgroup_id == group.pk)
+            for group in groups]).alias('members')
 
-        sa.get_scoped_session().commit()
+        session.execute(table_groups_nodes.insert().from_select(
+            ['dbgroup_id', 'dbnode_id'],
+            select([literal(self.pk), members.c.dbnode_id])))
+        session.commit()
 
     @classmethod
     def query(cls, name=None, type_string="", pk=None, uuid=None, nodes=None,
@@ -10,6 +10,7 @@
 from __future__ import absolute_import
 
 import copy
+from contextlib import contextmanager
 
 from sqlalchemy import literal
 from sqlalchemy.exc import SQLAlchemyError, ProgrammingError
@@ -193,9 +194,11 @@ class Node(AbstractNode):
         if link is not None:
             session.delete(link)
 
-    def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
-        from aiida.backends.sqlalchemy import get_scoped_session
-        session = get_scoped_session()
+    def _check_dblink_from(self, src, link_type):
+        """
+        Raise if a link from src to the current node cannot be added to
+        the DB.
+        """
         if not isinstance(src, Node):
             raise ValueError("src must be a Node instance")
         if self.uuid == src.uuid:
@@ -210,30 +213,39 @@ class Node(AbstractNode):
                 "Cannot call the internal _add_dblink_from if the "
                 "source node is not stored")
 
-        # Check for cycles. This works if the transitive closure is enabled; if
-        # it isn't, this test will never fail, but then having a circular link
-        # is not meaningful but does not pose a huge threat
+        # Check for cycles.
         #
-        # I am linking src->self; a loop would be created if a DbPath exists
-        # already in the TC table from self to src
+        # I am linking src->self; a loop would be created if src is already
+        # a descendant of self
         if link_type is LinkType.CREATE or link_type is LinkType.INPUT:
-            c = session.query(literal(True)).filter(DbPath.query
-                                                .filter_by(parent_id=self.dbnode.id, child_id=src.dbnode.id)
-                                                .exists()).scalar()
-            if c:
+            if self._has_descendant(src):
                 raise ValueError(
                     "The link you are attempting to create would generate a loop")
 
-        if label is None:
-            autolabel_idx = 1
+    def _get_next_autolabel_index(self):
+        """
+        Return the index of the next automatic label ('link_<index>') for an
+        input link of the current node: one more than the largest index
+        used so far, found with a single query.
+        """
+        from sqlalchemy import Integer, cast, func
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
 
-            existing_from_autolabels = session.query(DbLink.label).filter(
-                DbLink.output_id == self.dbnode.id,
-                DbLink.label.like("link%")
-            )
+        max_index = session.query(
+            func.max(cast(func.substr(DbLink.label, len("link_") + 1),
+                          Integer))
+        ).filter(
+            DbLink.output_id == self.dbnode.id,
+            DbLink.label.op('~')('^link_[0-9]+$')
+        ).scalar()
+        return 1 if max_index is None else max_index + 1
 
-            while "link_{}".format(autolabel_idx) in existing_from_autolabels:
-                autolabel_idx += 1
+    def _add_dblink_from(self, src, label=None, link_type=LinkType.UNSPECIFIED):
+        self._check_dblink_from(src, link_type)
+
+        if label is None:
+            autolabel_idx = self._get_next_autolabel_index()
 
             safety_counter = 0
             while True:
@@ -253,6 +265,34 @@ class Node(AbstractNode):
         else:
             self._do_create_link(src, label, link_type)
 
+    def _add_dblinks_from(self, links):
+        from aiida.backends.sqlalchemy import get_scoped_session
+        session = get_scoped_session()
+
+        for src, _, link_type in links:
+            self._check_dblink_from(src, link_type)
+
+        autolabel_idx = None
+        rows = []
+        for src, label, link_type in links:
+            if label is None:
+                if autolabel_idx is None:
+                    autolabel_idx = self._get_next_autolabel_index()
+                label = "link_{}".format(autolabel_idx)
+                autolabel_idx += 1
+            rows.append({'input_id': src.dbnode.id,
+                         'output_id': self.dbnode.id,
+                         'label': label,
+                         'type': link_type.value})
+
+        try:
+            with session.begin_nested():
+                _insert_rows(session, DbLink.__table__, rows)
+        except SQLAlchemyError as e:
+            raise UniquenessError("There is already a link with the same "
+                                  "name (raw message was {})"
+                                  "".format(e))
+
     def _do_create_link(self, src, label, link_type):
         from aiida.backends.sqlalchemy import get_scoped_session
         session = get_scoped_session()
@@ -296,7 +336,6 @@ class Node(AbstractNode):
         """
         try:
             self.dbnode.set_attr(key, value)
-            self._increment_version_number_db()
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -306,7 +345,6 @@ class Node(AbstractNode):
     def _del_db_attr(self, key):
         try:
             self.dbnode.del_attr(key)
-            self._increment_version_number_db()
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -326,7 +364,15 @@ class Node(AbstractNode):
 
         try:
             self.dbnode.set_extra(key, value)
-            self._increment_version_number_db()
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
+    def _set_db_extras(self, extras):
+        try:
+            self.dbnode.set_extras(extras)
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
@@ -353,13 +399,30 @@ class Node(AbstractNode):
     def _del_db_extra(self, key):
         try:
             self.dbnode.del_extra(key)
-            self._increment_version_number_db()
         except:
             from aiida.backends.sqlalchemy import get_scoped_session
             session = get_scoped_session()
             session.rollback()
             raise
 
+    def _del_db_extras(self, keys):
+        try:
+            self.dbnode.del_extras(keys)
+        except:
+            from aiida.backends.sqlalchemy import get_scoped_session
+            session = get_scoped_session()
+            session.rollback()
+            raise
+
+    @contextmanager
+    def coalesce_updates(self):
+        """
+        Return a context manager within which the changes to the attributes
+        and to the extras of this (stored) node are written to the database
+        with a single UPDATE, when the context is exited.
+        """
+        with self.dbnode.coalesce_updates():
+            yield
 
     def _db_iterextras(self):
         if self.dbnode.extras is None:
@@ -691,14 +754,197 @@ class Node(AbstractNode):
 
         return self
 
+    def _has_descendant(self, node):
+        """
+        Return True if the given (stored) node is a descendant of this one,
+        using the DbPath table if enabled in the profile, or otherwise a
+        recursive query on the links.
+        """
+        from sqlalchemy import exists, select
+        from aiida.backends import settings
+        from aiida.backends.sqlalchemy import get_scoped_session
+
+        session = get_scoped_session()
+
+        if settings.USE_DBPATH:
+            return session.query(literal(True)).filter(
+                DbPath.query.filter_by(parent_id=self.dbnode.id,
+                                       child_id=node.dbnode.id).exists()
+            ).scalar() is not None
+
+        links = DbLink.__table__
+        descendants = select([links.c.output_id.label('id')]).where(
+            links.c.input_id == self.dbnode.id).cte(name='descendants',
+                                                    recursive=True)
+        descendants_alias = descendants.alias()
+        links_alias = links.alias()
+        descendants = descendants.union(
+            select([links_alias.c.output_id]).where(
+                links_alias.c.input_id == descendants_alias.c.id))
+
+        return session.query(
+            exists().where(descendants.c.id == node.dbnode.id)).scalar()
+
     @property
     def has_children(self):
-        return self.dbnode.children_q.first() is not None
+        # A node has descendants if and only if it has outputs: no need to
+        # look at the transitive closure
+        return self.dbnode.outputs_q.first() is not None
 
     @property
     def has_parents(self):
-        return self.dbnode.parents_q.first() is not None
+        return self.dbnode.inputs_q.first() is not None
 
     @property
     def uuid(self):
         return unicode(self.dbnode.uuid)
+
+
+# Maximum number of rows inserted by a single INSERT in store_nodes
+_BULK_STORE_BATCH_SIZE = 1000
+
+
+def _insert_rows(session, table, rows):
+    """
+    Insert the given rows (dictionaries) in the table, with multi-row
+    INSERT statements of at most _BULK_STORE_BATCH_SIZE rows each.
+    """
+    for start in range(0, len(rows), _BULK_STORE_BATCH_SIZE):
+        session.execute(table.insert().values(
+            rows[start:start + _BULK_STORE_BATCH_SIZE]))
+
+
+def store_nodes(nodes, with_transaction=True):
+    """
+    Store a list of unstored nodes in a single transaction, together with
+    their cached input links, issuing multi-row INSERTs for the nodes
+    (including their attributes) and the links instead of a few queries
+    per node.
+
+    The input links of the nodes must come from nodes that are either
+    already stored or in the list. Nodes whose class customizes the
+    store() method (e.g. calculations, that also set their state) are
+    stored with their own store(), in the same transaction.
+
+    :param nodes: an iterable of unstored nodes
+    :parameter with_transaction: if False, no transaction is used. This
+      is meant to be used ONLY if the outer calling function has already
+      a transaction open!
+    :return: the list of nodes
+    :raise ModificationNotAllowed: if a node is already stored, or has
+      an input link from a node that is neither stored nor in the list
+    :raise ValueError: if a link is not valid, or the links between the
+      nodes would generate a loop
+    """
+    from sqlalchemy.orm.session import make_transient, \
+        make_transient_to_detached
+    from aiida.backends.sqlalchemy import get_scoped_session
+    from aiida.orm.implementation.general.node import (
+        _has_default_store, _get_bulk_store_order, _move_to_repository,
+        _move_back_to_sandbox, _finalize_bulk_store)
+    from aiida.utils import timezone
+
+    session = get_scoped_session()
+
+    nodes = list(nodes)
+    ordered = _get_bulk_store_order(nodes, Node)
+    to_insert = [n for n in ordered if _has_default_store(n, Node)]
+    to_store = [n for n in ordered if not _has_default_store(n, Node)]
+
+    for node in to_insert:
+        node._validate()
+
+    # As in store(), I first store the files, then the DB entries
+    _move_to_repository(to_insert)
+    try:
+        if to_insert:
+            # Get the primary keys in advance, so that a single INSERT
+            # can be used for many nodes
+            ids = [row[0] for row in session.execute(
+                "SELECT nextval(pg_get_serial_sequence('db_dbnode', 'id')) "
+                "FROM generate_series(1, :num)", {'num': len(to_insert)})]
+        else:
+            ids = []
+
+        rows = []
+        now = timezone.now()
+        for node, pk in zip(to_insert, ids):
+            dbnode = node.dbnode
+            if dbnode in session:
+                session.expunge(dbnode)
+            dbnode.id = pk
+            dbnode.attributes = node._attrs_cache
+            if dbnode.ctime is None:
+                dbnode.ctime = now
+            dbnode.mtime = now
+            if dbnode.nodeversion is None:
+                dbnode.nodeversion = 1
+            if dbnode.public is None:
+                dbnode.public = False
+            if dbnode.label is None:
+                dbnode.label = ""
+            if dbnode.description is None:
+                dbnode.description = ""
+            if dbnode.user is not None:
+                dbnode.user_id = dbnode.user.id
+            if dbnode.dbcomputer is not None:
+                dbnode.dbcomputer_id = dbnode.dbcomputer.id
+            rows.append({
+                'id': dbnode.id,
+                'uuid': dbnode.uuid,
+                'type': dbnode.type,
+                'label': dbnode.label,
+                'description': dbnode.description,
+                'ctime': dbnode.ctime,
+                'mtime': dbnode.mtime,
+                'nodeversion': dbnode.nodeversion,
+                'public': dbnode.public,
+                'attributes': dbnode.attributes,
+                'extras': dbnode.extras,
+                'dbcomputer_id': dbnode.dbcomputer_id,
+                'user_id': dbnode.user_id,
+            })
+        _insert_rows(session, DbNode.__table__, rows)
+
+        # The rows are in the DB: attach the objects to the session as
+        # persistent objects, without issuing further INSERTs
+        for node in to_insert:
+            make_transient_to_detached(node.dbnode)
+            session.add(node.dbnode)
+            node._to_be_stored = False
+
+        # The parents of these nodes are already stored at this point
+        for node in to_store:
+            node.store(with_transaction=False)
+        session.flush()
+
+        links = []
+        for node in to_insert:
+            for label, (src, link_type) in \
+                    node._inputlinks_cache.iteritems():
+                links.append({'input_id': src.dbnode.id,
+                              'output_id': node.dbnode.id,
+                              'label': label,
+                              'type': link_type.value})
+        _insert_rows(session, DbLink.__table__, links)
+
+        if with_transaction:
+            session.commit()
+
+    # This is one of the few cases where it is ok to do a 'global'
+    # except, also because I am re-raising the exception
+    except:
+        if with_transaction:
+            session.rollback()
+        for node in to_insert:
+            if node.dbnode in session:
+                session.expunge(node.dbnode)
+            make_transient(node.dbnode)
+            node.dbnode.id = None
+            node._to_be_stored = True
+        _move_back_to_sandbox(to_insert)
+        raise
+
+    _finalize_bulk_store(to_insert)
+
+    return nodes
@@ -23,6 +23,7 @@ from aiida.common.exceptions import (InternalError, ModificationNotAllowed,
                                      AiidaException)
 from aiida.common.folders import RepositoryFolder, SandboxFolder
 from aiida.common.utils import md5_file, str_timedelta
+from aiida.daemon.notifications import notify_workflow_state
 from aiida.orm.implementation.general.workflow import AbstractWorkflow
 from aiida.orm.implementation.sqlalchemy.utils import django_filter
 from aiida.utils import timezone
@@ -410,6 +411,8 @@ class Workflow(AbstractWorkflow):
         :param name: a state from wf_states in aiida.common.datastructures
         """
         self.dbworkflowinstance.set_state(state)
+        # The steps waiting on this workflow (as a subworkflow) can continue
+        notify_workflow_state(self.pk, state)
 
     def is_new(self):
         """
@@ -736,6 +739,52 @@ def get_all_running_steps():
     from aiida.backends.sqlalchemy.models.workflow import DbWorkflowStep
     return DbWorkflowStep.query.filter_by(state=wf_states.RUNNING).all()
 
+def get_running_steps_with_states():
+    """
+    Return all the RUNNING steps, together with the states of their
+    calculations and sub-workflows, using three queries in total.
+
+    :return: a list of tuples ``(step, calc_states, sub_workflow_states)``,
+      where ``step`` is a DbWorkflowStep (with its parent DbWorkflow already
+      loaded), ``calc_states`` a dictionary mapping the pk of each
+      JobCalculation of the step to its state, and ``sub_workflow_states``
+      a dictionary mapping the pk of each sub-workflow of the step to its
+      state.
+    """
+    from collections import defaultdict
+    from sqlalchemy.orm import joinedload
+    from aiida.backends.sqlalchemy.models.workflow import (
+        table_workflowstep_calc, table_workflowstep_subworkflow)
+
+    session = sa.get_scoped_session()
+
+    steps = DbWorkflowStep.query.options(joinedload('parent')).filter_by(
+        state=wf_states.RUNNING).all()
+    step_pks = [step.id for step in steps]
+
+    calc_states = defaultdict(dict)
+    sub_workflow_states = defaultdict(dict)
+    if step_pks:
+        step_calc = table_workflowstep_calc.c
+        for step_pk, calc_pk, state in session.query(
+                step_calc.dbworkflowstep_id, DbNode.id,
+                DbNode.calc_state).join(
+                DbNode, DbNode.id == step_calc.dbnode_id).filter(
+                step_calc.dbworkflowstep_id.in_(step_pks),
+                DbNode.type.like('calculation.job.%')):
+            calc_states[step_pk][calc_pk] = state
+
+        step_sub_wf = table_workflowstep_subworkflow.c
+        for step_pk, sub_wf_pk, state in session.query(
+                step_sub_wf.dbworkflowstep_id, DbWorkflow.id,
+                DbWorkflow.state).join(
+                DbWorkflow, DbWorkflow.id == step_sub_wf.dbworkflow_id).filter(
+                step_sub_wf.dbworkflowstep_id.in_(step_pks)):
+            sub_workflow_states[step_pk][sub_wf_pk] = state
+
+    return [(step, calc_states[step.id], sub_workflow_states[step.id])
+            for step in steps]
+
 def get_workflow_info(w, tab_size=2, short=False, pre_string="",
                       depth=16):
     """
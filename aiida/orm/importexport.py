@@ -17,6 +17,21 @@ from aiida.common.utils import (export_shard_uuid, get_class_string,
 
 IMPORTGROUP_TYPE = 'aiida.import'
 COMP_DUPL_SUFFIX = ' (Imported #{})'
+# Subfolder of a streamed export containing the data, in chunks of
+# newline-delimited JSON (instead of a single data.json file)
+EXPORT_DATA_SUBFOLDER = 'data'
+# Number of records (and of nodes per query) handled at a time by export
+EXPORT_CHUNK_SIZE = 1000
+# Name of the manifest of the node folders copied by a resumable export,
+# in the folder where the files are collected
+EXPORT_MANIFEST_NAME = '.manifest'
+# Version of the streamed and delta exports, that cannot be read by the
+# importers of the version 0.2. The other exports are still written with
+# the version 0.2, so that older versions of AiiDA can import them.
+EXPORT_VERSION = '0.3'
+BASE_EXPORT_VERSION = '0.2'
+# The export versions that can be imported
+IMPORT_EXPORT_VERSIONS = (BASE_EXPORT_VERSION, EXPORT_VERSION)
 
 
 def deserialize_attributes(attributes_data, conversion_data):
@@ -107,8 +122,10 @@ def extract_zip(infile, folder, nodes_export_subfolder="nodes",
 
             zip.extract(path=folder.abspath,
                    member='metadata.json')
-            zip.extract(path=folder.abspath,
-                   member='data.json')
+            # Streamed exports have no data.json, but the data subfolder
+            if 'data.json' in zip.namelist():
+                zip.extract(path=folder.abspath,
+                       member='data.json')
 
             if not silent:
                 print "EXTRACTING NODE DATA..."
@@ -118,7 +135,9 @@ def extract_zip(infile, folder, nodes_export_subfolder="nodes",
                 # the subfolder!
                 # TODO: better check such that there are no .. in the
                 # path; use probably the folder limit checks
-                if not membername.startswith(nodes_export_subfolder+os.sep):
+                if not membername.startswith(
+                        (nodes_export_subfolder+os.sep,
+                         EXPORT_DATA_SUBFOLDER+os.sep)):
                     continue
                 zip.extract(path=folder.abspath,
                             member=membername)
@@ -148,8 +167,12 @@ def extract_tar(infile, folder, nodes_export_subfolder="nodes",
 
             tar.extract(path=folder.abspath,
                    member=tar.getmember('metadata.json'))
-            tar.extract(path=folder.abspath,
-                   member=tar.getmember('data.json'))
+            try:
+                tar.extract(path=folder.abspath,
+                       member=tar.getmember('data.json'))
+            except KeyError:
+                # Streamed exports have no data.json, but the data subfolder
+                pass
 
             if not silent:
                 print "EXTRACTING NODE DATA..."
@@ -170,7 +193,9 @@ def extract_tar(infile, folder, nodes_export_subfolder="nodes",
                 # the subfolder!
                 # TODO: better check such that there are no .. in the
                 # path; use probably the folder limit checks
-                if not member.name.startswith(nodes_export_subfolder+os.sep):
+                if not member.name.startswith(
+                        (nodes_export_subfolder+os.sep,
+                         EXPORT_DATA_SUBFOLDER+os.sep)):
                     continue
                 tar.extract(path=folder.abspath,
                             member=member)
@@ -208,6 +233,284 @@ def extract_tree(infile, folder, silent=False):
     os.path.walk(infile,add_files,{'folder': folder,'root': infile})
 
 
+def extract_import_file(in_path, folder, silent=False,
+                        nodes_export_subfolder='nodes'):
+    """
+    Extract a file (or folder) to import in the given folder, detecting
+    its format (zip, tar.gz, tar.bz2, ...).
+
+    :param in_path: the path to a file or folder that can be imported
+    :param folder: a SandboxFolder, used to extract the file tree
+    :param silent: suppress debug print
+    :param nodes_export_subfolder: name of the subfolder for AiiDA nodes
+    :raise ValueError: if the format of the file is not recognized
+    """
+    import os
+    import tarfile
+    import zipfile
+
+    if os.path.isdir(in_path):
+        extract_tree(in_path,folder,silent=silent)
+    else:
+        if tarfile.is_tarfile(in_path):
+            extract_tar(in_path,folder,silent=silent,
+                        nodes_export_subfolder=nodes_export_subfolder)
+        elif zipfile.is_zipfile(in_path):
+            extract_zip(in_path,folder,silent=silent,
+                        nodes_export_subfolder=nodes_export_subfolder)
+        elif os.path.isfile(in_path) and in_path.endswith('.cif'):
+            extract_cif(in_path,folder,silent=silent,
+                        nodes_export_subfolder=nodes_export_subfolder)
+        else:
+            raise ValueError("Unable to detect the input file format, it "
+                             "is neither a (possibly compressed) tar file, "
+                             "nor a zip file.")
+
+
+def iter_export_records(folder, section, data=None):
+    """
+    Iterate over the records of a section of the data of an extracted
+    export file, in the format of the newline-delimited JSON files of
+    streamed exports (see :py:class:`ExportDataWriter`).
+
+    The records are read one chunk at a time from the data subfolder,
+    unless ``data`` is given.
+
+    :param folder: the folder where the export file was extracted
+    :param section: one of 'export_data' (records with the 'model', 'pk'
+        and 'fields' of a database entry), 'node_attributes' (with the 'pk',
+        'attributes' and 'conversion' of a node), 'links_uuid',
+        'groups_uuid' (with the 'uuid' of a group and its 'nodes') and
+        'snapshot' (see :py:class:`ExportSnapshot`, only in the data
+        subfolder)
+    :param data: the content of the data.json file, if the export is not
+        streamed
+    """
+    import json
+    import os
+
+    if data is not None:
+        if section == 'export_data':
+            for model_name, entries in data['export_data'].iteritems():
+                for pk, fields in entries.iteritems():
+                    yield {'model': model_name, 'pk': pk, 'fields': fields}
+        elif section == 'node_attributes':
+            conversions = data['node_attributes_conversion']
+            for pk, attributes in data['node_attributes'].iteritems():
+                yield {'pk': pk, 'attributes': attributes,
+                       'conversion': conversions[pk]}
+        elif section == 'links_uuid':
+            for link in data['links_uuid']:
+                yield link
+        elif section == 'groups_uuid':
+            for uuid, nodes in data['groups_uuid'].iteritems():
+                yield {'uuid': uuid, 'nodes': nodes}
+        return
+
+    datafolder = folder.get_subfolder(EXPORT_DATA_SUBFOLDER)
+    for fname in sorted(os.listdir(datafolder.abspath)):
+        # The files are named <section>.<chunk number>.ndjson
+        if fname.split('.', 1)[0] != section:
+            continue
+        with datafolder.open(fname) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def load_export_data(folder):
+    """
+    Load the data of an extracted export file, either from its data.json
+    file or, for streamed exports, from the newline-delimited JSON files in
+    the data subfolder.
+
+    :param folder: the folder where the export file was extracted
+    :return: a dictionary with the same content as data.json
+    :raise IOError: if the folder does not contain the data
+    """
+    import json
+
+    if (folder.isfile('data.json') or
+            not folder.isdir(EXPORT_DATA_SUBFOLDER)):
+        with open(folder.get_abs_path('data.json')) as f:
+            return json.load(f)
+
+    data = {
+        'node_attributes': {},
+        'node_attributes_conversion': {},
+        'export_data': {},
+        'links_uuid': [],
+        'groups_uuid': {},
+    }
+    for record in iter_export_records(folder, 'export_data'):
+        data['export_data'].setdefault(
+            record['model'], {})[str(record['pk'])] = record['fields']
+    for record in iter_export_records(folder, 'node_attributes'):
+        pk = str(record['pk'])
+        data['node_attributes'][pk] = record['attributes']
+        data['node_attributes_conversion'][pk] = record['conversion']
+    data['links_uuid'].extend(iter_export_records(folder, 'links_uuid'))
+    for record in iter_export_records(folder, 'groups_uuid'):
+        data['groups_uuid'][record['uuid']] = record['nodes']
+
+    return data
+
+
+def copy_node_folders(uuids, copy_folder, manifest=None, num_workers=None):
+    """
+    Copy the repository folders of many nodes, calling ``copy_folder(uuid)``
+    for each uuid on a pool of threads.
+
+    :param uuids: an iterable with the uuids of the nodes
+    :param copy_folder: a function copying the folder of the node with the
+        given uuid; it must be possible to call it again for a node whose
+        copy was interrupted
+    :param manifest: the path of a file listing the uuids (one per line) of
+        the nodes whose folder was already copied. These nodes are skipped,
+        and the uuid of each node is appended to the file as soon as its
+        folder is copied, so that an interrupted copy can be resumed by
+        passing the same manifest. If None, all the folders are copied.
+    :param num_workers: the number of threads; if None, the value of the
+        importexport.repository_workers property
+    :return: the number of folders copied
+    """
+    import itertools
+    import os
+    from multiprocessing.pool import ThreadPool
+
+    from aiida.common.setup import get_property
+    from aiida.common.utils import grouper
+
+    if num_workers is None:
+        num_workers = get_property('importexport.repository_workers')
+
+    done = set()
+    if manifest is not None and os.path.exists(manifest):
+        with open(manifest) as f:
+            done = set(line.strip() for line in f if line.strip())
+    to_copy = (str(uuid) for uuid in uuids if str(uuid) not in done)
+
+    def copy_and_return(uuid):
+        copy_folder(uuid)
+        return uuid
+
+    manifest_file = open(manifest, 'a') if manifest is not None else None
+    try:
+        if num_workers > 1:
+            pool = ThreadPool(num_workers)
+            # The uuids may come from database queries, so they are fetched
+            # here, one chunk at a time, rather than by the thread of the
+            # pool handing out the tasks. Iterating on the results re-raises
+            # the first exception
+            copied = itertools.chain.from_iterable(
+                pool.imap_unordered(copy_and_return, chunk)
+                for chunk in grouper(EXPORT_CHUNK_SIZE, to_copy))
+        else:
+            pool = None
+            copied = (copy_and_return(uuid) for uuid in to_copy)
+
+        num_copied = 0
+        try:
+            for uuid in copied:
+                num_copied += 1
+                if manifest_file is not None:
+                    manifest_file.write("{}\n".format(uuid))
+                    manifest_file.flush()
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+    finally:
+        if manifest_file is not None:
+            manifest_file.close()
+
+    return num_copied
+
+
+def export_node_folders(uuids, nodes_folder, manifest=None, num_workers=None):
+    """
+    Copy the repository folders of the given nodes in the folder of an
+    export file, with :py:func:`copy_node_folders`.
+
+    :param uuids: an iterable with the uuids of the nodes
+    :param nodes_folder: the subfolder of the export folder for the nodes;
+        the folders of a ZipFolder or of a TarFolder are written by a single
+        thread, and cannot be resumed
+    :param manifest: the path of the manifest, to resume an interrupted
+        export to a folder (see :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads
+    :return: the number of folders copied
+    """
+    from aiida.common.folders import Folder, RepositoryFolder
+    from aiida.orm import Node
+
+    if not isinstance(nodes_folder, Folder):
+        # Archives cannot be written concurrently, nor appended to
+        if manifest is not None:
+            raise ValueError("An export to an archive cannot be resumed")
+        num_workers = 1
+
+    def copy_folder(uuid):
+        # Important to set create=False, otherwise creates
+        # twice a subfolder. Maybe this is a bug of insert_path??
+        thisnodefolder = nodes_folder.get_subfolder(
+            export_shard_uuid(uuid), create=False,
+            reset_limit=True)
+        if isinstance(thisnodefolder, Folder) and thisnodefolder.exists():
+            # Partially copied by an interrupted export
+            thisnodefolder.erase()
+        # In this way, I copy the content of the folder, and not the
+        # folder itself
+        thisnodefolder.insert_path(src=RepositoryFolder(
+            section=Node._section_name, uuid=uuid).abspath,
+                                   dest_name='.')
+
+    return copy_node_folders(uuids, copy_folder, manifest=manifest,
+                             num_workers=num_workers)
+
+
+def import_node_folders(uuids, folder, nodes_export_subfolder='nodes',
+                        manifest=None, num_workers=None):
+    """
+    Move the repository folders of the given nodes from the folder where an
+    export file was extracted to the repository, with
+    :py:func:`copy_node_folders`.
+
+    :param uuids: an iterable with the uuids of the nodes
+    :param folder: the folder where the export file was extracted
+    :param nodes_export_subfolder: name of the subfolder for AiiDA nodes
+    :param manifest: the path of the manifest, to resume an interrupted
+        import (see :py:func:`copy_node_folders`); the folders listed in it
+        are already in the repository
+    :param num_workers: the number of threads
+    :return: the number of folders moved
+    :raise ValueError: if the folder of a node is not in the export file
+    """
+    import os
+
+    from aiida.common.folders import RepositoryFolder
+    from aiida.orm import Node
+
+    def move_folder(uuid):
+        subfolder = folder.get_subfolder(os.path.join(
+            nodes_export_subfolder, export_shard_uuid(uuid)))
+        if not subfolder.exists():
+            raise ValueError("Unable to find the repository "
+                             "folder for node with UUID={} "
+                             "in the exported "
+                             "file".format(uuid))
+        destdir = RepositoryFolder(section=Node._section_name, uuid=uuid)
+        # Replace the folder, possibly destroying existing
+        # previous folders, and move the files (faster if we
+        # are on the same filesystem, and
+        # in any case the source is a SandboxFolder)
+        destdir.replace_with_folder(subfolder.abspath,
+                                    move=True, overwrite=True)
+
+    return copy_node_folders(uuids, move_folder, manifest=manifest,
+                             num_workers=num_workers)
+
+
 def extract_cif(infile, folder, nodes_export_subfolder="nodes",
                 aiida_export_subfolder="aiida", silent=False):
     """
@@ -270,25 +573,181 @@ def extract_cif(infile, folder, nodes_export_subfolder="nodes",
                                       "file".format(dest_path))
 
 
-def import_data(in_path,ignore_unknown_nodes=False,
-                silent=False):
+# The fields of the existing nodes compared with the ones in a delta export
+# and, together with the attributes, replaced if they differ. The
+# nodeversion is not compared, since each database increments it on its own
+# (e.g. also when an extra is set)
+DELTA_UPDATED_FIELDS = ('label', 'description', 'public')
 
+
+def _get_modified_node_pks(nodes):
+    """
+    Return the pks of the existing nodes of which the
+    :py:data:`DELTA_UPDATED_FIELDS` or the attributes differ from the given
+    ones.
+
+    :param nodes: a dictionary with, for each pk in the database, a tuple
+        with the dictionary of the (deserialized) DELTA_UPDATED_FIELDS and
+        the dictionary of the attributes of the node in the export file
+    :return: a set of pks
+    """
     from aiida.backends.settings import BACKEND
     from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
+    modified = set()
+    for pks in grouper(EXPORT_CHUNK_SIZE, nodes.keys()):
+        if BACKEND == BACKEND_SQLA:
+            import aiida.backends.sqlalchemy
+            from aiida.backends.sqlalchemy.models.node import DbNode
+
+            session = aiida.backends.sqlalchemy.get_scoped_session()
+            columns = [getattr(DbNode, f) for f in DELTA_UPDATED_FIELDS]
+            local = {row[0]: (dict(zip(DELTA_UPDATED_FIELDS, row[1:-1])),
+                              row[-1])
+                     for row in session.query(
+                         DbNode.id, *(columns + [DbNode.attributes])).filter(
+                         DbNode.id.in_(pks))}
+        elif BACKEND == BACKEND_DJANGO:
+            from aiida.backends.djsite.db import models
+
+            local_attributes = models.DbAttribute.get_all_values_for_nodepks(
+                pks)
+            local = {row[0]: (dict(zip(DELTA_UPDATED_FIELDS, row[1:])),
+                              local_attributes.get(row[0], {}))
+                     for row in models.DbNode.objects.filter(
+                         pk__in=pks).values_list('pk', *DELTA_UPDATED_FIELDS)}
+        else:
+            raise Exception("Unknown settings.BACKEND: {}".format(BACKEND))
+
+        for pk in pks:
+            if local.get(pk) != nodes[pk]:
+                modified.add(pk)
+
+    return modified
+
+
+def update_modified_nodes(entries, reverse_mappings, data, fields_info):
+    """
+    Update the existing nodes of which a delta export contains a different
+    version, replacing their :py:data:`DELTA_UPDATED_FIELDS` and their
+    attributes, and setting their mtime to the one in the export file. The
+    exported values are compared with the local ones, so that the changes
+    made only to the extras, in either database, do not matter. Must be
+    called within the transaction of the import.
+
+    :param entries: a dictionary with the pks in the export file and the
+        serialized fields of the existing DbNodes
+    :param reverse_mappings: a dictionary with the uuids and the pks in the
+        database of the existing DbNodes
+    :param data: the data of the export file (see :py:func:`load_export_data`)
+    :param fields_info: the information on the DbNode fields, in the
+        metadata of the export file
+    :return: a list of tuples with the pk in the export file and the pk in
+        the database of the updated nodes
+    """
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
+
+    local_pks = {}
+    exported = {}
+    mtimes = {}
+    for import_pk, fields in entries.iteritems():
+        local_pk = reverse_mappings[fields['uuid']]
+        new_fields = dict(deserialize_field(
+            k, fields[k], fields_info=fields_info,
+            import_unique_ids_mappings={}, foreign_ids_reverse_mappings={})
+                          for k in DELTA_UPDATED_FIELDS + ('mtime',)
+                          if k in fields)
+        try:
+            attributes = deserialize_attributes(
+                data['node_attributes'][str(import_pk)],
+                data['node_attributes_conversion'][str(import_pk)])
+        except KeyError:
+            raise ValueError("Unable to find attribute info "
+                             "for DbNode with UUID = {}".format(
+                fields['uuid']))
+        local_pks[import_pk] = local_pk
+        mtimes[local_pk] = new_fields.pop('mtime', None)
+        exported[local_pk] = (new_fields, attributes)
+
+    modified = _get_modified_node_pks(exported)
+
     if BACKEND == BACKEND_SQLA:
+        import aiida.backends.sqlalchemy
+        from aiida.backends.sqlalchemy.models.node import DbNode
+
+        session = aiida.backends.sqlalchemy.get_scoped_session()
+    elif BACKEND == BACKEND_DJANGO:
+        from django.db.models import F
+        from aiida.backends.djsite.db import models
+    else:
+        raise Exception("Unknown settings.BACKEND: {}".format(BACKEND))
+
+    updated = []
+    for import_pk, local_pk in local_pks.iteritems():
+        if local_pk not in modified:
+            continue
+
+        new_fields, attributes = exported[local_pk]
+        new_fields = dict(new_fields)
+        if mtimes[local_pk] is not None:
+            new_fields['mtime'] = mtimes[local_pk]
+
+        if BACKEND == BACKEND_SQLA:
+            new_fields['attributes'] = attributes
+            new_fields['nodeversion'] = DbNode.nodeversion + 1
+            session.query(DbNode).filter(DbNode.id == local_pk).update(
+                new_fields, synchronize_session=False)
+        else:
+            models.DbNode.objects.filter(pk=local_pk).update(
+                nodeversion=F('nodeversion') + 1, **new_fields)
+            models.DbAttribute.reset_values_for_nodes(
+                {local_pk: attributes}, with_transaction=False)
+        updated.append((import_pk, local_pk))
+
+    return updated
+
+
+def import_data(in_path,ignore_unknown_nodes=False,
+                silent=False, bulk=False, manifest=None, num_workers=None):
+    """
+    Import exported AiiDA environment to the AiiDA database, with the
+    importer of the current backend. The import of a delta export (see
+    :py:func:`export`) also updates the existing nodes of which it contains a
+    different version (see :py:func:`update_modified_nodes`).
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param bulk: if True, use import_data_bulk (PostgreSQL only), loading the
+        entries with COPY commands rather than with the ORM
+    :param manifest: the path of a manifest of the node folders already
+        moved to the repository, to resume an interrupted import of the same
+        file (see :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads moving the node folders (if
+        not given, the importexport.repository_workers property)
+    """
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
+
+    if bulk:
+        return import_data_bulk(in_path,
+                                ignore_unknown_nodes=ignore_unknown_nodes,
+                                silent=silent, manifest=manifest,
+                                num_workers=num_workers)
+    elif BACKEND == BACKEND_SQLA:
         return import_data_sqla(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
-                         silent=silent)
+                         silent=silent, manifest=manifest,
+                         num_workers=num_workers)
     elif BACKEND == BACKEND_DJANGO:
         return import_data_dj(in_path, ignore_unknown_nodes=ignore_unknown_nodes,
-                       silent=silent)
+                       silent=silent, manifest=manifest,
+                       num_workers=num_workers)
     else:
         raise Exception("Unknown settings.BACKEND: {}".format(
             BACKEND))
 
 
 def import_data_dj(in_path,ignore_unknown_nodes=False,
-                silent=False):
+                silent=False, manifest=None, num_workers=None):
     """
     Import exported AiiDA environment to the AiiDA database.
     If the 'in_path' is a folder, calls export_tree; otherwise, tries to
@@ -296,6 +755,11 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
     correct function.
 
     :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param manifest: the path of a manifest of the node folders already
+        moved to the repository, to resume an interrupted import of the same
+        file (see :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads moving the node folders (if
+        not given, the importexport.repository_workers property)
     """
     import json
     import os
@@ -308,14 +772,11 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
 
     from aiida.orm import Node, Group
     from aiida.common.exceptions import UniquenessError
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.backends.djsite.db import models
     from aiida.common.utils import get_class_string, get_object_from_string
     from aiida.common.datastructures import calc_states
 
-    # This is the export version expected by this function
-    expected_export_version = '0.2'
-
     # The name of the subfolder in which the node files are stored
     nodes_export_subfolder = 'nodes'
 
@@ -327,29 +788,14 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
     ################
     # The sandbox has to remain open until the end
     with SandboxFolder() as folder:
-        if os.path.isdir(in_path):
-            extract_tree(in_path,folder,silent=silent)
-        else:
-            if tarfile.is_tarfile(in_path):
-                extract_tar(in_path,folder,silent=silent,
-                            nodes_export_subfolder=nodes_export_subfolder)
-            elif zipfile.is_zipfile(in_path):
-                extract_zip(in_path,folder,silent=silent,
+        extract_import_file(in_path, folder, silent=silent,
                             nodes_export_subfolder=nodes_export_subfolder)
-            elif os.path.isfile(in_path) and in_path.endswith('.cif'):
-                extract_cif(in_path,folder,silent=silent,
-                            nodes_export_subfolder=nodes_export_subfolder)
-            else:
-                raise ValueError("Unable to detect the input file format, it "
-                                 "is neither a (possibly compressed) tar file, "
-                                 "nor a zip file.")
 
         try:
             with open(folder.get_abs_path('metadata.json')) as f:
                 metadata = json.load(f)
 
-            with open(folder.get_abs_path('data.json')) as f:
-                data = json.load(f)
+            data = load_export_data(folder)
         except IOError as e:
             raise ValueError("Unable to find the file {} in the import "
                              "file or folder".format(e.filename))
@@ -357,10 +803,11 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
         ######################
         # PRELIMINARY CHECKS #
         ######################
-        if metadata['export_version'] != expected_export_version:
+        if metadata['export_version'] not in IMPORT_EXPORT_VERSIONS:
             raise ValueError("File export version is {}, but I can import only "
-                             "version {}".format(metadata['export_version'],
-                                                 expected_export_version))
+                             "versions {}".format(
+                                 metadata['export_version'],
+                                 ", ".join(IMPORT_EXPORT_VERSIONS)))
 
         ##########################################################################
         # CREATE UUID REVERSE TABLES AND CHECK IF I HAVE ALL NODES FOR THE LINKS #
@@ -373,14 +820,15 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
         # store them in a reverse table
         # I break up the query due to SQLite limitations..
         relevant_db_nodes = {}
-        for group in grouper(999, linked_nodes):
+        for group in grouper(999, linked_nodes.union(group_nodes)):
             relevant_db_nodes.update({n.uuid: n for n in
                                       models.DbNode.objects.filter(uuid__in=group)})
 
         db_nodes_uuid = set(relevant_db_nodes.keys())
         dbnode_model = get_class_string(models.DbNode)
+        # A delta export can contain no nodes
         import_nodes_uuid = set(v['uuid'] for v in
-                                data['export_data'][dbnode_model].values())
+                                data['export_data'].get(dbnode_model, {}).values())
 
 
         unknown_nodes = linked_nodes.union(group_nodes) - db_nodes_uuid.union(
@@ -514,6 +962,19 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                         # print "  `-> WARNING: NO DUPLICITY CHECK DONE!"
                         # CHECK ALSO FILES!
 
+                # The import of a delta export also updates the nodes
+                # of which it contains a different version
+                if (model_name == get_class_string(models.DbNode) and
+                        metadata.get('delta', False)):
+                    updated = update_modified_nodes(
+                        existing_entries[model_name],
+                        foreign_ids_reverse_mappings[model_name], data,
+                        fields_info)
+                    if updated:
+                        ret_dict[model_name]['updated'] = updated
+                    if not silent:
+                        print "   ({} updated nodes...)".format(len(updated))
+
                 # Store all objects for this model in a list, and store them
                 # all in once at the end.
                 objects_to_create = []
@@ -555,24 +1016,10 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                 if model_name == get_class_string(models.DbNode):
                     if not silent:
                         print "STORING NEW NODE FILES..."
-                    for o in objects_to_create:
-
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} " \
-                                             "in the exported "
-                                             "file".format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
+                    import_node_folders(
+                        (o.uuid for o in objects_to_create), folder,
+                        nodes_export_subfolder=nodes_export_subfolder,
+                        manifest=manifest, num_workers=num_workers)
 
                 # Store them all in once; however, the PK are not set in this way...
                 Model.objects.bulk_create(objects_to_create)
@@ -593,6 +1040,9 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                             models.DbCalcState(dbnode_id=new_pk,
                                                state=calc_states.IMPORTED))
                     models.DbCalcState.objects.bulk_create(imported_states)
+                    models.DbNode.objects.filter(
+                        pk__in=just_saved.values()).update(
+                        calc_state=calc_states.IMPORTED)
 
                 # Now I have the PKs, print the info
                 # Moreover, set the foreing_ids_reverse_mappings
@@ -613,6 +1063,7 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                 if model_name == get_class_string(models.DbNode):
                     if not silent:
                         print "STORING NEW NODE ATTRIBUTES..."
+                    attributes_by_node = {}
                     for unique_id, new_pk in just_saved.iteritems():
                         import_entry_id = import_entry_ids[unique_id]
                         # Get attributes from import file
@@ -628,12 +1079,11 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
                                 unique_id))
 
                         # Here I have to deserialize the attributes
-                        deserialized_attributes = deserialize_attributes(
+                        attributes_by_node[new_pk] = deserialize_attributes(
                             attributes, attributes_conversion)
-                        models.DbAttribute.reset_values_for_node(
-                            dbnode=new_pk,
-                            attributes=deserialized_attributes,
-                            with_transaction=False)
+                    # Store the attributes of all the new nodes at once
+                    models.DbAttribute.reset_values_for_nodes(
+                        attributes_by_node, with_transaction=False)
 
             if not silent:
                 print "STORING NODE LINKS..."
@@ -650,6 +1100,11 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
 
             dbnode_reverse_mappings = foreign_ids_reverse_mappings[
                 get_class_string(models.DbNode)]
+            # The links and the groups can also refer to nodes that are
+            # already in the database but not in the import file (e.g. in
+            # a delta export)
+            for uuid, dbnode in relevant_db_nodes.iteritems():
+                dbnode_reverse_mappings.setdefault(uuid, dbnode.pk)
             for link in import_links:
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
@@ -764,7 +1219,8 @@ def import_data_dj(in_path,ignore_unknown_nodes=False,
     return ret_dict
 
 
-def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
+def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False,
+                     manifest=None, num_workers=None):
     """
     Import exported AiiDA environment to the AiiDA database.
     If the 'in_path' is a folder, calls export_tree; otherwise, tries to
@@ -772,6 +1228,11 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     correct function.
 
     :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param manifest: the path of a manifest of the node folders already
+        moved to the repository, to resume an interrupted import of the same
+        file (see :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads moving the node folders (if
+        not given, the importexport.repository_workers property)
     """
     import json
     import os
@@ -783,15 +1244,12 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     from aiida.utils import timezone
 
     from aiida.orm import Node, Group
-    from aiida.common.folders import SandboxFolder, RepositoryFolder
+    from aiida.common.folders import SandboxFolder
     from aiida.common.utils import get_class_string, get_object_from_string
     from aiida.common.datastructures import calc_states
     from aiida.orm.querybuilder import QueryBuilder
 
 
-    # This is the export version expected by this function
-    expected_export_version = '0.2'
-
     # The name of the subfolder in which the node files are stored
     nodes_export_subfolder = 'nodes'
 
@@ -803,29 +1261,14 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     ################
     # The sandbox has to remain open until the end
     with SandboxFolder() as folder:
-        if os.path.isdir(in_path):
-            extract_tree(in_path,folder,silent=silent)
-        else:
-            if tarfile.is_tarfile(in_path):
-                extract_tar(in_path,folder,silent=silent,
-                            nodes_export_subfolder=nodes_export_subfolder)
-            elif zipfile.is_zipfile(in_path):
-                extract_zip(in_path,folder,silent=silent,
+        extract_import_file(in_path, folder, silent=silent,
                             nodes_export_subfolder=nodes_export_subfolder)
-            elif os.path.isfile(in_path) and in_path.endswith('.cif'):
-                extract_cif(in_path,folder,silent=silent,
-                            nodes_export_subfolder=nodes_export_subfolder)
-            else:
-                raise ValueError("Unable to detect the input file format, it "
-                                 "is neither a (possibly compressed) tar file, "
-                                 "nor a zip file.")
 
         try:
             with open(folder.get_abs_path('metadata.json')) as f:
                 metadata = json.load(f)
 
-            with open(folder.get_abs_path('data.json')) as f:
-                data = json.load(f)
+            data = load_export_data(folder)
         except IOError as e:
             raise ValueError("Unable to find the file {} in the import "
                              "file or folder".format(e.filename))
@@ -833,10 +1276,11 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
         ######################
         # PRELIMINARY CHECKS #
         ######################
-        if metadata['export_version'] != expected_export_version:
+        if metadata['export_version'] not in IMPORT_EXPORT_VERSIONS:
             raise ValueError("File export version is {}, but I can import only "
-                             "version {}".format(metadata['export_version'],
-                                                 expected_export_version))
+                             "versions {}".format(
+                                 metadata['export_version'],
+                                 ", ".join(IMPORT_EXPORT_VERSIONS)))
 
         ##########################################################################
         # CREATE UUID REVERSE TABLES AND CHECK IF I HAVE ALL NODES FOR THE LINKS #
@@ -864,8 +1308,9 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
         db_nodes_uuid = set(relevant_db_nodes.keys())
         # dbnode_model = get_class_string(models.DbNode)
         dbnode_model = "aiida.backends.djsite.db.models.DbNode"
+        # A delta export can contain no nodes
         import_nodes_uuid = set(v['uuid'] for v in
-                                data['export_data'][dbnode_model].values())
+                                data['export_data'].get(dbnode_model, {}).values())
 
         unknown_nodes = linked_nodes.union(group_nodes) - db_nodes_uuid.union(
             import_nodes_uuid)
@@ -1047,6 +1492,19 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                         # print "  `-> WARNING: NO DUPLICITY CHECK DONE!"
                         # CHECK ALSO FILES!
 
+                # The import of a delta export also updates the nodes
+                # of which it contains a different version
+                if (model_name == "aiida.backends.djsite.db.models.DbNode" and
+                        metadata.get('delta', False)):
+                    updated = update_modified_nodes(
+                        existing_entries[model_name],
+                        foreign_ids_reverse_mappings[model_name], data,
+                        fields_info)
+                    if updated:
+                        ret_dict[model_name]['updated'] = updated
+                    if not silent:
+                        print "   ({} updated nodes...)".format(len(updated))
+
                 # Store all objects for this model in a list, and store them
                 # all in once at the end.
                 objects_to_create = []
@@ -1071,25 +1529,12 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
                     if not silent:
                         print "STORING NEW NODE FILES & ATTRIBUTES..."
-                    for o in objects_to_create:
-
-                        # Creating the needed files
-                        subfolder = folder.get_subfolder(os.path.join(
-                            nodes_export_subfolder, export_shard_uuid(o.uuid)))
-                        if not subfolder.exists():
-                            raise ValueError("Unable to find the repository "
-                                             "folder for node with UUID={} in the exported "
-                                             "file".format(o.uuid))
-                        destdir = RepositoryFolder(
-                            section=Node._section_name,
-                            uuid=o.uuid)
-                        # Replace the folder, possibly destroying existing
-                        # previous folders, and move the files (faster if we
-                        # are on the same filesystem, and
-                        # in any case the source is a SandboxFolder)
-                        destdir.replace_with_folder(subfolder.abspath,
-                                                    move=True, overwrite=True)
+                    import_node_folders(
+                        (str(o.uuid) for o in objects_to_create), folder,
+                        nodes_export_subfolder=nodes_export_subfolder,
+                        manifest=manifest, num_workers=num_workers)
 
+                    for o in objects_to_create:
                         # For DbNodes, we also have to store Attributes!
                         import_entry_id = import_entry_ids[str(o.uuid)]
                         # Get attributes from import file
@@ -1146,13 +1591,19 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
                         print "SETTING THE IMPORTED STATES FOR NEW NODES..."
                     # I set for all nodes, even if I should set it only
                     # for calculations
-                    from aiida.backends.sqlalchemy.models.node import DbCalcState
+                    from aiida.backends.sqlalchemy.models.node import (
+                        DbCalcState, DbNode)
                     for unique_id, new_pk in just_saved.iteritems():
                         imported_states.append(
                             DbCalcState(dbnode_id=new_pk,
                                                state=calc_states.IMPORTED))
 
                     session.add_all(imported_states)
+                    if just_saved:
+                        session.query(DbNode).filter(
+                            DbNode.id.in_(just_saved.values())).update(
+                            {DbNode.calc_state: calc_states.IMPORTED},
+                            synchronize_session=False)
                     # session.commit()
                     # models.DbCalcState.objects.bulk_create(imported_states)
 
@@ -1191,6 +1642,11 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
 
             dbnode_reverse_mappings = foreign_ids_reverse_mappings[
                 "aiida.backends.djsite.db.models.DbNode"]
+            # The links and the groups can also refer to nodes that are
+            # already in the database but not in the import file (e.g. in
+            # a delta export)
+            for uuid, node in relevant_db_nodes.iteritems():
+                dbnode_reverse_mappings.setdefault(str(uuid), node.pk)
             for link in import_links:
                 try:
                     in_id = dbnode_reverse_mappings[link['input']]
@@ -1325,6 +1781,555 @@ def import_data_sqla(in_path, ignore_unknown_nodes=False, silent=False):
     return ret_dict
 
 
+# The columns of the DbNode entries loaded by import_data_bulk, in addition
+# to the pk in the export file
+_BULK_NODE_COLUMNS = ('uuid', 'type', 'label', 'description', 'ctime',
+                      'mtime', 'nodeversion', 'public', 'user_id',
+                      'dbcomputer_id')
+
+
+def import_data_bulk(in_path, ignore_unknown_nodes=False, silent=False,
+                     manifest=None, num_workers=None):
+    """
+    Import exported AiiDA environment to the AiiDA database, loading the
+    nodes, their attributes, the links and the group memberships with the
+    PostgreSQL COPY command rather than with the ORM, within a single
+    transaction.
+
+    The entries of the export file are compared with the existing ones with
+    joins on temporary tables, so that the nodes are never loaded all
+    together in memory if the export file was created with ``stream=True``.
+    The repository folders of the new nodes are moved by a pool of threads.
+    The import of a delta export also updates the existing nodes of which it
+    contains a different version (see :py:func:`update_modified_nodes`).
+
+    Only PostgreSQL databases are supported.
+
+    :param in_path: the path to a file or folder that can be imported in AiiDA
+    :param ignore_unknown_nodes: if True, skip the links and group members
+        referring to nodes that are neither in the export file nor in the
+        database, rather than raising
+    :param silent: suppress debug print
+    :param manifest: the path of a manifest of the node folders already
+        moved to the repository, to resume an interrupted import of the same
+        file (see :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads moving the node folders (if
+        not given, the importexport.repository_workers property)
+    :return: a dictionary with, for each model, the lists of the
+        (pk in the export file, pk in the database) pairs of the 'new' and
+        'existing' entries, and of the 'updated' nodes, as returned by the
+        other importers; for the links, the 'new' list contains (input pk,
+        output pk) pairs
+    """
+    import json
+    import uuid
+
+    from aiida.utils import timezone
+    from aiida.common.folders import SandboxFolder
+    from aiida.common.utils import get_object_from_string, grouper
+    from aiida.common.datastructures import calc_states
+    from aiida.backends.settings import BACKEND
+    from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
+    from aiida.backends.utils import (raw_transaction, copy_rows,
+                                      get_automatic_user)
+
+    # The name of the subfolder in which the node files are stored
+    nodes_export_subfolder = 'nodes'
+
+    user_model = 'aiida.backends.djsite.db.models.DbUser'
+    computer_model = 'aiida.backends.djsite.db.models.DbComputer'
+    node_model = 'aiida.backends.djsite.db.models.DbNode'
+    group_model = 'aiida.backends.djsite.db.models.DbGroup'
+    link_model = 'aiida.backends.djsite.db.models.DbLink'
+    attribute_model = 'aiida.backends.djsite.db.models.DbAttribute'
+
+    # The models imported with the ORM, in this order; they are few, and
+    # the nodes depend on them
+    model_order = [user_model, computer_model, group_model]
+    tables = {
+        user_model: 'db_dbuser',
+        computer_model: 'db_dbcomputer',
+        group_model: 'db_dbgroup',
+    }
+
+    if BACKEND == BACKEND_SQLA:
+        import aiida.backends.sqlalchemy
+        session = aiida.backends.sqlalchemy.get_scoped_session()
+
+        def get_model(model_name):
+            return get_object_from_string(django_to_sqla_schema[model_name])
+
+        def create_entry(Model, import_data):
+            entry = Model(**import_data)
+            session.add(entry)
+            session.flush()
+            return entry.id
+    elif BACKEND == BACKEND_DJANGO:
+        def get_model(model_name):
+            return get_object_from_string(model_name)
+
+        def create_entry(Model, import_data):
+            entry = Model(**import_data)
+            entry.save()
+            return entry.pk
+    else:
+        raise Exception("Unknown settings.BACKEND: {}".format(BACKEND))
+
+    ret_dict = {}
+
+    ################
+    # EXTRACT DATA #
+    ################
+    # The sandbox has to remain open until the end
+    with SandboxFolder() as folder:
+        extract_import_file(in_path, folder, silent=silent,
+                            nodes_export_subfolder=nodes_export_subfolder)
+
+        try:
+            with open(folder.get_abs_path('metadata.json')) as f:
+                metadata = json.load(f)
+
+            if (folder.isdir(EXPORT_DATA_SUBFOLDER) and
+                    not folder.isfile('data.json')):
+                # Streamed export: the records are read one chunk at a time
+                data = None
+            else:
+                data = load_export_data(folder)
+        except IOError as e:
+            raise ValueError("Unable to find the file {} in the import "
+                             "file or folder".format(e.filename))
+
+        ######################
+        # PRELIMINARY CHECKS #
+        ######################
+        if metadata['export_version'] not in IMPORT_EXPORT_VERSIONS:
+            raise ValueError("File export version is {}, but I can import only "
+                             "versions {}".format(
+                                 metadata['export_version'],
+                                 ", ".join(IMPORT_EXPORT_VERSIONS)))
+
+        all_known_models = model_order + [node_model, link_model,
+                                          attribute_model]
+        for import_field_name in metadata['all_fields_info']:
+            if import_field_name not in all_known_models:
+                raise NotImplementedError("Apparently, you are importing a "
+                                          "file with a model '{}', but this does not appear in "
+                                          "all_known_models!".format(import_field_name))
+
+        def records(section):
+            return iter_export_records(folder, section, data)
+
+        # The users, computers and groups are kept in memory
+        small_entries = {model_name: {} for model_name in model_order}
+        for record in records('export_data'):
+            if record['model'] in small_entries:
+                small_entries[record['model']][int(record['pk'])] = (
+                    record['fields'])
+
+        import_unique_ids_mappings = {}
+        for model_name, entries in small_entries.iteritems():
+            unique_identifier = metadata['unique_identifiers'][model_name]
+            import_unique_ids_mappings[model_name] = {
+                k: v[unique_identifier] for k, v in entries.iteritems()}
+
+        with raw_transaction() as cursor:
+            ######################################
+            # IMPORT USERS, COMPUTERS AND GROUPS #
+            ######################################
+            foreign_ids_reverse_mappings = {}
+            for model_name in model_order:
+                Model = get_model(model_name)
+                fields_info = metadata['all_fields_info'].get(model_name, {})
+                unique_identifier = metadata['unique_identifiers'][model_name]
+                entries = small_entries[model_name]
+
+                reverse_mappings = {}
+                for group in grouper(EXPORT_CHUNK_SIZE, entries.values()):
+                    cursor.execute(
+                        'SELECT "{0}"::text, id FROM "{1}" '
+                        'WHERE "{0}" IN %s'.format(unique_identifier,
+                                                   tables[model_name]),
+                        (tuple(v[unique_identifier] for v in group),))
+                    reverse_mappings.update(cursor.fetchall())
+                existing_ids = set(reverse_mappings)
+                foreign_ids_reverse_mappings[model_name] = reverse_mappings
+
+                if model_name == computer_model:
+                    cursor.execute('SELECT name FROM db_dbcomputer')
+                    computer_names = set(name for name, in cursor.fetchall())
+                    dupl_counter = 0
+
+                for entry_data in entries.itervalues():
+                    unique_id = entry_data[unique_identifier]
+                    if unique_id in reverse_mappings:
+                        continue
+                    import_data = dict(deserialize_field(
+                        k, v, fields_info=fields_info,
+                        import_unique_ids_mappings=import_unique_ids_mappings,
+                        foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                                       for k, v in entry_data.iteritems())
+
+                    if model_name == computer_model:
+                        # Rename the new computer if there is already a
+                        # computer with the same name
+                        orig_name = import_data['name']
+                        while import_data['name'] in computer_names:
+                            import_data['name'] = (
+                                orig_name +
+                                COMP_DUPL_SUFFIX.format(dupl_counter))
+                            dupl_counter += 1
+                        computer_names.add(import_data['name'])
+
+                    reverse_mappings[unique_id] = create_entry(Model,
+                                                               import_data)
+
+                if entries:
+                    ret_dict[model_name] = {'new': [], 'existing': []}
+                    for import_pk, entry_data in entries.iteritems():
+                        unique_id = entry_data[unique_identifier]
+                        ret_dict[model_name][
+                            'existing' if unique_id in existing_ids
+                            else 'new'].append(
+                            (import_pk, reverse_mappings[unique_id]))
+                    if not silent:
+                        print "{}: {} NEW, {} EXISTING".format(
+                            model_name, len(ret_dict[model_name]['new']),
+                            len(ret_dict[model_name]['existing']))
+
+            if BACKEND == BACKEND_SQLA:
+                # The entries have to be visible to the raw SQL queries
+                session.flush()
+
+            ################
+            # IMPORT NODES #
+            ################
+            if not silent:
+                print "LOADING THE NODES..."
+            cursor.execute(
+                "CREATE TEMPORARY TABLE t_import_node ON COMMIT DROP AS "
+                "SELECT id AS import_pk, id AS local_pk, {} FROM db_dbnode "
+                "WITH NO DATA".format(", ".join(_BULK_NODE_COLUMNS)))
+            cursor.execute("ALTER TABLE t_import_node "
+                           "ADD COLUMN is_new boolean NOT NULL DEFAULT false, "
+                           "ADD COLUMN is_updated boolean NOT NULL "
+                           "DEFAULT false")
+
+            fields_info = metadata['all_fields_info'][node_model]
+
+            def node_rows(node_records):
+                for record in node_records:
+                    import_data = dict(deserialize_field(
+                        k, v, fields_info=fields_info,
+                        import_unique_ids_mappings=import_unique_ids_mappings,
+                        foreign_ids_reverse_mappings=foreign_ids_reverse_mappings)
+                                       for k, v in record['fields'].iteritems())
+                    unknown_fields = set(import_data) - set(_BULK_NODE_COLUMNS)
+                    if unknown_fields:
+                        raise NotImplementedError(
+                            "Unable to import the DbNode fields {} in "
+                            "bulk".format(", ".join(sorted(unknown_fields))))
+                    yield [int(record['pk'])] + [import_data.get(c) for c in
+                                                 _BULK_NODE_COLUMNS]
+
+            node_records = (r for r in records('export_data')
+                            if r['model'] == node_model)
+            for group in grouper(EXPORT_CHUNK_SIZE, node_records):
+                copy_rows(cursor, 't_import_node',
+                          ('import_pk',) + _BULK_NODE_COLUMNS,
+                          node_rows(group))
+
+            cursor.execute("CREATE INDEX ON t_import_node (uuid)")
+            cursor.execute("CREATE INDEX ON t_import_node (import_pk)")
+            cursor.execute("ANALYZE t_import_node")
+
+            # Deduplicate against the existing nodes
+            cursor.execute(
+                "UPDATE t_import_node t SET local_pk = n.id "
+                "FROM db_dbnode n WHERE n.uuid = t.uuid")
+
+            columns = list(_BULK_NODE_COLUMNS) + ['calc_state']
+            values = list(_BULK_NODE_COLUMNS) + ['%s']
+            if BACKEND == BACKEND_SQLA:
+                columns += ['attributes', 'extras']
+                values += ["'{}'", "'{}'"]
+            cursor.execute(
+                "INSERT INTO db_dbnode ({}) SELECT {} FROM t_import_node "
+                "WHERE local_pk IS NULL".format(", ".join(columns),
+                                                ", ".join(values)),
+                (calc_states.IMPORTED,))
+            num_new_nodes = cursor.rowcount
+            cursor.execute(
+                "UPDATE t_import_node t SET local_pk = n.id, is_new = true "
+                "FROM db_dbnode n WHERE t.local_pk IS NULL AND n.uuid = t.uuid")
+            cursor.execute("SELECT count(*) FROM t_import_node")
+            num_nodes, = cursor.fetchone()
+
+            num_updated_nodes = 0
+            if metadata.get('delta', False):
+                # The import of a delta export also updates the nodes of
+                # which it contains a different version
+                for group in grouper(EXPORT_CHUNK_SIZE,
+                                     records('node_attributes')):
+                    cursor.execute(
+                        "SELECT import_pk, local_pk, {} FROM t_import_node "
+                        "WHERE NOT is_new AND import_pk = ANY(%s)".format(
+                            ", ".join(DELTA_UPDATED_FIELDS)),
+                        ([int(r['pk']) for r in group],))
+                    existing = {row[0]: (row[1], dict(zip(DELTA_UPDATED_FIELDS,
+                                                          row[2:])))
+                                for row in cursor.fetchall()}
+
+                    exported = {}
+                    for record in group:
+                        if int(record['pk']) in existing:
+                            local_pk, fields = existing[int(record['pk'])]
+                            exported[local_pk] = (fields, deserialize_attributes(
+                                record['attributes'], record['conversion']))
+
+                    modified = _get_modified_node_pks(exported)
+                    if modified:
+                        cursor.execute(
+                            "UPDATE t_import_node SET is_updated = true "
+                            "WHERE local_pk = ANY(%s)", (list(modified),))
+                        num_updated_nodes += cursor.rowcount
+                cursor.execute(
+                    "UPDATE db_dbnode n SET {}, mtime = t.mtime, "
+                    "nodeversion = n.nodeversion + 1 FROM t_import_node t "
+                    "WHERE t.is_updated AND n.id = t.local_pk".format(
+                        ", ".join("{0} = t.{0}".format(c)
+                                  for c in DELTA_UPDATED_FIELDS)))
+
+            # I set the imported state for all nodes, even if I should set
+            # it only for calculations
+            cursor.execute(
+                "INSERT INTO db_dbcalcstate (dbnode_id, state, time) "
+                "SELECT local_pk, %s, now() FROM t_import_node WHERE is_new",
+                (calc_states.IMPORTED,))
+
+            if num_nodes:
+                ret_dict[node_model] = {}
+                for key, condition in [('new', 'is_new'),
+                                       ('existing', 'NOT is_new'),
+                                       ('updated', 'is_updated')]:
+                    cursor.execute(
+                        "SELECT import_pk, local_pk FROM t_import_node "
+                        "WHERE {}".format(condition))
+                    ret_dict[node_model][key] = cursor.fetchall()
+                # As for the other importers, only if some were updated
+                if not ret_dict[node_model]['updated']:
+                    del ret_dict[node_model]['updated']
+                if not silent:
+                    print "{}: {} NEW, {} EXISTING".format(
+                        node_model, num_new_nodes, num_nodes - num_new_nodes)
+
+            #####################
+            # IMPORT ATTRIBUTES #
+            #####################
+            if not silent:
+                print "LOADING THE ATTRIBUTES OF THE NEW AND UPDATED NODES..."
+            if BACKEND == BACKEND_SQLA:
+                from aiida.backends.sqlalchemy.utils import dumps_json
+
+                cursor.execute(
+                    "CREATE TEMPORARY TABLE t_import_attributes "
+                    "(local_pk integer, attributes jsonb) ON COMMIT DROP")
+
+            num_attributes = 0
+            for group in grouper(EXPORT_CHUNK_SIZE, records('node_attributes')):
+                cursor.execute(
+                    "SELECT import_pk, local_pk FROM t_import_node "
+                    "WHERE (is_new OR is_updated) AND import_pk = ANY(%s)",
+                    ([int(r['pk']) for r in group],))
+                local_pks = dict(cursor.fetchall())
+
+                attributes_by_node = {}
+                for record in group:
+                    local_pk = local_pks.get(int(record['pk']))
+                    if local_pk is not None:
+                        attributes_by_node[local_pk] = deserialize_attributes(
+                            record['attributes'], record['conversion'])
+                num_attributes += len(attributes_by_node)
+
+                if BACKEND == BACKEND_SQLA:
+                    copy_rows(cursor, 't_import_attributes',
+                              ('local_pk', 'attributes'),
+                              ((k, dumps_json(v)) for k, v in
+                               attributes_by_node.iteritems()))
+                else:
+                    from aiida.backends.djsite.db import models
+                    models.DbAttribute.reset_values_for_nodes(
+                        attributes_by_node, with_transaction=False)
+
+            if num_attributes != num_new_nodes + num_updated_nodes:
+                raise ValueError("Unable to find attribute info for {} of "
+                                 "the new or updated DbNodes".format(
+                    num_new_nodes + num_updated_nodes - num_attributes))
+
+            if BACKEND == BACKEND_SQLA:
+                cursor.execute(
+                    "UPDATE db_dbnode n SET attributes = a.attributes "
+                    "FROM t_import_attributes a WHERE n.id = a.local_pk")
+
+            ################
+            # IMPORT LINKS #
+            ################
+            if not silent:
+                print "LOADING THE LINKS..."
+            cursor.execute(
+                "CREATE TEMPORARY TABLE t_import_link ON COMMIT DROP AS "
+                "SELECT n.uuid AS input_uuid, n.uuid AS output_uuid, l.label, "
+                "l.input_id, l.output_id FROM db_dbnode n, db_dblink l "
+                "WITH NO DATA")
+            for group in grouper(EXPORT_CHUNK_SIZE, records('links_uuid')):
+                copy_rows(cursor, 't_import_link',
+                          ('input_uuid', 'output_uuid', 'label'),
+                          ((l['input'], l['output'], l['label'])
+                           for l in group))
+            cursor.execute(
+                "UPDATE t_import_link t SET input_id = n.id "
+                "FROM db_dbnode n WHERE n.uuid = t.input_uuid")
+            cursor.execute(
+                "UPDATE t_import_link t SET output_id = n.id "
+                "FROM db_dbnode n WHERE n.uuid = t.output_uuid")
+
+            if not ignore_unknown_nodes:
+                cursor.execute(
+                    "SELECT input_uuid::text, output_uuid::text, label "
+                    "FROM t_import_link "
+                    "WHERE input_id IS NULL OR output_id IS NULL LIMIT 1")
+                unknown = cursor.fetchone()
+                if unknown is not None:
+                    raise ValueError("Trying to create a link with one "
+                                     "or both unknown nodes, stopping "
+                                     "(in_uuid={}, out_uuid={}, "
+                                     "label={})".format(*unknown))
+
+            cursor.execute(
+                "SELECT t.input_id, t.output_id, l.label, t.label "
+                "FROM t_import_link t JOIN db_dblink l "
+                "ON l.input_id = t.input_id AND l.output_id = t.output_id "
+                "WHERE l.label != t.label LIMIT 1")
+            renamed = cursor.fetchone()
+            if renamed is not None:
+                raise ValueError("Trying to rename an existing link name, "
+                                 "stopping (in={}, out={}, old_label={}, "
+                                 "new_label={})".format(*renamed))
+
+            cursor.execute(
+                "SELECT t.output_id, t.label, t.input_id "
+                "FROM t_import_link t JOIN db_dblink l "
+                "ON l.output_id = t.output_id AND l.label = t.label "
+                "WHERE l.input_id != t.input_id LIMIT 1")
+            conflicting = cursor.fetchone()
+            if conflicting is not None:
+                raise ValueError("There exists already an input link to "
+                                 "node {} with label {} but it does not "
+                                 "come the expected input {}".format(
+                    *conflicting))
+
+            cursor.execute(
+                "INSERT INTO db_dblink (input_id, output_id, label, type) "
+                "SELECT DISTINCT input_id, output_id, label, '' "
+                "FROM t_import_link t "
+                "WHERE input_id IS NOT NULL AND output_id IS NOT NULL "
+                "AND NOT EXISTS (SELECT 1 FROM db_dblink l "
+                "WHERE l.input_id = t.input_id "
+                "AND l.output_id = t.output_id) "
+                "RETURNING input_id, output_id")
+            new_links = cursor.fetchall()
+            if new_links:
+                ret_dict[link_model] = {'new': new_links}
+            if not silent:
+                print "   ({} new links...)".format(len(new_links))
+
+            ############################
+            # IMPORT GROUP MEMBERSHIPS #
+            ############################
+            if not silent:
+                print "LOADING THE GROUP ELEMENTS..."
+            cursor.execute(
+                "CREATE TEMPORARY TABLE t_import_group_node ON COMMIT DROP AS "
+                "SELECT g.uuid AS group_uuid, n.uuid AS node_uuid "
+                "FROM db_dbgroup g, db_dbnode n WITH NO DATA")
+            for group in grouper(EXPORT_CHUNK_SIZE, records('groups_uuid')):
+                copy_rows(cursor, 't_import_group_node',
+                          ('group_uuid', 'node_uuid'),
+                          ((g['uuid'], node_uuid) for g in group
+                           for node_uuid in g['nodes']))
+
+            if not ignore_unknown_nodes:
+                cursor.execute(
+                    "SELECT t.node_uuid::text FROM t_import_group_node t "
+                    "LEFT JOIN db_dbnode n ON n.uuid = t.node_uuid "
+                    "WHERE n.id IS NULL LIMIT 1")
+                unknown = cursor.fetchone()
+                if unknown is not None:
+                    raise ValueError("Trying to add to a group the unknown "
+                                     "node with UUID={}".format(*unknown))
+
+            cursor.execute(
+                "INSERT INTO db_dbgroup_dbnodes (dbgroup_id, dbnode_id) "
+                "SELECT DISTINCT g.id, n.id FROM t_import_group_node t "
+                "JOIN db_dbgroup g ON g.uuid = t.group_uuid "
+                "JOIN db_dbnode n ON n.uuid = t.node_uuid "
+                "WHERE NOT EXISTS (SELECT 1 FROM db_dbgroup_dbnodes m "
+                "WHERE m.dbgroup_id = g.id AND m.dbnode_id = n.id)")
+
+            ######################################################
+            # Put everything in a specific group
+            if num_nodes:
+                # Get an unique name for the import group, based on the
+                # current (local) time
+                basename = timezone.localtime(timezone.now()).strftime(
+                    "%Y%m%d-%H%M%S")
+                cursor.execute(
+                    "SELECT name FROM db_dbgroup WHERE type = %s "
+                    "AND (name = %s OR name LIKE %s)",
+                    (IMPORTGROUP_TYPE, basename, basename + '\\_%'))
+                existing_names = set(name for name, in cursor.fetchall())
+                group_name = basename
+                counter = 0
+                while group_name in existing_names:
+                    counter += 1
+                    group_name = "{}_{}".format(basename, counter)
+
+                cursor.execute(
+                    "INSERT INTO db_dbgroup "
+                    "(uuid, name, type, time, description, user_id) "
+                    "VALUES (%s, %s, %s, now(), '', %s) RETURNING id",
+                    (str(uuid.uuid4()), group_name, IMPORTGROUP_TYPE,
+                     get_automatic_user().id))
+                import_group_id, = cursor.fetchone()
+                cursor.execute(
+                    "INSERT INTO db_dbgroup_dbnodes (dbgroup_id, dbnode_id) "
+                    "SELECT DISTINCT %s, local_pk FROM t_import_node",
+                    (import_group_id,))
+
+                if not silent:
+                    print "IMPORTED NODES GROUPED IN IMPORT GROUP NAMED '{}'".format(group_name)
+            else:
+                if not silent:
+                    print "NO DBNODES TO IMPORT, SO NO GROUP CREATED"
+
+            #########################
+            # MOVE THE NODE FOLDERS #
+            #########################
+            # This is done last, so that nothing is moved if the import
+            # fails before; only the files of the new nodes are moved
+            if not silent:
+                print "MOVING THE FILES OF THE NEW NODES..."
+            cursor.execute("SELECT uuid::text FROM t_import_node WHERE is_new")
+            import_node_folders(
+                (node_uuid for node_uuid, in cursor.fetchall()), folder,
+                nodes_export_subfolder=nodes_export_subfolder,
+                manifest=manifest, num_workers=num_workers)
+
+    if not silent:
+        print "DONE."
+
+    return ret_dict
+
+
 class HTMLGetLinksParser(HTMLParser.HTMLParser):
     def __init__(self, filter_extension=None):
         """
@@ -1784,6 +2789,8 @@ def get_all_fields_info():
         user_model_string: ['password', 'is_staff',
                             'is_superuser', 'is_active',
                             'last_login', 'date_joined'],
+        # Set to IMPORTED on import, like the DbCalcState entries
+        get_class_string(models.DbNode): ['calc_state'],
     }
 
     # I start only with DbNode
@@ -2002,8 +3009,311 @@ def fill_in_query(partial_query, originating_entity_str, current_entity_str):
         fill_in_query(partial_query, current_entity_str, ref_model_name)
 
 
+class ExportSnapshot(object):
+    """
+    The manifest of the content of an export: the uuid and the nodeversion
+    of each node, the links and the group members. Each export writes it in
+    chunks of newline-delimited JSON (the 'snapshot' section of the
+    :py:data:`EXPORT_DATA_SUBFOLDER` subfolder), including the entries that
+    a delta export skips, so that the next delta export can be computed
+    against it.
+    """
+
+    def __init__(self):
+        # uuid -> nodeversion
+        self.nodes = {}
+        # (input uuid, output uuid, label)
+        self.links = set()
+        # group uuid -> set of node uuids
+        self.groups = {}
+
+    def has_node(self, uuid, nodeversion):
+        """
+        Return True if the node with the given uuid is in the snapshot, with
+        the same nodeversion.
+        """
+        return self.nodes.get(str(uuid)) == nodeversion
+
+    def has_link(self, link):
+        return (str(link['input']), str(link['output']),
+                link['label']) in self.links
+
+    def get_group_nodes(self, uuid):
+        """
+        Return the set of the uuids of the nodes of the group in the
+        snapshot.
+        """
+        return self.groups.get(str(uuid), set())
+
+    def add_record(self, record):
+        """
+        Add a record of the snapshot section of an export.
+        """
+        if 'node' in record:
+            self.nodes[str(record['node'])] = record['nodeversion']
+        elif 'link' in record:
+            link = record['link']
+            self.links.add((str(link['input']), str(link['output']),
+                            link['label']))
+        elif 'group' in record:
+            self.groups.setdefault(str(record['group']), set()).update(
+                str(uuid) for uuid in record['nodes'])
+
+    @classmethod
+    def load(cls, in_path):
+        """
+        Load the snapshot of an export file or folder, without extracting the
+        files of the nodes. For an export file written before the snapshots
+        were introduced, the snapshot is rebuilt from its data.
+
+        :param in_path: the path to an export file or folder
+        :raise ValueError: if the format of the file is not recognized
+        """
+        import os
+        import tarfile
+        import zipfile
+
+        from aiida.common.folders import Folder, SandboxFolder
+
+        def is_data_member(name):
+            name = os.path.normpath(name)
+            return (name == 'data.json' or
+                    name.startswith(EXPORT_DATA_SUBFOLDER + os.sep))
+
+        snapshot = cls()
+        with SandboxFolder() as sandbox:
+            if os.path.isdir(in_path):
+                folder = Folder(os.path.abspath(in_path))
+            elif tarfile.is_tarfile(in_path):
+                with tarfile.open(in_path, "r:*",
+                                  format=tarfile.PAX_FORMAT) as tar:
+                    tar.extractall(path=sandbox.abspath, members=(
+                        m for m in tar if m.isfile() and
+                        is_data_member(m.name)))
+                folder = sandbox
+            elif zipfile.is_zipfile(in_path):
+                with zipfile.ZipFile(in_path, 'r', allowZip64=True) as zf:
+                    zf.extractall(path=sandbox.abspath, members=[
+                        name for name in zf.namelist()
+                        if is_data_member(name)])
+                folder = sandbox
+            else:
+                raise ValueError("Unable to detect the input file format, it "
+                                 "is neither a (possibly compressed) tar file, "
+                                 "nor a zip file.")
+
+            if folder.isdir(EXPORT_DATA_SUBFOLDER) and any(
+                    fname.startswith('snapshot.') for fname in
+                    os.listdir(folder.get_abs_path(EXPORT_DATA_SUBFOLDER))):
+                for record in iter_export_records(folder, 'snapshot'):
+                    snapshot.add_record(record)
+                return snapshot
+
+            try:
+                data = load_export_data(folder)
+            except IOError as e:
+                raise ValueError("Unable to find the file {} in the export "
+                                 "file or folder".format(e.filename))
+            for record in iter_export_records(folder, 'export_data', data):
+                if record['model'] == ExportDataWriter.node_model:
+                    snapshot.add_record(
+                        {'node': record['fields']['uuid'],
+                         'nodeversion': record['fields']['nodeversion']})
+            for link in iter_export_records(folder, 'links_uuid', data):
+                snapshot.add_record({'link': link})
+            for record in iter_export_records(folder, 'groups_uuid', data):
+                snapshot.add_record({'group': record['uuid'],
+                                     'nodes': record['nodes']})
+
+        return snapshot
+
+
+class ExportDataWriter(object):
+    """
+    Write the data of an export (database entries, node attributes, links
+    and group members) to the export folder.
+
+    By default, the data is kept in memory and dumped to a single data.json
+    file when the writer is closed. If ``stream`` is True, each record is
+    instead serialized as soon as it is added, and written in chunks of
+    newline-delimited JSON files in the
+    :py:data:`EXPORT_DATA_SUBFOLDER` subfolder, so that only the primary
+    keys of the exported entries are kept in memory.
+
+    The snapshot of the export (see :py:class:`ExportSnapshot`) is always
+    written in chunks. If the snapshot of a previous export is given, the
+    nodes with the same nodeversion, the links and the group members that
+    it contains are only recorded in the snapshot (delta export).
+    """
+    # The (Django) class string of the nodes, for both backends
+    node_model = 'aiida.backends.djsite.db.models.DbNode'
+
+    def __init__(self, folder, stream=False, chunk_size=EXPORT_CHUNK_SIZE,
+                 previous=None):
+        """
+        :param folder: the folder (or ZipFolder, TarFolder) of the export
+        :param stream: if True, write the records in chunks while they are
+            added
+        :param chunk_size: the number of records in each file written when
+            streaming
+        :param previous: the ExportSnapshot of a previous export, for a
+            delta export
+        """
+        from collections import defaultdict
+
+        self._folder = folder
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._previous = previous
+        # The pks of the exported entries, for each model
+        self._pks = defaultdict(set)
+        # The pks of the entries skipped because already in the previous
+        # export, for each model
+        self._skipped_pks = defaultdict(set)
+        # The serialized records not yet written, and the number of chunks
+        # already written, for each section
+        self._lines = defaultdict(list)
+        self._num_chunks = defaultdict(int)
+        self._data = {
+            'node_attributes': {},
+            'node_attributes_conversion': {},
+            'export_data': {},
+            'links_uuid': [],
+            'groups_uuid': {},
+        }
+
+    @property
+    def num_entries(self):
+        """
+        The total number of database entries added so far.
+        """
+        return sum(len(pks) for pks in self._pks.itervalues())
+
+    @property
+    def num_skipped_entries(self):
+        """
+        The total number of database entries skipped so far, because
+        already in the previous export.
+        """
+        return sum(len(pks) for pks in self._skipped_pks.itervalues())
+
+    def has_entry(self, model_name, pk):
+        pk = int(pk)
+        return (pk in self._pks.get(model_name, ()) or
+                pk in self._skipped_pks.get(model_name, ()))
+
+    def get_pks(self, model_name, include_skipped=False):
+        """
+        Return the list of the pks of the added entries of the given model.
+
+        :param include_skipped: if True, include the entries skipped because
+            already in the previous export
+        """
+        pks = list(self._pks.get(model_name, ()))
+        if include_skipped:
+            pks.extend(self._skipped_pks.get(model_name, ()))
+        return pks
+
+    def add_entry(self, model_name, pk, fields):
+        """
+        Add a database entry, unless it was already added.
+
+        :param model_name: the (Django) class string of the model
+        :param pk: the pk of the entry
+        :param fields: the serialized fields of the entry
+        """
+        pk = int(pk)
+        if self.has_entry(model_name, pk):
+            return
+
+        if model_name == self.node_model:
+            self._write('snapshot', {'node': str(fields['uuid']),
+                                     'nodeversion': fields['nodeversion']})
+            if (self._previous is not None and
+                    self._previous.has_node(fields['uuid'],
+                                            fields['nodeversion'])):
+                self._skipped_pks[model_name].add(pk)
+                return
+        self._pks[model_name].add(pk)
+
+        if self._stream:
+            self._write('export_data',
+                        {'model': model_name, 'pk': pk, 'fields': fields})
+        else:
+            self._data['export_data'].setdefault(
+                model_name, {})[str(pk)] = fields
+
+    def add_node_attributes(self, pk, attributes, conversion):
+        if self._stream:
+            self._write('node_attributes',
+                        {'pk': pk, 'attributes': attributes,
+                         'conversion': conversion})
+        else:
+            self._data['node_attributes'][str(pk)] = attributes
+            self._data['node_attributes_conversion'][str(pk)] = conversion
+
+    def add_link(self, link):
+        self._write('snapshot', {'link': link})
+        if self._previous is not None and self._previous.has_link(link):
+            return
+
+        if self._stream:
+            self._write('links_uuid', link)
+        else:
+            self._data['links_uuid'].append(link)
+
+    def add_group(self, uuid, node_uuids):
+        self._write('snapshot', {'group': str(uuid),
+                                 'nodes': [str(u) for u in node_uuids]})
+        if self._previous is not None:
+            known_uuids = self._previous.get_group_nodes(uuid)
+            node_uuids = [node_uuid for node_uuid in node_uuids
+                          if str(node_uuid) not in known_uuids]
+            if not node_uuids:
+                return
+
+        if self._stream:
+            self._write('groups_uuid', {'uuid': uuid, 'nodes': node_uuids})
+        else:
+            self._data['groups_uuid'][uuid] = node_uuids
+
+    def _write(self, section, record):
+        import json
+
+        lines = self._lines[section]
+        lines.append(json.dumps(record))
+        if len(lines) >= self._chunk_size:
+            self._flush(section)
+
+    def _flush(self, section):
+        lines = self._lines.pop(section, None)
+        if not lines:
+            return
+
+        datafolder = self._folder.get_subfolder(
+            EXPORT_DATA_SUBFOLDER, create=True, reset_limit=True)
+        fname = '{}.{:06d}.ndjson'.format(section, self._num_chunks[section])
+        self._num_chunks[section] += 1
+        with datafolder.open(fname, 'w') as f:
+            f.write('\n'.join(lines))
+            f.write('\n')
+
+    def close(self):
+        """
+        Write the data still pending to the export folder.
+        """
+        import json
+
+        for section in self._lines.keys():
+            self._flush(section)
+        if not self._stream:
+            with self._folder.open('data.json', 'w') as f:
+                json.dump(self._data, f)
+
+
 def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
-                allowed_licenses=None, forbidden_licenses=None, silent=False):
+                allowed_licenses=None, forbidden_licenses=None, silent=False,
+                stream=False, manifest=None, num_workers=None, previous=None):
     """
     Export the DB entries passed in the 'what' list to a file tree.
 
@@ -2023,6 +3333,16 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
       then calls function for licenses of Data nodes expecting True if
       license is allowed, False otherwise.
     :param silent: suppress debug prints
+    :param stream: if True, write the data in chunks while it is collected
+      (see :py:class:`ExportDataWriter`)
+    :param manifest: the path of a manifest of the node folders already
+      copied, to resume an interrupted export to a folder (see
+      :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads copying the node folders
+    :param previous: the :py:class:`ExportSnapshot` of a previous export;
+      if given, only the nodes that are not in it (or with a different
+      nodeversion), and the links and group members that are not in it, are
+      exported (delta export)
     :raises LicensingException: if any node is licensed under forbidden
       license
     """
@@ -2035,14 +3355,11 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
     from aiida.backends.sqlalchemy import models
     from aiida.orm import Node, Calculation
     from aiida.common.exceptions import LicensingException
-    from aiida.common.folders import RepositoryFolder
     from aiida.orm.querybuilder import QueryBuilder
 
     if not silent:
         print "STARTING EXPORT..."
 
-    EXPORT_VERSION = '0.2'
-
     all_fields_info, unique_identifiers = get_all_fields_info_sqla()
 
 
@@ -2101,31 +3418,40 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
         project_cols.append(nprop)
     # project_cols contains the strings we can use to project, i.e. user_id, mtime, uuid, dbcomputer_id
 
-    entries_to_add = dict()
-    for k, v in entries_ids_to_add.iteritems():
+    def get_entries_query(entity_str, ids):
+        """
+        Return the query projecting the given entries and the entries
+        referenced by their foreign keys.
+        """
         qb = QueryBuilder()
         # qb.isouter = True
-        qb.append(Node, filters={"id": {"in": v}}, project=project_cols,
-                  tag=k, outerjoin=True)
-        entries_to_add[k] = qb
+        qb.append(Node, filters={"id": {"in": list(ids)}},
+                  project=project_cols, tag=entity_str, outerjoin=True)
 
-    # print "entries_to_add ===>", entries_to_add
-    # sys.exit()
+        foreign_fields = {k: v for k, v in
+                          all_fields_info[
+                              sqla_to_django_schema[model_name]].iteritems()
+                          # all_fields_info[model_name].iteritems()
+                          if 'requires' in v}
 
-    # entries_to_add = {k: [Q(id__in=v)]for k, v
-    #                   in entries_ids_to_add. iteritems()}
+        for k, v in foreign_fields.iteritems():
+            ref_model_name = v['requires']
+            new_ref_model_name = django_to_sqla_schema[ref_model_name]
+            fill_in_query(qb, entity_str, new_ref_model_name)
+        return qb
 
 
     # TODO (Spyros) To see better! Especially for functional licenses
     # Check the licenses of exported data.
     if allowed_licenses is not None or forbidden_licenses is not None:
-        qb = QueryBuilder()
-        qb.append(Node, project=["id", "attributes.source.license"],
-                  filters={"id": {"in": entries_ids_to_add[
-                      'aiida.backends.sqlalchemy.models.node.DbNode']}})
-        # Skip those nodes where the license is not set (this is the standard behavior with Django)
-        node_licenses = list((a,b) for [a,b] in qb.all() if b is not None)
-        check_licences(node_licenses, allowed_licenses, forbidden_licenses)
+        for ids in grouper(EXPORT_CHUNK_SIZE, entries_ids_to_add[
+                'aiida.backends.sqlalchemy.models.node.DbNode']):
+            qb = QueryBuilder()
+            qb.append(Node, project=["id", "attributes.source.license"],
+                      filters={"id": {"in": list(ids)}})
+            # Skip those nodes where the license is not set (this is the standard behavior with Django)
+            node_licenses = list((a,b) for [a,b] in qb.all() if b is not None)
+            check_licences(node_licenses, allowed_licenses, forbidden_licenses)
 
 
 
@@ -2136,39 +3462,27 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
     if not silent:
         print "STORING DATABASE ENTRIES..."
 
-    export_data = dict()
-    for top_entity_str, partial_query in entries_to_add.iteritems():
-
-        foreign_fields = {k: v for k, v in
-                          all_fields_info[
-                              sqla_to_django_schema[model_name]].iteritems()
-                          # all_fields_info[model_name].iteritems()
-                          if 'requires' in v}
-
-        for k, v in foreign_fields.iteritems():
-            ref_model_name = v['requires']
-            new_ref_model_name = django_to_sqla_schema[ref_model_name]
-            fill_in_query(partial_query, top_entity_str, new_ref_model_name)
-
-
-        # print "===============> "
-        # print str(partial_query)
-        # print partial_query.dict()
-
-        for temp_d in partial_query.iterdict():
-            for k in temp_d.keys():
-                # This is a empty result of an outer join.
-                # It should not be taken into account.
-                if temp_d[k]["id"] is None:
-                    continue
-
-                temp_d2 = {temp_d[k]["id"]: serialize_dict(temp_d[k], remove_fields=['id'], rename_fields=sqla_fields_to_django[k])}
-                try:
-                    export_data[sqla_to_django_schema[k]].update(temp_d2)
-                except KeyError:
-                    export_data[sqla_to_django_schema[k]] = temp_d2
+    writer = ExportDataWriter(folder, stream=stream, previous=previous)
+    # The entries are queried in chunks, together with the entries
+    # referenced by their foreign keys
+    for top_entity_str, entry_ids in entries_ids_to_add.iteritems():
+        for ids in grouper(EXPORT_CHUNK_SIZE, entry_ids):
+            partial_query = get_entries_query(top_entity_str, ids)
+            for temp_d in partial_query.iterdict():
+                for k in temp_d.keys():
+                    # This is a empty result of an outer join.
+                    # It should not be taken into account.
+                    if temp_d[k]["id"] is None:
+                        continue
+                    # The same entry (e.g. a user) is returned for many rows
+                    if writer.has_entry(sqla_to_django_schema[k],
+                                        temp_d[k]["id"]):
+                        continue
 
-    # print export_data
+                    writer.add_entry(
+                        sqla_to_django_schema[k], temp_d[k]["id"],
+                        serialize_dict(temp_d[k], remove_fields=['id'],
+                                       rename_fields=sqla_fields_to_django[k]))
 
     # Until here
     # sys.exit()
@@ -2177,56 +3491,32 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
     ######################################
     # Manually manage links and attributes
     ######################################
-    # I use .get because there may be no nodes to export
-    all_nodes_pk = export_data.get("aiida.backends.djsite.db.models.DbNode").keys()
-    if sum(len(model_data) for model_data in export_data.values()) == 0:
+    all_nodes_pk = writer.get_pks("aiida.backends.djsite.db.models.DbNode")
+    if writer.num_entries == 0 and writer.num_skipped_entries == 0:
         if not silent:
             print "No nodes to store, exiting..."
         return
 
     if not silent:
         print "Exporting a total of {} db entries, of which {} nodes.".format(
-            sum(len(model_data) for model_data in export_data.values()),
-            len(all_nodes_pk))
-
-    # !!!!!!!! WHY AGAIN ANOTHER QUERY FOR ALREADY EXTRACTED NODES !!!!!
-    # => In order to get the attributes too... => See if this can be optimized
-    all_nodes_query = QueryBuilder()
-    all_nodes_query.append(Node, filters={"id": {"in": all_nodes_pk}}, project=["*"])
-    # all_nodes_query = models.DbNode.objects.filter(pk__in=all_nodes_pk)
-
-    # sys.exit()
-
-    # if not silent:
-    #     print "Exporting a total of {} db entries, of which {} nodes.".format(
-    #         sum(len(model_data) for model_data in export_data.values()),
-    #         len(all_nodes_pk))
-    # all_nodes_query = models.DbNode.objects.filter(pk__in=all_nodes_pk)
+            writer.num_entries, len(all_nodes_pk))
+        if previous is not None:
+            print "Skipping {} db entries already in the previous export.".format(
+                writer.num_skipped_entries)
 
     ## ATTRIBUTES
     if not silent:
         print "STORING NODE ATTRIBUTES..."
-    node_attributes = {}
-    node_attributes_conversion = {}
-    for res in all_nodes_query.iterall():
-        n = res[0]
-        (node_attributes[str(n.pk)],
-         node_attributes_conversion[str(n.pk)]) = serialize_dict(
-            n.get_attrs(), track_conversion=True)
-        # for item in n.get_attrs().iteritems():
-        #     (node_attributes[str(n.pk)],
-        #      node_attributes_conversion[str(n.pk)]) = item
-
-    # See if the above is correct!!!!
-
-    ## If I want to store them 'raw'; it is faster, but more error prone and
-    ## less version-independent, I think. Better to optimize the n.attributes
-    ## call.
-    # all_nodes_query = models.DbNode.objects.filter(pk__in=all_nodes_pk)
-    #node_attributes_raw = list(models.DbAttribute.objects.filter(
-    #    dbnode__in=all_nodes_pk).distinct().values(
-    #    'bval', 'tval', 'ival', 'fval', 'dval',
-    #    'datatype', 'time', 'dbnode', 'key')
+    # The attributes are projected directly from the JSON column, in chunks
+    # of nodes, without loading the nodes themselves
+    for pks in grouper(EXPORT_CHUNK_SIZE, all_nodes_pk):
+        attributes_query = QueryBuilder()
+        attributes_query.append(Node, filters={"id": {"in": list(pks)}},
+                                project=["id", "attributes"])
+        for pk, attrs in attributes_query.iterall(batch_size=EXPORT_CHUNK_SIZE):
+            attributes, conversion = serialize_dict(
+                attrs or {}, track_conversion=True)
+            writer.add_node_attributes(pk, attributes, conversion)
 
     if not silent:
         print "STORING NODE LINKS..."
@@ -2234,26 +3524,31 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
     ## that will get automatically attached to a parent node in the end DB,
     ## if the parent node is already present in the DB)
 
-    links_qb =  QueryBuilder()
-    links_qb.append(Node, project=['uuid'], tag='input')
-    links_qb.append(Node,
-            project=['uuid'], tag='output', filters={'id':{'in':all_nodes_pk}},
-            edge_project=['label'], output_of='input')
-    links_uuid = list()
-
-    for input_uuid, output_uuid, link_label in links_qb.iterall():
-        links_uuid.append({
-            'input':str(input_uuid),
-            'output':str(output_uuid),
-            'label':str(link_label)
-        })
+    # For a delta export, also the links of the skipped nodes are
+    # recorded in the snapshot
+    for pks in grouper(EXPORT_CHUNK_SIZE, writer.get_pks(
+            "aiida.backends.djsite.db.models.DbNode", include_skipped=True)):
+        links_qb =  QueryBuilder()
+        links_qb.append(Node, project=['uuid'], tag='input')
+        links_qb.append(Node,
+                project=['uuid'], tag='output',
+                filters={'id':{'in':list(pks)}},
+                edge_project=['label'], output_of='input')
+
+        for input_uuid, output_uuid, link_label in links_qb.iterall():
+            writer.add_link({
+                'input':str(input_uuid),
+                'output':str(output_uuid),
+                'label':str(link_label)
+            })
 
 
     # The following has to be written more properly
     if not silent:
         print "STORING GROUP ELEMENTS..."
-    groups_uuid = {g.uuid: list(g.dbnodes.values_list('uuid', flat=True))
-                   for g in groups_entries}
+    for g in groups_entries:
+        writer.add_group(g.uuid,
+                         list(g.dbnodes.values_list('uuid', flat=True)))
 
     ######################################
     # Now I store
@@ -2265,21 +3560,18 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
     if not silent:
         print "STORING DATA..."
 
-    with folder.open('data.json', 'w') as f:
-        json.dump({
-                'node_attributes': node_attributes,
-                'node_attributes_conversion': node_attributes_conversion,
-                'export_data': export_data,
-                'links_uuid': links_uuid,
-                'groups_uuid': groups_uuid,
-                }, f)
+    writer.close()
 
     metadata = {
         'aiida_version': aiida.get_version(),
-        'export_version': EXPORT_VERSION,
+        'export_version': (EXPORT_VERSION if stream or previous is not None
+                           else BASE_EXPORT_VERSION),
         'all_fields_info': all_fields_info,
         'unique_identifiers': unique_identifiers,
         }
+    if previous is not None:
+        # Only the entries not in the previous export
+        metadata['delta'] = True
 
     with folder.open('metadata.json', 'w') as f:
         json.dump(metadata, f)
@@ -2289,26 +3581,16 @@ def export_tree_sqla(what, folder, also_parents=True, also_calc_outputs=True,
 
     # Large speed increase by not getting the node itself and looping in memory
     # in python, but just getting the uuid
-    # for uuid in models.DbNode.objects.filter(pk__in=all_nodes_pk).values_list(
-    #     'uuid', flat=True):
-    uuid_query = QueryBuilder()
-    uuid_query.append(Node, filters={"id": {"in": all_nodes_pk}},
-                               project=["uuid"])
-    for res in uuid_query.all():
-        uuid =  str(res[0])
-        sharded_uuid = export_shard_uuid(uuid)
+    def iter_uuids():
+        for pks in grouper(EXPORT_CHUNK_SIZE, all_nodes_pk):
+            uuid_query = QueryBuilder()
+            uuid_query.append(Node, filters={"id": {"in": list(pks)}},
+                              project=["uuid"])
+            for res in uuid_query.iterall():
+                yield str(res[0])
 
-        # Important to set create=False, otherwise creates
-        # twice a subfolder. Maybe this is a bug of insert_path??
-
-        thisnodefolder = nodesubfolder.get_subfolder(
-            sharded_uuid, create=False,
-            reset_limit=True)
-        # In this way, I copy the content of the folder, and not the folder
-        # itself
-        thisnodefolder.insert_path(src=RepositoryFolder(
-            section=Node._section_name, uuid=uuid).abspath,
-                                   dest_name='.')
+    export_node_folders(iter_uuids(), nodesubfolder, manifest=manifest,
+                        num_workers=num_workers)
 
 
 def check_licences(node_licenses, allowed_licenses, forbidden_licenses):
@@ -2364,23 +3646,30 @@ def check_licences(node_licenses, allowed_licenses, forbidden_licenses):
 
 def export_tree(what, folder, also_parents = True, also_calc_outputs=True,
                 allowed_licenses=None, forbidden_licenses=None,
-                silent=False):
+                silent=False, stream=False, manifest=None, num_workers=None,
+                previous=None):
 
     from aiida.backends.settings import BACKEND
     from aiida.backends.profile import BACKEND_DJANGO, BACKEND_SQLA
 
+    if previous is not None and not isinstance(previous, ExportSnapshot):
+        # The path of a previous export file
+        previous = ExportSnapshot.load(previous)
+
     if BACKEND == BACKEND_SQLA:
         export_tree_sqla(what, folder, also_parents = also_parents,
                          also_calc_outputs=also_calc_outputs,
                          allowed_licenses=allowed_licenses,
                          forbidden_licenses=forbidden_licenses,
-                         silent=silent)
+                         silent=silent, stream=stream, manifest=manifest,
+                         num_workers=num_workers, previous=previous)
     elif BACKEND == BACKEND_DJANGO:
         export_tree_dj(what, folder, also_parents = also_parents,
                        also_calc_outputs=also_calc_outputs,
                        allowed_licenses=allowed_licenses,
                        forbidden_licenses=forbidden_licenses,
-                       silent=silent)
+                       silent=silent, stream=stream, manifest=manifest,
+                       num_workers=num_workers, previous=previous)
     else:
         raise Exception("Unknown settings.BACKEND: {}".format(
             BACKEND))
@@ -2410,7 +3699,8 @@ def get_all_parents_dj(node_pks):
 
 def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
                 allowed_licenses=None, forbidden_licenses=None,
-                silent=False):
+                silent=False, stream=False, manifest=None, num_workers=None,
+                previous=None):
     """
     Export the DB entries passed in the 'what' list to a file tree.
 
@@ -2430,6 +3720,16 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
       then calls function for licenses of Data nodes expecting True if
       license is allowed, False otherwise.
     :param silent: suppress debug prints
+    :param stream: if True, write the data in chunks while it is collected
+      (see :py:class:`ExportDataWriter`)
+    :param manifest: the path of a manifest of the node folders already
+      copied, to resume an interrupted export to a folder (see
+      :py:func:`copy_node_folders`)
+    :param num_workers: the number of threads copying the node folders
+    :param previous: the :py:class:`ExportSnapshot` of a previous export;
+      if given, only the nodes that are not in it (or with a different
+      nodeversion), and the links and group members that are not in it, are
+      exported (delta export)
     :raises LicensingException: if any node is licensed under forbidden
       license
     """
@@ -2443,13 +3743,10 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
     from aiida.backends.djsite.db import models
     from aiida.orm import Node, Calculation
     from aiida.common.exceptions import LicensingException
-    from aiida.common.folders import RepositoryFolder
 
     if not silent:
         print "STARTING EXPORT..."
 
-    EXPORT_VERSION = '0.2'
-
     all_fields_info, unique_identifiers = get_all_fields_info()
 
     entries_ids_to_add = defaultdict(list)
@@ -2541,7 +3838,7 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
     ############################################################
     if not silent:
         print "STORING DATABASE ENTRIES..."
-    export_data = {}
+    writer = ExportDataWriter(folder, stream=stream, previous=previous)
     while entries_to_add:
         new_entries_to_add = {}
         for model_name, querysets in entries_to_add.iteritems():
@@ -2563,37 +3860,27 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
             for queryset in querysets:
                 db_ids.update(Model.objects.filter(queryset).values_list(
                     'id', flat=True))
-            dbentries = Model.objects.filter(id__in=db_ids)
-            entryvalues = dbentries.values(
-                'id', *all_fields_info[model_name].keys()
-            )
 
             # Only serialize new nodes (also to avoid infinite loops)
-            if model_name in export_data:
-                serialized = {
-                    str(v['id']): serialize_dict(v, remove_fields=['id'])
-                    for v in entryvalues
-                    if v['id'] not in export_data[model_name]
-                }
-            else:
-                serialized = {
-                    str(v['id']): serialize_dict(v, remove_fields=['id'])
-                    for v in entryvalues
-                }
-
-            try:
-                export_data[model_name].update(serialized)
-            except KeyError:
-                export_data[model_name] = serialized
-
-            if serialized:
+            new_ids = [pk for pk in db_ids
+                       if not writer.has_entry(model_name, pk)]
+            # The entries are fetched in chunks, and written while they come
+            for ids in grouper(EXPORT_CHUNK_SIZE, new_ids):
+                entryvalues = Model.objects.filter(id__in=ids).values(
+                    'id', *all_fields_info[model_name].keys()
+                )
+                for v in entryvalues:
+                    writer.add_entry(model_name, v['id'],
+                                     serialize_dict(v, remove_fields=['id']))
+
+            if new_ids:
                 foreign_fields = {k: v for k, v in
                                   all_fields_info[model_name].iteritems()
                                   if 'requires' in v}
 
                 for k, v in foreign_fields.iteritems():
                     related_queryobj = Q(**{'{}__in'.format(v['related_name']):
-                                                serialized.keys()})
+                                                new_ids})
                     try:
                         new_entries_to_add[v['requires']].append(related_queryobj)
                     except KeyError:
@@ -2604,56 +3891,53 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
     ######################################
     # Manually manage links and attributes
     ######################################
-    # I use .get because there may be no nodes to export
-    all_nodes_pk = export_data.get(get_class_string(models.DbNode), {}).keys()
-    if sum(len(model_data) for model_data in export_data.values()) == 0:
+    all_nodes_pk = writer.get_pks(get_class_string(models.DbNode))
+    if writer.num_entries == 0 and writer.num_skipped_entries == 0:
         if not silent:
             print "No nodes to store, exiting..."
         return
 
     if not silent:
         print "Exporting a total of {} db entries, of which {} nodes.".format(
-            sum(len(model_data) for model_data in export_data.values()),
-            len(all_nodes_pk))
-    all_nodes_query = models.DbNode.objects.filter(pk__in=all_nodes_pk)
+            writer.num_entries, len(all_nodes_pk))
+        if previous is not None:
+            print "Skipping {} db entries already in the previous export.".format(
+                writer.num_skipped_entries)
 
     ## ATTRIBUTES
     if not silent:
         print "STORING NODE ATTRIBUTES..."
-    node_attributes = {}
-    node_attributes_conversion = {}
-    for n in all_nodes_query:
-        (node_attributes[str(n.pk)],
-         node_attributes_conversion[str(n.pk)]) = serialize_dict(
-            n.attributes, track_conversion=True)
-    ## If I want to store them 'raw'; it is faster, but more error prone and
-    ## less version-independent, I think. Better to optimize the n.attributes
-    ## call.
-    # all_nodes_query = models.DbNode.objects.filter(pk__in=all_nodes_pk)
-    #node_attributes_raw = list(models.DbAttribute.objects.filter(
-    #    dbnode__in=all_nodes_pk).distinct().values(
-    #    'bval', 'tval', 'ival', 'fval', 'dval',
-    #    'datatype', 'time', 'dbnode', 'key')
+    # The attributes of a chunk of nodes are rebuilt from the DbAttribute
+    # rows fetched with a single query, without loading the nodes
+    for pks in grouper(EXPORT_CHUNK_SIZE, all_nodes_pk):
+        attributes_by_node = models.DbAttribute.get_all_values_for_nodepks(pks)
+        for pk, attrs in attributes_by_node.iteritems():
+            attributes, conversion = serialize_dict(
+                attrs, track_conversion=True)
+            writer.add_node_attributes(pk, attributes, conversion)
 
     if not silent:
         print "STORING NODE LINKS..."
     ## All 'parent' links (in this way, I can automatically export a node
     ## that will get automatically attached to a parent node in the end DB,
     ## if the parent node is already present in the DB)
-    linksquery = models.DbLink.objects.filter(
-        output__in=all_nodes_query).distinct()
-
-    links_uuid = [
-        serialize_dict(l, rename_fields={
-            'input__uuid': 'input',
-            'output__uuid': 'output'})
-        for l in linksquery.values(
-            'input__uuid', 'output__uuid', 'label')]
+    # For a delta export, also the links of the skipped nodes are
+    # recorded in the snapshot
+    for pks in grouper(EXPORT_CHUNK_SIZE, writer.get_pks(
+            get_class_string(models.DbNode), include_skipped=True)):
+        linksquery = models.DbLink.objects.filter(
+            output__pk__in=pks).distinct()
+
+        for l in linksquery.values('input__uuid', 'output__uuid', 'label'):
+            writer.add_link(serialize_dict(l, rename_fields={
+                'input__uuid': 'input',
+                'output__uuid': 'output'}))
 
     if not silent:
         print "STORING GROUP ELEMENTS..."
-    groups_uuid = {g.uuid: list(g.dbnodes.values_list('uuid', flat=True))
-                   for g in groups_entries}
+    for g in groups_entries:
+        writer.add_group(g.uuid,
+                         list(g.dbnodes.values_list('uuid', flat=True)))
 
     ######################################
     # Now I store
@@ -2665,21 +3949,18 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
     if not silent:
         print "STORING DATA..."
 
-    with folder.open('data.json', 'w') as f:
-        json.dump({
-                'node_attributes': node_attributes,
-                'node_attributes_conversion': node_attributes_conversion,
-                'export_data': export_data,
-                'links_uuid': links_uuid,
-                'groups_uuid': groups_uuid,
-                }, f)
+    writer.close()
 
     metadata = {
         'aiida_version': aiida.get_version(),
-        'export_version': EXPORT_VERSION,
+        'export_version': (EXPORT_VERSION if stream or previous is not None
+                           else BASE_EXPORT_VERSION),
         'all_fields_info': all_fields_info,
         'unique_identifiers': unique_identifiers,
         }
+    if previous is not None:
+        # Only the entries not in the previous export
+        metadata['delta'] = True
 
     with folder.open('metadata.json', 'w') as f:
         json.dump(metadata, f)
@@ -2689,21 +3970,14 @@ def export_tree_dj(what, folder, also_parents = True, also_calc_outputs=True,
 
     # Large speed increase by not getting the node itself and looping in memory
     # in python, but just getting the uuid
-    for uuid in models.DbNode.objects.filter(pk__in=all_nodes_pk).values_list(
-        'uuid', flat=True):
-        sharded_uuid = export_shard_uuid(uuid)
+    def iter_uuids():
+        for pks in grouper(EXPORT_CHUNK_SIZE, all_nodes_pk):
+            for uuid in models.DbNode.objects.filter(pk__in=pks).values_list(
+                    'uuid', flat=True):
+                yield uuid
 
-        # Important to set create=False, otherwise creates
-        # twice a subfolder. Maybe this is a bug of insert_path??
-
-        thisnodefolder = nodesubfolder.get_subfolder(
-            sharded_uuid, create=False,
-            reset_limit=True)
-        # In this way, I copy the content of the folder, and not the folder
-        # itself
-        thisnodefolder.insert_path(src=RepositoryFolder(
-            section=Node._section_name, uuid=uuid).abspath,
-                                   dest_name='.')
+    export_node_folders(iter_uuids(), nodesubfolder, manifest=manifest,
+                        num_workers=num_workers)
 
 
 class MyWritingZipFile(object):
@@ -2846,6 +4120,126 @@ class ZipFolder(object):
             self._zipfile.write(src, base_filename)
 
 
+class MyWritingTarFile(object):
+    def __init__(self, tarfile, fname):
+
+        self._tarfile = tarfile
+        self._fname = fname
+        self._buffer = None
+
+    def open(self):
+        import StringIO
+
+        if self._buffer is not None:
+            raise IOError("Cannot open again!")
+        self._buffer = StringIO.StringIO()
+
+    def write(self, data):
+        self._buffer.write(data)
+
+    def close(self):
+        import time
+        from tarfile import TarInfo
+
+        # The size has to be known before writing the member in the tar file
+        tarinfo = TarInfo(name=self._fname)
+        tarinfo.size = self._buffer.tell()
+        tarinfo.mtime = time.time()
+        self._buffer.seek(0)
+        self._tarfile.addfile(tarinfo, self._buffer)
+        self._buffer = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+class TarFolder(object):
+    """
+    Same as :py:class:`ZipFolder`, but for (possibly compressed) tar files:
+    files and folders are written directly in the tar file, that can be
+    written only sequentially.
+    """
+    def __init__(self, tarfolder_or_fname, mode=None, subfolder='.'):
+        """
+        :param tarfolder_or_fname: either another TarFolder instance,
+          of which you want to get a subfolder, or a filename to create.
+        :param mode: the file mode; see the tarfile.open docs for valid
+          strings (e.g. 'w:gz'). Note: can be specified only if
+          tarfolder_or_fname is a string (the filename to generate)
+        :param subfolder: the subfolder that specified the "current working
+          directory" in the tar file. If tarfolder_or_fname is a TarFolder,
+          subfolder is a relative path from tarfolder_or_fname.subfolder
+        """
+        import tarfile
+        import os
+
+        if isinstance(tarfolder_or_fname, basestring):
+            the_mode = mode
+            if the_mode is None:
+                the_mode = "r:*"
+            # See export() for PAX_FORMAT and dereference=True
+            self._tarfile = tarfile.open(tarfolder_or_fname, mode=the_mode,
+                                         format=tarfile.PAX_FORMAT,
+                                         dereference=True)
+            self._pwd = subfolder
+        else:
+            if mode is not None:
+                raise ValueError("Cannot specify 'mode' when passing a TarFolder")
+            self._tarfile = tarfolder_or_fname._tarfile
+            self._pwd = os.path.join(tarfolder_or_fname.pwd, subfolder)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        self._tarfile.close()
+
+    @property
+    def pwd(self):
+        return self._pwd
+
+    def open(self, fname, mode='r'):
+        if mode == 'w':
+            return MyWritingTarFile(
+                tarfile=self._tarfile, fname=self._get_internal_path(fname))
+        else:
+            return self._tarfile.extractfile(self._get_internal_path(fname))
+
+    def _get_internal_path(self, filename):
+        import os
+        return os.path.normpath(os.path.join(self.pwd, filename))
+
+    def get_subfolder(self, subfolder, create=False, reset_limit=False):
+        # reset_limit: ignored
+        # create: ignored, folders are created when files are added
+        subfolder = TarFolder(self, subfolder=subfolder)
+        return subfolder
+
+    def insert_path(self, src, dest_name=None, overwrite=True):
+        # overwrite: ignored, files cannot be replaced in a tar file
+        import os
+
+        if dest_name is None:
+            base_filename = os.path.basename(src)
+        else:
+            base_filename = dest_name
+
+        base_filename = self._get_internal_path(base_filename)
+
+        if not os.path.isabs(src):
+            raise ValueError("src must be an absolute path in insert_file")
+
+        # This also adds, recursively, the content of folders
+        self._tarfile.add(src, arcname=base_filename)
+
+
 def export_zip(what, outfile = 'testzip', overwrite = False,
               silent = False, use_compression = True, **kwargs):
     import os
@@ -2863,7 +4257,7 @@ def export_zip(what, outfile = 'testzip', overwrite = False,
 
 
 def export(what, outfile = 'export_data.aiida.tar.gz', overwrite = False,
-           silent = False, **kwargs):
+           silent = False, stream = False, resumable = False, **kwargs):
     """
     Export the DB entries passed in the 'what' list on a file.
 
@@ -2877,22 +4271,65 @@ def export(what, outfile = 'export_data.aiida.tar.gz', overwrite = False,
     :param overwrite: if True, overwrite the output file without asking.
         if False, raise an IOError in this case.
     :param silent: suppress debug print
+    :param stream: if True, the data and the files of the nodes are written
+        directly to the output file while they are collected, rather than
+        first copied to a temporary folder and then compressed. The data is
+        stored in chunks of newline-delimited JSON, so that the memory needed
+        does not grow with the size of the export.
+    :param resumable: if True, the files are collected in the folder
+        ``<outfile>.partial`` rather than in a temporary folder, together with
+        a manifest of the node folders already copied; if the export is
+        interrupted, calling it again with the same outfile only copies the
+        missing node folders. The folder is removed once the output file is
+        written. Cannot be combined with stream.
+    :param num_workers: the number of threads copying the node folders (if
+        not given, the importexport.repository_workers property)
+    :param previous: the path of a previous export file (or folder); if
+        given, only what is not in it is exported: the new nodes and the
+        nodes with a different nodeversion, the new links and the new group
+        members (delta export). The result can be imported with import_data
+        where the previous export was imported.
 
     :raise IOError: if overwrite==False and the filename already exists.
     """
     import os
+    import shutil
     import tarfile
     import time
 
-    from aiida.common.folders import SandboxFolder
+    from aiida.common.folders import Folder, SandboxFolder
 
     if not overwrite and os.path.exists(outfile):
         raise IOError("The output file '{}' already "
                       "exists".format(outfile))
 
-    folder = SandboxFolder()
+    if stream and resumable:
+        raise ValueError("A streamed export cannot be resumed")
+
+    if stream:
+        t1 = time.time()
+        with TarFolder(outfile, mode="w:gz") as folder:
+            export_tree(what, folder=folder, silent=silent, stream=True,
+                        **kwargs)
+        t2 = time.time()
+
+        if not silent:
+            print "Exported and compressed in {:6.2g}s.".format(t2-t1)
+            print "DONE."
+        return
+
+    if resumable:
+        folder = Folder(os.path.abspath(outfile) + '.partial')
+        folder.create()
+        manifest = folder.get_abs_path(EXPORT_MANIFEST_NAME)
+        if not silent and os.path.exists(manifest):
+            print "RESUMING THE EXPORT IN {}".format(folder.abspath)
+    else:
+        folder = SandboxFolder()
+        manifest = None
     t1 = time.time()
-    export_tree(what, folder=folder, silent=silent, **kwargs)
+    export_tree(what, folder=folder, silent=silent, manifest=manifest,
+                **kwargs)
 
     t2 = time.time()
 
@@ -2908,12 +4345,16 @@ def export(what, outfile = 'export_data.aiida.tar.gz', overwrite = False,
     t3 = time.time()
     with tarfile.open(outfile, "w:gz", format=tarfile.PAX_FORMAT,
                       dereference=True) as tar:
-        tar.add(folder.abspath, arcname="")
+        tar.add(folder.abspath, arcname="",
+                exclude=lambda name: name == manifest)
 
         #        import shutil
         #        shutil.make_archive(outfile, 'zip', folder.abspath)#, base_dir='aiida')
     t4 = time.time()
 
+    if resumable:
+        shutil.rmtree(folder.abspath)
+
     if not silent:
         filecr_time = t2-t1
         filecomp_time = t4-t3
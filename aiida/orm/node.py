@@ -7,7 +7,7 @@
 # For further information on the license, see the LICENSE.txt file        #
 # For further information please visit http://www.aiida.net               #
 ###########################################################################
-from aiida.orm.implementation import Node
+from aiida.orm.implementation import Node, store_nodes
 from aiida.common.old_pluginloader import from_type_to_pluginclassname
 from aiida.orm.implementation.general.node import AttributeManager
 
@@ -38,6 +38,7 @@ from sqlalchemy.sql.expression import cast
 from aiida.common.exceptions import InputValidationError, ConfigurationError
 # The way I get column as a an attribute to the orm class
 from aiida.backends.utils import _get_column
+from aiida.backends import settings
 
 
 
@@ -69,7 +70,8 @@ class QueryBuilder(object):
 
         :param bool with_dbpath:
             Whether to use the DbPath table (if existing) to query ancestor-descendant relations.
-            The default now is True. Set to False if you want to use the recursive functionality.
+            The default is True, unless the DbPath table is disabled in the profile
+            (AIIDADB_USE_DBPATH). Set to False if you want to use the recursive functionality.
             This gives you the ability to project the path which constructed on the fly.
             It also allows to have the AiiDA instance without the DbPath, which can consume
             a lot of memory for heavy usage of AiiDA.
@@ -183,7 +185,7 @@ class QueryBuilder(object):
 
         # The internal _with_dbpath attributes reports whether I need to do something with the path.
         # I.e. check, loads, etc, implementation left to backend implementation.
-        self.set_with_dbpath(kwargs.pop('with_dbpath', True))
+        self.set_with_dbpath(kwargs.pop('with_dbpath', settings.USE_DBPATH))
         # Whether expanding the path when using recursive functionality
         self.set_expand_path(kwargs.pop('expand_path',False))
 
@@ -1091,6 +1093,10 @@ class QueryBuilder(object):
 
         if not isinstance(l_with_dbpath, bool):
             raise InputValidationError("I expect a boolean")
+        if l_with_dbpath and not settings.USE_DBPATH:
+            raise InputValidationError(
+                "The DbPath table is disabled in this profile, "
+                "use recursive queries (with_dbpath=False)")
         self._with_dbpath = l_with_dbpath
         if self._with_dbpath:
             self._impl.prepare_with_dbpath()
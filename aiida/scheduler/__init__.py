@@ -48,11 +48,17 @@ class Scheduler(object):
     # 'can_query_by_user': True if I can pass the 'user' argument to
     # get_joblist_command (and in this case, no 'jobs' should be given).
     # Otherwise, if False, a list of jobs is passed, and no 'user' is given.
+    # 'can_query_all_users': True if calling get_joblist_command without
+    # 'jobs' nor 'user' lists the jobs of all the users of the computer.
     _features = {}
 
     # The class to be used for the job resource.
     _job_resource_class = None
 
+    # Marker separating the output of different jobs in the output of the
+    # command returned by _get_detailed_jobinfo_bulk_command
+    _detailed_jobinfo_marker = "AIIDA_DETAILED_JOBINFO"
+
     def __init__(self):
         self._transport = None
 
@@ -307,6 +313,14 @@ class Scheduler(object):
         retval, stdout, stderr = self.transport.exec_command_wait(
             command)
 
+        return self._format_detailed_jobinfo(command, retval, stdout, stderr)
+
+    @staticmethod
+    def _format_detailed_jobinfo(command, retval, stdout, stderr):
+        """
+        Return the string stored as detailed jobinfo, given the command
+        that was run and its output.
+        """
         return u"""Detailed jobinfo obtained with command '{}'
 Return Code: {}
 -------------------------------------------------------------
@@ -316,6 +330,95 @@ stderr:
 {}
 """.format(command, retval, stdout, stderr)
 
+    def _get_detailed_jobinfo_bulk_command(self, jobids):
+        """
+        Return a single command that gets the detailed information on all
+        the given jobs, to be parsed by
+        :py:meth:`_parse_detailed_jobinfo_bulk_output`.
+
+        The default implementation chains the commands returned by
+        _get_detailed_jobinfo_command for each job, separating their
+        outputs with marker lines. Plugins whose command accepts a list of
+        jobs can override this method (and the parsing method) to run a
+        single scheduler command.
+
+        :param jobids: a list of job ids (strings)
+        """
+        from aiida.common.utils import escape_for_bash
+
+        commands = []
+        for jobid in jobids:
+            commands.append(
+                "echo {marker} {jobid}; {command} 2>&1; "
+                "echo {marker}_RETVAL $?".format(
+                    marker=self._detailed_jobinfo_marker,
+                    jobid=escape_for_bash(jobid),
+                    command=self._get_detailed_jobinfo_command(jobid=jobid)))
+        return "; ".join(commands)
+
+    def _parse_detailed_jobinfo_bulk_output(self, jobids, retval, stdout,
+                                            stderr):
+        """
+        Split the output of the command returned by
+        _get_detailed_jobinfo_bulk_command into the detailed jobinfo of each
+        job.
+
+        :param jobids: the list of job ids passed to the command
+        :return: a dictionary with the job ids as keys and the detailed
+            jobinfo strings (in the same format returned by
+            get_detailed_jobinfo) as values. Jobs whose information could not
+            be found are not in the dictionary.
+        """
+        outputs = {}
+        retvals = {}
+        current_jobid = None
+        for line in stdout.splitlines():
+            fields = line.split()
+            if fields and fields[0] == self._detailed_jobinfo_marker:
+                current_jobid = " ".join(fields[1:])
+                outputs[current_jobid] = []
+            elif (fields and current_jobid is not None and
+                          fields[0] == self._detailed_jobinfo_marker + "_RETVAL"):
+                try:
+                    retvals[current_jobid] = int(fields[1])
+                except (IndexError, ValueError):
+                    retvals[current_jobid] = None
+                current_jobid = None
+            elif current_jobid is not None:
+                outputs[current_jobid].append(line)
+
+        detailed_jobinfos = {}
+        for jobid in jobids:
+            if jobid not in retvals:
+                continue
+            detailed_jobinfos[jobid] = self._format_detailed_jobinfo(
+                self._get_detailed_jobinfo_command(jobid=jobid),
+                retvals[jobid], "\n".join(outputs[jobid]) + "\n",
+                "(merged with stdout)")
+        return detailed_jobinfos
+
+    def get_detailed_jobinfo_bulk(self, jobids):
+        """
+        Return the detailed jobinfo of several jobs, executing a single
+        command on the remote computer.
+
+        :param jobids: a list of job ids
+        :return: a dictionary with the job ids as keys and the strings
+            returned by get_detailed_jobinfo as values. Jobs whose
+            information could not be obtained are not in the dictionary.
+        :raise NotImplementedError: if the plugin does not implement the
+            detailed jobinfo.
+        """
+        jobids = [str(jobid) for jobid in jobids]
+        if not jobids:
+            return {}
+
+        command = self._get_detailed_jobinfo_bulk_command(jobids=jobids)
+        retval, stdout, stderr = self.transport.exec_command_wait(command)
+
+        return self._parse_detailed_jobinfo_bulk_output(
+            jobids=jobids, retval=retval, stdout=stdout, stderr=stderr)
+
     @abstractmethod
     def _parse_joblist_output(self, retval, stdout, stderr):
         """
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A short-lived cache of the jobs found in the queue of the scheduler of a
+computer, so that the daemon tasks of different AiiDA users of the same
+computer can share a single query to the scheduler.
+"""
+import threading
+import time
+
+
+class _SnapshotEntry(object):
+    """
+    The last result of a query, together with the time it was obtained.
+    """
+
+    def __init__(self):
+        self.jobs = None
+        self.timestamp = None
+        # Only one thread at a time runs the query for a given key
+        self.lock = threading.Lock()
+
+
+class JobsSnapshotCache(object):
+    """
+    Keep, for each key (typically a computer and a query), the jobs
+    returned by the scheduler for at most ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl):
+        """
+        :param ttl: number of seconds for which a snapshot is reused
+        """
+        self._ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key):
+        with self._lock:
+            try:
+                return self._entries[key]
+            except KeyError:
+                entry = _SnapshotEntry()
+                self._entries[key] = entry
+                return entry
+
+    def get_jobs(self, key, fetch):
+        """
+        Return the jobs stored for the given key, calling ``fetch()`` to
+        get them if there is no snapshot or it is older than the ttl.
+
+        If several threads ask for the same key at the same time, only one
+        of them calls ``fetch``, the others wait for its result.
+
+        :param key: a hashable identifying the computer and the query
+        :param fetch: a callable without parameters, returning the jobs
+            (typically, the dictionary returned by Scheduler.getJobs)
+        :return: a tuple (jobs, fresh) where fresh is True if ``fetch`` was
+            called by this very call, False if the jobs come from a
+            previous snapshot
+        """
+        entry = self._get_entry(key)
+        with entry.lock:
+            if (entry.timestamp is not None and
+                    time.time() - entry.timestamp <= self._ttl):
+                return entry.jobs, False
+
+            jobs = fetch()
+            entry.jobs = jobs
+            entry.timestamp = time.time()
+            return jobs, True
+
+    def invalidate(self, key=None):
+        """
+        Forget the snapshot of the given key, or all snapshots if key is
+        None.
+        """
+        with self._lock:
+            if key is None:
+                self._entries = {}
+            else:
+                self._entries.pop(key, None)
+
+
+_DEFAULT_CACHE = None
+_DEFAULT_CACHE_LOCK = threading.Lock()
+
+
+def get_default():
+    """
+    Return the jobs snapshot cache of this process, creating it if needed.
+    """
+    global _DEFAULT_CACHE
+
+    with _DEFAULT_CACHE_LOCK:
+        if _DEFAULT_CACHE is None:
+            from aiida.common.setup import get_property
+
+            _DEFAULT_CACHE = JobsSnapshotCache(
+                ttl=get_property('daemon.jobs_cache_ttl'))
+
+    return _DEFAULT_CACHE
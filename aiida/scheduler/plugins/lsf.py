@@ -171,6 +171,7 @@ class LsfScheduler(aiida.scheduler.Scheduler):
     # Query only by list of jobs and not by user
     _features = {
         'can_query_by_user': False,
+        'can_query_all_users': False,
         }
     
     # The class to be used for the job resource.
@@ -118,6 +118,7 @@ class PbsBaseClass(aiida.scheduler.Scheduler):
     # Query only by list of jobs and not by user
     _features = {
         'can_query_by_user': False,
+        'can_query_all_users': True,
     }
 
     # The class to be used for the job resource.
@@ -103,6 +103,7 @@ class SgeScheduler(aiida.scheduler.Scheduler):
     # user, but not by job id
     _features = {
         'can_query_by_user': True,
+        'can_query_all_users': True,
         }
     
     # The class to be used for the job resource.
@@ -157,6 +157,7 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
     # Query only by list of jobs and not by user
     _features = {
         'can_query_by_user': False,
+        'can_query_all_users': True,
         }
     
     # The class to be used for the job resource.
@@ -232,6 +233,48 @@ class SlurmScheduler(aiida.scheduler.Scheduler):
         """
         return "sacct --format=AllocCPUS,Account,AssocID,AveCPU,AvePages,AveRSS,AveVMSize,Cluster,Comment,CPUTime,CPUTimeRAW,DerivedExitCode,Elapsed,Eligible,End,ExitCode,GID,Group,JobID,JobName,MaxRSS,MaxRSSNode,MaxRSSTask,MaxVMSize,MaxVMSizeNode,MaxVMSizeTask,MinCPU,MinCPUNode,MinCPUTask,NCPUS,NNodes,NodeList,NTasks,Priority,Partition,QOSRAW,ReqCPUS,Reserved,ResvCPU,ResvCPURAW,Start,State,Submit,Suspended,SystemCPU,Timelimit,TotalCPU,UID,User,UserCPU --parsable --jobs={}".format(jobid)
 
+    def _get_detailed_jobinfo_bulk_command(self, jobids):
+        """
+        Return a single sacct command getting the detailed information on
+        all the given jobs (sacct accepts a comma-separated list of jobs).
+        """
+        return self._get_detailed_jobinfo_command(jobid=",".join(jobids))
+
+    def _parse_detailed_jobinfo_bulk_output(self, jobids, retval, stdout,
+                                            stderr):
+        """
+        Split the (parsable) output of sacct by job, keeping for each job
+        the header line and the lines of the job and of its steps (whose
+        JobID is in the format jobid.stepname).
+        """
+        lines = [line for line in stdout.splitlines() if line.strip()]
+        try:
+            header = lines[0]
+            jobid_idx = header.split('|').index('JobID')
+        except (IndexError, ValueError):
+            # Unexpected output (e.g., an error): give the full output
+            # to each job
+            return {jobid: self._format_detailed_jobinfo(
+                        self._get_detailed_jobinfo_command(jobid=jobid),
+                        retval, stdout, stderr)
+                    for jobid in jobids}
+
+        job_lines = {jobid: [] for jobid in jobids}
+        for line in lines[1:]:
+            fields = line.split('|')
+            try:
+                line_jobid = fields[jobid_idx].split('.')[0]
+            except IndexError:
+                continue
+            if line_jobid in job_lines:
+                job_lines[line_jobid].append(line)
+
+        return {jobid: self._format_detailed_jobinfo(
+                    self._get_detailed_jobinfo_command(jobid=jobid),
+                    retval, "\n".join([header] + job_lines[jobid]) + "\n",
+                    stderr)
+                for jobid in jobids}
+
     def _get_submit_script_header(self, job_tmpl):
         """
         Return the submit script header, using the parameters from the
@@ -897,6 +897,34 @@ class TestParserQstat(unittest.TestCase):
 #            job_list = s._parse_joblist_output(retval, stdout, stderr)
 #            #            print s._logger._log, dir(s._logger._log),'!!!!'
 
+class TestDetailedJobinfoBulk(unittest.TestCase):
+    """
+    Test the splitting by job of the output of the chained tracejob
+    commands.
+    """
+
+    def test_parse_bulk_output(self):
+        s = PbsproScheduler()
+        marker = s._detailed_jobinfo_marker
+        stdout = ("{0} 12.host\n"
+                  "Job: 12.host\n"
+                  "exit status=0\n"
+                  "{0}_RETVAL 0\n"
+                  "{0} 13.host\n"
+                  "tracejob: Couldn't find Job Id 13.host\n"
+                  "{0}_RETVAL 1\n".format(marker))
+        infos = s._parse_detailed_jobinfo_bulk_output(
+            ['12.host', '13.host', '14.host'], retval=0, stdout=stdout,
+            stderr='')
+
+        self.assertEquals(set(infos.keys()), set(['12.host', '13.host']))
+        self.assertIn('exit status=0', infos['12.host'])
+        self.assertIn('Return Code: 0', infos['12.host'])
+        self.assertNotIn("Couldn't find", infos['12.host'])
+        self.assertIn("Couldn't find Job Id 13.host", infos['13.host'])
+        self.assertIn('Return Code: 1', infos['13.host'])
+
+
 class TestSubmitScript(unittest.TestCase):
     def test_submit_script(self):
         """
@@ -115,6 +115,36 @@ class TestParserSqueue(unittest.TestCase):
         #                self.assertTrue( j.num_machines==num_machines )
         #                self.assertTrue( j.num_mpiprocs==num_mpiprocs )
 
+class TestDetailedJobinfoBulk(unittest.TestCase):
+    """
+    Test the splitting by job of the output of a single sacct command.
+    """
+
+    def test_bulk_command(self):
+        s = SlurmScheduler()
+        command = s._get_detailed_jobinfo_bulk_command(['123', '456'])
+        self.assertTrue(command.startswith('sacct '))
+        self.assertTrue(command.endswith('--jobs=123,456'))
+
+    def test_parse_bulk_output(self):
+        s = SlurmScheduler()
+        stdout = ("JobID|JobName|State|\n"
+                  "123|aiida-1|COMPLETED|\n"
+                  "123.batch|batch|COMPLETED|\n"
+                  "456|aiida-2|FAILED|\n"
+                  "1234|aiida-3|COMPLETED|\n")
+        infos = s._parse_detailed_jobinfo_bulk_output(
+            ['123', '456', '789'], retval=0, stdout=stdout, stderr='')
+
+        self.assertEquals(set(infos.keys()), set(['123', '456', '789']))
+        self.assertIn('123.batch|batch', infos['123'])
+        self.assertIn('JobID|JobName', infos['123'])
+        self.assertNotIn('aiida-2', infos['123'])
+        self.assertNotIn('aiida-3', infos['123'])
+        self.assertIn('456|aiida-2|FAILED', infos['456'])
+        self.assertNotIn('aiida-', infos['789'])
+
+
 class TestTimes(unittest.TestCase):
     def test_time_conversion(self):
         """
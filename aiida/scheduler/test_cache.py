@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import unittest
+
+from aiida.scheduler.cache import JobsSnapshotCache
+
+
+class _Fetcher(object):
+    def __init__(self):
+        self.num_calls = 0
+
+    def __call__(self):
+        self.num_calls += 1
+        return {'1': self.num_calls}
+
+
+class TestJobsSnapshotCache(unittest.TestCase):
+    """
+    Test the reuse of the jobs snapshots within the ttl.
+    """
+
+    def test_reuse(self):
+        cache = JobsSnapshotCache(ttl=60)
+        fetch = _Fetcher()
+
+        jobs, fresh = cache.get_jobs('a', fetch)
+        self.assertTrue(fresh)
+        self.assertEquals(jobs, {'1': 1})
+        jobs, fresh = cache.get_jobs('a', fetch)
+        self.assertFalse(fresh)
+        self.assertEquals(jobs, {'1': 1})
+        self.assertEquals(fetch.num_calls, 1)
+
+        # Different keys (e.g. computers) have different snapshots
+        _, fresh = cache.get_jobs('b', fetch)
+        self.assertTrue(fresh)
+        self.assertEquals(fetch.num_calls, 2)
+
+    def test_expire(self):
+        import time
+
+        cache = JobsSnapshotCache(ttl=0)
+        fetch = _Fetcher()
+
+        cache.get_jobs('a', fetch)
+        time.sleep(0.01)
+        jobs, fresh = cache.get_jobs('a', fetch)
+        self.assertTrue(fresh)
+        self.assertEquals(jobs, {'1': 2})
+
+    def test_invalidate(self):
+        cache = JobsSnapshotCache(ttl=60)
+        fetch = _Fetcher()
+
+        cache.get_jobs('a', fetch)
+        cache.invalidate('a')
+        _, fresh = cache.get_jobs('a', fetch)
+        self.assertTrue(fresh)
+        self.assertEquals(fetch.num_calls, 2)
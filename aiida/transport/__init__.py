@@ -115,6 +115,18 @@ class Transport(object):
         """
         raise NotImplementedError
 
+    def check_alive(self):
+        """
+        Return True if the transport is open and can still be used, False
+        otherwise. Used e.g. by the transport pool to decide whether a
+        cached connection can be reused.
+
+        The default implementation only checks if the transport was opened
+        (and not closed); subclasses connecting to remote machines should
+        also check that the connection did not drop.
+        """
+        return getattr(self, '_is_open', False)
+
     def __repr__(self):
         return '<{}: {}>'.format(self.__class__.__name__, str(self))
 
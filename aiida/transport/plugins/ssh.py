@@ -489,6 +489,26 @@ class SshTransport(aiida.transport.Transport):
         self._client.close()
         self._is_open = False
 
+    def check_alive(self):
+        """
+        Return True if the SSH connection is open and still active. Performs
+        a (cheap) round trip on the SFTP channel to detect dropped
+        connections.
+        """
+        if not self._is_open:
+            return False
+
+        transport = self._client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+
+        try:
+            self._sftp.stat('.')
+        except Exception:
+            return False
+
+        return True
+
     @property
     def sshclient(self):
         if not self._is_open:
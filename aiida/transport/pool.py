@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+A pool of open transports, to reuse the same connection to a computer
+across different daemon tasks instead of opening (e.g. with a full SSH
+handshake) a new one every time.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from aiida.common import aiidalogger
+
+poollogger = aiidalogger.getChild('transport').getChild('pool')
+
+
+class _PoolEntry(object):
+    """
+    An open transport kept in the pool, together with its bookkeeping.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.transport = None
+        self.initial_cwd = None
+        self.last_used = None
+        # Only one user at a time can use a given transport
+        self.lock = threading.Lock()
+
+
+class TransportPool(object):
+    """
+    Keep open transports, one per authinfo, and hand them out on request.
+
+    When a transport is requested, the cached one is reused if it is still
+    alive (see :py:meth:`aiida.transport.Transport.check_alive`) and was not
+    left idle for more than ``idle_timeout`` seconds; otherwise it is closed
+    and a new one is opened. Transports are never closed by the users of
+    the pool: use :py:meth:`close_all` for that.
+    """
+
+    def __init__(self, idle_timeout=None):
+        """
+        :param idle_timeout: number of seconds after which an unused
+            transport is considered stale and reopened. None to never expire
+            transports.
+        """
+        self._idle_timeout = idle_timeout
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(authinfo):
+        """
+        Return the key identifying the transport of the given authinfo.
+
+        Also the connection parameters enter the key, so that a connection
+        is not reused after the configuration of the authinfo or of the
+        computer has changed.
+        """
+        from aiida.orm.computer import Computer
+
+        params = dict(
+            Computer(dbcomputer=authinfo.dbcomputer).get_transport_params())
+        params.update(authinfo.get_auth_params())
+        return (authinfo.id, authinfo.dbcomputer.transport_type,
+                authinfo.dbcomputer.hostname,
+                json.dumps(params, sort_keys=True, default=str))
+
+    def _get_entry(self, authinfo):
+        key = self._get_key(authinfo)
+        with self._lock:
+            try:
+                return self._entries[key]
+            except KeyError:
+                entry = _PoolEntry(key)
+                self._entries[key] = entry
+                return entry
+
+    def _is_reusable(self, entry):
+        if entry.transport is None:
+            return False
+        if (self._idle_timeout is not None and
+                time.time() - entry.last_used > self._idle_timeout):
+            poollogger.debug("Transport {} was idle for too long, "
+                             "reopening it".format(entry.transport))
+            return False
+        if not entry.transport.check_alive():
+            poollogger.info("Transport {} is not alive anymore, "
+                            "reopening it".format(entry.transport))
+            return False
+        return True
+
+    @staticmethod
+    def _close_quietly(transport):
+        try:
+            transport.close()
+        except Exception as e:
+            poollogger.debug("Error while closing transport {} ({}): "
+                             "{}".format(transport, e.__class__.__name__,
+                                         e.message))
+
+    @contextmanager
+    def get_transport(self, authinfo):
+        """
+        Return a context manager yielding an open transport for the given
+        authinfo. The transport is returned to the pool (but not closed) when
+        the context is exited.
+
+        :param authinfo: a DbAuthInfo instance
+        """
+        entry = self._get_entry(authinfo)
+        with entry.lock:
+            if not self._is_reusable(entry):
+                if entry.transport is not None:
+                    self._close_quietly(entry.transport)
+                    entry.transport = None
+                transport = authinfo.get_transport()
+                transport.open()
+                entry.transport = transport
+                entry.initial_cwd = transport.getcwd()
+
+            transport = entry.transport
+            try:
+                yield transport
+            except Exception:
+                # The transport may have been left in a broken state: do not
+                # trust it anymore
+                self._close_quietly(transport)
+                entry.transport = None
+                raise
+            else:
+                transport._set_logger_extra(None)
+                try:
+                    if transport.getcwd() != entry.initial_cwd:
+                        transport.chdir(entry.initial_cwd)
+                except Exception:
+                    self._close_quietly(transport)
+                    entry.transport = None
+            finally:
+                entry.last_used = time.time()
+
+    def close_all(self):
+        """
+        Close all the transports in the pool and empty it.
+        """
+        with self._lock:
+            entries = self._entries.values()
+            self._entries = {}
+
+        for entry in entries:
+            with entry.lock:
+                if entry.transport is not None:
+                    self._close_quietly(entry.transport)
+                    entry.transport = None
+
+
+_DEFAULT_POOL = None
+_DEFAULT_POOL_LOCK = threading.Lock()
+
+
+def get_default():
+    """
+    Return the transport pool of this process, creating it if needed.
+    """
+    global _DEFAULT_POOL
+
+    with _DEFAULT_POOL_LOCK:
+        if _DEFAULT_POOL is None:
+            import atexit
+            from aiida.common.setup import get_property
+
+            idle_timeout = get_property('transport.pool_idle_timeout')
+            _DEFAULT_POOL = TransportPool(
+                idle_timeout=idle_timeout if idle_timeout > 0 else None)
+            atexit.register(_DEFAULT_POOL.close_all)
+
+    return _DEFAULT_POOL
+
+
+@contextmanager
+def get_transport(authinfo):
+    """
+    Return a context manager yielding an open transport for the given
+    authinfo.
+
+    If the ``transport.pool`` property is set, the transport is taken from
+    (and returned to) the default pool of this process, otherwise a new
+    transport is opened and closed when exiting the context.
+
+    :param authinfo: a DbAuthInfo instance
+    """
+    from aiida.common.setup import get_property
+
+    if get_property('transport.pool'):
+        with get_default().get_transport(authinfo) as transport:
+            yield transport
+    else:
+        with authinfo.get_transport() as transport:
+            yield transport
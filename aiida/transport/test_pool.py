@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+import unittest
+
+from aiida.transport.plugins.local import LocalTransport
+from aiida.transport.pool import TransportPool
+
+
+class _FakeAuthInfo(object):
+    """
+    Minimal stand-in for a DbAuthInfo, returning local transports.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.num_transports = 0
+
+    def get_transport(self):
+        self.num_transports += 1
+        return LocalTransport()
+
+
+class _TestTransportPool(TransportPool):
+    """
+    A transport pool that does not need the database to compute the keys.
+    """
+
+    @staticmethod
+    def _get_key(authinfo):
+        return authinfo.key
+
+
+class TestTransportPool(unittest.TestCase):
+    """
+    Test the reuse of transports in the TransportPool.
+    """
+
+    def test_reuse(self):
+        pool = _TestTransportPool()
+        authinfo = _FakeAuthInfo('a')
+
+        with pool.get_transport(authinfo) as t1:
+            self.assertTrue(t1.check_alive())
+            initial_cwd = t1.getcwd()
+            t1.chdir('/')
+        with pool.get_transport(authinfo) as t2:
+            self.assertIs(t1, t2)
+            # The working directory is restored when the transport
+            # is returned to the pool
+            self.assertEquals(t2.getcwd(), initial_cwd)
+        self.assertEquals(authinfo.num_transports, 1)
+
+        pool.close_all()
+        self.assertFalse(t1.check_alive())
+
+    def test_different_authinfos(self):
+        pool = _TestTransportPool()
+        authinfo_a = _FakeAuthInfo('a')
+        authinfo_b = _FakeAuthInfo('b')
+
+        with pool.get_transport(authinfo_a) as t1:
+            with pool.get_transport(authinfo_b) as t2:
+                self.assertIsNot(t1, t2)
+        pool.close_all()
+
+    def test_reopen_dead(self):
+        pool = _TestTransportPool()
+        authinfo = _FakeAuthInfo('a')
+
+        with pool.get_transport(authinfo) as t1:
+            pass
+        # Simulate a dropped connection
+        t1.close()
+        with pool.get_transport(authinfo) as t2:
+            self.assertIsNot(t1, t2)
+            self.assertTrue(t2.check_alive())
+        self.assertEquals(authinfo.num_transports, 2)
+        pool.close_all()
+
+    def test_discard_after_exception(self):
+        pool = _TestTransportPool()
+        authinfo = _FakeAuthInfo('a')
+
+        with self.assertRaises(ValueError):
+            with pool.get_transport(authinfo) as t1:
+                raise ValueError
+        self.assertFalse(t1.check_alive())
+
+        with pool.get_transport(authinfo) as t2:
+            self.assertIsNot(t1, t2)
+        pool.close_all()
+
+    def test_idle_timeout(self):
+        import time
+
+        pool = _TestTransportPool(idle_timeout=0)
+        authinfo = _FakeAuthInfo('a')
+
+        with pool.get_transport(authinfo) as t1:
+            pass
+        time.sleep(0.01)
+        with pool.get_transport(authinfo) as t2:
+            self.assertIsNot(t1, t2)
+        pool.close_all()
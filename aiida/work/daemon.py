@@ -13,59 +13,149 @@ from aiida.backends.utils import load_dbenv, is_dbenv_loaded
 if not is_dbenv_loaded():
     load_dbenv()
 
+import threading
 import traceback
+import Queue
 import aiida.work.defaults as defaults
 from plum.process import ProcessState
+from aiida.common import aiidalogger
 from aiida.work.process import Process
 import aiida.work.persistence
 
 
+logger = aiidalogger.getChild('work').getChild('daemon')
+
 
 def tick_workflow_engine(storage=None, print_exceptions=True):
+    """
+    Tick once all the running processes that have a checkpoint in the storage.
+
+    The checkpoints are read in chunks and the processes waiting on a
+    calculation that is still running are skipped without being
+    instantiated (see the iter_ready_checkpoints method of the storage).
+    If the ``daemon.workflow_engine_workers`` property is larger than one,
+    the other processes are ticked concurrently by that many worker threads.
+
+    :param storage: The persistence to load the checkpoints from, the
+        default one if None.
+    :param print_exceptions: Print the exceptions raised by the processes.
+    :return: True if there are processes that have not finished yet.
+    """
+    from aiida.common.setup import get_property
+
     if storage is None:
         storage = aiida.work.persistence.get_default()
 
-    more_work = False
-
-    for proc in _load_all_processes(storage):
-        storage.persist_process(proc)
-        is_waiting = proc.get_waiting_on()
-        try:
-            # Get the Process till the point it is about to do some work
-            if is_waiting is not None:
-                proc.run_until(ProcessState.WAITING)
-            else:
-                proc.run_until(ProcessState.STARTED)
-
-            proc.tick()
+    num_workers = get_property('daemon.workflow_engine_workers')
+    if num_workers <= 1:
+        more_work = False
+        for checkpoints, waiting in storage.iter_ready_checkpoints():
+            more_work |= waiting
+            for cp in checkpoints:
+                more_work |= _tick_checkpoint(storage, cp, print_exceptions)
+        return more_work
 
-            # Now stop the process and let it finish running through the states
-            # until it is destroyed
-            proc.stop()
-            proc.run_until(ProcessState.DESTROYED)
-        except BaseException:
-            if print_exceptions:
-                traceback.print_exc()
-            continue
+    return _tick_concurrently(storage, print_exceptions, num_workers)
 
-        # Check if the process finished or was stopped early
-        if not proc.has_finished():
-            more_work = True
 
-    return more_work
+def _tick_concurrently(storage, print_exceptions, num_workers):
+    from aiida.backends.utils import close_thread_db_connection
 
+    # Bounded, so that the checkpoints are not loaded much faster than the
+    # processes are ticked
+    queue = Queue.Queue(maxsize=2 * num_workers)
+    more_work = []
+    lock = threading.Lock()
 
-def _load_all_processes(storage):
-    procs = []
-    for cp in storage.load_all_checkpoints():
+    def worker():
         try:
-            procs.append(Process.create_from(cp))
-        except KeyboardInterrupt:
-            raise
-        except BaseException:
-            # TODO: Log exception
-            pass
-    return procs
+            while True:
+                cp = queue.get()
+                if cp is None:
+                    return
+                try:
+                    if _tick_checkpoint(storage, cp, print_exceptions):
+                        with lock:
+                            more_work.append(True)
+                except Exception:
+                    logger.exception("Unexpected error while ticking a "
+                                     "process")
+        finally:
+            close_thread_db_connection()
+
+    threads = [threading.Thread(target=worker,
+                                name="aiida-workflow-engine-{}".format(i))
+               for i in range(num_workers)]
+    for thread in threads:
+        thread.start()
+
+    def put(item):
+        # Do not block forever if no worker is left to get the item
+        while any(thread.is_alive() for thread in threads):
+            try:
+                queue.put(item, timeout=1.)
+                return True
+            except Queue.Full:
+                pass
+        logger.error("All the workflow engine workers have stopped")
+        return False
+
+    try:
+        for checkpoints, waiting in storage.iter_ready_checkpoints():
+            if waiting:
+                more_work.append(True)
+            for cp in checkpoints:
+                if not put(cp):
+                    # The remaining processes are ticked at the next call
+                    return True
+    finally:
+        for _ in threads:
+            if not put(None):
+                break
+        for thread in threads:
+            thread.join()
+
+    return bool(more_work)
+
+
+def _tick_checkpoint(storage, checkpoint, print_exceptions):
+    """
+    Recreate the process of a checkpoint and tick it.
+
+    :return: True if the process has not finished yet.
+    """
+    try:
+        storage.load_inputs(checkpoint)
+        proc = Process.create_from(checkpoint)
+    except KeyboardInterrupt:
+        raise
+    except BaseException:
+        logger.exception("Unable to recreate a process from its checkpoint")
+        return False
+
+    try:
+        storage.persist_process(proc)
+        is_waiting = proc.get_waiting_on()
+        # Get the Process till the point it is about to do some work
+        if is_waiting is not None:
+            proc.run_until(ProcessState.WAITING)
+        else:
+            proc.run_until(ProcessState.STARTED)
+
+        proc.tick()
+
+        # Now stop the process and let it finish running through the states
+        # until it is destroyed
+        proc.stop()
+        proc.run_until(ProcessState.DESTROYED)
+    except BaseException:
+        logger.exception("Error while ticking process {}".format(proc.pid))
+        if print_exceptions:
+            traceback.print_exc()
+        return False
+
+    # Check if the process finished or was stopped early
+    return not proc.has_finished()
 
 
 if __name__ == "__main__":
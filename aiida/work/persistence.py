@@ -9,26 +9,123 @@
 ###########################################################################
 
 import collections
+import glob
+import pickle
 import uritools
 import os.path
 
 import plum.persistence.pickle_persistence
+from plum.persistence._base import LOGGER
 from plum.process import Process
+from plum.util import fullname
+from plum.wait import WaitOn
+from aiida.common.datastructures import calc_states
 from aiida.common.lang import override
+from aiida.daemon.notifications import notify_process
 from aiida.work.defaults import class_loader
+from aiida.work.legacy.wait_on import WaitOnJobCalculation
+
+# Number of checkpoints loaded, and checked together for the calculations
+# they are waiting on, at a time by iter_ready_checkpoints
+_CHECKPOINTS_CHUNK_SIZE = 100
+
+# A process waiting on a calculation in one of these states is not ready to
+# continue (see WaitOnJobCalculation.is_ready)
+_CALC_RUNNING_STATES = (
+    calc_states.TOSUBMIT,
+    calc_states.SUBMITTING,
+    calc_states.WITHSCHEDULER,
+    calc_states.COMPUTED,
+    calc_states.RETRIEVING,
+    calc_states.RETRIEVED,
+    calc_states.PARSING,
+)
+
+_WAIT_ON_JOB_CALCULATION = fullname(WaitOnJobCalculation)
 
 
 class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
     @override
-    def load_checkpoint_from_file(self, filepath):
+    def load_checkpoint_from_file(self, filepath, load_inputs=True):
+        """
+        Load the checkpoint stored in a file.
+
+        :param filepath: The path of the checkpoint file.
+        :param load_inputs: If False the input nodes are not loaded from the
+            database and the inputs of the checkpoint are left as pks, use
+            :func:`load_inputs` to load them later.
+        :return: The checkpoint bundle.
+        """
         cp = super(Persistence, self).load_checkpoint_from_file(filepath)
+        self._prepare_checkpoint(cp, load_inputs)
+        return cp
 
-        inputs = cp[Process.BundleKeys.INPUTS.value]
-        if inputs:
-            cp[Process.BundleKeys.INPUTS.value] = self._load_nodes_from(inputs)
+    def _prepare_checkpoint(self, cp, load_inputs):
+        if load_inputs:
+            self.load_inputs(cp)
 
         cp.set_class_loader(class_loader)
-        return cp
+
+    def load_inputs(self, checkpoint):
+        """
+        Replace the input pks of a checkpoint loaded with ``load_inputs=False``
+        by the corresponding nodes.
+
+        :param checkpoint: The checkpoint bundle.
+        """
+        inputs = checkpoint[Process.BundleKeys.INPUTS.value]
+        if inputs:
+            checkpoint[Process.BundleKeys.INPUTS.value] = \
+                self._load_nodes_from(inputs)
+
+    @override
+    def on_process_wait(self, process, wait_on):
+        super(Persistence, self).on_process_wait(process, wait_on)
+        _notify_checkpoint(process, wait_on)
+
+    @override
+    def on_process_finish(self, process):
+        super(Persistence, self).on_process_finish(process)
+        # The processes waiting on this one can continue
+        notify_process(process.pid)
+
+    def _iter_checkpoint_files(self):
+        """
+        Iterate lazily over the checkpoint files of the running processes.
+
+        :return: An iterator over the paths of the checkpoint files.
+        """
+        return glob.iglob(os.path.join(self.store_directory, "*.pickle"))
+
+    def iter_ready_checkpoints(self, chunk_size=_CHECKPOINTS_CHUNK_SIZE):
+        """
+        Iterate over the checkpoints of the running processes, in chunks.
+
+        For each chunk, yield the list of the checkpoints of the processes
+        that may be able to continue, with the inputs not loaded (see
+        :func:`load_inputs`), and whether some processes were left out
+        because they are waiting on a calculation that is still running.
+
+        :param chunk_size: The number of checkpoints loaded at a time.
+        """
+        chunk = []
+        for filepath in self._iter_checkpoint_files():
+            try:
+                chunk.append(self.load_checkpoint_from_file(
+                    filepath, load_inputs=False))
+            except KeyboardInterrupt:
+                raise
+            except BaseException:
+                # The file may have been moved away since it was listed,
+                # e.g. because the process finished
+                continue
+
+            if len(chunk) >= chunk_size:
+                yield _filter_ready(chunk)
+                chunk = []
+
+        if chunk:
+            yield _filter_ready(chunk)
 
     @override
     def create_bundle(self, process):
@@ -81,6 +178,187 @@ class Persistence(plum.persistence.pickle_persistence.PicklePersistence):
         return nodes
 
 
+class DbPersistence(Persistence):
+    """
+    Persistence storing the checkpoints in the database (DbCheckpoint table)
+    instead of pickle files.
+
+    Each process has a single row that is updated in place, so that saving
+    a checkpoint is atomic, and the processes that can continue (those not
+    waiting on a calculation that is still running) are found with a query
+    rather than by loading all the checkpoints.
+    """
+    RUNNING = 'running'
+    FINISHED = 'finished'
+    FAILED = 'failed'
+
+    def __init__(self, auto_persist=False):
+        from aiida.orm.implementation import CheckpointStore
+
+        super(DbPersistence, self).__init__(auto_persist=auto_persist)
+        self._store = CheckpointStore()
+
+    @override
+    def load_checkpoint(self, pid):
+        from aiida.common.exceptions import NotExistent
+
+        try:
+            return self._loads(self._store.load(pid))
+        except NotExistent:
+            raise ValueError(
+                "Not checkpoint with pid '{}' could be found".format(pid))
+
+    @override
+    def load_all_checkpoints(self):
+        checkpoints = []
+        for chunk in self._iter_checkpoints(blocking_calc_states=()):
+            for cp in chunk:
+                self.load_inputs(cp)
+                checkpoints.append(cp)
+        return checkpoints
+
+    @override
+    def iter_ready_checkpoints(self, chunk_size=_CHECKPOINTS_CHUNK_SIZE):
+        for checkpoints in self._iter_checkpoints(_CALC_RUNNING_STATES,
+                                                  chunk_size):
+            yield checkpoints, False
+
+        yield [], self._store.has_blocked(self.RUNNING, _CALC_RUNNING_STATES)
+
+    def _iter_checkpoints(self, blocking_calc_states,
+                          chunk_size=_CHECKPOINTS_CHUNK_SIZE):
+        after_pid = None
+        while True:
+            rows = self._store.get_ready(
+                self.RUNNING, blocking_calc_states, after_pid=after_pid,
+                limit=chunk_size)
+            checkpoints = []
+            for pid, data in rows:
+                try:
+                    checkpoints.append(self._loads(data, load_inputs=False))
+                except KeyboardInterrupt:
+                    raise
+                except BaseException as e:
+                    LOGGER.warning(
+                        "Failed to load checkpoint of process {} because of "
+                        "exception\n{}".format(pid, e.message))
+            if checkpoints:
+                yield checkpoints
+            if len(rows) < chunk_size:
+                break
+            after_pid = rows[-1][0]
+
+    @override
+    def persist_process(self, process):
+        # If the process doesn't have a persisted state then persist it now
+        if not self._store.exists(process.pid):
+            try:
+                self.save(process)
+            except pickle.PicklingError as e:
+                LOGGER.error(
+                    "exception raised trying to pickle process (pid={}).\n"
+                    "{}".format(process.pid, e.message))
+
+        try:
+            process.add_process_listener(self)
+        except AssertionError:
+            # Happens if we're already listening
+            pass
+
+    @override
+    def save(self, process, state=RUNNING):
+        checkpoint = self.create_bundle(process)
+        self._store.save(process.pid, state,
+                         _get_waited_on_calculation(checkpoint),
+                         pickle.dumps(checkpoint, pickle.HIGHEST_PROTOCOL))
+
+    @override
+    def on_process_finish(self, process):
+        try:
+            self.save(process, state=self.FINISHED)
+        except pickle.PicklingError:
+            LOGGER.error("exception raised trying to pickle process (pid={}) "
+                         "during on_finish message.".format(process.pid))
+        notify_process(process.pid)
+
+    @override
+    def on_monitored_process_failed(self, pid):
+        from aiida.common.exceptions import NotExistent
+
+        try:
+            self._store.set_state(pid, self.FAILED)
+        except NotExistent:
+            pass
+
+    def _loads(self, data, load_inputs=True):
+        cp = pickle.loads(data)
+        self._prepare_checkpoint(cp, load_inputs)
+        return cp
+
+
+def _notify_checkpoint(process, wait_on):
+    """
+    Notify that the checkpoint of a waiting process was written, if it can
+    already continue (e.g. between two steps of a WorkChain). Otherwise, the
+    calculation or process it is waiting on notifies when it finishes.
+    """
+    try:
+        ready = wait_on.is_ready()
+    except Exception:
+        ready = False
+    if ready:
+        notify_process(process.pid)
+
+
+def _filter_ready(checkpoints):
+    """
+    Split the checkpoints of processes waiting on a calculation that is still
+    running from the others, looking up the state of all the calculations
+    with a single query.
+
+    :return: A tuple with the list of the other checkpoints, and whether
+        some were left out.
+    """
+    waited_on = {}
+    for cp in checkpoints:
+        pk = _get_waited_on_calculation(cp)
+        if pk is not None:
+            waited_on[id(cp)] = pk
+
+    if not waited_on:
+        return checkpoints, False
+
+    states = _get_calculation_states(set(waited_on.values()))
+    ready = [cp for cp in checkpoints
+             if states.get(waited_on.get(id(cp))) not in _CALC_RUNNING_STATES]
+    return ready, len(ready) < len(checkpoints)
+
+
+def _get_waited_on_calculation(checkpoint):
+    """
+    Return the pk of the calculation that the process of a checkpoint is
+    waiting on, or None if it is not waiting on a calculation.
+    """
+    wait_on = checkpoint.get(Process.BundleKeys.WAITING_ON.value, None)
+    if (wait_on and wait_on.get(WaitOn.BundleKeys.CLASS_NAME.value) ==
+            _WAIT_ON_JOB_CALCULATION):
+        return wait_on[WaitOnJobCalculation.PK]
+    return None
+
+
+def _get_calculation_states(pks):
+    """
+    Return a dictionary with the current state of the given calculations.
+    """
+    from aiida.orm.querybuilder import QueryBuilder
+    from aiida.orm.calculation.job import JobCalculation
+
+    qb = QueryBuilder()
+    qb.append(JobCalculation, filters={'id': {'in': list(pks)}},
+              project=['id', 'calc_state'])
+    return dict(qb.all())
+
+
 _DEFAULT_STORAGE = None
 
 
@@ -98,6 +376,10 @@ def _create_storage():
     import aiida.settings as settings
     global _DEFAULT_STORAGE
 
+    if setup.get_property('workflow.checkpoint_storage') == 'database':
+        _DEFAULT_STORAGE = DbPersistence(auto_persist=False)
+        return
+
     parts = uritools.urisplit(settings.REPOSITORY_URI)
     if parts.scheme == u'file':
         WORKFLOWS_DIR = os.path.expanduser(
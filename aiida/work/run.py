@@ -14,6 +14,7 @@ from aiida.work import util as util
 from aiida.work.defaults import parallel_engine, serial_engine
 from aiida.work.process import Process
 import aiida.work.persistence
+from aiida.daemon.notifications import notify_process
 
 
 
@@ -143,4 +144,6 @@ def queue_up(process_class, inputs, storage):
     proc.stop()
     proc.run_until_complete()
     del proc
+    # 4) Wake up the daemon, if it listens for notifications
+    notify_process(pid)
     return pid
@@ -0,0 +1,85 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Measure the rate (rows per second) at which the attributes of nodes are
+written in the DbAttribute table of the Django backend, for wide and deep
+attribute dictionaries, using multi-row INSERTs and using COPY.
+
+Usage: verdi run attributes.py [NUMBER_OF_LEAVES]
+
+WARNING: the nodes are created in the database of the current profile;
+use a test profile.
+"""
+import sys
+import time
+
+from aiida.backends import settings
+from aiida.backends.profile import BACKEND_DJANGO
+from aiida.orm.node import Node
+
+
+def wide_attributes(num_leaves):
+    return {'values': [float(i) for i in range(num_leaves)]}
+
+
+def deep_attributes(num_leaves):
+    # Nested dictionaries of depth 10, each level with a few leaves
+    attributes = current = {}
+    while num_leaves > 0:
+        for i in range(min(num_leaves, 10)):
+            current['leaf{}'.format(i)] = i
+        num_leaves -= 10
+        current['nested'] = {}
+        current = current['nested']
+    return attributes
+
+
+def time_store(attributes):
+    from aiida.backends.djsite.db.models import DbAttribute
+
+    node = Node()
+    for k, v in attributes.iteritems():
+        node._set_attr(k, v)
+    start = time.time()
+    node.store()
+    elapsed = time.time() - start
+    return DbAttribute.objects.filter(dbnode=node.dbnode).count(), elapsed
+
+
+def main():
+    from aiida.backends.djsite.db.models import DbAttribute
+
+    if settings.BACKEND != BACKEND_DJANGO:
+        print >> sys.stderr, "This benchmark is only for the Django backend"
+        sys.exit(1)
+
+    try:
+        num_leaves = int(sys.argv[1])
+    except IndexError:
+        num_leaves = 10000
+
+    copy_threshold = DbAttribute._copy_threshold
+    for name, attributes in [('wide', wide_attributes(num_leaves)),
+                             ('deep', deep_attributes(num_leaves))]:
+        try:
+            DbAttribute._copy_threshold = sys.maxint
+            num_rows, insert_time = time_store(attributes)
+        finally:
+            DbAttribute._copy_threshold = copy_threshold
+        num_rows, copy_time = time_store(attributes)
+
+        print "{} attributes ({} rows):".format(name, num_rows)
+        print "  INSERT: {:10.0f} rows/s".format(num_rows / insert_time)
+        print "  COPY:   {:10.0f} rows/s".format(num_rows / copy_time)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Measure the rate (nodes per second) at which the attributes of many nodes
+are read, loading each node and calling get_attrs() or projecting the
+attributes with the QueryBuilder, and at which the nodes are exported.
+
+Usage: verdi run export_attributes.py [NUMBER_OF_NODES]
+
+WARNING: the nodes are created in the database of the current profile;
+use a test profile.
+"""
+import sys
+import time
+
+from aiida.common.folders import SandboxFolder
+from aiida.orm import DataFactory
+from aiida.orm.importexport import export_tree
+from aiida.orm.node import Node, store_nodes
+from aiida.orm.querybuilder import QueryBuilder
+
+ParameterData = DataFactory('parameter')
+
+
+def create_nodes(num_nodes):
+    nodes = [ParameterData(dict={
+        'index': i,
+        'energy': -1.5 * i,
+        'label': 'node {}'.format(i),
+        'forces': [[0., 0., float(i)]] * 3,
+    }) for i in range(num_nodes)]
+    store_nodes(nodes)
+    return [node.pk for node in nodes]
+
+
+def time_get_attrs(pks):
+    qb = QueryBuilder()
+    qb.append(Node, filters={'id': {'in': pks}}, project=['*'])
+    start = time.time()
+    for node, in qb.iterall():
+        node.get_attrs()
+    return time.time() - start
+
+
+def time_projection(pks):
+    qb = QueryBuilder()
+    qb.append(Node, filters={'id': {'in': pks}}, project=['id', 'attributes'])
+    start = time.time()
+    for _ in qb.iterall(batch_size=1000):
+        pass
+    return time.time() - start
+
+
+def time_export(pks):
+    qb = QueryBuilder()
+    qb.append(Node, filters={'id': {'in': pks}}, project=['*'])
+    dbnodes = [node.dbnode for node, in qb.iterall()]
+    with SandboxFolder() as folder:
+        start = time.time()
+        export_tree(dbnodes, folder=folder, silent=True)
+        return time.time() - start
+
+
+def main():
+    try:
+        num_nodes = int(sys.argv[1])
+    except IndexError:
+        num_nodes = 10000
+
+    pks = create_nodes(num_nodes)
+
+    print "Reading the attributes of {} nodes:".format(num_nodes)
+    print "  get_attrs():  {:10.0f} nodes/s".format(
+        num_nodes / time_get_attrs(pks))
+    print "  projection:   {:10.0f} nodes/s".format(
+        num_nodes / time_projection(pks))
+    print "Exporting {} nodes:".format(num_nodes)
+    print "  export_tree(): {:9.0f} nodes/s".format(
+        num_nodes / time_export(pks))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env runaiida
+# -*- coding: utf-8 -*-
+###########################################################################
+# Copyright (c), The AiiDA team. All rights reserved.                     #
+# This file is part of the AiiDA code.                                    #
+#                                                                         #
+# The code is hosted on GitHub at https://github.com/aiidateam/aiida_core #
+# For further information on the license, see the LICENSE.txt file        #
+# For further information please visit http://www.aiida.net               #
+###########################################################################
+"""
+Compare the time needed to store many nodes (with attributes and links)
+one by one with store(), and all at once with store_nodes().
+
+Usage: verdi run store_nodes.py [NUMBER_OF_NODES]
+
+WARNING: the nodes are created in the database of the current profile;
+use a test profile.
+"""
+import sys
+import time
+
+from aiida.orm import DataFactory
+from aiida.orm.node import store_nodes
+
+ParameterData = DataFactory('parameter')
+
+
+def create_nodes(num_nodes):
+    """
+    Create a parent and num_nodes children, each with a few attributes
+    """
+    parent = ParameterData(dict={'benchmark': True})
+    children = []
+    for i in range(num_nodes):
+        child = ParameterData(dict={
+            'index': i,
+            'energy': -1.5 * i,
+            'label': 'child {}'.format(i),
+            'forces': [[0., 0., float(i)]] * 3,
+        })
+        child.add_link_from(parent, label='parent')
+        children.append(child)
+    return parent, children
+
+
+def main():
+    try:
+        num_nodes = int(sys.argv[1])
+    except IndexError:
+        num_nodes = 1000
+
+    parent, children = create_nodes(num_nodes)
+    start = time.time()
+    parent.store()
+    for child in children:
+        child.store()
+    store_time = time.time() - start
+
+    parent, children = create_nodes(num_nodes)
+    start = time.time()
+    store_nodes([parent] + children)
+    store_nodes_time = time.time() - start
+
+    print "Storing {} nodes:".format(num_nodes + 1)
+    print "  store():       {:8.2f} s".format(store_time)
+    print "  store_nodes(): {:8.2f} s ({:.1f}x)".format(
+        store_nodes_time, store_time / store_nodes_time)
+
+
+if __name__ == '__main__':
+    main()